@@ -11,7 +11,18 @@ This module provides deep code analysis capabilities including:
 
 from .engine import AnalysisEngine
 from .config import AnalysisConfig
+from .events import AnalysisEvent
+from .latency_metrics import LatencyHistogram, LatencyRecorder
+from .watcher import CodebaseWatcher, FileWatcher, PollingWatcher, WatchfilesWatcher, create_watcher
 from .ast_parser import ASTParserManager, ParseResult
+from .ast_visitor import FusedASTVisitor, FileVisit, FunctionMetrics, visit_file
+from .tree_walk import walk_tree, walk_tree_depths
+from .symbol_queries import QuerySymbolExtractor, SymbolQuery, get_symbol_query
+from .incremental_parse import IncrementalReuse, ParseTreeCache, compute_edit, parse_incremental
+from .generated_files import GeneratedFileClassifier
+from .skeleton import sample_source
+from .source_document import SourceDocument
+from .signal_scanner import SignalMatches, SignalScanner
 from .complexity_analyzer import ComplexityAnalyzer, ComplexityMetrics
 from .documentation_coverage import DocumentationCoverageAnalyzer, DocumentationCoverage
 from .teaching_value_scorer import TeachingValueScorer, TeachingValueScore
@@ -24,6 +35,9 @@ from .pattern_detector import (
     DatabasePatternDetector,
     AuthPatternDetector
 )
+from .pattern_rules import PatternRule, RuleSet, RulePatternDetector
+from .detector_budget import DetectorBudget, DetectorCostTable
+from .pattern_aggregate import PatternAggregate
 from .language_pattern_detector import (
     PythonPatternDetector,
     JavaScriptPatternDetector
@@ -51,8 +65,34 @@ from .notebook_analyzer import NotebookAnalyzer, NotebookCode, CodeCell
 __all__ = [
     'AnalysisEngine',
     'AnalysisConfig',
+    'AnalysisEvent',
+    'LatencyHistogram',
+    'LatencyRecorder',
+    'CodebaseWatcher',
+    'FileWatcher',
+    'PollingWatcher',
+    'WatchfilesWatcher',
+    'create_watcher',
     'ASTParserManager',
     'ParseResult',
+    'FusedASTVisitor',
+    'FileVisit',
+    'FunctionMetrics',
+    'visit_file',
+    'walk_tree',
+    'walk_tree_depths',
+    'QuerySymbolExtractor',
+    'SymbolQuery',
+    'get_symbol_query',
+    'IncrementalReuse',
+    'ParseTreeCache',
+    'compute_edit',
+    'parse_incremental',
+    'GeneratedFileClassifier',
+    'sample_source',
+    'SourceDocument',
+    'SignalMatches',
+    'SignalScanner',
     'ComplexityAnalyzer',
     'ComplexityMetrics',
     'DocumentationCoverageAnalyzer',
@@ -66,6 +106,12 @@ __all__ = [
     'APIPatternDetector',
     'DatabasePatternDetector',
     'AuthPatternDetector',
+    'PatternRule',
+    'RuleSet',
+    'RulePatternDetector',
+    'DetectorBudget',
+    'DetectorCostTable',
+    'PatternAggregate',
     'PythonPatternDetector',
     'JavaScriptPatternDetector',
     'JavaPatternDetector',
@@ -7,14 +7,16 @@ and provides a unified interface for parsing source files into Abstract Syntax T
 
 import time
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
 from tree_sitter import Language, Parser
-from tree_sitter_languages import get_language, get_parser
+from tree_sitter_languages import get_language
 
 from .config import AnalysisConfig
+from .tree_walk import find_error_nodes
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +33,7 @@ class ParseResult:
         has_errors: Whether the parse encountered syntax errors
         error_nodes: List of error nodes found in the tree
         parse_time_ms: Time taken to parse in milliseconds
+        incremental: Whether the tree was reparsed from an edited previous tree
     """
     file_path: str
     language: str
@@ -39,6 +42,7 @@ class ParseResult:
     has_errors: bool
     error_nodes: List[Any]
     parse_time_ms: float
+    incremental: bool = False
 
 
 class ASTParserManager:
@@ -49,6 +53,11 @@ class ASTParserManager:
     Supports 50+ languages including Python, JavaScript, TypeScript, Java, Go,
     Rust, C++, C#, Ruby, PHP, and more.
     
+    tree-sitter parsers are not thread-safe, so every thread gets its own
+    parser per language (grammars are loaded once and shared). Parsing runs
+    in C without holding the GIL, so the thread execution backend
+    (`executor_backend: thread`) parses several files at once.
+    
     Example:
         >>> config = AnalysisConfig()
         >>> parser_manager = ASTParserManager(config)
@@ -84,13 +93,23 @@ class ASTParserManager:
             config: Analysis configuration containing supported languages
         """
         self.config = config
-        self.parsers: Dict[str, Parser] = {}
         self.languages: Dict[str, Language] = {}
+        self._languages_lock = threading.Lock()
+        self._local = threading.local()
         
-        # Pre-load parsers for configured languages
-        self._initialize_parsers()
-        
-        logger.info(f"ASTParserManager initialized with {len(self.parsers)} languages")
+        # Grammars are loaded by get_parser() when a language is first parsed
+        logger.info(
+            f"ASTParserManager initialized for {len(config.supported_languages)} languages "
+            f"(grammars load on first use)"
+        )
+    
+    @property
+    def parsers(self) -> Dict[str, Parser]:
+        """Parsers of the calling thread by language."""
+        parsers = getattr(self._local, 'parsers', None)
+        if parsers is None:
+            parsers = self._local.parsers = {}
+        return parsers
     
     def parse_file(self, file_path: str) -> ParseResult:
         """
@@ -131,13 +150,6 @@ class ASTParserManager:
             logger.warning(f"Unsupported file type: {file_path}")
             raise ValueError(f"Unsupported file extension: {file_path_obj.suffix}")
         
-        # Get parser for language
-        try:
-            parser = self.get_parser(language)
-        except Exception as e:
-            logger.error(f"Failed to get parser for {language}: {e}")
-            raise ValueError(f"Parser not available for language: {language}")
-        
         # Read file content
         try:
             with open(file_path, 'rb') as f:
@@ -146,10 +158,64 @@ class ASTParserManager:
             logger.error(f"Failed to read file {file_path}: {e}")
             raise
         
-        # Parse the file
+        return self.parse_bytes(source_code, language, file_path)
+    
+    def parse_bytes(
+        self,
+        source: bytes,
+        language: str,
+        file_path: str = "<memory>",
+        old_tree: Any = None
+    ) -> ParseResult:
+        """
+        Parse an in-memory source buffer and return AST with metadata.
+        
+        This is the entry point used by the analysis pipeline, which reads
+        each file exactly once and shares the buffer between hashing,
+        parsing and pattern detection.
+        
+        Args:
+            source: Source code bytes
+            language: Language name (e.g., 'python', 'javascript')
+            file_path: Path the source was read from (used for reporting only)
+            old_tree: Tree of a previous version of the source, already
+                      adjusted with `Tree.edit()`; tree-sitter reuses its
+                      unchanged subtrees (see incremental_parse)
+        
+        Returns:
+            ParseResult containing the AST and metadata
+        
+        Raises:
+            ValueError: If the source is too large, the language is
+                        unsupported, or parsing fails
+        
+        Example:
+            >>> result = parser_manager.parse_bytes(b"def f(): pass", "python")
+            >>> print(result.root_node.type)  # "module"
+        """
+        # Check source size
+        size_mb = len(source) / (1024 * 1024)
+        if size_mb > self.config.max_file_size_mb:
+            raise ValueError(
+                f"File too large for parsing: {size_mb:.2f}MB "
+                f"(max: {self.config.max_file_size_mb}MB)"
+            )
+        
+        if language == 'unknown':
+            logger.warning(f"Unsupported file type: {file_path}")
+            raise ValueError(f"Unsupported language for {file_path}")
+        
+        # Get parser for language
+        try:
+            parser = self.get_parser(language)
+        except Exception as e:
+            logger.error(f"Failed to get parser for {language}: {e}")
+            raise ValueError(f"Parser not available for language: {language}")
+        
+        # Parse the source
         start_time = time.time()
         try:
-            tree = parser.parse(source_code)
+            tree = parser.parse(source, old_tree) if old_tree is not None else parser.parse(source)
             parse_time_ms = (time.time() - start_time) * 1000
         except Exception as e:
             logger.error(f"Failed to parse {file_path}: {e}")
@@ -174,41 +240,61 @@ class ASTParserManager:
             root_node=root_node,
             has_errors=has_errors,
             error_nodes=error_nodes,
-            parse_time_ms=parse_time_ms
+            parse_time_ms=parse_time_ms,
+            incremental=old_tree is not None
         )
     
     def get_parser(self, language: str) -> Parser:
         """
-        Get or create parser for language using tree-sitter-languages.
+        Get or create the calling thread's parser for a language.
         
         Args:
             language: Language name (e.g., 'python', 'javascript')
         
         Returns:
-            Parser instance for the language
+            Parser instance for the language, owned by the calling thread
         
         Raises:
             ValueError: If language is not supported
         """
-        if language not in self.parsers:
+        parsers = self.parsers
+        parser = parsers.get(language)
+        if parser is None:
             try:
-                # Use pre-built parser from tree-sitter-languages
-                self.parsers[language] = get_parser(language)
-                self.languages[language] = get_language(language)
-                logger.debug(f"Loaded parser for {language}")
+                parser = Parser()
+                parser.set_language(self._get_language(language))
             except Exception as e:
                 logger.error(f"Failed to load parser for {language}: {e}")
                 raise ValueError(f"Language not supported: {language}")
+            parsers[language] = parser
+            logger.debug(f"Created {language} parser for thread {threading.current_thread().name}")
         
-        return self.parsers[language]
+        return parser
     
-    def _initialize_parsers(self):
-        """Pre-load parsers for configured languages."""
-        for lang in self.config.supported_languages:
-            try:
-                self.get_parser(lang)
-            except Exception as e:
-                logger.warning(f"Failed to initialize parser for {lang}: {e}")
+    def _get_language(self, language: str) -> Language:
+        """Load a grammar from tree-sitter-languages once, for all threads."""
+        grammar = self.languages.get(language)
+        if grammar is None:
+            with self._languages_lock:
+                grammar = self.languages.get(language)
+                if grammar is None:
+                    # Use pre-built grammar from tree-sitter-languages
+                    grammar = get_language(language)
+                    self.languages[language] = grammar
+                    logger.debug(f"Loaded grammar for {language}")
+        return grammar
+    
+    def detect_language(self, file_path: str) -> str:
+        """
+        Detect the parser language for a file from its extension.
+        
+        Args:
+            file_path: Path to the file
+        
+        Returns:
+            Language name or 'unknown' if not supported
+        """
+        return self._detect_language(file_path)
     
     def _detect_language(self, file_path: str) -> str:
         """
@@ -225,7 +311,7 @@ class ASTParserManager:
     
     def _find_error_nodes(self, node: Any) -> List[Any]:
         """
-        Recursively find all error nodes in tree.
+        Find all error nodes in tree.
         
         Args:
             node: tree-sitter Node to search
@@ -233,17 +319,7 @@ class ASTParserManager:
         Returns:
             List of error nodes found
         """
-        errors = []
-        
-        # Check if this node is an error
-        if node.type == 'ERROR' or node.is_missing:
-            errors.append(node)
-        
-        # Recursively check children
-        for child in node.children:
-            errors.extend(self._find_error_nodes(child))
-        
-        return errors
+        return find_error_nodes(node)
     
     def get_supported_languages(self) -> List[str]:
         """
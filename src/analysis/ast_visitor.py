@@ -0,0 +1,323 @@
+"""
+Single-pass AST visitor gathering per-function and file-level signals.
+
+Symbol extraction, complexity analysis and documentation coverage used to
+walk the same syntax tree several times: once per function to count
+decision points, once more to measure nesting depth, and a text rescan of
+the whole file to find comments. `FusedASTVisitor` collects all of these in
+one iterative traversal of the tree. The analyzers look up the results
+instead of walking the tree again.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from .tree_walk import walk_tree_depths
+
+logger = logging.getLogger(__name__)
+
+# Node types that add a decision point to the cyclomatic complexity of the
+# enclosing functions (as counted by SymbolExtractor for every language)
+DECISION_NODES = frozenset({
+    'if_statement', 'elif_clause',
+    'for_statement', 'while_statement',
+    'except_clause',
+    'case_clause',  # Python 3.10+ match statements
+    'boolean_operator'  # and, or
+})
+
+# Node types that increase the nesting depth of their children
+NESTING_NODES = frozenset({
+    'if_statement', 'elif_clause', 'else_clause',
+    'for_statement', 'while_statement', 'do_statement',
+    'switch_statement', 'case', 'case_clause',
+    'try_statement', 'catch_clause', 'except_clause',
+    'with_statement',
+    'if_expression', 'for_expression', 'while_expression',
+    'match_expression', 'match_arm'
+})
+
+COMMENT_NODES = frozenset({'comment', 'line_comment', 'block_comment'})
+
+# Comment delimiters stripped from comment text, longest first
+COMMENT_MARKERS = ('///', '//!', '//', '/**', '/*', '#', '--')
+
+
+@dataclass(frozen=True)
+class VisitorSpec:
+    """
+    Node types a FusedASTVisitor reacts to for one language.
+
+    Attributes:
+        function_nodes: Node types whose metrics are recorded
+        decision_nodes: Node types counted as decision points
+        nesting_nodes: Node types that increase nesting depth
+        comment_nodes: Node types holding comments
+    """
+    function_nodes: FrozenSet[str]
+    decision_nodes: FrozenSet[str] = DECISION_NODES
+    nesting_nodes: FrozenSet[str] = NESTING_NODES
+    comment_nodes: FrozenSet[str] = COMMENT_NODES
+
+
+_JAVASCRIPT_SPEC = VisitorSpec(frozenset({
+    'function_declaration', 'function', 'function_expression',
+    'generator_function_declaration', 'arrow_function', 'method_definition'
+}))
+
+VISITOR_SPECS: Dict[str, VisitorSpec] = {
+    'python': VisitorSpec(frozenset({'function_definition'})),
+    'javascript': _JAVASCRIPT_SPEC,
+    'typescript': _JAVASCRIPT_SPEC,
+    'tsx': _JAVASCRIPT_SPEC,
+    'java': VisitorSpec(frozenset({'method_declaration', 'constructor_declaration'})),
+    'go': VisitorSpec(frozenset({'function_declaration', 'method_declaration', 'func_literal'})),
+    'rust': VisitorSpec(frozenset({'function_item', 'closure_expression'})),
+    'cpp': VisitorSpec(frozenset({'function_definition', 'lambda_expression'})),
+    'c': VisitorSpec(frozenset({'function_definition'})),
+    'c_sharp': VisitorSpec(frozenset({'method_declaration', 'constructor_declaration'})),
+    'ruby': VisitorSpec(frozenset({'method', 'singleton_method'})),
+    'php': VisitorSpec(frozenset({'function_definition', 'method_declaration'})),
+}
+
+
+@dataclass
+class FunctionMetrics:
+    """
+    Metrics of one function node, including nested code.
+
+    Attributes:
+        decision_points: Decision points within the function
+        max_nesting_depth: Deepest nesting of control structures,
+                           relative to the function
+        base_depth: Nesting depth at which the function starts
+    """
+    decision_points: int = 0
+    max_nesting_depth: int = 0
+    base_depth: int = 0
+
+    @property
+    def complexity(self) -> int:
+        """Cyclomatic complexity (1 + decision points)."""
+        return 1 + self.decision_points
+
+
+@dataclass
+class CommentInfo:
+    """
+    A comment found in the tree.
+
+    Attributes:
+        text: Comment text without comment delimiters
+        line: Full source line the comment starts on
+        has_code_before: Whether code precedes the comment on that line
+    """
+    text: str
+    line: str
+    has_code_before: bool
+
+
+@dataclass
+class FileVisit:
+    """
+    Combined result of visiting a file's syntax tree.
+
+    Attributes:
+        functions: Metrics by (start_byte, end_byte, type) of each function node
+        comments: Comments in source order
+        max_nesting_depth: Deepest nesting anywhere in the file
+        extracted: Metrics of the functions looked up by symbol extraction,
+                   in lookup order
+    """
+    functions: Dict[Tuple[int, int, str], FunctionMetrics] = field(default_factory=dict)
+    comments: List[CommentInfo] = field(default_factory=list)
+    max_nesting_depth: int = 0
+    extracted: List[FunctionMetrics] = field(default_factory=list)
+
+    def lookup(self, node: Any) -> Optional[FunctionMetrics]:
+        """
+        Get the metrics of a function node.
+
+        Found metrics are also appended to `extracted`, so that file-level
+        aggregates cover exactly the functions reported as symbols.
+
+        Args:
+            node: tree-sitter node of a function
+
+        Returns:
+            FunctionMetrics, or None if the node was not recorded
+        """
+        metrics = self.functions.get((node.start_byte, node.end_byte, node.type))
+        if metrics is not None:
+            self.extracted.append(metrics)
+        return metrics
+
+
+class FusedASTVisitor:
+    """
+    Iterative visitor collecting decision points, nesting depth and comments.
+
+    The tree is walked once with a tree cursor (see tree_walk), so deeply
+    nested code cannot exhaust the interpreter's recursion limit. Every
+    node carries the tuple of functions enclosing it; decision points and
+    nesting depth are credited to all of them, which gives each function
+    the same totals as walking its own subtree.
+
+    Example:
+        >>> visit = get_visitor('python').visit(parse_result.root_node, source)
+        >>> metrics = visit.lookup(function_node)
+        >>> print(metrics.complexity, metrics.max_nesting_depth)
+    """
+
+    def __init__(self, spec: VisitorSpec):
+        """
+        Initialize the visitor.
+
+        Args:
+            spec: Node types of the language to visit
+        """
+        self.spec = spec
+
+    def visit(self, root_node: Any, source: Optional[bytes] = None, reuse: Optional[Any] = None) -> FileVisit:
+        """
+        Walk a syntax tree once and collect all signals.
+
+        Args:
+            root_node: Root node of the tree
+            source: Source bytes the tree was parsed from (read from the
+                    tree when omitted)
+            reuse: IncrementalReuse of the file's previous version; the
+                   results of unchanged top-level statements are reused
+                   instead of walking them (requires source)
+
+        Returns:
+            FileVisit with per-function metrics and comments
+        """
+        result = FileVisit()
+        lines: List[List[bytes]] = []
+
+        def get_lines() -> List[bytes]:
+            if not lines:
+                lines.append((source if source is not None else root_node.text).split(b'\n'))
+            return lines[0]
+
+        spec = self.spec
+        if (
+            reuse is None or source is None or root_node.parent is not None
+            or root_node.type in spec.function_nodes or root_node.type in spec.nesting_nodes
+            or root_node.type in spec.decision_nodes or root_node.type in spec.comment_nodes
+        ):
+            self._visit_subtree(root_node, result, get_lines)
+        else:
+            # The root contributes nothing itself, so its children can be
+            # visited (or reused) one at a time
+            for child in root_node.children:
+                reuse.visit_statement(
+                    child, result,
+                    lambda node, part: self._visit_subtree(node, part, get_lines)
+                )
+
+        return result
+
+    def _visit_subtree(self, root_node: Any, result: FileVisit, get_lines: Callable[[], List[bytes]]) -> None:
+        """Walk a subtree, starting outside any nesting or function, into result."""
+        function_nodes = self.spec.function_nodes
+        decision_nodes = self.spec.decision_nodes
+        nesting_nodes = self.spec.nesting_nodes
+        comment_nodes = self.spec.comment_nodes
+
+        # Nesting depth and enclosing functions at each level of the current path
+        depths: List[int] = []
+        enclosings: List[Tuple[FunctionMetrics, ...]] = []
+        for node, level in walk_tree_depths(root_node):
+            if level:
+                depth = depths[level - 1]
+                enclosing = enclosings[level - 1]
+            else:
+                depth = 0
+                enclosing = ()
+            node_type = node.type
+
+            if node_type in nesting_nodes:
+                depth += 1
+                if depth > result.max_nesting_depth:
+                    result.max_nesting_depth = depth
+                for metrics in enclosing:
+                    if depth - metrics.base_depth > metrics.max_nesting_depth:
+                        metrics.max_nesting_depth = depth - metrics.base_depth
+
+            if node_type in decision_nodes:
+                for metrics in enclosing:
+                    metrics.decision_points += 1
+
+            if node_type in comment_nodes:
+                result.comments.append(self._comment_info(node, get_lines()))
+
+            elif node_type in function_nodes:
+                metrics = FunctionMetrics(base_depth=depth)
+                result.functions[(node.start_byte, node.end_byte, node_type)] = metrics
+                enclosing = enclosing + (metrics,)
+
+            if level < len(depths):
+                depths[level] = depth
+                enclosings[level] = enclosing
+            else:
+                depths.append(depth)
+                enclosings.append(enclosing)
+
+    @staticmethod
+    def _comment_info(node: Any, lines: List[bytes]) -> CommentInfo:
+        """Describe a comment node using the source line it starts on."""
+        row, column = node.start_point
+        line = lines[row] if row < len(lines) else b''
+        text = node.text.decode('utf-8', errors='ignore').strip()
+        for marker in COMMENT_MARKERS:
+            if text.startswith(marker):
+                text = text[len(marker):]
+                break
+        if text.endswith('*/'):
+            text = text[:-2]
+        return CommentInfo(
+            text=text.strip(),
+            line=line.decode('utf-8', errors='ignore'),
+            has_code_before=bool(line[:column].strip())
+        )
+
+
+_VISITORS: Dict[str, FusedASTVisitor] = {}
+
+
+def get_visitor(language: str) -> FusedASTVisitor:
+    """
+    Get the visitor for a language.
+
+    Languages without a dedicated spec use the decision, nesting and
+    comment node types shared by all languages.
+
+    Args:
+        language: Parser language name
+
+    Returns:
+        FusedASTVisitor (shared; visitors hold no per-file state)
+    """
+    visitor = _VISITORS.get(language)
+    if visitor is None:
+        visitor = FusedASTVisitor(VISITOR_SPECS.get(language, VisitorSpec(frozenset())))
+        _VISITORS[language] = visitor
+    return visitor
+
+
+def visit_file(parse_result: Any, source: Optional[bytes] = None, reuse: Optional[Any] = None) -> FileVisit:
+    """
+    Visit a parsed file with its language's visitor.
+
+    Args:
+        parse_result: ParseResult from the AST parser
+        source: Source bytes the file was parsed from
+        reuse: IncrementalReuse of the file's previous version, if any
+
+    Returns:
+        FileVisit for the file
+    """
+    return get_visitor(parse_result.language).visit(parse_result.root_node, source, reuse)
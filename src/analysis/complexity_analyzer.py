@@ -9,6 +9,9 @@ import logging
 from typing import Any, Optional, Dict
 from dataclasses import dataclass, field
 
+from .ast_visitor import FileVisit, NESTING_NODES
+from .tree_walk import count_nodes, max_nesting_depth
+
 logger = logging.getLogger(__name__)
 
 
@@ -193,12 +196,14 @@ class ComplexityAnalyzer:
         """
         return self._calculate_depth_recursive(node, 0)
     
-    def analyze_file(self, symbol_info: Any) -> ComplexityMetrics:
+    def analyze_file(self, symbol_info: Any, visit: Optional[FileVisit] = None) -> ComplexityMetrics:
         """
         Analyze complexity metrics for an entire file.
         
         Args:
             symbol_info: SymbolInfo containing functions and classes
+            visit: FileVisit used to extract symbol_info; provides the nesting
+                   depth of the extracted functions without walking the AST
         
         Returns:
             ComplexityMetrics with aggregated statistics
@@ -208,7 +213,6 @@ class ComplexityAnalyzer:
             >>> print(f"Average complexity: {metrics.avg_complexity}")
         """
         complexities = []
-        nesting_depths = []
         high_complexity_count = 0
         trivial_count = 0
         total_decision_points = 0
@@ -253,14 +257,23 @@ class ComplexityAnalyzer:
             max_complexity = 0
             min_complexity = 0
         
+        # Nesting depth is only known when the AST was visited
+        nesting_depths = [m.max_nesting_depth for m in visit.extracted] if visit is not None else []
+        if nesting_depths:
+            avg_nesting_depth = sum(nesting_depths) / len(nesting_depths)
+            max_nesting_depth = max(nesting_depths)
+        else:
+            avg_nesting_depth = 0.0
+            max_nesting_depth = 0
+        
         metrics = ComplexityMetrics(
             avg_complexity=round(avg_complexity, 2),
             max_complexity=max_complexity,
             min_complexity=min_complexity,
             high_complexity_count=high_complexity_count,
             trivial_count=trivial_count,
-            avg_nesting_depth=0.0,  # Would need AST nodes to calculate
-            max_nesting_depth=0,
+            avg_nesting_depth=round(avg_nesting_depth, 2),
+            max_nesting_depth=max_nesting_depth,
             total_decision_points=total_decision_points
         )
         
@@ -275,7 +288,7 @@ class ComplexityAnalyzer:
     
     def _count_decision_points(self, node: Any, decision_node_types: set) -> int:
         """
-        Recursively count decision points in a node tree.
+        Count decision points in a node tree.
         
         Args:
             node: Node to analyze
@@ -284,23 +297,15 @@ class ComplexityAnalyzer:
         Returns:
             Number of decision points
         """
-        count = 0
-        
-        # Check if this node is a decision point
-        if node.type in decision_node_types:
-            # For binary expressions, only count logical operators
-            if node.type in ['binary_expression', 'boolean_operator', 'binary']:
-                operator = self._get_operator(node)
-                if operator in self.logical_operators:
-                    count += 1
-            else:
-                count += 1
-        
-        # Recursively count in children
-        for child in node.children:
-            count += self._count_decision_points(child, decision_node_types)
-        
-        return count
+        # For binary expressions, only count logical operators
+        return count_nodes(
+            node,
+            decision_node_types,
+            lambda n: (
+                n.type not in ('binary_expression', 'boolean_operator', 'binary')
+                or self._get_operator(n) in self.logical_operators
+            )
+        )
     
     def _get_operator(self, node: Any) -> str:
         """
@@ -320,7 +325,7 @@ class ComplexityAnalyzer:
     
     def _calculate_depth_recursive(self, node: Any, current_depth: int) -> int:
         """
-        Recursively calculate maximum nesting depth.
+        Calculate maximum nesting depth below a node.
         
         Args:
             node: Current node
@@ -329,30 +334,7 @@ class ComplexityAnalyzer:
         Returns:
             Maximum depth found
         """
-        max_depth = current_depth
-        
-        # Node types that increase nesting depth
-        nesting_nodes = {
-            'if_statement', 'elif_clause', 'else_clause',
-            'for_statement', 'while_statement', 'do_statement',
-            'switch_statement', 'case', 'case_clause',
-            'try_statement', 'catch_clause', 'except_clause',
-            'with_statement',
-            'if_expression', 'for_expression', 'while_expression',
-            'match_expression', 'match_arm'
-        }
-        
-        # Increase depth if this is a nesting node
-        if node.type in nesting_nodes:
-            current_depth += 1
-            max_depth = current_depth
-        
-        # Recursively check children
-        for child in node.children:
-            child_depth = self._calculate_depth_recursive(child, current_depth)
-            max_depth = max(max_depth, child_depth)
-        
-        return max_depth
+        return current_depth + max_nesting_depth(node, NESTING_NODES)
     
     def flag_high_complexity(self, complexity: int) -> bool:
         """
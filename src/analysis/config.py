@@ -44,7 +44,29 @@ class AnalysisConfig:
     
     # Performance settings
     max_parallel_files: int = 10
-    parse_timeout_seconds: int = 5
+    parse_timeout_seconds: float = 5  # Per-file deadline, enforced by the process backend (0 disables)
+    executor_backend: str = "inline"  # 'inline', 'thread' or 'process'
+    skip_timed_out_files: bool = True  # Skip unchanged files that timed out in a previous run
+    use_symbol_queries: bool = True  # Locate symbols with tree-sitter queries instead of walking the AST
+    incremental_parse: bool = True  # Reparse edited files from their previous tree and reuse unchanged symbols
+    parse_cache_size: int = 256  # Files whose last syntax tree is kept for incremental re-parsing
+    generated_files: str = "metadata"  # Generated/minified files: 'analyze', 'metadata' (no parsing) or 'skip'
+    generated_sample_kb: int = 8  # Leading KB of a file inspected by the generated-file classifier
+    minified_line_length: int = 300  # Average line length above which a file counts as minified
+    skeleton_threshold_kb: int = 1024  # Files larger than this get a skeleton analysis (0 disables)
+    skeleton_sample_kb: int = 256  # KB of a skeleton file's text sampled for pattern detection
+    
+    # Declarative pattern rules: YAML files or directories of them (see pattern_rules)
+    pattern_rules: List[str] = field(default_factory=list)
+    
+    # Pattern detector budgets, in milliseconds (opt-in; 0 disables a budget)
+    detector_soft_budget_ms: float = 0  # Per-file time above which a detector run is an overrun
+    detector_hard_budget_ms: float = 0  # Per-file time above which a detector is demoted at once
+    detector_file_budget_ms: float = 0  # Time all detectors may spend on one file before the rest are skipped
+    detector_run_budget_ms: float = 0  # Time one detector may spend in one analysis run
+    detector_overrun_limit: int = 3  # Soft overruns that demote a detector (active -> sampled -> disabled)
+    detector_sample_rate: int = 10  # Sampled detectors run on 1 in this many files
+    adaptive_detector_order: bool = True  # Run cheap, high-yield detectors first, from their history
     
     # Linter integration
     enable_linters: bool = False
@@ -54,6 +76,13 @@ class AnalysisConfig:
     
     # Incremental analysis
     enable_incremental: bool = True
+    trust_stat_manifest: bool = False  # Skip re-hashing racy (recently modified) files
+    use_git_index: bool = True  # Key clean tracked files by their git blob SHA
+    
+    # Watch mode
+    watch_backend: str = "auto"  # 'auto', 'watchfiles' (native events) or 'polling'
+    watch_debounce_ms: int = 200  # Quiet period before a batch of file events is applied
+    watch_poll_interval_ms: int = 1000  # Rescan interval of the polling watcher
     persistence_path: str = ".documee/analysis"
     
     @classmethod
@@ -70,8 +99,31 @@ class AnalysisConfig:
             teaching_value_weights=analysis_config.get('teaching_value_weights', cls.__dataclass_fields__['teaching_value_weights'].default_factory()),
             max_parallel_files=analysis_config.get('max_parallel_files', 10),
             parse_timeout_seconds=analysis_config.get('parse_timeout_seconds', 5),
+            executor_backend=analysis_config.get('executor_backend', 'inline'),
+            skip_timed_out_files=analysis_config.get('skip_timed_out_files', True),
+            use_symbol_queries=analysis_config.get('use_symbol_queries', True),
+            incremental_parse=analysis_config.get('incremental_parse', True),
+            parse_cache_size=analysis_config.get('parse_cache_size', 256),
+            generated_files=analysis_config.get('generated_files', 'metadata'),
+            generated_sample_kb=analysis_config.get('generated_sample_kb', 8),
+            minified_line_length=analysis_config.get('minified_line_length', 300),
+            skeleton_threshold_kb=analysis_config.get('skeleton_threshold_kb', 1024),
+            skeleton_sample_kb=analysis_config.get('skeleton_sample_kb', 256),
+            pattern_rules=analysis_config.get('pattern_rules') or [],
+            detector_soft_budget_ms=analysis_config.get('detector_soft_budget_ms', 0),
+            detector_hard_budget_ms=analysis_config.get('detector_hard_budget_ms', 0),
+            detector_file_budget_ms=analysis_config.get('detector_file_budget_ms', 0),
+            detector_run_budget_ms=analysis_config.get('detector_run_budget_ms', 0),
+            detector_overrun_limit=analysis_config.get('detector_overrun_limit', 3),
+            detector_sample_rate=analysis_config.get('detector_sample_rate', 10),
+            adaptive_detector_order=analysis_config.get('adaptive_detector_order', True),
             enable_linters=analysis_config.get('enable_linters', False),
             cache_ttl_seconds=analysis_config.get('cache_ttl_seconds', 3600),
             enable_incremental=analysis_config.get('enable_incremental', True),
+            trust_stat_manifest=analysis_config.get('trust_stat_manifest', False),
+            use_git_index=analysis_config.get('use_git_index', True),
+            watch_backend=analysis_config.get('watch_backend', 'auto'),
+            watch_debounce_ms=analysis_config.get('watch_debounce_ms', 200),
+            watch_poll_interval_ms=analysis_config.get('watch_poll_interval_ms', 1000),
             persistence_path=analysis_config.get('persistence_path', '.documee/analysis')
         )
@@ -10,6 +10,7 @@ from typing import List, Dict, Set, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from pathlib import Path
 import os
+from collections import deque
 
 from .symbol_extractor import SymbolInfo, ImportInfo
 
@@ -111,6 +112,88 @@ class DependencyGraph:
         )
 
 
+# Endings tried when resolving an import to an analyzed file (see
+# _resolve_absolute_import and _resolve_relative_import)
+_MODULE_FILE_ENDINGS = (
+    '/__init__.py', '/index.js', '/index.ts', '.py', '.js', '.ts', '.tsx', '.jsx'
+)
+
+
+class _DependencyIndex:
+    """
+    Lookup tables kept alongside a DependencyGraph for incremental updates.
+    
+    Built once per graph object and maintained by update_dependencies, so a
+    graph kept in memory (watch mode) is patched in time proportional to the
+    change.
+    
+    Attributes:
+        edges: The graph's edge list (the index is rebuilt if it is replaced)
+        edge_slots: Positions in `edges` of the edges of each importing file
+        unresolved: Files with an unresolved import, by module key
+    """
+    
+    def __init__(self, graph: 'DependencyGraph'):
+        """Index the edges and unresolved imports of a graph."""
+        self.edges = graph.edges
+        self.edge_slots: Dict[str, List[int]] = {}
+        for position, edge in enumerate(graph.edges):
+            self.edge_slots.setdefault(edge.from_file, []).append(position)
+        self.unresolved: Dict[str, Set[str]] = {}
+        for file_path, node in graph.nodes.items():
+            for module in node.external_imports:
+                self.add_unresolved(module, file_path)
+    
+    @staticmethod
+    def module_key(module: str) -> str:
+        """Path form of a module, as the import resolvers match it."""
+        if module.startswith('.'):
+            return module.lstrip('.').strip('.')
+        return module.replace('.', '/')
+    
+    @staticmethod
+    def file_keys(file_path: str) -> Set[str]:
+        """Module keys that could resolve to a file (a superset)."""
+        normalized = file_path.replace('\\', '/')
+        keys = {''} if '__init__.py' in normalized else set()
+        for ending in _MODULE_FILE_ENDINGS:
+            end = normalized.find(ending)
+            while end != -1:
+                keys.update(normalized[start:end] for start in range(end + 1))
+                end = normalized.find(ending, end + 1)
+        return keys
+    
+    def add_edge(self, edge: 'DependencyEdge') -> None:
+        """Append an edge to the graph."""
+        self.edge_slots.setdefault(edge.from_file, []).append(len(self.edges))
+        self.edges.append(edge)
+    
+    def remove_edges(self, from_file: str) -> None:
+        """Remove the edges of an importing file, filling the gaps from the end."""
+        edges = self.edges
+        for position in sorted(self.edge_slots.pop(from_file, ()), reverse=True):
+            last = len(edges) - 1
+            if position != last:
+                moved = edges[last]
+                edges[position] = moved
+                slots = self.edge_slots[moved.from_file]
+                slots[slots.index(last)] = position
+            edges.pop()
+    
+    def add_unresolved(self, module: str, file_path: str) -> None:
+        """Record an import of a file that resolved to no analyzed file."""
+        self.unresolved.setdefault(self.module_key(module), set()).add(file_path)
+    
+    def remove_unresolved(self, module: str, file_path: str) -> None:
+        """Forget an unresolved import of a file."""
+        key = self.module_key(module)
+        importers = self.unresolved.get(key)
+        if importers is not None:
+            importers.discard(file_path)
+            if not importers:
+                del self.unresolved[key]
+
+
 class DependencyAnalyzer:
     """
     Analyzes dependencies between files and builds dependency graphs.
@@ -152,48 +235,13 @@ class DependencyAnalyzer:
         
         graph = DependencyGraph()
         
-        # Build nodes and extract imports
-        for file_path, file_analysis in file_analyses.items():
-            node = FileNode(file_path=file_path)
-            
-            # Extract imports from symbol info
-            symbol_info = file_analysis.symbol_info
-            for import_info in symbol_info.imports:
-                # Categorize as internal or external
-                resolved_path = self._resolve_import_path(
-                    import_info, 
-                    file_path, 
-                    file_analyses
-                )
-                
-                if resolved_path:
-                    # Internal dependency
-                    node.imports.append(resolved_path)
-                else:
-                    # External dependency
-                    node.external_imports.append(import_info.module)
-                    
-                    # Track external dependency usage
-                    package_name = self._get_package_name(import_info.module)
-                    graph.external_dependencies[package_name] = \
-                        graph.external_dependencies.get(package_name, 0) + 1
-            
-            graph.nodes[file_path] = node
+        # Create all nodes first so imports can be linked in both directions
+        for file_path in file_analyses:
+            graph.nodes[file_path] = FileNode(file_path=file_path)
         
-        # Build edges and reverse relationships
-        for file_path, node in graph.nodes.items():
-            for imported_file in node.imports:
-                # Add edge
-                edge = DependencyEdge(
-                    from_file=file_path,
-                    to_file=imported_file,
-                    import_count=1
-                )
-                graph.edges.append(edge)
-                
-                # Update imported_by relationship
-                if imported_file in graph.nodes:
-                    graph.nodes[imported_file].imported_by.append(file_path)
+        # Resolve imports into edges, reverse relationships and external usage
+        for file_path in file_analyses:
+            self._add_file_dependencies(graph, file_path, file_analyses)
         
         # Detect circular dependencies
         graph.circular_dependencies = self._detect_circular_dependencies(graph)
@@ -208,6 +256,251 @@ class DependencyAnalyzer:
         
         return graph
     
+    def update_dependencies(
+        self,
+        codebase_id: str,
+        graph: DependencyGraph,
+        file_analyses: Dict[str, Any],
+        changed_files: Set[str]
+    ) -> DependencyGraph:
+        """
+        Patch a previous dependency graph after an incremental analysis.
+        
+        Only the imports of changed and added files, of files that imported a
+        deleted file, and of files with an unresolved import that an added file
+        now satisfies are resolved again. Circular dependencies are recomputed
+        only for the strongly connected components (before and after the
+        patch) containing those files; cycles elsewhere are kept as they are.
+        
+        Unchanged files keep the edges they had, so an import that an added
+        file would now shadow (when another file already matched it) keeps
+        its previous target until the importing file changes.
+        
+        Args:
+            codebase_id: Identifier for the codebase
+            graph: Dependency graph of the previous run (updated in place)
+            file_analyses: Dictionary mapping file paths to FileAnalysis objects
+                           for the current run
+            changed_files: Paths of files that were re-analyzed in this run
+        
+        Returns:
+            The updated DependencyGraph
+        
+        Example:
+            >>> graph = analyzer.update_dependencies(
+            ...     "my_project", previous.dependency_graph, file_analyses, {"src/app.py"}
+            ... )
+        """
+        removed = {path for path in graph.nodes if path not in file_analyses}
+        added = [path for path in file_analyses if path not in graph.nodes]
+        changed = {path for path in changed_files if path in graph.nodes and path in file_analyses}
+        
+        if not removed and not added and not changed:
+            logger.info(f"Dependency graph unchanged for codebase: {codebase_id}")
+            return graph
+        
+        index = self._index_of(graph)
+        
+        # Files whose imports must be resolved again
+        dirty = changed | set(added)
+        for path in removed:
+            dirty.update(
+                importer for importer in graph.nodes[path].imported_by
+                if importer in file_analyses
+            )
+        if added:
+            dirty.update(self._find_importers_of(added, index, file_analyses, dirty))
+        
+        # Components that may split once the outgoing edges are removed
+        detached = (dirty | removed) & graph.nodes.keys()
+        affected = self._components_of(graph, detached)
+        
+        # Detach the outgoing edges of dirty and deleted files
+        for path in detached:
+            node = graph.nodes[path]
+            for imported_file in node.imports:
+                target = graph.nodes.get(imported_file)
+                if target is not None and path in target.imported_by:
+                    target.imported_by.remove(path)
+            for module in node.external_imports:
+                index.remove_unresolved(module, path)
+                package_name = self._get_package_name(module)
+                count = graph.external_dependencies.get(package_name, 0) - 1
+                if count > 0:
+                    graph.external_dependencies[package_name] = count
+                else:
+                    graph.external_dependencies.pop(package_name, None)
+            node.imports = []
+            node.external_imports = []
+            index.remove_edges(path)
+        
+        for path in removed:
+            del graph.nodes[path]
+        for path in added:
+            graph.nodes[path] = FileNode(file_path=path)
+        
+        for path in sorted(dirty):
+            self._add_file_dependencies(graph, path, file_analyses, index)
+        
+        # Components that may have merged through the new edges
+        affected |= self._components_of(graph, dirty)
+        
+        graph.circular_dependencies = [
+            circular for circular in graph.circular_dependencies
+            if affected.isdisjoint(circular.cycle)
+        ]
+        affected -= removed
+        graph.circular_dependencies.extend(self._detect_circular_dependencies(graph, affected))
+        
+        logger.info(
+            f"Dependency graph updated for codebase {codebase_id}: "
+            f"{len(added)} added, {len(changed)} changed, {len(removed)} removed, "
+            f"{len(dirty)} files re-resolved, {len(affected)} files in affected components "
+            f"({len(graph.nodes)} files, {len(graph.edges)} edges, "
+            f"{len(graph.circular_dependencies)} circular dependencies)"
+        )
+        
+        return graph
+    
+    def _add_file_dependencies(
+        self,
+        graph: DependencyGraph,
+        file_path: str,
+        file_analyses: Dict[str, Any],
+        index: Optional[_DependencyIndex] = None
+    ) -> None:
+        """
+        Resolve the imports of a file and add them to the graph.
+        
+        Adds the file's internal imports as edges (updating imported_by of the
+        imported files) and counts its external packages.
+        
+        Args:
+            graph: Dependency graph containing a node for every analyzed file
+            file_path: Path of the file whose imports are resolved
+            file_analyses: Dictionary of all analyzed files
+            index: The graph's index, kept up to date when given
+        """
+        node = graph.nodes[file_path]
+        
+        # Extract imports from symbol info
+        symbol_info = file_analyses[file_path].symbol_info
+        for import_info in symbol_info.imports:
+            # Categorize as internal or external
+            resolved_path = self._resolve_import_path(
+                import_info, 
+                file_path, 
+                file_analyses
+            )
+            
+            if resolved_path:
+                # Internal dependency
+                node.imports.append(resolved_path)
+                edge = DependencyEdge(
+                    from_file=file_path,
+                    to_file=resolved_path,
+                    import_count=1
+                )
+                if index is not None:
+                    index.add_edge(edge)
+                else:
+                    graph.edges.append(edge)
+                
+                # Update imported_by relationship
+                if resolved_path in graph.nodes:
+                    graph.nodes[resolved_path].imported_by.append(file_path)
+            else:
+                # External dependency
+                node.external_imports.append(import_info.module)
+                if index is not None:
+                    index.add_unresolved(import_info.module, file_path)
+                
+                # Track external dependency usage
+                package_name = self._get_package_name(import_info.module)
+                graph.external_dependencies[package_name] = \
+                    graph.external_dependencies.get(package_name, 0) + 1
+    
+    @staticmethod
+    def _index_of(graph: DependencyGraph) -> _DependencyIndex:
+        """Get the index of a graph, building it on first use."""
+        index = getattr(graph, '_dependency_index', None)
+        if index is None or index.edges is not graph.edges:
+            index = _DependencyIndex(graph)
+            graph._dependency_index = index
+        return index
+    
+    def _find_importers_of(
+        self,
+        added: List[str],
+        index: _DependencyIndex,
+        file_analyses: Dict[str, Any],
+        exclude: Set[str]
+    ) -> Set[str]:
+        """
+        Find files with an unresolved import that now resolves to an added file.
+        
+        Only files whose unresolved imports have a module key an added file
+        could satisfy are resolved again.
+        
+        Args:
+            added: Paths of files added since the graph was built
+            index: Index of the previous run's dependency graph
+            file_analyses: Dictionary of all analyzed files
+            exclude: Files that are re-resolved anyway
+        
+        Returns:
+            Paths of files whose imports must be resolved again
+        """
+        candidates: Set[str] = set()
+        for path in added:
+            for key in _DependencyIndex.file_keys(path):
+                candidates.update(index.unresolved.get(key, ()))
+        
+        added_analyses = {path: file_analyses[path] for path in added}
+        importers = set()
+        for file_path in sorted(candidates - exclude):
+            if file_path not in file_analyses:
+                continue
+            for import_info in file_analyses[file_path].symbol_info.imports:
+                if file_path in index.unresolved.get(index.module_key(import_info.module), ()) and (
+                    self._resolve_import_path(import_info, file_path, added_analyses)
+                ):
+                    importers.add(file_path)
+                    break
+        
+        return importers
+    
+    def _components_of(self, graph: DependencyGraph, file_paths: Set[str]) -> Set[str]:
+        """
+        Get the strongly connected components containing a set of files.
+        
+        The files reachable from any of them are found in one pass, and
+        their components in one run of Tarjan's algorithm over those files.
+        
+        Args:
+            graph: Dependency graph
+            file_paths: Paths of files in the graph
+        
+        Returns:
+            Union of the components (including file_paths)
+        """
+        reachable = set(file_paths)
+        stack = list(file_paths)
+        while stack:
+            node = graph.nodes.get(stack.pop())
+            if node is None:
+                continue
+            for imported_file in node.imports:
+                if imported_file not in reachable and imported_file in graph.nodes:
+                    reachable.add(imported_file)
+                    stack.append(imported_file)
+        
+        affected: Set[str] = set()
+        for component in self._strongly_connected_components(graph, reachable):
+            if not file_paths.isdisjoint(component):
+                affected.update(component)
+        return affected
+    
     def _resolve_import_path(
         self, 
         import_info: ImportInfo, 
@@ -369,14 +662,21 @@ class DependencyAnalyzer:
         # Regular packages
         return module.split('.')[0].split('/')[0]
     
-    def _detect_circular_dependencies(self, graph: DependencyGraph) -> List[CircularDependency]:
+    def _detect_circular_dependencies(
+        self,
+        graph: DependencyGraph,
+        nodes: Optional[Set[str]] = None
+    ) -> List[CircularDependency]:
         """
-        Detect circular dependencies using depth-first search.
+        Detect circular dependencies from strongly connected components.
         
-        Uses DFS with a recursion stack to detect cycles in the dependency graph.
+        Every component with more than one file (or a file importing itself)
+        contains at least one cycle; one cycle is reported per component.
         
         Args:
             graph: Dependency graph to analyze
+            nodes: Only consider components within these files (all files
+                   if None); must be a union of whole components
         
         Returns:
             List of detected circular dependencies
@@ -384,53 +684,122 @@ class DependencyAnalyzer:
         logger.debug("Detecting circular dependencies...")
         
         circular_deps = []
-        visited: Set[str] = set()
-        rec_stack: Set[str] = set()
-        path: List[str] = []
-        
-        def dfs(node_path: str) -> bool:
-            """
-            Depth-first search to detect cycles.
-            
-            Returns True if cycle detected.
-            """
-            visited.add(node_path)
-            rec_stack.add(node_path)
-            path.append(node_path)
-            
-            # Check all dependencies
-            node = graph.nodes.get(node_path)
-            if node:
-                for imported_file in node.imports:
-                    if imported_file not in visited:
-                        if dfs(imported_file):
-                            return True
-                    elif imported_file in rec_stack:
-                        # Cycle detected!
-                        cycle_start = path.index(imported_file)
-                        cycle = path[cycle_start:] + [imported_file]
-                        
-                        circular_deps.append(CircularDependency(
-                            cycle=cycle,
-                            severity='warning'
-                        ))
-                        
-                        logger.warning(f"Circular dependency detected: {' -> '.join(cycle)}")
-                        return True
+        for component in self._strongly_connected_components(graph, nodes):
+            start = component[0]
+            if len(component) == 1 and start not in graph.nodes[start].imports:
+                continue
             
-            path.pop()
-            rec_stack.remove(node_path)
-            return False
-        
-        # Run DFS from each unvisited node
-        for node_path in graph.nodes.keys():
-            if node_path not in visited:
-                dfs(node_path)
+            cycle = self._find_cycle(graph, start, set(component))
+            circular_deps.append(CircularDependency(
+                cycle=cycle,
+                severity='warning'
+            ))
+            logger.warning(f"Circular dependency detected: {' -> '.join(cycle)}")
         
         logger.debug(f"Found {len(circular_deps)} circular dependencies")
         
         return circular_deps
     
+    def _strongly_connected_components(
+        self,
+        graph: DependencyGraph,
+        nodes: Optional[Set[str]] = None
+    ) -> List[List[str]]:
+        """
+        Find strongly connected components with an iterative Tarjan's algorithm.
+        
+        Args:
+            graph: Dependency graph
+            nodes: Restrict the search to these files (all files if None)
+        
+        Returns:
+            List of components, each a list of file paths
+        """
+        if nodes is None:
+            roots = list(graph.nodes)
+        else:
+            roots = sorted(path for path in nodes if path in graph.nodes)
+        
+        def successors(path: str):
+            for imported_file in graph.nodes[path].imports:
+                if imported_file in graph.nodes and (nodes is None or imported_file in nodes):
+                    yield imported_file
+        
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        components: List[List[str]] = []
+        
+        for root in roots:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, successors(root))]
+            
+            while work:
+                node_path, children = work[-1]
+                descended = False
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, successors(child)))
+                        descended = True
+                        break
+                    if child in on_stack:
+                        lowlink[node_path] = min(lowlink[node_path], index[child])
+                if descended:
+                    continue
+                
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node_path])
+                
+                if lowlink[node_path] == index[node_path]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node_path:
+                            break
+                    components.append(component[::-1])
+        
+        return components
+    
+    def _find_cycle(self, graph: DependencyGraph, start: str, component: Set[str]) -> List[str]:
+        """
+        Find a shortest cycle through a file within its component.
+        
+        Args:
+            graph: Dependency graph
+            start: File the cycle starts and ends at
+            component: Strongly connected component containing start
+        
+        Returns:
+            Cycle as a list of file paths, e.g. [a, b, a]
+        """
+        parents: Dict[str, str] = {}
+        queue = deque([start])
+        while queue:
+            node_path = queue.popleft()
+            for imported_file in graph.nodes[node_path].imports:
+                if imported_file == start:
+                    # Walk back to start, then close the cycle
+                    path = [node_path]
+                    while path[-1] != start:
+                        path.append(parents[path[-1]])
+                    return path[::-1] + [start]
+                if imported_file in component and imported_file not in parents:
+                    parents[imported_file] = node_path
+                    queue.append(imported_file)
+        return [start, start]
+    
     def get_dependency_metrics(self, graph: DependencyGraph) -> Dict[str, Any]:
         """
         Calculate dependency metrics for the graph.
@@ -0,0 +1,350 @@
+"""
+Time budgets and cost accounting for pattern detectors.
+
+Custom detectors registered with PatternDetector.register_detector run on
+every file of their languages, so one slow detector can multiply the time
+of a whole-codebase analysis. `DetectorBudget` times every detector run and
+keeps a cost table (runs, time, patterns found). A detector that keeps
+exceeding its budget is demoted, with a warning:
+
+    active --(overruns)--> sampled --(overruns)--> disabled
+
+- Soft budget (per file): each run over it is an overrun, and
+  `overrun_limit` overruns demote the detector one step.
+- Hard budget (per file): a single run over it demotes the detector.
+- Run budget: a detector whose total time in the current run exceeds it
+  is disabled for the rest of the run.
+- File budget: once all detectors together have spent it on a file, the
+  remaining detectors are skipped for that file.
+
+Sampled detectors run on one in every `sample_rate` files they apply to.
+Demotions last until the next run (`DetectorBudget.start_run`), so a
+detector slowed down by a busy machine is not penalized for good; the cost
+history itself is kept.
+With `adaptive_order`, detectors run cheapest and most productive first
+(patterns found per millisecond, from their history), so a file budget
+cuts off the detectors that cost most for what they find.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+MODE_ACTIVE = "active"
+MODE_SAMPLED = "sampled"
+MODE_DISABLED = "disabled"
+
+# Runs before a detector's history is used to order it
+MIN_HISTORY_RUNS = 5
+
+
+class DetectorCost:
+    """
+    Accumulated cost and yield of one detector.
+
+    Attributes:
+        runs: Files the detector ran on
+        hits: Runs that found at least one pattern
+        patterns: Patterns found
+        total_ms: Time spent in the detector
+        max_ms: Slowest run
+        run_ms: Time spent in the current run (see DetectorBudget.start_run)
+        overruns: Soft budget overruns since the last demotion
+        skipped: Files skipped because of the detector's mode or a file budget
+        mode: 'active', 'sampled' or 'disabled'
+    """
+
+    __slots__ = (
+        'runs', 'hits', 'patterns', 'total_ms', 'max_ms', 'run_ms', 'overruns', 'skipped', 'mode'
+    )
+
+    def __init__(self):
+        """Initialize an empty cost record."""
+        self.runs = 0
+        self.hits = 0
+        self.patterns = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.run_ms = 0.0
+        self.overruns = 0
+        self.skipped = 0
+        self.mode = MODE_ACTIVE
+
+    def add(self, elapsed_ms: float, pattern_count: int) -> None:
+        """Record one run."""
+        self.runs += 1
+        self.hits += 1 if pattern_count else 0
+        self.patterns += pattern_count
+        self.total_ms += elapsed_ms
+        self.run_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    @property
+    def avg_ms(self) -> float:
+        """Average time per run."""
+        return self.total_ms / self.runs if self.runs else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of runs that found a pattern."""
+        return self.hits / self.runs if self.runs else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'mode': self.mode,
+            'runs': self.runs,
+            'skipped': self.skipped,
+            'patterns': self.patterns,
+            'hit_rate': round(self.hit_rate, 3),
+            'avg_ms': round(self.avg_ms, 3),
+            'max_ms': round(self.max_ms, 3),
+            'total_ms': round(self.total_ms, 2)
+        }
+
+
+class DetectorCostTable:
+    """
+    Cost records by detector name.
+
+    Example:
+        >>> table = DetectorCostTable()
+        >>> table.record('ReactPatternDetector', 1.5, 2)
+        >>> table.to_dict()['ReactPatternDetector']['hit_rate']
+        1.0
+    """
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self.costs: Dict[str, DetectorCost] = {}
+
+    def get(self, name: str) -> DetectorCost:
+        """Get a detector's cost record, creating it on first use."""
+        cost = self.costs.get(name)
+        if cost is None:
+            cost = self.costs[name] = DetectorCost()
+        return cost
+
+    def record(self, name: str, elapsed_ms: float, pattern_count: int) -> None:
+        """Record one run of a detector."""
+        self.get(name).add(elapsed_ms, pattern_count)
+
+    def record_file(
+        self,
+        timings: Dict[str, float],
+        yields: Dict[str, int],
+        skips: Dict[str, int],
+        modes: Dict[str, str]
+    ) -> None:
+        """
+        Record the detector runs of one file, as reported by a pipeline run.
+
+        Args:
+            timings: Milliseconds spent in each detector
+            yields: Patterns found by each detector that ran
+            skips: Detectors skipped because of their mode or a file budget
+            modes: Modes of demoted detectors
+        """
+        for name, pattern_count in yields.items():
+            self.record(name, timings.get(name, 0.0), pattern_count)
+        for name, count in skips.items():
+            self.get(name).skipped += count
+        for name, mode in modes.items():
+            cost = self.get(name)
+            # Workers demote independently; report the most demoted mode
+            if _MODE_RANK[mode] > _MODE_RANK[cost.mode]:
+                cost.mode = mode
+
+    def reset_modes(self) -> None:
+        """Mark every detector active again, as budgets do at the start of a run."""
+        for cost in self.costs.values():
+            cost.mode = MODE_ACTIVE
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Convert to {detector name: cost} sorted by total time, slowest first."""
+        return {
+            name: cost.to_dict()
+            for name, cost in sorted(self.costs.items(), key=lambda item: -item[1].total_ms)
+        }
+
+
+_MODE_RANK = {MODE_ACTIVE: 0, MODE_SAMPLED: 1, MODE_DISABLED: 2}
+
+
+class DetectorBudget:
+    """
+    Per-detector budgets, demotion and ordering for a PatternDetector.
+
+    All budgets are in milliseconds; 0 disables a budget. The default
+    budget only keeps the cost table.
+
+    Example:
+        >>> budget = DetectorBudget(soft_ms=50, hard_ms=500)
+        >>> detector = PatternDetector(budget=budget)
+        >>> budget.costs.to_dict()
+    """
+
+    def __init__(
+        self,
+        soft_ms: float = 0,
+        hard_ms: float = 0,
+        file_ms: float = 0,
+        run_ms: float = 0,
+        overrun_limit: int = 3,
+        sample_rate: int = 10,
+        adaptive_order: bool = True
+    ):
+        """
+        Initialize the budget.
+
+        Args:
+            soft_ms: Per-file time above which a run counts as an overrun
+            hard_ms: Per-file time above which a run demotes the detector
+            file_ms: Time all detectors together may spend on one file
+            run_ms: Time one detector may spend in one run
+            overrun_limit: Soft overruns that demote a detector
+            sample_rate: Sampled detectors run on 1 in this many files
+            adaptive_order: Run cheap, productive detectors first
+        """
+        self.soft_ms = soft_ms
+        self.hard_ms = hard_ms
+        self.file_ms = file_ms
+        self.run_ms = run_ms
+        self.overrun_limit = max(overrun_limit, 1)
+        self.sample_rate = max(sample_rate, 1)
+        self.adaptive_order = adaptive_order
+        self.costs = DetectorCostTable()
+        self._sample_counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Any) -> 'DetectorBudget':
+        """Create the budget from an AnalysisConfig."""
+        return cls(
+            soft_ms=config.detector_soft_budget_ms,
+            hard_ms=config.detector_hard_budget_ms,
+            file_ms=config.detector_file_budget_ms,
+            run_ms=config.detector_run_budget_ms,
+            overrun_limit=config.detector_overrun_limit,
+            sample_rate=config.detector_sample_rate,
+            adaptive_order=config.adaptive_detector_order
+        )
+
+    def start_run(self) -> None:
+        """Start a new run: budgets start over and demoted detectors are active again."""
+        with self._lock:
+            for cost in self.costs.costs.values():
+                cost.mode = MODE_ACTIVE
+                cost.overruns = 0
+                cost.run_ms = 0.0
+            self._sample_counters.clear()
+
+    def reset(self) -> None:
+        """Forget all history, restoring every detector to active."""
+        with self._lock:
+            self.costs = DetectorCostTable()
+            self._sample_counters.clear()
+
+    def order(self, detectors: Sequence[Any]) -> List[Any]:
+        """
+        Order detectors for running on a file.
+
+        Detectors without enough history keep their registration order and
+        run first, so they get measured; the others follow, most patterns
+        per millisecond first.
+
+        Args:
+            detectors: Detectors in registration order
+
+        Returns:
+            Detectors in running order
+        """
+        if not self.adaptive_order:
+            return list(detectors)
+        costs = self.costs.costs
+
+        def key(item):
+            index, detector = item
+            cost = costs.get(detector.__class__.__name__)
+            if cost is None or cost.runs < MIN_HISTORY_RUNS:
+                return (0, 0.0, index)
+            return (1, -(cost.patterns / cost.runs) / max(cost.avg_ms, 0.01), index)
+
+        return [detector for _, detector in sorted(enumerate(detectors), key=key)]
+
+    def should_run(self, name: str, file_spent_ms: float = 0.0) -> bool:
+        """
+        Check whether a detector runs on the current file.
+
+        Records a skip when it does not.
+
+        Args:
+            name: Detector class name
+            file_spent_ms: Time the detectors have already spent on the file
+
+        Returns:
+            False if the file budget is spent or the detector's mode skips
+            this file
+        """
+        with self._lock:
+            cost = self.costs.get(name)
+            if self.file_ms and file_spent_ms > self.file_ms:
+                run = False
+            elif cost.mode == MODE_SAMPLED:
+                counter = self._sample_counters.get(name, 0)
+                self._sample_counters[name] = counter + 1
+                run = counter % self.sample_rate == 0
+            else:
+                run = cost.mode == MODE_ACTIVE
+            if not run:
+                cost.skipped += 1
+            return run
+
+    def record(self, name: str, elapsed_ms: float, pattern_count: int, file_path: str = "") -> None:
+        """
+        Record a detector run and apply the budgets.
+
+        Args:
+            name: Detector class name
+            elapsed_ms: Time the run took
+            pattern_count: Patterns the run found
+            file_path: File the detector ran on (for warnings)
+        """
+        with self._lock:
+            cost = self.costs.get(name)
+            cost.add(elapsed_ms, pattern_count)
+            if cost.mode == MODE_DISABLED:
+                return
+            if self.hard_ms and elapsed_ms > self.hard_ms:
+                self._demote(name, cost, f"took {elapsed_ms:.0f}ms on {file_path} (hard budget {self.hard_ms:.0f}ms)")
+            elif self.soft_ms and elapsed_ms > self.soft_ms:
+                cost.overruns += 1
+                if cost.overruns >= self.overrun_limit:
+                    self._demote(
+                        name, cost,
+                        f"exceeded its {self.soft_ms:.0f}ms budget on {cost.overruns} files, "
+                        f"most recently {file_path} ({elapsed_ms:.0f}ms)"
+                    )
+            if self.run_ms and cost.run_ms > self.run_ms and cost.mode != MODE_DISABLED:
+                cost.mode = MODE_DISABLED
+                logger.warning(
+                    f"Pattern detector {name} disabled for this run: spent {cost.run_ms:.0f}ms "
+                    f"(run budget {self.run_ms:.0f}ms)"
+                )
+
+    def _demote(self, name: str, cost: DetectorCost, reason: str) -> None:
+        """Demote a detector one step and log why."""
+        cost.overruns = 0
+        cost.mode = MODE_SAMPLED if cost.mode == MODE_ACTIVE else MODE_DISABLED
+        if cost.mode == MODE_SAMPLED:
+            logger.warning(
+                f"Pattern detector {name} {reason}; now running on 1 in {self.sample_rate} files"
+            )
+        else:
+            logger.warning(f"Pattern detector {name} {reason}; disabled")
+
+    def modes(self) -> Dict[str, str]:
+        """Modes of the detectors that are not active."""
+        return {name: cost.mode for name, cost in self.costs.costs.items() if cost.mode != MODE_ACTIVE}
@@ -9,6 +9,7 @@ import logging
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
 
+from .ast_visitor import FileVisit
 from .symbol_extractor import SymbolInfo, FunctionInfo, ClassInfo
 
 logger = logging.getLogger(__name__)
@@ -70,7 +71,8 @@ class DocumentationCoverageAnalyzer:
         self,
         symbol_info: SymbolInfo,
         file_content: Optional[str] = None,
-        language: str = "python"
+        language: str = "python",
+        visit: Optional[FileVisit] = None
     ) -> DocumentationCoverage:
         """
         Calculate documentation coverage for a file.
@@ -79,6 +81,8 @@ class DocumentationCoverageAnalyzer:
             symbol_info: Extracted symbols from the file
             file_content: Optional file content for inline comment detection
             language: Programming language (python, javascript, typescript)
+            visit: Optional FileVisit of the file's AST; its comment nodes are
+                   used instead of rescanning file_content
         
         Returns:
             DocumentationCoverage with detailed metrics
@@ -129,13 +133,15 @@ class DocumentationCoverageAnalyzer:
                 coverage.documented_methods / coverage.total_methods
             )
         
-        # Detect inline comments if file content provided
-        if file_content:
+        # Detect inline comments from the AST comments or the file content
+        if visit is not None:
+            coverage.has_inline_comments = self._detect_visited_comments(visit)
+        elif file_content:
             coverage.has_inline_comments = self._detect_inline_comments(
                 file_content, language
             )
-            if coverage.has_inline_comments:
-                coverage.inline_comment_bonus = 0.1
+        if coverage.has_inline_comments:
+            coverage.inline_comment_bonus = 0.1
         
         # Calculate total score
         coverage.total_score = self._calculate_total_score(coverage)
@@ -259,6 +265,27 @@ class DocumentationCoverageAnalyzer:
         # Require at least 3 inline comments to consider it well-commented
         return inline_comment_count >= 3
     
+    def _detect_visited_comments(self, visit: FileVisit) -> bool:
+        """
+        Detect inline comments among the comment nodes of a FileVisit.
+        
+        Applies the same rules as _detect_inline_comments to the comments
+        found in the AST, so comment markers inside strings are ignored.
+        
+        Args:
+            visit: FileVisit of the file
+        
+        Returns:
+            True if meaningful inline comments detected, False otherwise
+        """
+        inline_comment_count = sum(
+            1 for comment in visit.comments
+            if comment.has_code_before or self._is_explanatory_comment(comment.text, comment.line)
+        )
+        
+        # Require at least 3 inline comments to consider it well-commented
+        return inline_comment_count >= 3
+    
     def _is_explanatory_comment(self, comment_text: str, full_line: str) -> bool:
         """
         Check if a comment is explanatory (not a section header or decorator).
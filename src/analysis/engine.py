@@ -8,27 +8,46 @@ for analyzing files and codebases.
 import hashlib
 import logging
 import asyncio
+import time
 import traceback
-from typing import Optional, Dict, Any, List
+from collections import deque
+from typing import Optional, Dict, Any, List, Set, Tuple, AsyncIterator
 from datetime import datetime
 from pathlib import Path
 
 from .config import AnalysisConfig
 from .ast_parser import ASTParserManager
+from .ast_visitor import FileVisit, visit_file
 from .symbol_extractor import SymbolExtractor
+from .symbol_queries import QuerySymbolExtractor
+from .incremental_parse import IncrementalReuse, ParseTreeCache, parse_incremental
+from .generated_files import GeneratedFileClassifier
+from .skeleton import ANALYSIS_MODE_SKELETON, sample_source
+from .source_document import SourceDocument
+from .detector_budget import DetectorBudget, DetectorCostTable
+from .pattern_aggregate import PatternAggregate
 from .pattern_detector import PatternDetector, ReactPatternDetector, APIPatternDetector, DatabasePatternDetector, AuthPatternDetector
 from .language_pattern_detector import PythonPatternDetector, JavaScriptPatternDetector
+from .pattern_rules import RuleSet, RulePatternDetector
 from .universal_language_detectors import (
     JavaPatternDetector, GoPatternDetector, RustPatternDetector,
     CppPatternDetector, CSharpPatternDetector, RubyPatternDetector, PHPPatternDetector
 )
 from .dependency_analyzer import DependencyAnalyzer
 from .teaching_value_scorer import TeachingValueScorer
-from .complexity_analyzer import ComplexityAnalyzer
+from .complexity_analyzer import ComplexityAnalyzer, ComplexityMetrics
 from .documentation_coverage import DocumentationCoverageAnalyzer
 from .persistence import PersistenceManager
 from .linter_integration import LinterIntegration
 from .notebook_analyzer import NotebookAnalyzer
+from .file_manifest import FileManifest, scan_files
+from .git_index import git_blob_sha, read_git_index
+from .executor import ParseTimeoutError, PipelineResult, create_backend
+from .events import AnalysisEvent
+from .scheduler import AnalysisScheduler, WorkItem
+from .latency_metrics import LatencyRecorder
+from .registry import ComponentRegistry, LazyComponent
+from .watcher import CodebaseWatcher, create_watcher
 from src.models.analysis_models import (
     FileAnalysis, CodebaseAnalysis, CodebaseMetrics,
     ComplexityMetrics as ComplexityMetricsModel,
@@ -40,6 +59,9 @@ from src.models.analysis_models import (
 
 logger = logging.getLogger(__name__)
 
+# Scheduler result of a duplicate file whose primary is still being analyzed
+_DUPLICATE_PENDING = object()
+
 
 class AnalysisEngine:
     """
@@ -49,6 +71,31 @@ class AnalysisEngine:
     dependency analysis, and teaching value scoring.
     """
     
+    # Directories never descended into when discovering files
+    IGNORED_DIRS = [
+        'node_modules', '.git', '__pycache__', 'venv', '.venv',
+        'dist', 'build', '.next', '.cache'
+    ]
+    
+    # Number of recent samples kept for slow operations, errors and file timings
+    MAX_RECENT_SAMPLES = 1000
+    
+    # Analysis components, built on first use
+    parser = LazyComponent()
+    symbol_extractor = LazyComponent()
+    complexity_analyzer = LazyComponent()
+    doc_coverage_analyzer = LazyComponent()
+    pattern_detector = LazyComponent()
+    dependency_analyzer = LazyComponent()
+    teaching_value_scorer = LazyComponent()
+    persistence = LazyComponent()
+    linter = LazyComponent()
+    notebook_analyzer = LazyComponent()
+    parse_cache = LazyComponent()
+    generated_file_classifier = LazyComponent()
+    backend = LazyComponent()
+    scheduler = LazyComponent()
+    
     def __init__(self, cache_manager, config: AnalysisConfig):
         """
         Initialize the Analysis Engine.
@@ -61,106 +108,113 @@ class AnalysisEngine:
         self.config = config
         
         # Performance metrics tracking
-        self.metrics = {
-            'total_files_analyzed': 0,
-            'total_cache_hits': 0,
-            'total_cache_misses': 0,
-            'total_analysis_time_ms': 0.0,
-            'slow_operations': [],  # List of (file_path, duration_ms)
-            'errors': [],  # List of (file_path, error_message)
-            'file_analysis_times': []  # List of (file_path, duration_ms)
-        }
-        
-        # Initialize all analysis components
-        logger.info("Initializing Analysis Engine components...")
-        
-        try:
-            self.parser = ASTParserManager(config)
-            logger.debug("AST Parser Manager initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize AST Parser Manager: {e}", exc_info=True)
-            raise
-        
-        try:
-            self.symbol_extractor = SymbolExtractor()
-            logger.debug("Symbol Extractor initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize Symbol Extractor: {e}", exc_info=True)
-            raise
-        
-        try:
-            self.complexity_analyzer = ComplexityAnalyzer()
-            logger.debug("Complexity Analyzer initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize Complexity Analyzer: {e}", exc_info=True)
-            raise
-        
-        try:
-            self.doc_coverage_analyzer = DocumentationCoverageAnalyzer()
-            logger.debug("Documentation Coverage Analyzer initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize Documentation Coverage Analyzer: {e}", exc_info=True)
-            raise
-        
-        # Initialize pattern detector with default detectors
-        try:
-            self.pattern_detector = PatternDetector()
-            # Framework-specific detectors
-            self.pattern_detector.register_detector(ReactPatternDetector())
-            self.pattern_detector.register_detector(APIPatternDetector())
-            self.pattern_detector.register_detector(DatabasePatternDetector())
-            self.pattern_detector.register_detector(AuthPatternDetector())
-            # Language-specific detectors (Universal God Mode)
-            self.pattern_detector.register_detector(PythonPatternDetector())
-            self.pattern_detector.register_detector(JavaScriptPatternDetector())
-            self.pattern_detector.register_detector(JavaPatternDetector())
-            self.pattern_detector.register_detector(GoPatternDetector())
-            self.pattern_detector.register_detector(RustPatternDetector())
-            self.pattern_detector.register_detector(CppPatternDetector())
-            self.pattern_detector.register_detector(CSharpPatternDetector())
-            self.pattern_detector.register_detector(RubyPatternDetector())
-            self.pattern_detector.register_detector(PHPPatternDetector())
-            logger.debug("Pattern Detector initialized with 13 detectors (4 framework + 9 language) - Universal God Mode")
-        except Exception as e:
-            logger.error(f"Failed to initialize Pattern Detector: {e}", exc_info=True)
-            raise
-        
-        try:
-            self.dependency_analyzer = DependencyAnalyzer()
-            logger.debug("Dependency Analyzer initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize Dependency Analyzer: {e}", exc_info=True)
-            raise
+        self.metrics = self._new_metrics()
         
-        try:
-            self.teaching_value_scorer = TeachingValueScorer(config)
-            logger.debug("Teaching Value Scorer initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize Teaching Value Scorer: {e}", exc_info=True)
-            raise
+        # Components are built on first use (see _register_components), so
+        # starting a server or analyzing a single language stays cheap
+        self.components = ComponentRegistry()
+        self._register_components()
         
-        try:
-            self.persistence = PersistenceManager(config.persistence_path)
-            logger.debug(f"Persistence Manager initialized (path: {config.persistence_path})")
-        except Exception as e:
-            logger.error(f"Failed to initialize Persistence Manager: {e}", exc_info=True)
-            raise
+        # Content hash of each file whose last analysis exceeded the parse timeout
+        self.timed_out_files: Dict[str, str] = {}
         
-        try:
-            self.linter = LinterIntegration(config)
-            logger.debug(f"Linter Integration initialized (enabled: {config.enable_linters})")
-        except Exception as e:
-            logger.error(f"Failed to initialize Linter Integration: {e}", exc_info=True)
-            raise
+        # Pattern counts and teaching ranking of each codebase's last analysis,
+        # updated by delta on later runs (see _update_pattern_aggregate)
+        self.pattern_aggregates: Dict[str, PatternAggregate] = {}
         
-        try:
-            self.notebook_analyzer = NotebookAnalyzer()
-            logger.debug("Notebook Analyzer initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize Notebook Analyzer: {e}", exc_info=True)
-            raise
+        # Watch mode state per codebase_id
+        self.watchers: Dict[str, CodebaseWatcher] = {}
         
-        logger.info("Analysis Engine initialized successfully with all components")
+        logger.info("Analysis Engine initialized (components are built on first use)")
+    
+    def _register_components(self):
+        """Register the factory of every analysis component."""
+        config = self.config
+        register = self.components.register
+        register('parser', lambda: ASTParserManager(config), "AST Parser Manager")
+        register(
+            'symbol_extractor',
+            QuerySymbolExtractor if config.use_symbol_queries else SymbolExtractor,
+            "Symbol Extractor"
+        )
+        register('complexity_analyzer', ComplexityAnalyzer, "Complexity Analyzer")
+        register('doc_coverage_analyzer', DocumentationCoverageAnalyzer, "Documentation Coverage Analyzer")
+        register('pattern_detector', lambda: self._create_pattern_detector(config), "Pattern Detector")
+        register('dependency_analyzer', DependencyAnalyzer, "Dependency Analyzer")
+        register('teaching_value_scorer', lambda: TeachingValueScorer(config), "Teaching Value Scorer")
+        register('persistence', lambda: PersistenceManager(config.persistence_path), "Persistence Manager")
+        register('linter', lambda: LinterIntegration(config), "Linter Integration")
+        register('notebook_analyzer', NotebookAnalyzer, "Notebook Analyzer")
+        register('parse_cache', lambda: ParseTreeCache(config.parse_cache_size), "Parse tree cache")
+        register(
+            'generated_file_classifier',
+            lambda: GeneratedFileClassifier(config.generated_sample_kb * 1024, config.minified_line_length),
+            "Generated file classifier"
+        )
+        register('backend', lambda: create_backend(self, config), "Execution backend")
+        register('scheduler', self._create_scheduler, "Analysis scheduler")
+    
+    @staticmethod
+    def _create_pattern_detector(config: AnalysisConfig) -> PatternDetector:
+        """Create the pattern detector with the framework, language and rule detectors."""
+        pattern_detector = PatternDetector(budget=DetectorBudget.from_config(config))
+        # Framework-specific detectors
+        pattern_detector.register_detector(ReactPatternDetector())
+        pattern_detector.register_detector(APIPatternDetector())
+        pattern_detector.register_detector(DatabasePatternDetector())
+        pattern_detector.register_detector(AuthPatternDetector())
+        # Language-specific detectors (Universal God Mode)
+        pattern_detector.register_detector(PythonPatternDetector())
+        pattern_detector.register_detector(JavaScriptPatternDetector())
+        pattern_detector.register_detector(JavaPatternDetector())
+        pattern_detector.register_detector(GoPatternDetector())
+        pattern_detector.register_detector(RustPatternDetector())
+        pattern_detector.register_detector(CppPatternDetector())
+        pattern_detector.register_detector(CSharpPatternDetector())
+        pattern_detector.register_detector(RubyPatternDetector())
+        pattern_detector.register_detector(PHPPatternDetector())
+        logger.debug("Pattern Detector initialized with 13 detectors (4 framework + 9 language) - Universal God Mode")
+        # Declarative rules (one batched tree-sitter query per language)
+        if config.pattern_rules:
+            rule_set = AnalysisEngine._load_pattern_rules(config.pattern_rules)
+            pattern_detector.register_detector(RulePatternDetector(rule_set))
+            logger.debug(f"Loaded {len(rule_set.rules)} pattern rules from {config.pattern_rules}")
+        return pattern_detector
+    
+    @staticmethod
+    def _load_pattern_rules(paths: List[str]) -> RuleSet:
+        """
+        Load the configured pattern rule files, skipping bad ones.
+
+        A missing or invalid rule file (or a rule whose id is already taken)
+        is logged and left out, so it cannot fail the analysis of every file.
+        """
+        rules = []
+        rule_ids = set()
+        for path in paths:
+            try:
+                loaded = RuleSet.from_paths([path]).rules
+            except (OSError, ValueError) as e:
+                logger.error(f"Skipping pattern rules {path}: {e}")
+                continue
+            for rule in loaded:
+                if rule.rule_id in rule_ids:
+                    logger.error(f"Skipping duplicate pattern rule {rule.rule_id} in {path}")
+                    continue
+                rule_ids.add(rule.rule_id)
+                rules.append(rule)
+        return RuleSet(rules)
+    
+    def _create_scheduler(self) -> AnalysisScheduler:
+        """Create the scheduler bounding in-flight work for the execution backend."""
+        logger.debug(
+            f"Execution backend: {self.backend.name} "
+            f"(max_workers: {self.backend.max_workers})"
+        )
+        return AnalysisScheduler(
+            max_in_flight=self.config.max_parallel_files,
+            parallelism=self.backend.max_workers
+        )
     
     def _convert_symbol_info(self, symbol_info) -> SymbolInfoModel:
         """
@@ -244,12 +298,41 @@ class AnalysisEngine:
         Returns:
             SHA-256 hash as hex string
         """
+        source = self._read_source(file_path)
+        return self._hash_content(source) if source is not None else ""
+    
+    def _read_source(self, file_path: str) -> Optional[bytes]:
+        """
+        Read the raw bytes of a file.
+        
+        The returned buffer is shared by hashing, parsing and pattern
+        detection so each file is read from disk only once per analysis.
+        
+        Args:
+            file_path: Path to file
+        
+        Returns:
+            File content as bytes, or None if the file could not be read
+        """
         try:
             with open(file_path, 'rb') as f:
-                return hashlib.sha256(f.read()).hexdigest()
+                return f.read()
         except Exception as e:
-            logger.error(f"Failed to calculate hash for {file_path}: {e}")
-            return ""
+            logger.error(f"Failed to read {file_path}: {e}")
+            return None
+    
+    @staticmethod
+    def _hash_content(source: bytes) -> str:
+        """
+        Calculate SHA-256 hash of a content buffer.
+        
+        Args:
+            source: File content
+        
+        Returns:
+            SHA-256 hash as hex string
+        """
+        return hashlib.sha256(source).hexdigest()
     
     def _is_analyzable(self, file_path: str) -> bool:
         """
@@ -311,13 +394,27 @@ class AnalysisEngine:
         except Exception as e:
             logger.warning(f"Error caching analysis: {e}")
     
-    async def analyze_file(self, file_path: str, force: bool = False) -> FileAnalysis:
+    async def analyze_file(
+        self,
+        file_path: str,
+        force: bool = False,
+        source: Optional[bytes] = None,
+        file_hash: Optional[str] = None
+    ) -> FileAnalysis:
         """
         Analyze single file with caching and incremental support.
         
+        The CPU-bound pipeline runs on the configured execution backend
+        (see config.executor_backend); caching, linting and metrics are
+        handled here. The file is read once and the same buffer is used
+        for the cache key, parsing and pattern detection.
+        
         Args:
             file_path: Path to file to analyze
             force: If True, bypass cache and re-analyze
+            source: File content if the caller has already read it
+            file_hash: Content key if the caller already knows it (e.g. the
+                       git blob SHA); the file is then only read on a cache miss
         
         Returns:
             FileAnalysis with all extracted information
@@ -330,8 +427,11 @@ class AnalysisEngine:
         start_time = datetime.now()
         logger.info(f"Starting analysis for file: {file_path}")
         
-        # Calculate file hash for incremental analysis
-        file_hash = self._calculate_file_hash(file_path)
+        # Read once and hash the buffer for incremental analysis
+        if file_hash is None:
+            if source is None:
+                source = self._read_source(file_path)
+            file_hash = self._hash_content(source) if source is not None else ""
         if not file_hash:
             logger.error(f"Failed to calculate file hash for {file_path}")
         
@@ -339,52 +439,211 @@ class AnalysisEngine:
         if not force and file_hash:
             cached = await self._get_cached_analysis(file_path, file_hash)
             if cached:
+                # Entries are keyed by content and may come from another path
+                cached = cached.with_file_path(file_path)
                 cached.cache_hit = True
                 elapsed_ms = (datetime.now() - start_time).total_seconds() * 1000
                 logger.info(f"Analysis complete for {file_path} (cached) in {elapsed_ms:.0f}ms")
                 return cached
         
-        logger.debug(f"Performing full analysis for {file_path} (force={force})")
+        logger.debug(
+            f"Performing full analysis for {file_path} "
+            f"(force={force}, backend={self.backend.name})"
+        )
+        if source is None:
+            source = self._read_source(file_path)
+        
+        # Generated and minified files are recorded without being parsed
+        if self.config.generated_files != 'analyze':
+            skip_reason = self.generated_file_classifier.classify(file_path, source)
+            if skip_reason:
+                logger.info(f"Not parsing {file_path}: classified as {skip_reason}")
+                analysis = self._create_metadata_analysis(
+                    file_path,
+                    self.parser.detect_language(file_path),
+                    skip_reason
+                )
+                analysis.content_hash = file_hash
+                return analysis
+        
+        # Run parsing, extraction, detection and scoring on the backend
+        pipeline_start = time.perf_counter()
+        try:
+            result = await self.backend.run(file_path, source)
+        except ParseTimeoutError as e:
+            logger.warning(f"Parse timeout for {file_path}: {e}")
+            self.metrics['parse_timeouts_count'] += 1
+            self._record_errors([(file_path, str(e))])
+            if file_hash:
+                self.timed_out_files[file_path] = file_hash
+            analysis = self._create_error_analysis(
+                file_path,
+                self.parser.detect_language(file_path),
+                str(e),
+                start_time
+            )
+            analysis.content_hash = file_hash
+            return analysis
+        self.timed_out_files.pop(file_path, None)
+        pipeline_ms = self._elapsed_ms(pipeline_start)
+        self._record_errors(result.errors)
+        latency = self.metrics['latency']
+        latency.record_all('stage', result.stage_timings)
+        latency.record_all('detector', result.detector_timings)
+        for key, value in result.detector_counts.items():
+            self.metrics['detector_dispatch'][key] = self.metrics['detector_dispatch'].get(key, 0) + value
+        self.metrics['detector_costs'].record_file(
+            result.detector_timings, result.detector_yields, result.detector_skips, result.detector_modes
+        )
+        analysis = result.analysis
+        latency.record('language', analysis.language, pipeline_ms)
+        analysis.content_hash = file_hash
+        if not result.completed:
+            return analysis
+        
+        # Run linters asynchronously (non-blocking)
+        try:
+            logger.debug(f"Running linters for {file_path}")
+            stage_start = time.perf_counter()
+            linter_issues = await self.linter.run_linters(
+                file_path,
+                analysis.language
+            )
+            latency.record('stage', 'linters', self._elapsed_ms(stage_start))
+            if linter_issues:
+                logger.debug(f"Linter found {len(linter_issues)} issues in {file_path}")
+        except Exception as e:
+            logger.warning(f"Linter execution failed for {file_path}: {e}\n{traceback.format_exc()}")
+            linter_issues = []
+        analysis.linter_issues = linter_issues
+        
+        # Cache results
+        if file_hash:
+            await self._cache_analysis(file_path, file_hash, analysis)
+        
+        # Track performance metrics
+        elapsed_ms = (datetime.now() - start_time).total_seconds() * 1000
+        self.metrics['total_files_analyzed'] += 1
+        self.metrics['total_analysis_time_ms'] += elapsed_ms
+        self.metrics['file_analysis_times'].append((file_path, elapsed_ms))
+        latency.record('stage', 'total', elapsed_ms)
+        
+        # Log slow operations (>1000ms)
+        if elapsed_ms > 1000:
+            logger.warning(
+                f"Slow operation detected: Analysis of {file_path} took {elapsed_ms:.0f}ms "
+                f"(threshold: 1000ms)"
+            )
+            self.metrics['slow_operations'].append((file_path, elapsed_ms))
+            self.metrics['slow_operations_count'] += 1
+        
+        logger.info(
+            f"Analysis complete for {file_path} in {elapsed_ms:.0f}ms "
+            f"(teaching_value: {analysis.teaching_value.total_score:.2f}, "
+            f"functions: {len(analysis.symbol_info.functions)}, "
+            f"classes: {len(analysis.symbol_info.classes)})"
+        )
+        
+        return analysis
+    
+    def _run_pipeline(self, file_path: str, source: Optional[bytes] = None) -> PipelineResult:
+        """
+        Run the synchronous, CPU-bound analysis pipeline for a file.
+        
+        Parses the source, extracts symbols, detects patterns and computes
+        complexity, documentation coverage and teaching value. Apart from
+        the parse tree cache used for incremental re-parsing (local to each
+        process and safe to share between threads), this method touches no
+        shared state, so execution backends can run it in worker processes.
+        
+        Args:
+            file_path: Path to file to analyze
+            source: File content; read from file_path when not provided
+        
+        Returns:
+            PipelineResult with the FileAnalysis (linter issues not included)
+            and per-stage and per-detector timings in milliseconds
+        """
+        start_time = datetime.now()
+        stage_timings: Dict[str, float] = {}
+        detector_timings: Dict[str, float] = {}
+        detector_counts: Dict[str, int] = {}
+        detector_yields: Dict[str, int] = {}
+        detector_skips: Dict[str, int] = {}
+        
+        if source is None:
+            try:
+                stage_start = time.perf_counter()
+                with open(file_path, 'rb') as f:
+                    source = f.read()
+                stage_timings['read'] = self._elapsed_ms(stage_start)
+                logger.debug(f"Read {len(source)} bytes from {file_path}")
+            except Exception as e:
+                error_msg = f"Failed to read file: {e}"
+                logger.error(f"{error_msg} - {file_path}\n{traceback.format_exc()}")
+                return PipelineResult(
+                    analysis=self._create_error_analysis(
+                        file_path,
+                        "unknown",
+                        error_msg,
+                        start_time
+                    ),
+                    completed=False,
+                    errors=[(file_path, error_msg)]
+                )
         
         # Handle Jupyter notebooks
         is_notebook = file_path.endswith('.ipynb')
         if is_notebook:
             logger.debug(f"Detected Jupyter notebook: {file_path}")
             try:
-                notebook_code = self.notebook_analyzer.extract_code(file_path)
+                stage_start = time.perf_counter()
+                notebook_code = self.notebook_analyzer.extract_code_from_content(
+                    source.decode('utf-8'),
+                    file_path
+                )
                 source_code = notebook_code.full_code.encode('utf-8')
+                stage_timings['notebook'] = self._elapsed_ms(stage_start)
                 logger.debug(f"Extracted {notebook_code.total_cells} cells from notebook {file_path}")
             except Exception as e:
                 error_msg = f"Failed to extract notebook code: {e}"
                 logger.error(f"{error_msg}\n{traceback.format_exc()}")
-                self.metrics['errors'].append((file_path, error_msg))
                 # Return error analysis
-                return self._create_error_analysis(
-                    file_path, 
-                    "python",
-                    error_msg,
-                    start_time
+                return PipelineResult(
+                    analysis=self._create_error_analysis(
+                        file_path, 
+                        "python",
+                        error_msg,
+                        start_time
+                    ),
+                    completed=False,
+                    errors=[(file_path, error_msg)]
                 )
         else:
-            try:
-                with open(file_path, 'rb') as f:
-                    source_code = f.read()
-                logger.debug(f"Read {len(source_code)} bytes from {file_path}")
-            except Exception as e:
-                error_msg = f"Failed to read file: {e}"
-                logger.error(f"{error_msg} - {file_path}\n{traceback.format_exc()}")
-                self.metrics['errors'].append((file_path, error_msg))
-                return self._create_error_analysis(
-                    file_path,
-                    "unknown",
-                    error_msg,
-                    start_time
-                )
+            source_code = source
+        
+        # Very large files only get a skeleton analysis
+        skeleton_threshold = self.config.skeleton_threshold_kb * 1024
+        skeleton = 0 < skeleton_threshold < len(source_code)
+        if skeleton:
+            logger.info(f"Skeleton analysis for {file_path} ({len(source_code) / 1024:.0f} KB)")
         
-        # Parse file
+        # Parse the in-memory buffer (notebooks parse their extracted code)
         try:
             logger.debug(f"Parsing file: {file_path}")
-            parse_result = self.parser.parse_file(file_path)
+            stage_start = time.perf_counter()
+            previous_parse = self.parse_cache.take(file_path) if self.config.incremental_parse else None
+            if skeleton:
+                # Trees of skeleton files are not kept for incremental re-parsing
+                previous_parse = None
+            parse_result, changed_ranges = parse_incremental(
+                self.parser,
+                source_code,
+                self.parser.detect_language(file_path),
+                file_path,
+                previous_parse
+            )
+            stage_timings['parse'] = self._elapsed_ms(stage_start)
             logger.debug(f"Parse complete for {file_path} (language: {parse_result.language}, has_errors: {parse_result.has_errors})")
             
             if parse_result.has_errors:
@@ -392,18 +651,43 @@ class AnalysisEngine:
         except Exception as e:
             error_msg = f"Parse error: {e}"
             logger.error(f"Failed to parse {file_path}: {e}\n{traceback.format_exc()}")
-            self.metrics['errors'].append((file_path, error_msg))
-            return self._create_error_analysis(
-                file_path,
-                "unknown",
-                error_msg,
-                start_time
+            return PipelineResult(
+                analysis=self._create_error_analysis(
+                    file_path,
+                    "unknown",
+                    error_msg,
+                    start_time
+                ),
+                completed=False,
+                errors=[(file_path, error_msg)]
             )
         
         # Extract symbols
         try:
             logger.debug(f"Extracting symbols from {file_path}")
-            symbol_info_extractor = self.symbol_extractor.extract_symbols(parse_result)
+            stage_start = time.perf_counter()
+            reuse = None
+            if skeleton:
+                file_visit = FileVisit()
+                symbol_info_extractor = self.symbol_extractor.extract_skeleton(parse_result)
+            else:
+                if self.config.incremental_parse:
+                    reuse = IncrementalReuse(
+                        source_code,
+                        parse_result.language,
+                        previous_parse if parse_result.incremental else None,
+                        changed_ranges
+                    )
+                file_visit = visit_file(parse_result, source_code, reuse=reuse)
+                symbol_info_extractor = self.symbol_extractor.extract_symbols(
+                    parse_result,
+                    visit=file_visit,
+                    reuse=reuse
+                )
+            if reuse is not None:
+                self.parse_cache.put(file_path, reuse.parsed_file(parse_result))
+                logger.debug(f"Incremental reuse for {file_path}: {reuse.stats}")
+            stage_timings['symbols'] = self._elapsed_ms(stage_start)
             logger.debug(
                 f"Symbol extraction complete for {file_path}: "
                 f"{len(symbol_info_extractor.functions)} functions, "
@@ -413,32 +697,54 @@ class AnalysisEngine:
         except Exception as e:
             error_msg = f"Symbol extraction error: {e}"
             logger.error(f"Failed to extract symbols from {file_path}: {e}\n{traceback.format_exc()}")
-            self.metrics['errors'].append((file_path, error_msg))
-            return self._create_error_analysis(
-                file_path,
-                parse_result.language,
-                error_msg,
-                start_time
+            return PipelineResult(
+                analysis=self._create_error_analysis(
+                    file_path,
+                    parse_result.language,
+                    error_msg,
+                    start_time
+                ),
+                completed=False,
+                errors=[(file_path, error_msg)]
             )
         
+        # Text and line index shared by the stages below, decoded on first use
+        document = SourceDocument(source_code)
+        
         # Detect patterns
         try:
             logger.debug(f"Detecting patterns in {file_path}")
-            file_content = source_code.decode('utf-8', errors='ignore')
+            stage_start = time.perf_counter()
             patterns = self.pattern_detector.detect_patterns_in_file(
                 symbol_info_extractor,
-                file_content,
-                file_path
+                SourceDocument.from_text(
+                    sample_source(document.text, self.config.skeleton_sample_kb * 1024)
+                ) if skeleton else document,
+                file_path,
+                timings=detector_timings,
+                language=parse_result.language,
+                counts=detector_counts,
+                tree=parse_result.root_node,
+                yields=detector_yields,
+                budget_skips=detector_skips
             )
+            stage_timings['patterns'] = self._elapsed_ms(stage_start)
+            detector_modes = self.pattern_detector.budget.modes()
             logger.debug(f"Pattern detection complete for {file_path}: {len(patterns)} patterns detected")
         except Exception as e:
             logger.warning(f"Pattern detection failed for {file_path}: {e}\n{traceback.format_exc()}")
             patterns = []
+            detector_modes = {}
         
         # Calculate complexity metrics
         try:
             logger.debug(f"Calculating complexity metrics for {file_path}")
-            complexity_metrics = self.complexity_analyzer.analyze_file(symbol_info_extractor)
+            stage_start = time.perf_counter()
+            if skeleton:
+                # Function bodies were not walked, so there is nothing to aggregate
+                complexity_metrics = ComplexityMetrics()
+            else:
+                complexity_metrics = self.complexity_analyzer.analyze_file(symbol_info_extractor, visit=file_visit)
             
             # Convert to model format
             complexity_metrics_model = ComplexityMetricsModel(
@@ -454,7 +760,7 @@ class AnalysisEngine:
                     for method in cls.methods 
                     if method.complexity > 10
                 ],
-                trivial_functions=[
+                trivial_functions=[] if skeleton else [
                     func.name for func in symbol_info_extractor.functions 
                     if func.complexity < 2
                 ] + [
@@ -465,6 +771,7 @@ class AnalysisEngine:
                 ],
                 avg_nesting_depth=complexity_metrics.avg_nesting_depth
             )
+            stage_timings['complexity'] = self._elapsed_ms(stage_start)
             logger.debug(
                 f"Complexity analysis complete for {file_path}: "
                 f"avg={complexity_metrics.avg_complexity:.1f}, "
@@ -485,11 +792,14 @@ class AnalysisEngine:
         # Calculate documentation coverage
         try:
             logger.debug(f"Calculating documentation coverage for {file_path}")
+            stage_start = time.perf_counter()
             doc_coverage = self.doc_coverage_analyzer.calculate_coverage(
                 symbol_info_extractor,
-                file_content,
-                parse_result.language
+                document.text,
+                parse_result.language,
+                visit=file_visit
             )
+            stage_timings['documentation'] = self._elapsed_ms(stage_start)
             logger.debug(f"Documentation coverage for {file_path}: {doc_coverage.total_score:.2%}")
         except Exception as e:
             logger.warning(f"Documentation coverage analysis failed for {file_path}: {e}\n{traceback.format_exc()}")
@@ -499,6 +809,7 @@ class AnalysisEngine:
         # Score teaching value
         try:
             logger.debug(f"Scoring teaching value for {file_path}")
+            stage_start = time.perf_counter()
             teaching_value_result = self.teaching_value_scorer.score_file(
                 symbol_info_extractor,
                 patterns,
@@ -516,6 +827,7 @@ class AnalysisEngine:
                 explanation=teaching_value_result.explanation,
                 factors=teaching_value_result.factors
             )
+            stage_timings['scoring'] = self._elapsed_ms(stage_start)
             logger.debug(f"Teaching value score for {file_path}: {teaching_value.total_score:.2f}")
         except Exception as e:
             logger.warning(f"Teaching value scoring failed for {file_path}: {e}\n{traceback.format_exc()}")
@@ -530,19 +842,6 @@ class AnalysisEngine:
                 factors={}
             )
         
-        # Run linters asynchronously (non-blocking)
-        try:
-            logger.debug(f"Running linters for {file_path}")
-            linter_issues = await self.linter.run_linters(
-                file_path,
-                parse_result.language
-            )
-            if linter_issues:
-                logger.debug(f"Linter found {len(linter_issues)} issues in {file_path}")
-        except Exception as e:
-            logger.warning(f"Linter execution failed for {file_path}: {e}\n{traceback.format_exc()}")
-            linter_issues = []
-        
         # Convert symbol_info to model version for storage
         symbol_info_model = self._convert_symbol_info(symbol_info_extractor)
         
@@ -555,40 +854,24 @@ class AnalysisEngine:
             teaching_value=teaching_value,
             complexity_metrics=complexity_metrics_model,
             documentation_coverage=doc_coverage.total_score,
-            linter_issues=linter_issues,
+            linter_issues=[],
             has_errors=parse_result.has_errors,
             errors=[str(node) for node in parse_result.error_nodes] if parse_result.has_errors else [],
             analyzed_at=datetime.now().isoformat(),
             cache_hit=False,
-            is_notebook=is_notebook
+            is_notebook=is_notebook,
+            analysis_mode=ANALYSIS_MODE_SKELETON if skeleton else "full"
         )
         
-        # Cache results
-        if file_hash:
-            await self._cache_analysis(file_path, file_hash, analysis)
-        
-        # Track performance metrics
-        elapsed_ms = (datetime.now() - start_time).total_seconds() * 1000
-        self.metrics['total_files_analyzed'] += 1
-        self.metrics['total_analysis_time_ms'] += elapsed_ms
-        self.metrics['file_analysis_times'].append((file_path, elapsed_ms))
-        
-        # Log slow operations (>1000ms)
-        if elapsed_ms > 1000:
-            logger.warning(
-                f"Slow operation detected: Analysis of {file_path} took {elapsed_ms:.0f}ms "
-                f"(threshold: 1000ms)"
-            )
-            self.metrics['slow_operations'].append((file_path, elapsed_ms))
-        
-        logger.info(
-            f"Analysis complete for {file_path} in {elapsed_ms:.0f}ms "
-            f"(teaching_value: {analysis.teaching_value.total_score:.2f}, "
-            f"functions: {len(analysis.symbol_info.functions)}, "
-            f"classes: {len(analysis.symbol_info.classes)})"
+        return PipelineResult(
+            analysis=analysis,
+            stage_timings=stage_timings,
+            detector_timings=detector_timings,
+            detector_counts=detector_counts,
+            detector_yields=detector_yields,
+            detector_skips=detector_skips,
+            detector_modes=detector_modes
         )
-        
-        return analysis
     
     def _create_error_analysis(
         self,
@@ -647,6 +930,32 @@ class AnalysisEngine:
             is_notebook=False
         )
     
+    def _create_metadata_analysis(
+        self,
+        file_path: str,
+        language: str,
+        skip_reason: str
+    ) -> FileAnalysis:
+        """
+        Create a metadata-only analysis for a file that is not parsed.
+        
+        Args:
+            file_path: Path to file
+            language: Programming language
+            skip_reason: Why the file is not analyzed (see generated_files)
+        
+        Returns:
+            FileAnalysis without symbols or patterns, with analysis_mode
+            'metadata' and the skip reason
+        """
+        analysis = self._create_error_analysis(file_path, language, "", datetime.now())
+        analysis.has_errors = False
+        analysis.errors = []
+        analysis.teaching_value.explanation = f"Not analyzed: {skip_reason.replace('_', ' ')}"
+        analysis.analysis_mode = 'metadata'
+        analysis.skip_reason = skip_reason
+        return analysis
+    
     async def analyze_codebase(
         self,
         codebase_id: str,
@@ -655,6 +964,8 @@ class AnalysisEngine:
         """
         Analyze entire codebase with parallel processing and incremental support.
         
+        Consumes analyze_codebase_stream() and returns the final result.
+        
         Args:
             codebase_id: ID of codebase to analyze
             incremental: If True, only analyze changed files
@@ -667,173 +978,387 @@ class AnalysisEngine:
             >>> analysis = await engine.analyze_codebase("my_project", incremental=True)
             >>> print(f"Analyzed {analysis.metrics.total_files} files")
         """
+        analysis = None
+        async for event in self.analyze_codebase_stream(codebase_id, incremental):
+            if event.kind == AnalysisEvent.COMPLETE:
+                analysis = event.data
+        return analysis
+    
+    async def analyze_codebase_stream(
+        self,
+        codebase_id: str,
+        incremental: bool = True
+    ) -> AsyncIterator[AnalysisEvent]:
+        """
+        Analyze entire codebase, yielding results as they become available.
+        
+        Yields a STARTED event once files are discovered, a FILE event for
+        every file as soon as its analysis completes (or is reused from the
+        previous run), a STAGE event after each codebase-level step
+        (dependency graph, global patterns, metrics, persistence) and a
+        final COMPLETE event carrying the CodebaseAnalysis.
+        
+        Args:
+            codebase_id: ID of codebase to analyze
+            incremental: If True, only analyze changed files
+        
+        Yields:
+            AnalysisEvent instances with completed/total file counts
+        
+        Raises:
+            ValueError: If the codebase has not been scanned
+        
+        Example:
+            >>> async for event in engine.analyze_codebase_stream("my_project"):
+            ...     if event.kind == AnalysisEvent.FILE:
+            ...         print(event.file_path, event.completed, event.total)
+        """
         start_time = datetime.now()
         logger.info(
             f"Starting codebase analysis: {codebase_id} "
             f"(incremental={incremental}, enable_incremental={self.config.enable_incremental})"
         )
         
-        # Get scan results
-        try:
-            scan_result = await self.cache.get_analysis(f"scan:{codebase_id}")
-            if not scan_result:
-                error_msg = f"Codebase not scanned. Call scan_codebase first for codebase_id: {codebase_id}"
-                logger.error(error_msg)
-                raise ValueError(error_msg)
-            logger.debug(f"Retrieved scan results for {codebase_id}")
-        except ValueError:
-            raise
-        except Exception as e:
-            error_msg = f"Failed to retrieve scan results for {codebase_id}: {e}"
-            logger.error(f"{error_msg}\n{traceback.format_exc()}")
-            raise ValueError(error_msg)
+        # Per-run detector budgets start over, here and in backend workers
+        self._start_detector_run()
+        
+        # Discover files (the manifest scan time must precede every stat call)
+        manifest = FileManifest(scan_started_ns=time.time_ns())
+        root_path, file_list, file_stats = await self._discover_files(codebase_id)
+        total_files = len(file_list)
         
         # Load previous analysis for incremental mode
-        previous_analysis = None
-        previous_hashes = {}
-        if incremental and self.config.enable_incremental:
-            try:
-                logger.debug(f"Loading previous analysis for {codebase_id}")
-                previous_analysis = self.persistence.load_analysis(codebase_id)
-                previous_hashes = self.persistence.get_file_hashes(codebase_id)
-                if previous_analysis:
-                    logger.info(
-                        f"Loaded previous analysis for {codebase_id}: "
-                        f"{len(previous_analysis.file_analyses)} files, "
-                        f"{len(previous_hashes)} hashes"
-                    )
-                else:
-                    logger.info(f"No previous analysis found for {codebase_id}, performing full analysis")
-            except Exception as e:
-                logger.warning(f"Failed to load previous analysis for {codebase_id}: {e}")
-                previous_analysis = None
-                previous_hashes = {}
+        incremental_enabled = incremental and self.config.enable_incremental
+        previous_analysis, previous_hashes, previous_manifest = self._load_previous_run(
+            codebase_id,
+            incremental_enabled
+        )
+        previous_file_analyses = previous_analysis.file_analyses if previous_analysis else {}
+        
+        # Files that exceeded the parse timeout before are skipped while their
+        # content is unchanged, and scheduled last otherwise
+        previous_timeouts = self.persistence.get_timed_out_files(codebase_id)
+        skipped_timeouts = set()
         
         # Determine which files to analyze
-        files_to_analyze = []
+        files_to_analyze = set()
         current_hashes = {}
         
-        # Get file list from scan result
-        # scan_result contains 'path' which is the root directory
-        # We need to walk the directory to get all analyzable files
-        file_list = []
+        # Collected analyses, keyed by path
+        collected: Dict[str, FileAnalysis] = {}
+        reused_count = 0
         
-        if isinstance(scan_result, dict) and 'path' in scan_result:
-            root_path = scan_result['path']
-            logger.debug(f"Scanning directory for files: {root_path}")
-            
-            # Walk the directory to find all analyzable files
-            import os
-            for dirpath, dirnames, filenames in os.walk(root_path):
-                # Filter out ignored directories
-                dirnames[:] = [d for d in dirnames if d not in [
-                    'node_modules', '.git', '__pycache__', 'venv', '.venv',
-                    'dist', 'build', '.next', '.cache'
-                ]]
-                
-                for filename in filenames:
-                    file_path = os.path.join(dirpath, filename)
-                    if self._is_analyzable(file_path):
-                        file_list.append(file_path)
+        # Files whose stat tuple is unchanged since they were last hashed are
+        # reused without being read
+        pending_files = file_list
+        if incremental_enabled and previous_manifest is not None:
+            pending_files = []
+            for file_path in file_list:
+                known_hash = previous_manifest.lookup(
+                    file_path,
+                    file_stats[file_path],
+                    trust=self.config.trust_stat_manifest
+                )
+                previous = previous_file_analyses.get(file_path)
+                if known_hash and previous is not None and previous_hashes.get(file_path) == known_hash:
+                    current_hashes[file_path] = known_hash
+                    manifest.entries[file_path] = previous_manifest.entries[file_path]
+                    collected[file_path] = previous
+                    reused_count += 1
+                else:
+                    pending_files.append(file_path)
             
-            logger.info(f"Found {len(file_list)} analyzable files")
-        else:
-            logger.error(f"Invalid scan result format for {codebase_id}: missing 'path' key")
-            raise ValueError("Invalid scan result format: missing 'path' key")
+            logger.info(
+                f"Stat manifest: {reused_count} files unchanged, "
+                f"{len(pending_files)} files to read and hash"
+            )
         
-        for file_path in file_list:
-            if not self._is_analyzable(file_path):
-                continue
-            
-            file_hash = self._calculate_file_hash(file_path)
-            if not file_hash:
-                logger.warning(f"Could not calculate hash for {file_path}, skipping")
-                continue
-            
-            current_hashes[file_path] = file_hash
-            
-            # In incremental mode, skip unchanged files
-            if incremental and self.config.enable_incremental and file_path in previous_hashes:
-                if previous_hashes[file_path] == file_hash:
-                    logger.debug(f"Skipping unchanged file: {file_path}")
-                    continue
+        # In git checkouts, clean tracked files are keyed by their blob SHA
+        # from the index instead of being read and hashed
+        git_shas = None
+        if pending_files and self.config.use_git_index:
+            loop = asyncio.get_running_loop()
+            git_shas = await loop.run_in_executor(None, read_git_index, root_path)
+        if git_shas is not None:
+            remaining_files = []
+            for file_path in pending_files:
+                blob_sha = git_shas.get(file_path)
+                previous = previous_file_analyses.get(file_path)
+                if (
+                    incremental_enabled and blob_sha and previous is not None
+                    and previous_hashes.get(file_path) == blob_sha
+                ):
+                    current_hashes[file_path] = blob_sha
+                    manifest.record(file_path, file_stats[file_path], blob_sha)
+                    collected[file_path] = previous
+                    reused_count += 1
                 else:
-                    logger.debug(f"File changed: {file_path}")
+                    remaining_files.append(file_path)
             
-            files_to_analyze.append(file_path)
+            logger.info(
+                f"Git index: {sum(fp in git_shas for fp in pending_files)} of "
+                f"{len(pending_files)} files keyed by blob SHA, "
+                f"{len(pending_files) - len(remaining_files)} unchanged"
+            )
+            pending_files = remaining_files
         
-        logger.info(
-            f"Analyzing {len(files_to_analyze)} files "
-            f"(total: {len(current_hashes)}, incremental: {incremental})"
+        yield AnalysisEvent(
+            kind=AnalysisEvent.STARTED,
+            codebase_id=codebase_id,
+            completed=0,
+            total=total_files
         )
         
-        # Initialize file analyses dict
-        file_analyses = {}
-        reused_count = 0
+        completed_count = 0
+        for file_path, analysis in list(collected.items()):
+            completed_count += 1
+            yield AnalysisEvent(
+                kind=AnalysisEvent.FILE,
+                codebase_id=codebase_id,
+                completed=completed_count,
+                total=total_files,
+                file_path=file_path,
+                file_analysis=analysis,
+                reused=True
+            )
         
-        # Reuse previous analyses for unchanged files
-        if previous_analysis and incremental and self.config.enable_incremental:
-            for file_path, analysis in previous_analysis.file_analyses.items():
-                if file_path not in files_to_analyze and file_path in current_hashes:
-                    # File unchanged, reuse previous analysis
-                    file_analyses[file_path] = analysis
-                    reused_count += 1
-                    logger.debug(f"Reusing previous analysis for {file_path}")
-            
-            if reused_count > 0:
-                logger.info(f"Reusing {reused_count} unchanged file analyses from previous run")
+        logger.info(
+            f"Analyzing {len(pending_files)} files "
+            f"(max_parallel_files: {self.config.max_parallel_files}, "
+            f"backend: {self.backend.name}, workers: {self.backend.max_workers}, "
+            f"incremental: {incremental})..."
+        )
         
-        # Analyze new/changed files in parallel
-        if files_to_analyze:
-            logger.info(
-                f"Analyzing {len(files_to_analyze)} files in parallel "
-                f"(max_workers: {self.config.max_parallel_files})..."
-            )
+        # Byte-identical files (vendored copies, generated clients) are
+        # analyzed once per run: the first path with a given content and
+        # extension is the primary, later ones wait for its result and get a
+        # copy with the path-dependent fields rewritten. Files whose name
+        # marks them as generated are only matched with each other.
+        blob_keys: Dict[str, Tuple[str, str, bool]] = {}
+        blob_results: Dict[Tuple[str, str, bool], FileAnalysis] = {}
+        blob_followers: Dict[Tuple[str, str, bool], List[str]] = {}
+        blob_elapsed_ms: Dict[Tuple[str, str, bool], float] = {}
+        duplicate_files = set()
+        dedup_saved_ms = 0.0
+        
+        def deduplicate(fp: str, primary: FileAnalysis) -> FileAnalysis:
+            nonlocal dedup_saved_ms
+            duplicate_files.add(fp)
+            dedup_saved_ms += blob_elapsed_ms.get(blob_keys[fp], 0.0)
+            return primary.with_file_path(fp)
+        
+        async def analyze_discovered(fp: str) -> Optional[FileAnalysis]:
+            """Read a file once, then reuse a previous or identical analysis or analyze it."""
+            source = None
+            file_hash = git_shas.get(fp) if git_shas is not None else None
+            if file_hash is None:
+                source = self._read_source(fp)
+                if source is None:
+                    logger.warning(f"Could not calculate hash for {fp}, skipping")
+                    return None
+                # Inside a git repository, untracked and modified files are
+                # hashed like git would, so keys survive a commit
+                file_hash = git_blob_sha(source) if git_shas is not None else self._hash_content(source)
+            current_hashes[fp] = file_hash
+            manifest.record(fp, file_stats[fp], file_hash)
+            
+            if self.config.skip_timed_out_files and previous_timeouts.get(fp) == file_hash:
+                logger.info(f"Skipping {fp}: exceeded the parse timeout in a previous run")
+                skipped_timeouts.add(fp)
+                self.timed_out_files[fp] = file_hash
+                analysis = self._create_error_analysis(
+                    fp,
+                    self.parser.detect_language(fp),
+                    "Skipped: analysis exceeded the parse timeout in a previous run",
+                    datetime.now()
+                )
+                analysis.content_hash = file_hash
+                return analysis
             
-            # Create analysis tasks
-            tasks = [self.analyze_file(fp) for fp in files_to_analyze]
+            # In incremental mode, skip unchanged files
+            if incremental_enabled and previous_hashes.get(fp) == file_hash:
+                previous = previous_file_analyses.get(fp)
+                if previous is not None:
+                    logger.debug(f"Skipping unchanged file: {fp}")
+                    return previous
+            elif incremental_enabled and fp in previous_hashes:
+                logger.debug(f"File changed: {fp}")
             
-            # Run in parallel with asyncio.gather
-            parallel_start = datetime.now()
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            parallel_elapsed_ms = (datetime.now() - parallel_start).total_seconds() * 1000
+            blob_key = (
+                file_hash,
+                Path(fp).suffix.lower(),
+                self.config.generated_files != 'analyze'
+                and self.generated_file_classifier.classify(fp) is not None
+            )
+            blob_keys[fp] = blob_key
+            if blob_key in blob_results:
+                return deduplicate(fp, blob_results[blob_key])
+            if blob_key in blob_followers:
+                blob_followers[blob_key].append(fp)
+                return _DUPLICATE_PENDING
+            blob_followers[blob_key] = []
             
-            # Process results
-            success_count = 0
-            error_count = 0
-            for file_path, result in zip(files_to_analyze, results):
+            files_to_analyze.add(fp)
+            analysis_start = time.perf_counter()
+            analysis = await self.analyze_file(fp, source=source, file_hash=file_hash)
+            blob_elapsed_ms[blob_key] = self._elapsed_ms(analysis_start)
+            return analysis
+        
+        # Analyze files longest-first with bounded in-flight work (shared
+        # with concurrent runs), yielding each result as it completes
+        work_items = [
+            WorkItem(
+                file_path=fp,
+                size_bytes=file_stats[fp].st_size,
+                language=self.parser.detect_language(fp),
+                priority=1 if fp in previous_timeouts else 0
+            )
+            for fp in pending_files
+        ]
+        parallel_start = datetime.now()
+        success_count = 0
+        error_count = 0
+        results = self.scheduler.run(
+            codebase_id,
+            work_items,
+            analyze_discovered,
+            # Only real analyses refine the cost model: reused, deduplicated
+            # and cached results return in well under a millisecond
+            measured=lambda fp, result: fp in files_to_analyze and not getattr(result, 'cache_hit', False)
+        )
+        try:
+            async for file_path, result in results:
+                if result is None:
+                    total_files -= 1
+                    continue
+                if result is _DUPLICATE_PENDING:
+                    # Emitted together with the primary file below
+                    continue
+                
+                reused = False
                 if isinstance(result, Exception):
                     error_count += 1
                     error_msg = str(result)
-                    logger.error(f"Failed to analyze {file_path}: {error_msg}\n{traceback.format_exc()}")
-                    self.metrics['errors'].append((file_path, error_msg))
+                    logger.error(f"Failed to analyze {file_path}: {error_msg}")
+                    self._record_errors([(file_path, error_msg)])
                     # Create error analysis
-                    file_analyses[file_path] = self._create_error_analysis(
+                    result = self._create_error_analysis(
                         file_path,
                         "unknown",
                         error_msg,
                         start_time
                     )
-                else:
+                elif file_path in files_to_analyze:
                     success_count += 1
-                    file_analyses[file_path] = result
-            
+                elif file_path in duplicate_files:
+                    pass
+                elif file_path in skipped_timeouts:
+                    pass
+                else:
+                    # File unchanged, reuse previous analysis
+                    reused_count += 1
+                    reused = True
+                
+                collected[file_path] = result
+                completed_count += 1
+                yield AnalysisEvent(
+                    kind=AnalysisEvent.FILE,
+                    codebase_id=codebase_id,
+                    completed=completed_count,
+                    total=total_files,
+                    file_path=file_path,
+                    file_analysis=result,
+                    reused=reused,
+                    queue_depth=self.scheduler.queue_depth,
+                    eta_seconds=self.scheduler.eta_seconds(codebase_id),
+                    duplicate_of=(
+                        blob_results[blob_keys[file_path]].file_path
+                        if file_path in duplicate_files else None
+                    )
+                )
+                
+                # Fan the primary's result out to duplicates that waited for it
+                blob_key = blob_keys.get(file_path)
+                if file_path not in files_to_analyze or blob_key in blob_results:
+                    continue
+                blob_results[blob_key] = result
+                for duplicate_path in blob_followers.pop(blob_key, []):
+                    duplicate = deduplicate(duplicate_path, result)
+                    collected[duplicate_path] = duplicate
+                    completed_count += 1
+                    yield AnalysisEvent(
+                        kind=AnalysisEvent.FILE,
+                        codebase_id=codebase_id,
+                        completed=completed_count,
+                        total=total_files,
+                        file_path=duplicate_path,
+                        file_analysis=duplicate,
+                        queue_depth=self.scheduler.queue_depth,
+                        eta_seconds=self.scheduler.eta_seconds(codebase_id),
+                        duplicate_of=file_path
+                    )
+        finally:
+            # Stop outstanding work if the consumer stops iterating early
+            await results.aclose()
+        parallel_elapsed_ms = (datetime.now() - parallel_start).total_seconds() * 1000
+        
+        if reused_count > 0:
+            logger.info(f"Reused {reused_count} unchanged file analyses from previous run")
+        
+        if duplicate_files:
+            logger.info(
+                f"Deduplicated {len(duplicate_files)} files with identical content "
+                f"(~{dedup_saved_ms:.0f}ms of analysis saved)"
+            )
+        
+        if files_to_analyze:
             logger.info(
                 f"Parallel file analysis complete: {success_count} succeeded, {error_count} failed "
                 f"in {parallel_elapsed_ms:.0f}ms "
                 f"(avg: {parallel_elapsed_ms / len(files_to_analyze):.0f}ms per file)"
             )
         
+        # Keep discovery order regardless of how each file was resolved
+        file_analyses = {fp: collected[fp] for fp in file_list if fp in collected}
+        
+        # Generated files are left out entirely in 'skip' mode
+        skipped_generated: Dict[str, str] = {}
+        if self.config.generated_files == 'skip':
+            skipped_generated = {fp: fa.skip_reason for fp, fa in file_analyses.items() if fa.skip_reason}
+            file_analyses = {fp: fa for fp, fa in file_analyses.items() if not fa.skip_reason}
+        
         logger.info(f"Total file analyses: {len(file_analyses)} files")
         
-        # Build dependency graph
+        def stage_event(stage: str, data: Any) -> AnalysisEvent:
+            return AnalysisEvent(
+                kind=AnalysisEvent.STAGE,
+                codebase_id=codebase_id,
+                completed=completed_count,
+                total=total_files,
+                stage=stage,
+                data=data
+            )
+        
+        # Build dependency graph, patching the previous one in incremental mode
         try:
             logger.info("Building dependency graph...")
             dep_start = datetime.now()
-            dependency_graph = self.dependency_analyzer.analyze_dependencies(
-                codebase_id,
-                file_analyses
-            )
+            dependency_graph = None
+            if previous_analysis is not None:
+                try:
+                    dependency_graph = self.dependency_analyzer.update_dependencies(
+                        codebase_id,
+                        previous_analysis.dependency_graph,
+                        file_analyses,
+                        files_to_analyze | skipped_timeouts | duplicate_files
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to update previous dependency graph, rebuilding: {e}")
+            if dependency_graph is None:
+                dependency_graph = self.dependency_analyzer.analyze_dependencies(
+                    codebase_id,
+                    file_analyses
+                )
             dep_elapsed_ms = (datetime.now() - dep_start).total_seconds() * 1000
             logger.info(
                 f"Dependency graph built in {dep_elapsed_ms:.0f}ms: "
@@ -846,26 +1371,31 @@ class AnalysisEngine:
             # Create empty dependency graph
             from .dependency_analyzer import DependencyGraph
             dependency_graph = DependencyGraph()
+        yield stage_event(AnalysisEvent.STAGE_DEPENDENCY_GRAPH, dependency_graph)
         
-        # Detect global patterns
+        # Detect global patterns, updating the previous run's aggregate by delta
+        pattern_aggregate = None
         try:
             logger.info("Detecting global patterns...")
             pattern_start = datetime.now()
-            global_patterns = self.pattern_detector.detect_global_patterns(file_analyses)
+            pattern_aggregate = self._update_pattern_aggregate(
+                codebase_id,
+                file_analyses,
+                files_to_analyze | skipped_timeouts | duplicate_files,
+                previous_analysis is not None
+            )
+            global_patterns = self.pattern_detector.detect_global_patterns(file_analyses, pattern_aggregate)
             pattern_elapsed_ms = (datetime.now() - pattern_start).total_seconds() * 1000
             logger.info(f"Global pattern detection complete in {pattern_elapsed_ms:.0f}ms: {len(global_patterns)} patterns")
         except Exception as e:
             logger.error(f"Failed to detect global patterns: {e}\n{traceback.format_exc()}")
             global_patterns = []
+        yield stage_event(AnalysisEvent.STAGE_GLOBAL_PATTERNS, global_patterns)
         
         # Rank files by teaching value
         try:
             logger.debug("Ranking files by teaching value...")
-            top_teaching_files = sorted(
-                [(fp, fa.teaching_value.total_score) for fp, fa in file_analyses.items()],
-                key=lambda x: x[1],
-                reverse=True
-            )[:20]  # Top 20 files
+            top_teaching_files = self._rank_teaching_files(file_analyses, pattern_aggregate)
             if top_teaching_files:
                 logger.info(
                     f"Top teaching file: {top_teaching_files[0][0]} "
@@ -878,7 +1408,12 @@ class AnalysisEngine:
         # Calculate codebase metrics
         try:
             logger.debug("Calculating codebase metrics...")
-            metrics = self._calculate_codebase_metrics(file_analyses, start_time)
+            metrics = self._calculate_codebase_metrics(
+                file_analyses,
+                start_time,
+                skipped_generated,
+                total_patterns=pattern_aggregate.total_patterns if pattern_aggregate else None
+            )
             logger.info(
                 f"Codebase metrics: {metrics.total_files} files, "
                 f"{metrics.total_functions} functions, "
@@ -899,6 +1434,11 @@ class AnalysisEngine:
                 analysis_time_ms=0.0,
                 cache_hit_rate=0.0
             )
+        metrics.duplicate_files = len(duplicate_files)
+        if duplicate_files:
+            metrics.dedup_ratio = round(len(duplicate_files) / (len(files_to_analyze) + len(duplicate_files)), 3)
+            metrics.dedup_time_saved_ms = round(dedup_saved_ms, 2)
+        yield stage_event(AnalysisEvent.STAGE_METRICS, metrics)
         
         # Create codebase analysis
         analysis = CodebaseAnalysis(
@@ -917,10 +1457,19 @@ class AnalysisEngine:
             persist_start = datetime.now()
             self.persistence.save_analysis(codebase_id, analysis)
             self.persistence.save_file_hashes(codebase_id, current_hashes)
+            self.persistence.save_file_manifest(codebase_id, manifest)
+            if pattern_aggregate is not None:
+                self.persistence.save_pattern_aggregate(codebase_id, pattern_aggregate)
+            self.persistence.save_timed_out_files(codebase_id, {
+                fp: file_hash for fp, file_hash in current_hashes.items()
+                if self.timed_out_files.get(fp) == file_hash
+                or (fp not in files_to_analyze and previous_timeouts.get(fp) == file_hash)
+            })
             persist_elapsed_ms = (datetime.now() - persist_start).total_seconds() * 1000
             logger.info(f"Analysis persisted to disk in {persist_elapsed_ms:.0f}ms")
         except Exception as e:
             logger.error(f"Failed to persist analysis: {e}\n{traceback.format_exc()}")
+        yield stage_event(AnalysisEvent.STAGE_PERSISTED, self.config.persistence_path)
         
         # Cache in memory
         try:
@@ -934,6 +1483,10 @@ class AnalysisEngine:
         except Exception as e:
             logger.error(f"Failed to cache analysis: {e}\n{traceback.format_exc()}")
         
+        # Watch mode applies later file changes to this analysis
+        if codebase_id in self.watchers:
+            self.watchers[codebase_id].set_baseline(analysis)
+        
         # Calculate and log final metrics
         elapsed_ms = (datetime.now() - start_time).total_seconds() * 1000
         
@@ -948,8 +1501,15 @@ class AnalysisEngine:
         logger.info(f"Average complexity: {metrics.avg_complexity:.2f}")
         logger.info(f"Average documentation coverage: {metrics.avg_documentation_coverage:.2%}")
         logger.info(f"Cache hit rate: {metrics.cache_hit_rate:.2%}")
+        logger.info(
+            f"Duplicate files: {metrics.duplicate_files} "
+            f"(dedup ratio: {metrics.dedup_ratio:.2%}, "
+            f"time saved: ~{metrics.dedup_time_saved_ms:.0f}ms)"
+        )
+        logger.info(f"Generated/minified files not parsed: {metrics.skipped_files} {metrics.skip_reasons}")
+        logger.info(f"Large files with skeleton analysis: {metrics.skeleton_files}")
         logger.info(f"Total analysis time: {elapsed_ms:.0f}ms ({elapsed_ms/1000:.1f}s)")
-        logger.info(f"Average time per file: {metrics.analysis_time_ms / metrics.total_files:.0f}ms")
+        logger.info(f"Average time per file: {metrics.analysis_time_ms / max(metrics.total_files, 1):.0f}ms")
         
         # Log cache statistics
         total_cache_requests = self.metrics['total_cache_hits'] + self.metrics['total_cache_misses']
@@ -961,14 +1521,14 @@ class AnalysisEngine:
         
         # Log slow operations
         if self.metrics['slow_operations']:
-            logger.warning(f"Slow operations detected: {len(self.metrics['slow_operations'])}")
-            for file_path, duration_ms in self.metrics['slow_operations'][:5]:  # Top 5 slowest
+            logger.warning(f"Slow operations detected: {self.metrics['slow_operations_count']}")
+            for file_path, duration_ms in list(self.metrics['slow_operations'])[:5]:  # First 5 recent
                 logger.warning(f"  - {file_path}: {duration_ms:.0f}ms")
         
         # Log errors
         if self.metrics['errors']:
-            logger.error(f"Errors encountered: {len(self.metrics['errors'])}")
-            for file_path, error_msg in self.metrics['errors'][:5]:  # First 5 errors
+            logger.error(f"Errors encountered: {self.metrics['errors_count']}")
+            for file_path, error_msg in list(self.metrics['errors'])[:5]:  # First 5 recent errors
                 logger.error(f"  - {file_path}: {error_msg}")
         
         logger.info("=" * 80)
@@ -981,19 +1541,387 @@ class AnalysisEngine:
             f"in {elapsed_ms:.0f}ms"
         )
         
-        return analysis
+        yield AnalysisEvent(
+            kind=AnalysisEvent.COMPLETE,
+            codebase_id=codebase_id,
+            completed=completed_count,
+            total=total_files,
+            data=analysis
+        )
+    
+    def _load_previous_run(
+        self,
+        codebase_id: str,
+        incremental_enabled: bool
+    ) -> Tuple[Optional[CodebaseAnalysis], Dict[str, str], Optional[FileManifest]]:
+        """
+        Load the persisted results of the previous run for incremental mode.
+        
+        Args:
+            codebase_id: ID of codebase
+            incremental_enabled: Whether incremental analysis is in effect
+        
+        Returns:
+            Tuple of (previous analysis, file hashes, stat manifest); empty
+            when incremental analysis is disabled or nothing was persisted
+        """
+        if not incremental_enabled:
+            return None, {}, None
+        
+        try:
+            logger.debug(f"Loading previous analysis for {codebase_id}")
+            previous_analysis = self.persistence.load_analysis(codebase_id)
+            previous_hashes = self.persistence.get_file_hashes(codebase_id)
+            previous_manifest = self.persistence.get_file_manifest(codebase_id)
+            if previous_analysis:
+                logger.info(
+                    f"Loaded previous analysis for {codebase_id}: "
+                    f"{len(previous_analysis.file_analyses)} files, "
+                    f"{len(previous_hashes)} hashes"
+                )
+            else:
+                logger.info(f"No previous analysis found for {codebase_id}, performing full analysis")
+            return previous_analysis, previous_hashes, previous_manifest
+        except Exception as e:
+            logger.warning(f"Failed to load previous analysis for {codebase_id}: {e}")
+            return None, {}, None
+    
+    async def _get_root_path(self, codebase_id: str) -> str:
+        """
+        Get the root directory of a scanned codebase.
+        
+        Args:
+            codebase_id: ID of codebase (must have been scanned)
+        
+        Returns:
+            Root directory path recorded by scan_codebase
+        
+        Raises:
+            ValueError: If the codebase has not been scanned or the scan
+                        result is invalid
+        """
+        # Get scan results
+        try:
+            scan_result = await self.cache.get_analysis(f"scan:{codebase_id}")
+            if not scan_result:
+                error_msg = f"Codebase not scanned. Call scan_codebase first for codebase_id: {codebase_id}"
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+            logger.debug(f"Retrieved scan results for {codebase_id}")
+        except ValueError:
+            raise
+        except Exception as e:
+            error_msg = f"Failed to retrieve scan results for {codebase_id}: {e}"
+            logger.error(f"{error_msg}\n{traceback.format_exc()}")
+            raise ValueError(error_msg)
+        
+        # scan_result contains 'path' which is the root directory
+        if not (isinstance(scan_result, dict) and 'path' in scan_result):
+            logger.error(f"Invalid scan result format for {codebase_id}: missing 'path' key")
+            raise ValueError("Invalid scan result format: missing 'path' key")
+        
+        return scan_result['path']
+    
+    async def _discover_files(self, codebase_id: str) -> Tuple[str, List[str], Dict[str, Any]]:
+        """
+        Find all analyzable files of a scanned codebase.
+        
+        Args:
+            codebase_id: ID of codebase (must have been scanned)
+        
+        Returns:
+            Tuple of (root directory, file paths in discovery order, stat
+            result per path)
+        
+        Raises:
+            ValueError: If the codebase has not been scanned or the scan
+                        result is invalid
+        """
+        # We need to walk the root directory to get all analyzable files
+        root_path = await self._get_root_path(codebase_id)
+        logger.debug(f"Scanning directory for files: {root_path}")
+        
+        # Walk the directory once, collecting stat tuples for the manifest
+        file_list = []
+        file_stats = {}
+        for file_path, st in scan_files(root_path, self.IGNORED_DIRS, self._is_analyzable):
+            file_list.append(file_path)
+            file_stats[file_path] = st
+        
+        logger.info(f"Found {len(file_list)} analyzable files")
+        return root_path, file_list, file_stats
+    
+    async def watch_codebase(self, codebase_id: str) -> Dict[str, Any]:
+        """
+        Keep the analysis of a codebase warm by watching its files.
+        
+        Runs an incremental analysis as the baseline, then re-analyzes only
+        the files that change afterwards and patches the in-memory analysis,
+        dependency graph and `codebase:{id}` cache entry (see
+        apply_file_changes). Watching a codebase twice has no effect.
+        
+        Args:
+            codebase_id: ID of codebase (must have been scanned)
+        
+        Returns:
+            Watcher status dictionary (backend, debounce_ms, updates, ...)
+        
+        Raises:
+            ValueError: If the codebase has not been scanned or the configured
+                        watch backend is unavailable
+        
+        Example:
+            >>> status = await engine.watch_codebase("my_project")
+            >>> status['backend']
+            'watchfiles'
+        """
+        if codebase_id in self.watchers:
+            return self.watchers[codebase_id].to_dict()
+        
+        root_path = await self._get_root_path(codebase_id)
+        watcher = create_watcher(
+            self.config.watch_backend,
+            root_path,
+            self.IGNORED_DIRS,
+            self._is_analyzable,
+            poll_interval_seconds=self.config.watch_poll_interval_ms / 1000
+        )
+        codebase_watcher = CodebaseWatcher(
+            self,
+            codebase_id,
+            watcher,
+            debounce_seconds=self.config.watch_debounce_ms / 1000
+        )
+        
+        # Start receiving events before the baseline run so no edit is missed
+        self.watchers[codebase_id] = codebase_watcher
+        try:
+            await codebase_watcher.start()
+            await self.analyze_codebase(codebase_id, incremental=True)
+        except Exception:
+            del self.watchers[codebase_id]
+            await codebase_watcher.stop()
+            raise
+        
+        logger.info(f"Watching {root_path} for {codebase_id} ({watcher.name} backend)")
+        return codebase_watcher.to_dict()
+    
+    async def unwatch_codebase(self, codebase_id: str) -> bool:
+        """
+        Stop watching a codebase.
+        
+        The last patched analysis stays in the cache until it expires.
+        
+        Args:
+            codebase_id: ID of codebase
+        
+        Returns:
+            True if the codebase was being watched
+        """
+        codebase_watcher = self.watchers.pop(codebase_id, None)
+        if codebase_watcher is None:
+            return False
+        await codebase_watcher.stop()
+        logger.info(f"Stopped watching {codebase_id}")
+        return True
+    
+    def get_watched_analysis(self, codebase_id: str) -> Optional[CodebaseAnalysis]:
+        """
+        Get the up-to-date analysis of a watched codebase.
+        
+        Args:
+            codebase_id: ID of codebase
+        
+        Returns:
+            CodebaseAnalysis, or None if the codebase is not watched or its
+            baseline analysis has not finished
+        """
+        codebase_watcher = self.watchers.get(codebase_id)
+        return codebase_watcher.analysis if codebase_watcher else None
+    
+    async def apply_file_changes(self, codebase_id: str, paths: Set[str]) -> int:
+        """
+        Patch the analysis of a watched codebase after files changed.
+        
+        Existing files are re-analyzed through analyze_file (unchanged
+        content is a cache hit) and missing files are dropped. The dependency
+        graph is patched with DependencyAnalyzer.update_dependencies and the
+        pattern aggregate (global patterns, teaching ranking) by delta;
+        metrics are recomputed from the in-memory file analyses without
+        touching the disk. The result replaces the
+        `codebase:{id}` cache entry. Persisted state is refreshed by the next
+        analyze_codebase run, whose stat manifest detects the same changes.
+        
+        Args:
+            codebase_id: ID of a watched codebase
+            paths: Paths of created, modified or deleted files
+        
+        Returns:
+            Number of files re-analyzed or removed
+        
+        Raises:
+            ValueError: If the codebase is not being watched
+        """
+        codebase_watcher = self.watchers.get(codebase_id)
+        if codebase_watcher is None or codebase_watcher.analysis is None:
+            raise ValueError(f"Codebase is not being watched: {codebase_id}")
+        
+        start_time = datetime.now()
+        previous = codebase_watcher.analysis
+        file_analyses = dict(previous.file_analyses)
+        changed = set()
+        for file_path in sorted(paths):
+            if not self._is_analyzable(file_path):
+                continue
+            if Path(file_path).is_file():
+                analysis = await self.analyze_file(file_path)
+                if analysis.skip_reason and self.config.generated_files == 'skip':
+                    if file_analyses.pop(file_path, None) is not None:
+                        changed.add(file_path)
+                    continue
+                file_analyses[file_path] = analysis
+                changed.add(file_path)
+            elif file_analyses.pop(file_path, None) is not None:
+                changed.add(file_path)
+                if self.components.is_built('parse_cache'):
+                    self.parse_cache.discard(file_path)
+        if not changed:
+            return 0
+        
+        try:
+            dependency_graph = self.dependency_analyzer.update_dependencies(
+                codebase_id,
+                previous.dependency_graph,
+                file_analyses,
+                changed
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update dependency graph, rebuilding: {e}")
+            dependency_graph = self.dependency_analyzer.analyze_dependencies(codebase_id, file_analyses)
+        
+        pattern_aggregate = None
+        try:
+            pattern_aggregate = self._update_pattern_aggregate(codebase_id, file_analyses, changed, True)
+            global_patterns = self.pattern_detector.detect_global_patterns(file_analyses, pattern_aggregate)
+        except Exception as e:
+            logger.error(f"Failed to detect global patterns: {e}\n{traceback.format_exc()}")
+            global_patterns = previous.global_patterns
+        
+        analysis = CodebaseAnalysis(
+            codebase_id=codebase_id,
+            file_analyses=file_analyses,
+            dependency_graph=dependency_graph,
+            global_patterns=global_patterns,
+            top_teaching_files=self._rank_teaching_files(file_analyses, pattern_aggregate),
+            metrics=self._calculate_codebase_metrics(
+                file_analyses,
+                start_time,
+                total_patterns=pattern_aggregate.total_patterns if pattern_aggregate else None
+            ),
+            analyzed_at=datetime.now().isoformat()
+        )
+        codebase_watcher.analysis = analysis
+        
+        try:
+            await self.cache.set_analysis(
+                f"codebase:{codebase_id}",
+                analysis.to_dict(),
+                ttl=self.config.cache_ttl_seconds
+            )
+        except Exception as e:
+            logger.error(f"Failed to cache analysis: {e}\n{traceback.format_exc()}")
+        
+        logger.debug(f"Applied {len(changed)} file changes to {codebase_id}")
+        return len(changed)
+    
+    def _start_detector_run(self) -> None:
+        """Start a new run of the detector budgets, clearing demotions from the last run."""
+        self.metrics['detector_costs'].reset_modes()
+        if self.components.is_built('pattern_detector'):
+            self.pattern_detector.budget.start_run()
+        if self.components.is_built('backend'):
+            self.backend.start_run()
+    
+    def _update_pattern_aggregate(
+        self,
+        codebase_id: str,
+        file_analyses: Dict[str, FileAnalysis],
+        changed: Set[str],
+        load_persisted: bool
+    ) -> PatternAggregate:
+        """
+        Bring a codebase's pattern aggregate up to date by delta.
+        
+        The aggregate of the codebase's last analysis is taken from memory,
+        or from disk after a restart; only the files in `changed` (and files
+        whose content hash differs) are re-aggregated.
+        
+        Args:
+            codebase_id: ID of codebase
+            file_analyses: Current file analyses
+            changed: Paths re-analyzed or removed since the last analysis
+            load_persisted: Whether the persisted aggregate may be used
+        
+        Returns:
+            PatternAggregate synced with file_analyses
+        """
+        aggregate = self.pattern_aggregates.pop(codebase_id, None)
+        if aggregate is None and load_persisted:
+            aggregate = self.persistence.get_pattern_aggregate(codebase_id)
+        if aggregate is None:
+            aggregate = PatternAggregate()
+        # Kept only once synced, so a failed update never leaves a partial aggregate
+        updated = aggregate.sync(file_analyses, changed)
+        self.pattern_aggregates[codebase_id] = aggregate
+        logger.debug(f"Pattern aggregate for {codebase_id}: {updated} of {len(file_analyses)} files updated")
+        return aggregate
+    
+    @staticmethod
+    def _rank_teaching_files(
+        file_analyses: Dict[str, FileAnalysis],
+        aggregate: Optional[PatternAggregate] = None,
+        limit: int = 20
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank files by teaching value.
+        
+        Args:
+            file_analyses: Current file analyses
+            aggregate: PatternAggregate synced with file_analyses, whose
+                       ranking is used when given
+            limit: Maximum number of files
+        
+        Returns:
+            (file_path, score) tuples, best first
+        """
+        if aggregate is not None:
+            return aggregate.top_teaching_files(limit)
+        return sorted(
+            [(fp, fa.teaching_value.total_score) for fp, fa in file_analyses.items()],
+            key=lambda x: x[1],
+            reverse=True
+        )[:limit]
     
     def _calculate_codebase_metrics(
         self,
         file_analyses: Dict[str, FileAnalysis],
-        start_time: datetime
+        start_time: datetime,
+        skipped: Optional[Dict[str, str]] = None,
+        total_patterns: Optional[int] = None
     ) -> CodebaseMetrics:
         """
         Calculate aggregate metrics for the codebase.
         
+        Metadata-only analyses of generated files count as files and skip
+        reasons, but not towards complexity and documentation averages.
+        
         Args:
             file_analyses: Dictionary of file analyses
             start_time: Analysis start time
+            skipped: Skip reasons of generated files left out of
+                     file_analyses
+            total_patterns: Pattern total kept by a PatternAggregate; when
+                            None, patterns are counted file by file
         
         Returns:
             CodebaseMetrics with aggregate statistics
@@ -1003,10 +1931,18 @@ class AnalysisEngine:
         total_classes = 0
         complexities = []
         doc_coverages = []
-        total_patterns = 0
+        counted_patterns = 0
         cache_hits = 0
+        skeleton_files = 0
+        skip_reasons: Dict[str, int] = {}
+        for reason in (skipped or {}).values():
+            skip_reasons[reason] = skip_reasons.get(reason, 0) + 1
         
         for analysis in file_analyses.values():
+            if analysis.skip_reason:
+                skip_reasons[analysis.skip_reason] = skip_reasons.get(analysis.skip_reason, 0) + 1
+                continue
+            
             # Count functions and classes
             total_functions += len(analysis.symbol_info.functions)
             total_classes += len(analysis.symbol_info.classes)
@@ -1019,11 +1955,15 @@ class AnalysisEngine:
             doc_coverages.append(analysis.documentation_coverage)
             
             # Count patterns
-            total_patterns += len(analysis.patterns)
+            if total_patterns is None:
+                counted_patterns += len(analysis.patterns)
             
             # Count cache hits
             if analysis.cache_hit:
                 cache_hits += 1
+            
+            if analysis.analysis_mode == ANALYSIS_MODE_SKELETON:
+                skeleton_files += 1
         
         # Calculate averages
         avg_complexity = sum(complexities) / len(complexities) if complexities else 0.0
@@ -1039,9 +1979,12 @@ class AnalysisEngine:
             total_classes=total_classes,
             avg_complexity=round(avg_complexity, 2),
             avg_documentation_coverage=round(avg_doc_coverage, 3),
-            total_patterns_detected=total_patterns,
+            total_patterns_detected=counted_patterns if total_patterns is None else total_patterns,
             analysis_time_ms=round(elapsed_ms, 2),
-            cache_hit_rate=round(cache_hit_rate, 3)
+            cache_hit_rate=round(cache_hit_rate, 3),
+            skipped_files=sum(skip_reasons.values()),
+            skip_reasons=skip_reasons,
+            skeleton_files=skeleton_files
         )
     
     def get_performance_metrics(self) -> Dict[str, Any]:
@@ -1058,7 +2001,18 @@ class AnalysisEngine:
                 - avg_time_per_file_ms: Average time per file
                 - slow_operations_count: Number of slow operations (>1000ms)
                 - errors_count: Number of errors encountered
-                - file_analysis_times: List of (file_path, duration_ms) tuples
+                - parse_timeouts_count: Number of files that exceeded the parse timeout
+                - file_analysis_times: Recent (file_path, duration_ms) tuples
+                  (at most MAX_RECENT_SAMPLES)
+                - latency: p50/p95/p99 histograms by pipeline stage, language
+                  and pattern detector
+                - detector_dispatch: Pattern detectors invoked, skipped because
+                  they do not apply to the file's language, and skipped because
+                  a precondition failed
+                - detector_costs: Per pattern detector runs, skips, patterns
+                  found, hit rate, time and budget mode, slowest first
+                - scheduler: Queue depth, in-flight count and ETA of the scheduler
+                  (empty until the scheduler is first used)
         """
         total_requests = self.metrics['total_cache_hits'] + self.metrics['total_cache_misses']
         cache_hit_rate = (
@@ -1078,24 +2032,69 @@ class AnalysisEngine:
             'cache_hit_rate': round(cache_hit_rate, 3),
             'total_analysis_time_ms': round(self.metrics['total_analysis_time_ms'], 2),
             'avg_time_per_file_ms': round(avg_time_per_file, 2),
-            'slow_operations_count': len(self.metrics['slow_operations']),
-            'errors_count': len(self.metrics['errors']),
-            'file_analysis_times': self.metrics['file_analysis_times']
+            'slow_operations_count': self.metrics['slow_operations_count'],
+            'errors_count': self.metrics['errors_count'],
+            'parse_timeouts_count': self.metrics['parse_timeouts_count'],
+            'file_analysis_times': list(self.metrics['file_analysis_times']),
+            'latency': self.metrics['latency'].to_dict(),
+            'detector_dispatch': dict(self.metrics['detector_dispatch']),
+            'detector_costs': self.metrics['detector_costs'].to_dict(),
+            # Reading metrics must not start the scheduler and its backend
+            'scheduler': self.scheduler.get_stats() if self.components.is_built('scheduler') else {}
         }
     
     def reset_performance_metrics(self):
         """Reset performance metrics to initial state."""
         logger.info("Resetting performance metrics")
-        self.metrics = {
+        self.metrics = self._new_metrics()
+    
+    def _new_metrics(self) -> Dict[str, Any]:
+        """
+        Create an empty performance metrics dictionary.
+        
+        Recent samples are kept in bounded deques and latency distributions
+        in fixed-size histograms, so memory stays flat however many files a
+        long-running server analyzes.
+        
+        Returns:
+            Dictionary of counters, recent samples and latency histograms
+        """
+        return {
             'total_files_analyzed': 0,
             'total_cache_hits': 0,
             'total_cache_misses': 0,
             'total_analysis_time_ms': 0.0,
-            'slow_operations': [],
-            'errors': [],
-            'file_analysis_times': []
+            'slow_operations_count': 0,
+            'errors_count': 0,
+            'parse_timeouts_count': 0,
+            'slow_operations': deque(maxlen=self.MAX_RECENT_SAMPLES),  # Recent (file_path, duration_ms)
+            'errors': deque(maxlen=self.MAX_RECENT_SAMPLES),  # Recent (file_path, error_message)
+            'file_analysis_times': deque(maxlen=self.MAX_RECENT_SAMPLES),  # Recent (file_path, duration_ms)
+            'latency': LatencyRecorder(),
+            'detector_dispatch': {'invoked': 0, 'skipped_language': 0, 'skipped_precondition': 0},
+            'detector_costs': DetectorCostTable()
         }
     
+    def _record_errors(self, errors: List[Tuple[str, str]]):
+        """Record (file_path, error_message) tuples in the performance metrics."""
+        self.metrics['errors'].extend(errors)
+        self.metrics['errors_count'] += len(errors)
+    
+    @staticmethod
+    def _elapsed_ms(start: float) -> float:
+        """Milliseconds elapsed since a time.perf_counter() timestamp."""
+        return (time.perf_counter() - start) * 1000
+    
+    def shutdown(self):
+        """Stop file watchers and release execution backend resources such as worker processes."""
+        for codebase_watcher in self.watchers.values():
+            codebase_watcher.cancel()
+        self.watchers.clear()
+        if not self.components.is_built('backend'):
+            return
+        logger.info(f"Shutting down execution backend: {self.backend.name}")
+        self.backend.shutdown()
+    
     def log_performance_summary(self):
         """Log a summary of performance metrics."""
         metrics = self.get_performance_metrics()
@@ -0,0 +1,89 @@
+"""
+Progress events emitted by streaming codebase analysis.
+
+AnalysisEngine.analyze_codebase_stream() yields these events so callers
+(MCP tools, course generation) can act on per-file results while the rest
+of the codebase is still being analyzed.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from src.models.analysis_models import FileAnalysis
+
+
+@dataclass
+class AnalysisEvent:
+    """A single step of a streaming codebase analysis.
+    
+    Attributes:
+        kind: Event kind (STARTED, FILE, STAGE or COMPLETE)
+        codebase_id: ID of the codebase being analyzed
+        completed: Number of files finished so far
+        total: Total number of files in this run
+        file_path: Analyzed file (FILE events)
+        file_analysis: Analysis of the file (FILE events)
+        reused: True if the file analysis was reused from the previous run
+        duplicate_of: File with identical content whose analysis was reused
+                      in this run (FILE events)
+        stage: Codebase-level stage name (STAGE events)
+        data: Stage result (STAGE events) or the CodebaseAnalysis (COMPLETE)
+        queue_depth: Files still waiting for the scheduler (FILE events)
+        eta_seconds: Estimated time until this run's files are done (FILE events)
+    """
+    
+    STARTED = "started"
+    FILE = "file"
+    STAGE = "stage"
+    COMPLETE = "complete"
+    
+    # Codebase-level stages, in the order they are emitted
+    STAGE_DEPENDENCY_GRAPH = "dependency_graph"
+    STAGE_GLOBAL_PATTERNS = "global_patterns"
+    STAGE_METRICS = "metrics"
+    STAGE_PERSISTED = "persisted"
+    
+    kind: str
+    codebase_id: str
+    completed: int = 0
+    total: int = 0
+    file_path: Optional[str] = None
+    file_analysis: Optional[FileAnalysis] = None
+    reused: bool = False
+    stage: Optional[str] = None
+    data: Any = None
+    queue_depth: Optional[int] = None
+    eta_seconds: Optional[float] = None
+    duplicate_of: Optional[str] = None
+    
+    @property
+    def message(self) -> str:
+        """Human-readable progress message for this event."""
+        if self.kind == self.STARTED:
+            return f"Analyzing {self.total} files"
+        if self.kind == self.FILE:
+            if self.duplicate_of:
+                suffix = f" (duplicate of {self.duplicate_of})"
+            else:
+                suffix = " (unchanged)" if self.reused else ""
+            return f"Analyzed {self.file_path}{suffix}"
+        if self.kind == self.STAGE:
+            return f"Completed stage: {self.stage}"
+        return f"Analysis complete: {self.completed} files"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization (without stage data)."""
+        return {
+            'kind': self.kind,
+            'codebase_id': self.codebase_id,
+            'completed': self.completed,
+            'total': self.total,
+            'file_path': self.file_path,
+            'file_analysis': self.file_analysis.to_dict() if self.file_analysis else None,
+            'reused': self.reused,
+            'stage': self.stage,
+            'queue_depth': self.queue_depth,
+            'eta_seconds': self.eta_seconds,
+            'duplicate_of': self.duplicate_of,
+            'message': self.message
+        }
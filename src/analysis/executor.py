@@ -0,0 +1,529 @@
+"""
+Execution backends for the file analysis pipeline.
+
+This module provides pluggable backends that run the CPU-bound part of
+AnalysisEngine.analyze_file (parsing, symbol extraction, pattern detection,
+complexity, documentation coverage and teaching value scoring) on the event
+loop thread, on a thread pool, or in supervised worker processes with a
+per-file deadline.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import multiprocessing
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.models.analysis_models import FileAnalysis
+
+from .config import AnalysisConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelineResult:
+    """Result of running the analysis pipeline for one file.
+
+    Attributes:
+        analysis: FileAnalysis produced by the pipeline
+        completed: False when the pipeline bailed out early with an error analysis
+        errors: (file_path, error_message) tuples to record in engine metrics
+        stage_timings: Milliseconds spent in each pipeline stage (parse, symbols, ...)
+        detector_timings: Milliseconds spent in each pattern detector
+        detector_counts: Pattern detectors invoked and skipped (see
+            PatternDetector.get_dispatch_stats)
+        detector_yields: Patterns found by each pattern detector that ran
+        detector_skips: Pattern detectors skipped by the detector budget
+        detector_modes: Pattern detectors the budget has demoted, with their
+            mode ('sampled' or 'disabled')
+    """
+    analysis: FileAnalysis
+    completed: bool = True
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    detector_timings: Dict[str, float] = field(default_factory=dict)
+    detector_counts: Dict[str, int] = field(default_factory=dict)
+    detector_yields: Dict[str, int] = field(default_factory=dict)
+    detector_skips: Dict[str, int] = field(default_factory=dict)
+    detector_modes: Dict[str, str] = field(default_factory=dict)
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Convert to a compact, picklable payload for inter-process transfer."""
+        return {
+            'analysis': self.analysis.to_dict(),
+            'completed': self.completed,
+            'errors': self.errors,
+            'stage_timings': self.stage_timings,
+            'detector_timings': self.detector_timings,
+            'detector_counts': self.detector_counts,
+            'detector_yields': self.detector_yields,
+            'detector_skips': self.detector_skips,
+            'detector_modes': self.detector_modes
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> 'PipelineResult':
+        """Create from a payload produced by to_payload()."""
+        return cls(
+            analysis=FileAnalysis.from_dict(payload['analysis']),
+            completed=payload.get('completed', True),
+            errors=[tuple(e) for e in payload.get('errors', [])],
+            stage_timings=payload.get('stage_timings', {}),
+            detector_timings=payload.get('detector_timings', {}),
+            detector_counts=payload.get('detector_counts', {}),
+            detector_yields=payload.get('detector_yields', {}),
+            detector_skips=payload.get('detector_skips', {}),
+            detector_modes=payload.get('detector_modes', {})
+        )
+
+
+class AnalysisBackend(ABC):
+    """
+    Abstract base class for analysis execution backends.
+
+    A backend receives a file path (and the content already read by the
+    engine) and returns the PipelineResult of the synchronous analysis
+    pipeline. Caching, linting and metrics stay in the
+    AnalysisEngine; only the CPU-bound work is delegated.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def run(self, file_path: str, source: Optional[bytes] = None) -> PipelineResult:
+        """
+        Run the analysis pipeline for a file.
+
+        Args:
+            file_path: Path to file to analyze
+            source: File content; the pipeline reads the file when None
+
+        Returns:
+            PipelineResult for the file
+        """
+        pass
+
+    @property
+    def max_workers(self) -> int:
+        """Number of files this backend can analyze concurrently."""
+        return 1
+
+    def start_run(self) -> None:
+        """Start a codebase run, resetting per-run state kept by workers."""
+        pass
+
+    def shutdown(self) -> None:
+        """Release backend resources (worker processes, threads)."""
+        pass
+
+
+class InlineBackend(AnalysisBackend):
+    """
+    Runs the pipeline on the calling thread.
+
+    This is the original behavior: all analysis shares one core with the
+    event loop. Useful for tests, single-file calls and small codebases.
+    """
+
+    name = "inline"
+
+    def __init__(self, engine: Any):
+        """
+        Initialize the inline backend.
+
+        Args:
+            engine: AnalysisEngine whose components run the pipeline
+        """
+        self.engine = engine
+
+    async def run(self, file_path: str, source: Optional[bytes] = None) -> PipelineResult:
+        """Run the pipeline synchronously in the current thread."""
+        return self.engine._run_pipeline(file_path, source)
+
+
+class ThreadPoolBackend(AnalysisBackend):
+    """
+    Runs the pipeline on a pool of threads in this process.
+
+    tree-sitter releases the GIL while parsing, so the parse stage of
+    several files overlaps on multiple cores, while the Python stages
+    (symbol extraction, pattern detection, scoring) take turns on the GIL.
+    Compared to the process backend there is no worker start-up and no
+    pickling of results, and components and caches such as the parse tree
+    cache are shared; in exchange, threads cannot be killed, so
+    config.parse_timeout_seconds is not enforced.
+
+    Example:
+        >>> backend = ThreadPoolBackend(engine, max_workers=4)
+        >>> result = await backend.run("src/main.py")
+        >>> backend.shutdown()
+    """
+
+    name = "thread"
+
+    def __init__(self, engine: Any, max_workers: Optional[int] = None):
+        """
+        Initialize the thread backend.
+
+        Args:
+            engine: AnalysisEngine whose components run the pipeline
+            max_workers: Number of threads (defaults to
+                         min(config.max_parallel_files, CPU count))
+        """
+        self.engine = engine
+        self._max_workers = max_workers or max(
+            1, min(engine.config.max_parallel_files, os.cpu_count() or 1)
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def max_workers(self) -> int:
+        """Number of threads."""
+        return self._max_workers
+
+    async def run(self, file_path: str, source: Optional[bytes] = None) -> PipelineResult:
+        """Run the pipeline on a pool thread."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="analysis-thread"
+            )
+            logger.info(f"Starting analysis threads: {self._max_workers}")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.engine._run_pipeline, file_path, source)
+
+    def shutdown(self) -> None:
+        """Wait for running files and stop the threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class ParseTimeoutError(TimeoutError):
+    """Raised when the pipeline of a file exceeds the per-file deadline.
+
+    Attributes:
+        file_path: Path of the file that timed out
+        timeout_seconds: Deadline that was exceeded
+    """
+
+    def __init__(self, file_path: str, timeout_seconds: float):
+        super().__init__(f"Analysis exceeded parse timeout of {timeout_seconds}s")
+        self.file_path = file_path
+        self.timeout_seconds = timeout_seconds
+
+
+class WorkerCrashedError(RuntimeError):
+    """Raised when a worker process dies while analyzing a file."""
+
+
+# Per-process engine used by worker processes. Each worker builds its own
+# ASTParserManager, SymbolExtractor and PatternDetector on startup.
+_worker_engine = None
+# Run id of the last file the worker analyzed (see ProcessPoolBackend.start_run)
+_worker_run_id = None
+
+# Message sent by a worker once its engine is initialized
+_WORKER_READY = "ready"
+
+
+def _init_worker(config: AnalysisConfig) -> None:
+    """Initialize the analysis engine of a worker process."""
+    global _worker_engine
+
+    from .engine import AnalysisEngine
+
+    _worker_engine = AnalysisEngine(None, dataclasses.replace(config, executor_backend="inline"))
+    logger.debug(f"Analysis worker {os.getpid()} initialized")
+
+
+def _run_in_worker(file_path: str, source: Optional[bytes], run_id: int) -> Dict[str, Any]:
+    """Run the pipeline in a worker process and return a compact payload."""
+    global _worker_run_id
+
+    if run_id != _worker_run_id:
+        # First file of a new run: detector budgets start over
+        _worker_run_id = run_id
+        if _worker_engine.components.is_built('pattern_detector'):
+            _worker_engine.pattern_detector.budget.start_run()
+    return _worker_engine._run_pipeline(file_path, source).to_payload()
+
+
+def _worker_main(config: AnalysisConfig, conn: Connection) -> None:
+    """Serve (file_path, source, run_id) requests from the supervisor until closed."""
+    _init_worker(config)
+    conn.send(_WORKER_READY)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        file_path, source, run_id = request
+        try:
+            conn.send(_run_in_worker(file_path, source, run_id))
+        except Exception as e:
+            conn.send({'error': f"{type(e).__name__}: {e}"})
+
+
+class _SupervisedWorker:
+    """A worker process with a dedicated pipe, so it can be killed on its own."""
+
+    # Generous deadline for a new worker to import and build its engine
+    START_TIMEOUT_SECONDS = 120
+
+    def __init__(self, context: Any, config: AnalysisConfig):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(config, child_conn),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def call(
+        self,
+        file_path: str,
+        source: Optional[bytes],
+        run_id: int,
+        timeout: Optional[float]
+    ) -> Dict[str, Any]:
+        """
+        Send a file to the worker and wait for its payload (blocking).
+
+        The deadline only starts once the worker is ready, so start-up time
+        is never charged to a file.
+
+        Raises:
+            ParseTimeoutError: If the worker does not answer within timeout
+            WorkerCrashedError: If the worker dies
+        """
+        try:
+            if not self.ready:
+                if not self.conn.poll(self.START_TIMEOUT_SECONDS):
+                    raise WorkerCrashedError(f"Worker {self.process.pid} did not start")
+                self.conn.recv()
+                self.ready = True
+            self.conn.send((file_path, source, run_id))
+            answered = self.conn.poll(timeout)
+            payload = self.conn.recv() if answered else None
+        except (EOFError, OSError) as e:
+            raise WorkerCrashedError(
+                f"Worker {self.process.pid} exited (code {self.process.exitcode}): {e}"
+            ) from e
+        if not answered:
+            raise ParseTimeoutError(file_path, timeout)
+        if 'error' in payload:
+            raise RuntimeError(payload['error'])
+        return payload
+
+    def kill(self) -> None:
+        """Kill the worker immediately."""
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def close(self) -> None:
+        """Ask the worker to exit, killing it if it does not."""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ProcessPoolBackend(AnalysisBackend):
+    """
+    Runs the pipeline in supervised worker processes.
+
+    File paths and the content buffers read by the engine are sent to the
+    workers (so files are not read a second time) and FileAnalysis payloads
+    come back as plain dictionaries, so analysis scales with the number of cores
+    instead of being limited by the GIL.
+
+    Each worker has its own pipe and a hard per-file deadline
+    (config.parse_timeout_seconds). A worker that exceeds it, or dies, is
+    killed and replaced right away, so a pathological file costs one slot for
+    at most the deadline and the rest of the run continues at full
+    throughput.
+
+    Example:
+        >>> backend = ProcessPoolBackend(config)
+        >>> try:
+        ...     result = await backend.run("src/main.py")
+        ... except ParseTimeoutError:
+        ...     print("File took too long")
+        >>> backend.shutdown()
+    """
+
+    name = "process"
+
+    def __init__(
+        self,
+        config: AnalysisConfig,
+        max_workers: Optional[int] = None,
+        timeout_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the process backend.
+
+        Workers are started lazily on first use so that constructing an
+        AnalysisEngine stays cheap.
+
+        Args:
+            config: Analysis configuration passed to each worker
+            max_workers: Number of worker processes (defaults to
+                         min(config.max_parallel_files, CPU count))
+            timeout_seconds: Per-file deadline (defaults to
+                             config.parse_timeout_seconds; 0 disables it)
+        """
+        self.config = config
+        self._max_workers = max_workers or max(
+            1, min(config.max_parallel_files, os.cpu_count() or 1)
+        )
+        if timeout_seconds is None:
+            timeout_seconds = config.parse_timeout_seconds
+        self.timeout_seconds = timeout_seconds or None
+        # spawn avoids inheriting event loop, SQLite and thread state
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: List[_SupervisedWorker] = []
+        self._busy: Set[_SupervisedWorker] = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiters: Optional[ThreadPoolExecutor] = None
+        self.timeouts = 0
+        self.restarts = 0
+        # Sent with every file; workers reset per-run state when it changes
+        self._run_id = 0
+
+    @property
+    def max_workers(self) -> int:
+        """Number of worker processes."""
+        return self._max_workers
+
+    def start_run(self) -> None:
+        """Start a codebase run: workers reset their detector budgets on their next file."""
+        self._run_id += 1
+
+    def _start_worker(self) -> _SupervisedWorker:
+        """Start a new worker process."""
+        worker = _SupervisedWorker(self._context, self.config)
+        logger.debug(f"Started analysis worker {worker.process.pid}")
+        return worker
+
+    def _replace_worker(self, worker: _SupervisedWorker, reason: str) -> None:
+        """Kill a worker and start its replacement."""
+        logger.warning(f"Killing analysis worker {worker.process.pid}: {reason}")
+        worker.kill()
+        self.restarts += 1
+        self._idle.append(self._start_worker())
+
+    async def run(self, file_path: str, source: Optional[bytes] = None) -> PipelineResult:
+        """
+        Run the pipeline in a worker process.
+
+        Raises:
+            ParseTimeoutError: If the file exceeds the per-file deadline
+            WorkerCrashedError: If the worker dies while analyzing the file
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_workers)
+            self._waiters = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="analysis-worker"
+            )
+            logger.info(
+                f"Starting analysis workers: {self._max_workers} processes, "
+                f"timeout: {self.timeout_seconds}s"
+            )
+
+        async with self._slots:
+            worker = self._idle.pop() if self._idle else self._start_worker()
+            self._busy.add(worker)
+            loop = asyncio.get_running_loop()
+            try:
+                payload = await loop.run_in_executor(
+                    self._waiters, worker.call, file_path, source, self._run_id, self.timeout_seconds
+                )
+            except ParseTimeoutError:
+                self.timeouts += 1
+                self._replace_worker(worker, f"{file_path} exceeded {self.timeout_seconds}s")
+                raise
+            except WorkerCrashedError as e:
+                self._replace_worker(worker, str(e))
+                raise
+            except asyncio.CancelledError:
+                # The worker is still busy with the file; drop it
+                self._replace_worker(worker, f"analysis of {file_path} was cancelled")
+                raise
+            else:
+                self._idle.append(worker)
+            finally:
+                self._busy.discard(worker)
+
+        return PipelineResult.from_payload(payload)
+
+    def shutdown(self) -> None:
+        """Shut down the worker processes."""
+        workers = self._idle + list(self._busy)
+        for worker in self._idle:
+            worker.close()
+        for worker in self._busy:
+            worker.kill()
+        self._idle = []
+        self._busy = set()
+        if self._waiters is not None:
+            self._waiters.shutdown(wait=True)
+            self._waiters = None
+        self._slots = None
+        if workers:
+            logger.info(
+                f"Analysis workers shut down "
+                f"({self.timeouts} timeouts, {self.restarts} restarts)"
+            )
+
+
+BACKENDS = {
+    InlineBackend.name: InlineBackend,
+    ThreadPoolBackend.name: ThreadPoolBackend,
+    ProcessPoolBackend.name: ProcessPoolBackend,
+}
+
+
+def create_backend(engine: Any, config: AnalysisConfig) -> AnalysisBackend:
+    """
+    Create the analysis backend selected by config.executor_backend.
+
+    Args:
+        engine: AnalysisEngine that owns the backend
+        config: Analysis configuration
+
+    Returns:
+        AnalysisBackend instance
+
+    Raises:
+        ValueError: If the configured backend is unknown
+    """
+    backend_name = config.executor_backend
+    if backend_name == InlineBackend.name:
+        return InlineBackend(engine)
+    if backend_name == ThreadPoolBackend.name:
+        return ThreadPoolBackend(engine)
+    if backend_name == ProcessPoolBackend.name:
+        return ProcessPoolBackend(config)
+    raise ValueError(
+        f"Unknown executor backend: {backend_name} "
+        f"(expected one of: {', '.join(BACKENDS)})"
+    )
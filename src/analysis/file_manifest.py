@@ -0,0 +1,204 @@
+"""
+Stat-based file manifest for incremental analysis.
+
+This module records the (size, mtime_ns, inode) stat tuple and content hash
+of every analyzed file, much like the git index. On the next run a file is
+only read and hashed again when its stat tuple has changed, so re-analyzing
+an unchanged codebase costs little more than one directory scan.
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Coarsest mtime granularity we guard against (FAT stores 2-second mtimes).
+# Entries whose mtime falls within this window of the scan start are "racy":
+# the file may have changed again within the same timestamp tick after it
+# was hashed, so the stat tuple alone cannot prove it is unchanged.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass
+class ManifestEntry:
+    """Stat tuple and content hash recorded for one file.
+
+    Attributes:
+        size: File size in bytes
+        mtime_ns: Modification time in nanoseconds
+        inode: Inode number (0 on platforms without inodes)
+        content_hash: SHA-256 hash of the file content
+    """
+    size: int
+    mtime_ns: int
+    inode: int
+    content_hash: str
+
+    @classmethod
+    def from_stat(cls, st: os.stat_result, content_hash: str) -> 'ManifestEntry':
+        """Create an entry from an os.stat_result."""
+        return cls(
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            inode=st.st_ino,
+            content_hash=content_hash
+        )
+
+    def matches(self, st: os.stat_result) -> bool:
+        """Check whether a stat result has the same stat tuple as this entry."""
+        return (
+            self.size == st.st_size
+            and self.mtime_ns == st.st_mtime_ns
+            and self.inode == st.st_ino
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'size': self.size,
+            'mtime_ns': self.mtime_ns,
+            'inode': self.inode,
+            'content_hash': self.content_hash
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ManifestEntry':
+        """Create from dictionary."""
+        return cls(
+            size=data['size'],
+            mtime_ns=data['mtime_ns'],
+            inode=data.get('inode', 0),
+            content_hash=data['content_hash']
+        )
+
+
+@dataclass
+class FileManifest:
+    """
+    Per-codebase manifest of file stat tuples and content hashes.
+
+    Attributes:
+        scan_started_ns: Wall-clock time (ns) at which the recording scan began
+        entries: Mapping of file path to ManifestEntry
+
+    Example:
+        >>> manifest = FileManifest(scan_started_ns=time.time_ns())
+        >>> manifest.record("src/main.py", os.stat("src/main.py"), file_hash)
+        >>> previous.lookup("src/main.py", os.stat("src/main.py"))
+        'a3f5...'
+    """
+    scan_started_ns: int = 0
+    entries: Dict[str, ManifestEntry] = field(default_factory=dict)
+
+    def record(self, file_path: str, st: os.stat_result, content_hash: str) -> None:
+        """
+        Record the stat tuple and content hash of a file.
+
+        Args:
+            file_path: Path to file
+            st: Stat result captured before the file was read
+            content_hash: SHA-256 hash of the content that was read
+        """
+        self.entries[file_path] = ManifestEntry.from_stat(st, content_hash)
+
+    def is_racy(self, entry: ManifestEntry) -> bool:
+        """
+        Check whether an entry was recorded too close to its file's mtime.
+
+        Args:
+            entry: Manifest entry to check
+
+        Returns:
+            True if the file could have changed without changing its stat tuple
+        """
+        return entry.mtime_ns >= self.scan_started_ns - RACY_WINDOW_NS
+
+    def lookup(self, file_path: str, st: os.stat_result, trust: bool = False) -> Optional[str]:
+        """
+        Return the recorded content hash if the file is provably unchanged.
+
+        Args:
+            file_path: Path to file
+            st: Current stat result of the file
+            trust: If True, trust the stat tuple even for racy entries
+
+        Returns:
+            Recorded SHA-256 hash, or None if the file must be re-hashed
+        """
+        entry = self.entries.get(file_path)
+        if entry is None or not entry.matches(st):
+            return None
+        if not trust and self.is_racy(entry):
+            logger.debug(f"Racy manifest entry, re-hashing: {file_path}")
+            return None
+        return entry.content_hash
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'scan_started_ns': self.scan_started_ns,
+            'entries': {path: entry.to_dict() for path, entry in self.entries.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FileManifest':
+        """Create from dictionary."""
+        return cls(
+            scan_started_ns=data.get('scan_started_ns', 0),
+            entries={
+                path: ManifestEntry.from_dict(entry)
+                for path, entry in data.get('entries', {}).items()
+            }
+        )
+
+
+def scan_files(
+    root_path: str,
+    ignore_dirs: Iterable[str],
+    include: Callable[[str], bool]
+) -> List[Tuple[str, os.stat_result]]:
+    """
+    Walk a directory with os.scandir and collect file stats in the same pass.
+
+    Directory entries already carry the information needed to descend, and
+    the stat result collected here is reused by the manifest, so each file
+    costs a single stat call.
+
+    Args:
+        root_path: Directory to walk
+        ignore_dirs: Directory names to skip
+        include: Predicate selecting which file paths to return
+
+    Returns:
+        List of (file_path, stat_result) tuples
+    """
+    ignored = set(ignore_dirs)
+    results = []
+    pending = [root_path]
+
+    while pending:
+        dir_path = pending.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError as e:
+            logger.warning(f"Cannot scan directory {dir_path}: {e}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in ignored:
+                        subdirs.append(entry.path)
+                elif entry.is_file() and include(entry.path):
+                    results.append((entry.path, entry.stat()))
+            except OSError as e:
+                logger.warning(f"Cannot stat {entry.path}: {e}")
+
+        # Visit subdirectories in directory order, like os.walk
+        pending.extend(reversed(subdirs))
+
+    return results
@@ -0,0 +1,107 @@
+"""
+Git index based change detection for incremental analysis.
+
+In a git checkout the index already stores the blob SHA of every tracked
+file. This module reads those SHAs in bulk (`git ls-files -s`) and drops the
+files whose working tree content differs from the index (`git diff
+--name-only`), so clean tracked files get a content key without being read
+or hashed. Other files are hashed in the same blob format, so a file keeps
+its key when it is committed unchanged.
+"""
+
+import hashlib
+import logging
+import os
+import subprocess
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Index modes of regular files (symlinks and submodules are not analyzed)
+REGULAR_FILE_MODES = {"100644", "100755"}
+
+
+def git_blob_sha(content: bytes) -> str:
+    """
+    Compute the git blob SHA-1 of file content.
+
+    Args:
+        content: File content
+
+    Returns:
+        Hex digest identical to `git hash-object` for the same content
+
+    Example:
+        >>> git_blob_sha(b"hello\\n")
+        'ce013625030ba8dba906f756967f9e9ca394464a'
+    """
+    header = f"blob {len(content)}\0".encode()
+    return hashlib.sha1(header + content).hexdigest()
+
+
+def _run_git(root_path: str, args: List[str], timeout: float) -> Optional[str]:
+    """Run a git command in root_path and return its output, or None on failure."""
+    completed = subprocess.run(
+        ["git", *args],
+        cwd=root_path,
+        capture_output=True,
+        timeout=timeout
+    )
+    if completed.returncode != 0:
+        logger.debug(
+            f"git {' '.join(args)} failed in {root_path}: "
+            f"{os.fsdecode(completed.stderr).strip()}"
+        )
+        return None
+    return os.fsdecode(completed.stdout)
+
+
+def read_git_index(root_path: str, timeout: float = 30) -> Optional[Dict[str, str]]:
+    """
+    Get the blob SHAs of clean tracked files under a directory.
+
+    Runs two bulk git commands regardless of the number of files. Files
+    that are untracked, modified in the working tree, unmerged, symlinks or
+    submodules are not included and must be hashed by the caller.
+
+    Args:
+        root_path: Directory inside a git working tree
+        timeout: Timeout for each git command in seconds
+
+    Returns:
+        Dictionary mapping file paths (joined onto root_path) to blob SHAs,
+        or None if root_path is not in a git repository or git is unavailable
+
+    Example:
+        >>> shas = read_git_index("/path/to/repo")
+        >>> shas["/path/to/repo/src/main.py"]
+        '3b18e512dba79e4c8300dd08aeb37f8e728b8dad'
+    """
+    try:
+        staged = _run_git(root_path, ["ls-files", "--stage", "-z"], timeout)
+        if staged is None:
+            return None
+        dirty = _run_git(root_path, ["diff", "--name-only", "--relative", "-z"], timeout)
+        if dirty is None:
+            return None
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Git index unavailable for {root_path}: {e}")
+        return None
+
+    dirty_paths = set(path for path in dirty.split('\0') if path)
+    shas = {}
+    for record in staged.split('\0'):
+        if not record:
+            continue
+        # "<mode> <sha> <stage>\t<path>", paths relative to root_path
+        meta, _, relative_path = record.partition('\t')
+        mode, sha, stage = meta.split(' ')
+        if stage != '0' or mode not in REGULAR_FILE_MODES or relative_path in dirty_paths:
+            continue
+        shas[os.path.join(root_path, *relative_path.split('/'))] = sha
+
+    logger.debug(
+        f"Read {len(shas)} clean blob SHAs from git index "
+        f"({len(dirty_paths)} modified files) for {root_path}"
+    )
+    return shas
@@ -0,0 +1,448 @@
+"""
+Incremental re-parsing of edited files.
+
+When a file is analyzed again after a small edit (watch mode, repeated
+`analyze_file` calls), parsing it from scratch and extracting every symbol
+again repeats work for the unchanged bulk of the file. This module keeps
+the last syntax tree of each recently analyzed file:
+
+- `compute_edit` finds the single byte range that differs between the old
+  and the new content, which is turned into a `Tree.edit()` call so that
+  tree-sitter reuses the unchanged subtrees when reparsing.
+- `Tree.changed_ranges()` reports where the syntactic structure changed.
+  `IncrementalReuse` hands back the previous symbols of functions and
+  classes outside those ranges whose source text is unchanged, shifting
+  their line numbers, and the previous single-pass visit results of
+  unchanged top-level statements, so only the edited code is analyzed again.
+"""
+
+import dataclasses
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .ast_parser import ASTParserManager, ParseResult
+
+logger = logging.getLogger(__name__)
+
+# Previous siblings of a top-level definition included in its context, by
+# language: as many as SymbolExtractor searches for doc comments, so that
+# edits to those comments invalidate the definition's symbols
+CONTEXT_SIBLINGS = {
+    'javascript': 3,
+    'typescript': 3,
+    'tsx': 3,
+    'java': 3,
+    'go': 5,
+    'rust': 3,
+}
+
+
+@dataclass(frozen=True)
+class SourceEdit:
+    """
+    Byte range replaced between two versions of a source buffer.
+
+    Points are (row, column) pairs as used by tree-sitter, with the column
+    counted in bytes.
+
+    Attributes:
+        start_byte: First differing byte
+        old_end_byte: End of the replaced range in the old content
+        new_end_byte: End of the replacement in the new content
+        start_point: Point of start_byte
+        old_end_point: Point of old_end_byte in the old content
+        new_end_point: Point of new_end_byte in the new content
+    """
+    start_byte: int
+    old_end_byte: int
+    new_end_byte: int
+    start_point: Tuple[int, int]
+    old_end_point: Tuple[int, int]
+    new_end_point: Tuple[int, int]
+
+    def apply(self, tree: Any) -> None:
+        """
+        Adjust a tree of the old content to the edit (`Tree.edit()`).
+
+        Args:
+            tree: tree-sitter Tree parsed from the old content
+        """
+        tree.edit(**dataclasses.asdict(self))
+
+
+def _common_prefix_length(old: bytes, new: bytes) -> int:
+    """Length of the common prefix, found by bisecting with C-level comparisons."""
+    low, high = 0, min(len(old), len(new))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[low:middle] == new[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix_length(old: bytes, new: bytes, limit: int) -> int:
+    """Length of the common suffix, at most limit bytes."""
+    low, high = 0, limit
+    old_end, new_end = len(old), len(new)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[old_end - middle:old_end - low] == new[new_end - middle:new_end - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _point(source: bytes, offset: int) -> Tuple[int, int]:
+    """(row, byte column) of a byte offset."""
+    row = source.count(b'\n', 0, offset)
+    return row, offset - (source.rfind(b'\n', 0, offset) + 1)
+
+
+def compute_edit(old: bytes, new: bytes) -> Optional[SourceEdit]:
+    """
+    Describe the change from old to new content as a single edit.
+
+    Everything between the common prefix and the common suffix of the two
+    buffers is treated as replaced, so several scattered changes become one
+    edit spanning all of them.
+
+    Args:
+        old: Previous content
+        new: Current content
+
+    Returns:
+        SourceEdit, or None if the contents are identical
+
+    Example:
+        >>> edit = compute_edit(b"x = 1\\n", b"x = 10\\n")
+        >>> edit.start_byte, edit.old_end_byte, edit.new_end_byte
+        (5, 5, 6)
+    """
+    if old == new:
+        return None
+    prefix = _common_prefix_length(old, new)
+    suffix = _common_suffix_length(old, new, min(len(old), len(new)) - prefix)
+    old_end = len(old) - suffix
+    new_end = len(new) - suffix
+    return SourceEdit(
+        start_byte=prefix,
+        old_end_byte=old_end,
+        new_end_byte=new_end,
+        start_point=_point(new, prefix),
+        old_end_point=_point(old, old_end),
+        new_end_point=_point(new, new_end)
+    )
+
+
+@dataclass
+class ParsedFile:
+    """
+    Last parsed version of a file, kept for incremental re-parsing.
+
+    Attributes:
+        source: Content the tree was parsed from
+        tree: tree-sitter Tree of the content
+        language: Parser language name
+        symbols: Extracted symbols by context key (see IncrementalReuse)
+        statements: Visit results of top-level statements by context key
+    """
+    source: bytes
+    tree: Any
+    language: str
+    symbols: Dict[Tuple, Tuple[Any, int, List[Any]]] = field(default_factory=dict)
+    statements: Dict[Tuple, Tuple[Dict[Tuple[int, int, str], Any], List[Any], int]] = field(default_factory=dict)
+
+
+class ParseTreeCache:
+    """
+    Bounded LRU cache of the last parsed version of recently analyzed files.
+
+    Entries are taken out of the cache while a file is analyzed, because
+    editing a tree for the new content invalidates it for anyone else, and
+    put back with the new tree afterwards.
+
+    Example:
+        >>> previous = cache.take(file_path)
+        >>> parse_result, changed = parse_incremental(parser, source, 'python', file_path, previous)
+        >>> reuse = IncrementalReuse(source, 'python', previous, changed)
+        >>> cache.put(file_path, reuse.parsed_file(parse_result))
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Number of files whose trees are kept
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ParsedFile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, file_path: str) -> Optional[ParsedFile]:
+        """
+        Remove and return the entry of a file.
+
+        Args:
+            file_path: Path of the file
+
+        Returns:
+            ParsedFile, or None if the file is not cached
+        """
+        with self._lock:
+            return self._entries.pop(file_path, None)
+
+    def put(self, file_path: str, entry: ParsedFile) -> None:
+        """
+        Store the entry of a file, evicting the least recently stored files.
+
+        Args:
+            file_path: Path of the file
+            entry: Parsed version to keep
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[file_path] = entry
+            self._entries.move_to_end(file_path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, file_path: str) -> None:
+        """Forget a file (e.g. after it was deleted)."""
+        with self._lock:
+            self._entries.pop(file_path, None)
+
+    def clear(self) -> None:
+        """Forget all files."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def parse_incremental(
+    parser: ASTParserManager,
+    source: bytes,
+    language: str,
+    file_path: str,
+    previous: Optional[ParsedFile] = None
+) -> Tuple[ParseResult, Optional[List[Any]]]:
+    """
+    Parse a file, reusing the tree of its previous version when available.
+
+    Args:
+        parser: AST parser manager
+        source: Current content
+        language: Parser language name
+        file_path: Path of the file
+        previous: Previous version taken from a ParseTreeCache; its tree is
+                  edited in place and must not be used afterwards
+
+    Returns:
+        (ParseResult, changed ranges) where the changed ranges are the
+        tree-sitter Ranges whose syntactic structure differs from the
+        previous tree, or None after a full parse
+    """
+    if previous is None or previous.language != language:
+        return parser.parse_bytes(source, language, file_path), None
+
+    edit = compute_edit(previous.source, source)
+    if edit is not None:
+        edit.apply(previous.tree)
+    parse_result = parser.parse_bytes(source, language, file_path, old_tree=previous.tree)
+    changed_ranges = list(previous.tree.changed_ranges(parse_result.tree))
+    logger.debug(
+        f"Reparsed {file_path} incrementally: {len(changed_ranges)} changed range(s)"
+    )
+    return parse_result, changed_ranges
+
+
+class IncrementalReuse:
+    """
+    Reuses the analysis of code unaffected by an edit.
+
+    Results are keyed by the source text they were computed from, and only
+    reused when that text is unchanged and does not overlap a range whose
+    syntactic structure changed:
+
+    - Captured definitions (symbol extraction) are keyed by their position
+      within their top-level statement and the text of that statement plus,
+      for languages with doc comments, the preceding siblings searched for
+      them (CONTEXT_SIBLINGS).
+      Reused symbols are shallow copies with shifted line numbers, and the
+      function metrics they were built from are added to the FileVisit's
+      `extracted` list as if they had been looked up.
+    - Top-level statements (FusedASTVisitor) are keyed by the full lines
+      they span. Their function metrics and comments are merged into the
+      new FileVisit without walking the statement again.
+
+    Example:
+        >>> reuse = IncrementalReuse(source, 'python', previous, changed_ranges)
+        >>> visit = visit_file(parse_result, source, reuse=reuse)
+        >>> symbols = extractor.extract_symbols(parse_result, visit=visit, reuse=reuse)
+        >>> cache.put(path, reuse.parsed_file(parse_result))
+    """
+
+    def __init__(
+        self,
+        source: bytes,
+        language: str,
+        previous: Optional[ParsedFile] = None,
+        changed_ranges: Optional[List[Any]] = None
+    ):
+        """
+        Initialize reuse for one analysis of a file.
+
+        Args:
+            source: Content the tree was parsed from
+            language: Parser language name
+            previous: Previous version of the file (None to reuse nothing,
+                      e.g. after a full parse)
+            changed_ranges: Ranges whose structure changed since the
+                            previous version
+        """
+        self.source = source
+        self.context_siblings = CONTEXT_SIBLINGS.get(language, 0)
+        self.previous_symbols = previous.symbols if previous is not None else {}
+        self.previous_statements = previous.statements if previous is not None else {}
+        self.changed_ranges = [(r.start_byte, r.end_byte) for r in changed_ranges or []]
+        self.symbols: Dict[Tuple, Tuple[Any, int, List[Any]]] = {}
+        self.statements: Dict[Tuple, Tuple[Dict[Tuple[int, int, str], Any], List[Any], int]] = {}
+        self.stats = {
+            'symbols_reused': 0, 'symbols_extracted': 0,
+            'statements_reused': 0, 'statements_visited': 0
+        }
+        self._contexts: Dict[Tuple[int, int], Tuple[bytes, bool]] = {}
+
+    def _context(self, start: int, end: int) -> Tuple[bytes, bool]:
+        """Text of a byte range and whether it overlaps a changed range."""
+        context = self._contexts.get((start, end))
+        if context is None:
+            changed = any(
+                range_start < end and start < range_end
+                for range_start, range_end in self.changed_ranges
+            )
+            context = (self.source[start:end], changed)
+            self._contexts[(start, end)] = context
+        return context
+
+    def extract(self, capture: str, node: Any, extractor: Callable[[Any], Any], visit: Any) -> Any:
+        """
+        Get the symbol of a captured node, reusing the previous one if possible.
+
+        Args:
+            capture: Capture name of the node
+            node: Captured definition node
+            extractor: Extracts the symbol from the node
+            visit: FileVisit of the tree, whose `extracted` list receives the
+                   metrics of the function symbols
+
+        Returns:
+            Symbol (FunctionInfo or ClassInfo), or None if extraction failed
+        """
+        top = node
+        parent = top.parent
+        while parent is not None and parent.parent is not None:
+            top = parent
+            parent = top.parent
+        start = top.start_byte
+        sibling = top.prev_sibling
+        for _ in range(self.context_siblings):
+            if sibling is None:
+                break
+            start = sibling.start_byte
+            sibling = sibling.prev_sibling
+        text, changed = self._context(start, top.end_byte)
+        key = (capture, node.type, node.start_byte - start, node.end_byte - start, text)
+        row = node.start_point[0]
+
+        entry = None if changed else self.previous_symbols.get(key)
+        if entry is not None:
+            symbol, previous_row, metrics = entry
+            symbol = _shift_lines(symbol, row - previous_row)
+            visit.extracted.extend(metrics)
+            self.stats['symbols_reused'] += 1
+        else:
+            extracted_before = len(visit.extracted)
+            symbol = extractor(node)
+            metrics = visit.extracted[extracted_before:]
+            self.stats['symbols_extracted'] += 1
+
+        if symbol is not None:
+            self.symbols[key] = (symbol, row, metrics)
+        return symbol
+
+    def visit_statement(self, node: Any, result: Any, visit_subtree: Callable[[Any, Any], None]) -> None:
+        """
+        Add the visit results of a top-level statement to a FileVisit.
+
+        Args:
+            node: Top-level statement node
+            result: FileVisit being built
+            visit_subtree: Walks a node into an empty FileVisit
+        """
+        source = self.source
+        start = source.rfind(b'\n', 0, node.start_byte) + 1
+        end = source.find(b'\n', node.end_byte)
+        if end < 0:
+            end = len(source)
+        text, changed = self._context(start, end)
+        key = (node.type, node.start_byte - start, node.end_byte - start, text)
+
+        entry = None if changed else self.previous_statements.get(key)
+        if entry is not None:
+            self.stats['statements_reused'] += 1
+        else:
+            part = type(result)()
+            visit_subtree(node, part)
+            entry = (
+                {
+                    (function_start - start, function_end - start, function_type): metrics
+                    for (function_start, function_end, function_type), metrics in part.functions.items()
+                },
+                part.comments,
+                part.max_nesting_depth
+            )
+            self.stats['statements_visited'] += 1
+        self.statements[key] = entry
+
+        functions, comments, max_nesting_depth = entry
+        for (function_start, function_end, function_type), metrics in functions.items():
+            result.functions[(function_start + start, function_end + start, function_type)] = metrics
+        result.comments.extend(comments)
+        if max_nesting_depth > result.max_nesting_depth:
+            result.max_nesting_depth = max_nesting_depth
+
+    def parsed_file(self, parse_result: ParseResult) -> ParsedFile:
+        """
+        Build the cache entry for the analyzed version of the file.
+
+        Args:
+            parse_result: ParseResult of the analyzed content
+
+        Returns:
+            ParsedFile holding the tree and everything recorded for reuse
+        """
+        return ParsedFile(
+            self.source, parse_result.tree, parse_result.language,
+            self.symbols, self.statements
+        )
+
+
+def _shift_lines(symbol: Any, delta: int) -> Any:
+    """Copy of a FunctionInfo or ClassInfo (and its methods) moved by delta lines."""
+    changes = {
+        'start_line': symbol.start_line + delta,
+        'end_line': symbol.end_line + delta
+    }
+    if hasattr(symbol, 'methods'):
+        changes['methods'] = [_shift_lines(method, delta) for method in symbol.methods]
+    return dataclasses.replace(symbol, **changes)
@@ -6,15 +6,25 @@ like decorators, generators, async/await, comprehensions, etc.
 """
 
 import logging
+import re
 from typing import List, Optional, Dict, Any
 from tree_sitter import Language, Query
 
 from .pattern_detector import BasePatternDetector, DetectedPattern
+from .signal_scanner import SignalMatches
 from .symbol_extractor import SymbolInfo
 
 logger = logging.getLogger(__name__)
 
 
+def _code_lines(signals: SignalMatches, name: str, comment_prefix: str) -> List[int]:
+    """Lines on which a signal occurs, skipping lines that are comments."""
+    return [
+        i for i in signals.lines(name)
+        if not signals.line(i).lstrip().startswith(comment_prefix)
+    ]
+
+
 class PythonPatternDetector(BasePatternDetector):
     """
     Detects Python-specific patterns using tree-sitter queries.
@@ -28,11 +38,26 @@ class PythonPatternDetector(BasePatternDetector):
     - Lambda functions
     """
     
+    LANGUAGES = frozenset({'python'})
+    EXTENSIONS = frozenset({'.py'})
+    
+    SIGNALS = {
+        # A line starting with 'with ' and containing a colon
+        'with_statement': re.compile(r'^[^\S\n]*with [^\n]*:', re.MULTILINE),
+        'with_open': re.compile(r'with open\(', re.IGNORECASE),
+        'with_lock': re.compile(r'with lock|with threading', re.IGNORECASE),
+        'yield': 'yield',
+        'for': 'for',
+        'await': 'await ',
+        'for_clause': ' for ',
+    }
+    
     def detect(
         self,
         symbol_info: SymbolInfo,
         file_content: str,
-        file_path: str
+        file_path: str,
+        signals: Optional[SignalMatches] = None
     ) -> List[DetectedPattern]:
         """Detect Python-specific patterns."""
         patterns = []
@@ -41,28 +66,31 @@ class PythonPatternDetector(BasePatternDetector):
         if not file_path.endswith('.py'):
             return patterns
         
+        if signals is None:
+            signals = self.scan_signals(file_content)
+        
         # Detect decorators
         decorator_pattern = self._detect_decorators(symbol_info, file_content, file_path)
         if decorator_pattern:
             patterns.append(decorator_pattern)
         
         # Detect context managers
-        context_pattern = self._detect_context_managers(file_content, file_path)
+        context_pattern = self._detect_context_managers(signals, file_path)
         if context_pattern:
             patterns.append(context_pattern)
         
         # Detect generators
-        generator_pattern = self._detect_generators(symbol_info, file_content, file_path)
+        generator_pattern = self._detect_generators(symbol_info, signals, file_path)
         if generator_pattern:
             patterns.append(generator_pattern)
         
         # Detect async/await
-        async_pattern = self._detect_async_patterns(symbol_info, file_content, file_path)
+        async_pattern = self._detect_async_patterns(symbol_info, signals, file_path)
         if async_pattern:
             patterns.append(async_pattern)
         
         # Detect comprehensions
-        comprehension_pattern = self._detect_comprehensions(file_content, file_path)
+        comprehension_pattern = self._detect_comprehensions(signals, file_path)
         if comprehension_pattern:
             patterns.append(comprehension_pattern)
         
@@ -130,7 +158,7 @@ class PythonPatternDetector(BasePatternDetector):
     
     def _detect_context_managers(
         self,
-        file_content: str,
+        signals: SignalMatches,
         file_path: str
     ) -> Optional[DetectedPattern]:
         """Detect context manager usage (with statements)."""
@@ -138,13 +166,10 @@ class PythonPatternDetector(BasePatternDetector):
         line_numbers = []
         with_count = 0
         
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            if stripped.startswith('with ') and ':' in stripped:
-                with_count += 1
-                if len(line_numbers) < 10:
-                    line_numbers.append(i)
+        for i in signals.lines('with_statement'):
+            with_count += 1
+            if len(line_numbers) < 10:
+                line_numbers.append(i)
         
         if with_count == 0:
             return None
@@ -152,10 +177,9 @@ class PythonPatternDetector(BasePatternDetector):
         evidence.append(f"Uses context managers ({with_count} with statements)")
         
         # Check for common patterns
-        content_lower = file_content.lower()
-        if 'with open(' in content_lower:
+        if 'with_open' in signals:
             evidence.append("File handling with context managers")
-        if 'with lock' in content_lower or 'with threading' in content_lower:
+        if 'with_lock' in signals:
             evidence.append("Thread synchronization with context managers")
         
         confidence = min(1.0, with_count * 0.2)
@@ -174,7 +198,7 @@ class PythonPatternDetector(BasePatternDetector):
     def _detect_generators(
         self,
         symbol_info: SymbolInfo,
-        file_content: str,
+        signals: SignalMatches,
         file_path: str
     ) -> Optional[DetectedPattern]:
         """Detect generator functions (yield statements)."""
@@ -183,12 +207,10 @@ class PythonPatternDetector(BasePatternDetector):
         generator_count = 0
         
         # Check for yield in file content
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            if 'yield' in line and not line.strip().startswith('#'):
-                generator_count += 1
-                if len(line_numbers) < 10:
-                    line_numbers.append(i)
+        for i in _code_lines(signals, 'yield', '#'):
+            generator_count += 1
+            if len(line_numbers) < 10:
+                line_numbers.append(i)
         
         if generator_count == 0:
             return None
@@ -196,10 +218,11 @@ class PythonPatternDetector(BasePatternDetector):
         evidence.append(f"Uses generators ({generator_count} yield statements)")
         
         # Check for generator expressions
-        if '(' in file_content and 'for' in file_content and 'in' in file_content:
-            if any(line.count('(') > 0 and 'for' in line and 'in' in line 
-                   for line in lines if not line.strip().startswith('#')):
-                evidence.append("Uses generator expressions")
+        if any(
+            '(' in signals.line(i) and 'in' in signals.line(i)
+            for i in _code_lines(signals, 'for', '#')
+        ):
+            evidence.append("Uses generator expressions")
         
         confidence = min(1.0, generator_count * 0.25)
         
@@ -217,7 +240,7 @@ class PythonPatternDetector(BasePatternDetector):
     def _detect_async_patterns(
         self,
         symbol_info: SymbolInfo,
-        file_content: str,
+        signals: SignalMatches,
         file_path: str
     ) -> Optional[DetectedPattern]:
         """Detect async/await patterns."""
@@ -241,10 +264,7 @@ class PythonPatternDetector(BasePatternDetector):
                         line_numbers.append(method.start_line)
         
         # Count await statements
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            if 'await ' in line and not line.strip().startswith('#'):
-                await_count += 1
+        await_count = len(_code_lines(signals, 'await', '#'))
         
         if async_func_count == 0 and await_count == 0:
             return None
@@ -276,7 +296,7 @@ class PythonPatternDetector(BasePatternDetector):
     
     def _detect_comprehensions(
         self,
-        file_content: str,
+        signals: SignalMatches,
         file_path: str
     ) -> Optional[DetectedPattern]:
         """Detect list/dict/set comprehensions."""
@@ -284,14 +304,11 @@ class PythonPatternDetector(BasePatternDetector):
         line_numbers = []
         comprehension_count = 0
         
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            if stripped.startswith('#'):
-                continue
+        for i in _code_lines(signals, 'for_clause', '#'):
+            line = signals.line(i)
             
             # Simple heuristic: look for [... for ... in ...] or {... for ... in ...}
-            if ' for ' in line and ' in ' in line:
+            if ' in ' in line:
                 if ('[' in line and ']' in line) or ('{' in line and '}' in line):
                     comprehension_count += 1
                     if len(line_numbers) < 10:
@@ -329,11 +346,26 @@ class JavaScriptPatternDetector(BasePatternDetector):
     - ES6 classes
     """
     
+    LANGUAGES = frozenset({'javascript', 'typescript', 'tsx'})
+    EXTENSIONS = frozenset({'.js', '.jsx', '.ts', '.tsx'})
+    
+    SIGNALS = {
+        '.then(': '.then(',
+        '.catch(': '.catch(',
+        'new Promise(': 'new Promise(',
+        'Promise.all(': 'Promise.all(',
+        'await': 'await ',
+        '=>': '=>',
+        'destructuring': re.compile(r'(?:const|let|var) [{\[]'),
+        '...': '...',
+    }
+    
     def detect(
         self,
         symbol_info: SymbolInfo,
         file_content: str,
-        file_path: str
+        file_path: str,
+        signals: Optional[SignalMatches] = None
     ) -> List[DetectedPattern]:
         """Detect JavaScript-specific patterns."""
         patterns = []
@@ -343,28 +375,31 @@ class JavaScriptPatternDetector(BasePatternDetector):
                 file_path.endswith('.jsx') or file_path.endswith('.tsx')):
             return patterns
         
+        if signals is None:
+            signals = self.scan_signals(file_content)
+        
         # Detect promises
-        promise_pattern = self._detect_promises(file_content, file_path)
+        promise_pattern = self._detect_promises(signals, file_path)
         if promise_pattern:
             patterns.append(promise_pattern)
         
         # Detect async/await
-        async_pattern = self._detect_async_await(symbol_info, file_content, file_path)
+        async_pattern = self._detect_async_await(symbol_info, signals, file_path)
         if async_pattern:
             patterns.append(async_pattern)
         
         # Detect arrow functions
-        arrow_pattern = self._detect_arrow_functions(file_content, file_path)
+        arrow_pattern = self._detect_arrow_functions(signals, file_path)
         if arrow_pattern:
             patterns.append(arrow_pattern)
         
         # Detect destructuring
-        destructuring_pattern = self._detect_destructuring(file_content, file_path)
+        destructuring_pattern = self._detect_destructuring(signals, file_path)
         if destructuring_pattern:
             patterns.append(destructuring_pattern)
         
         # Detect spread operators
-        spread_pattern = self._detect_spread_operators(file_content, file_path)
+        spread_pattern = self._detect_spread_operators(signals, file_path)
         if spread_pattern:
             patterns.append(spread_pattern)
         
@@ -372,7 +407,7 @@ class JavaScriptPatternDetector(BasePatternDetector):
     
     def _detect_promises(
         self,
-        file_content: str,
+        signals: SignalMatches,
         file_path: str
     ) -> Optional[DetectedPattern]:
         """Detect Promise usage."""
@@ -380,23 +415,21 @@ class JavaScriptPatternDetector(BasePatternDetector):
         line_numbers = []
         promise_count = 0
         
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            if '.then(' in line or '.catch(' in line or 'new Promise(' in line:
-                promise_count += 1
-                if len(line_numbers) < 10:
-                    line_numbers.append(i)
+        for i in signals.lines('.then(', '.catch(', 'new Promise('):
+            promise_count += 1
+            if len(line_numbers) < 10:
+                line_numbers.append(i)
         
         if promise_count == 0:
             return None
         
         evidence.append(f"Uses Promises ({promise_count} occurrences)")
         
-        if '.then(' in file_content:
+        if '.then(' in signals:
             evidence.append("Promise chaining with .then()")
-        if '.catch(' in file_content:
+        if '.catch(' in signals:
             evidence.append("Error handling with .catch()")
-        if 'Promise.all(' in file_content:
+        if 'Promise.all(' in signals:
             evidence.append("Parallel promises with Promise.all()")
         
         confidence = min(1.0, promise_count * 0.2)
@@ -415,7 +448,7 @@ class JavaScriptPatternDetector(BasePatternDetector):
     def _detect_async_await(
         self,
         symbol_info: SymbolInfo,
-        file_content: str,
+        signals: SignalMatches,
         file_path: str
     ) -> Optional[DetectedPattern]:
         """Detect async/await patterns."""
@@ -432,10 +465,7 @@ class JavaScriptPatternDetector(BasePatternDetector):
                     line_numbers.append(func.start_line)
         
         # Count await statements
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            if 'await ' in line:
-                await_count += 1
+        await_count = len(signals.lines('await'))
         
         if async_func_count == 0 and await_count == 0:
             return None
@@ -461,7 +491,7 @@ class JavaScriptPatternDetector(BasePatternDetector):
     
     def _detect_arrow_functions(
         self,
-        file_content: str,
+        signals: SignalMatches,
         file_path: str
     ) -> Optional[DetectedPattern]:
         """Detect arrow function usage."""
@@ -469,12 +499,10 @@ class JavaScriptPatternDetector(BasePatternDetector):
         line_numbers = []
         arrow_count = 0
         
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            if '=>' in line and not line.strip().startswith('//'):
-                arrow_count += 1
-                if len(line_numbers) < 10:
-                    line_numbers.append(i)
+        for i in _code_lines(signals, '=>', '//'):
+            arrow_count += 1
+            if len(line_numbers) < 10:
+                line_numbers.append(i)
         
         if arrow_count == 0:
             return None
@@ -496,7 +524,7 @@ class JavaScriptPatternDetector(BasePatternDetector):
     
     def _detect_destructuring(
         self,
-        file_content: str,
+        signals: SignalMatches,
         file_path: str
     ) -> Optional[DetectedPattern]:
         """Detect destructuring patterns."""
@@ -504,18 +532,11 @@ class JavaScriptPatternDetector(BasePatternDetector):
         line_numbers = []
         destructuring_count = 0
         
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            if stripped.startswith('//'):
-                continue
-            
-            # Look for { ... } = or [ ... ] =
-            if (('const {' in line or 'let {' in line or 'var {' in line) or
-                ('const [' in line or 'let [' in line or 'var [' in line)):
-                destructuring_count += 1
-                if len(line_numbers) < 10:
-                    line_numbers.append(i)
+        # Look for { ... } = or [ ... ] =
+        for i in _code_lines(signals, 'destructuring', '//'):
+            destructuring_count += 1
+            if len(line_numbers) < 10:
+                line_numbers.append(i)
         
         if destructuring_count == 0:
             return None
@@ -537,7 +558,7 @@ class JavaScriptPatternDetector(BasePatternDetector):
     
     def _detect_spread_operators(
         self,
-        file_content: str,
+        signals: SignalMatches,
         file_path: str
     ) -> Optional[DetectedPattern]:
         """Detect spread operator usage."""
@@ -545,12 +566,10 @@ class JavaScriptPatternDetector(BasePatternDetector):
         line_numbers = []
         spread_count = 0
         
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            if '...' in line and not line.strip().startswith('//'):
-                spread_count += 1
-                if len(line_numbers) < 10:
-                    line_numbers.append(i)
+        for i in _code_lines(signals, '...', '//'):
+            spread_count += 1
+            if len(line_numbers) < 10:
+                line_numbers.append(i)
         
         if spread_count == 0:
             return None
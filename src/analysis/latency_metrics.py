@@ -0,0 +1,157 @@
+"""
+Bounded latency histograms for analysis performance metrics.
+
+This module provides fixed-size, log-bucketed histograms that summarize any
+number of timing samples with p50/p95/p99 percentiles in constant memory,
+and a recorder that groups them by category (pipeline stage, language,
+pattern detector) and key.
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram with constant memory.
+
+    Buckets grow geometrically by 2^(1/8) (about 9%), covering 1µs up to
+    several hours, so percentiles are accurate to within about 5% no
+    matter how many samples are recorded.
+
+    Example:
+        >>> histogram = LatencyHistogram()
+        >>> for ms in [1.0, 2.0, 3.0, 250.0]:
+        ...     histogram.record(ms)
+        >>> histogram.percentile(50)  # ~2.0
+    """
+
+    MIN_MS = 0.001
+    BUCKETS_PER_DOUBLING = 8
+    NUM_BUCKETS = 288
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts: List[int] = [0] * self.NUM_BUCKETS
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+
+    def _bucket_index(self, elapsed_ms: float) -> int:
+        """Get the bucket index of a sample."""
+        if elapsed_ms <= self.MIN_MS:
+            return 0
+        index = int(math.log2(elapsed_ms / self.MIN_MS) * self.BUCKETS_PER_DOUBLING) + 1
+        return min(index, self.NUM_BUCKETS - 1)
+
+    def _bucket_value(self, index: int) -> float:
+        """Get the representative (geometric midpoint) value of a bucket."""
+        if index == 0:
+            return self.MIN_MS
+        return self.MIN_MS * 2 ** ((index - 0.5) / self.BUCKETS_PER_DOUBLING)
+
+    def record(self, elapsed_ms: float) -> None:
+        """
+        Record a timing sample.
+
+        Args:
+            elapsed_ms: Duration in milliseconds
+        """
+        self.counts[self._bucket_index(elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.min_ms = min(self.min_ms, elapsed_ms)
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, p: float) -> float:
+        """
+        Estimate a percentile of the recorded samples.
+
+        Args:
+            p: Percentile between 0 and 100
+
+        Returns:
+            Estimated duration in milliseconds (0.0 if empty)
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = max(1, math.ceil(p / 100 * self.count))
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return min(max(self._bucket_value(index), self.min_ms), self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the histogram for JSON serialization."""
+        if self.count == 0:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 3),
+            'min_ms': round(self.min_ms, 3),
+            'max_ms': round(self.max_ms, 3),
+            'p50_ms': round(self.percentile(50), 3),
+            'p95_ms': round(self.percentile(95), 3),
+            'p99_ms': round(self.percentile(99), 3)
+        }
+
+
+class LatencyRecorder:
+    """
+    Collection of latency histograms grouped by category and key.
+
+    Categories used by the analysis engine:
+        - stage: pipeline stage (parse, symbols, patterns, ...)
+        - language: total pipeline time per language
+        - detector: time spent in each pattern detector
+
+    Example:
+        >>> recorder = LatencyRecorder()
+        >>> recorder.record("stage", "parse", 12.5)
+        >>> recorder.to_dict()["stage"]["parse"]["p50_ms"]
+    """
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self.histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    def record(self, category: str, key: str, elapsed_ms: float) -> None:
+        """
+        Record a timing sample.
+
+        Args:
+            category: Histogram category (e.g. 'stage')
+            key: Histogram key within the category (e.g. 'parse')
+            elapsed_ms: Duration in milliseconds
+        """
+        by_key = self.histograms.setdefault(category, {})
+        histogram = by_key.get(key)
+        if histogram is None:
+            histogram = by_key[key] = LatencyHistogram()
+        histogram.record(elapsed_ms)
+
+    def record_all(self, category: str, timings: Dict[str, float]) -> None:
+        """
+        Record a timing sample for every key of a mapping.
+
+        Args:
+            category: Histogram category
+            timings: Mapping of key to duration in milliseconds
+        """
+        for key, elapsed_ms in timings.items():
+            self.record(category, key, elapsed_ms)
+
+    def get(self, category: str, key: str) -> Optional[LatencyHistogram]:
+        """Get a histogram, or None if nothing was recorded for it."""
+        return self.histograms.get(category, {}).get(key)
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Summarize all histograms for JSON serialization."""
+        return {
+            category: {key: histogram.to_dict() for key, histogram in sorted(by_key.items())}
+            for category, by_key in self.histograms.items()
+        }
@@ -11,10 +11,11 @@ from pathlib import Path
 from typing import List, Optional, Dict, Any
 import logging
 
-try:
-    import nbformat
-except ImportError:
-    nbformat = None
+from .registry import lazy_import
+
+# Imported on first use: nbformat pulls in jsonschema, which dominates the
+# import time of the analysis package
+nbformat = lazy_import("nbformat")
 
 logger = logging.getLogger(__name__)
 
@@ -97,12 +98,40 @@ class NotebookAnalyzer:
         if not notebook_path_obj.exists():
             raise FileNotFoundError(f"Notebook not found: {notebook_path}")
         
+        try:
+            with open(notebook_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception as e:
+            logger.error(f"Failed to read notebook {notebook_path}: {e}")
+            raise
+        
+        return self.extract_code_from_content(content, notebook_path)
+    
+    def extract_code_from_content(self, content: str, notebook_path: str) -> NotebookCode:
+        """Extract code cells from notebook JSON that has already been read.
+        
+        Args:
+            content: Notebook JSON text
+            notebook_path: Path the notebook was read from
+            
+        Returns:
+            NotebookCode containing extracted cells and concatenated code
+            
+        Raises:
+            ValueError: If nbformat is not installed
+            json.JSONDecodeError: If notebook content is invalid JSON
+        """
+        if not self.nbformat_available:
+            raise ValueError(
+                "nbformat is required for notebook analysis. "
+                "Install with: pip install nbformat>=5.9.0"
+            )
+        
         logger.info(f"Extracting code from notebook: {notebook_path}")
         
-        # Read and parse notebook
+        # Parse notebook
         try:
-            with open(notebook_path, 'r', encoding='utf-8') as f:
-                nb = nbformat.read(f, as_version=4)
+            nb = nbformat.reads(content, as_version=4)
         except json.JSONDecodeError as e:
             logger.error(f"Invalid notebook JSON: {notebook_path}")
             raise
@@ -0,0 +1,208 @@
+"""
+Incremental codebase-wide pattern aggregation.
+
+Global patterns, `total_patterns_detected` and `top_teaching_files` used to
+be recomputed from every pattern of every file on every codebase run. A
+`PatternAggregate` keeps, per file, what it contributed (pattern counts by
+type and teaching score), and derived indexes over all files:
+
+- pattern counts by type, and the set of files containing each type,
+- the total number of patterns,
+- the files ranked by teaching score.
+
+`sync()` applies a run's changes by delta: a changed file's old
+contribution is subtracted and the new one added, so the cost of an
+incremental run is proportional to the files that changed. The per-file
+contributions are persisted with the analysis (see PersistenceManager), and
+the indexes are rebuilt from them when loaded.
+"""
+
+import bisect
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+
+@dataclass
+class FileContribution:
+    """What one file contributes to the aggregate.
+
+    Attributes:
+        content_hash: Content hash of the analyzed file (None when unknown,
+            e.g. for error analyses; such files are re-aggregated every sync)
+        pattern_counts: Number of patterns of each type in the file
+        teaching_score: Teaching value score of the file
+        counted: False for metadata-only analyses (generated files), whose
+            patterns are left out of the pattern total
+    """
+    content_hash: Optional[str] = None
+    pattern_counts: Dict[str, int] = field(default_factory=dict)
+    teaching_score: float = 0.0
+    counted: bool = True
+
+    @classmethod
+    def from_analysis(cls, analysis: Any) -> 'FileContribution':
+        """Create the contribution of a FileAnalysis."""
+        pattern_counts: Dict[str, int] = {}
+        for pattern in getattr(analysis, 'patterns', None) or []:
+            pattern_counts[pattern.pattern_type] = pattern_counts.get(pattern.pattern_type, 0) + 1
+        teaching_value = getattr(analysis, 'teaching_value', None)
+        return cls(
+            content_hash=getattr(analysis, 'content_hash', None),
+            pattern_counts=pattern_counts,
+            teaching_score=teaching_value.total_score if teaching_value is not None else 0.0,
+            counted=not getattr(analysis, 'skip_reason', None)
+        )
+
+    @property
+    def total_patterns(self) -> int:
+        """Patterns in the file counted towards the pattern total."""
+        return sum(self.pattern_counts.values()) if self.counted else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'content_hash': self.content_hash,
+            'pattern_counts': self.pattern_counts,
+            'teaching_score': self.teaching_score,
+            'counted': self.counted
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FileContribution':
+        """Create from dictionary."""
+        return cls(
+            content_hash=data.get('content_hash'),
+            pattern_counts=data.get('pattern_counts', {}),
+            teaching_score=data.get('teaching_score', 0.0),
+            counted=data.get('counted', True)
+        )
+
+
+class PatternAggregate:
+    """
+    Codebase-wide pattern counts, pattern file sets and teaching ranking,
+    updated by delta.
+
+    Example:
+        >>> aggregate = PatternAggregate()
+        >>> aggregate.sync(file_analyses)
+        >>> aggregate.sync(file_analyses, changed={"src/app.py"})
+        >>> aggregate.pattern_counts['react_component']
+        12
+        >>> aggregate.top_teaching_files(20)
+        [('src/app.py', 0.91), ...]
+    """
+
+    def __init__(self, contributions: Optional[Mapping[str, FileContribution]] = None):
+        """
+        Initialize the aggregate.
+
+        Args:
+            contributions: Per-file contributions to start from (e.g. loaded
+                           from disk)
+        """
+        self.contributions: Dict[str, FileContribution] = {}
+        self.pattern_counts: Dict[str, int] = {}
+        self.pattern_files: Dict[str, Set[str]] = {}
+        self.total_patterns = 0
+        # (-teaching_score, file_path), best first
+        self._ranking: List[Tuple[float, str]] = []
+        for file_path, contribution in (contributions or {}).items():
+            self._add(file_path, contribution)
+
+    def sync(self, file_analyses: Mapping[str, Any], changed: Optional[Iterable[str]] = None) -> int:
+        """
+        Bring the aggregate up to date with a run's file analyses.
+
+        Files listed in `changed`, files not yet in the aggregate and files
+        whose content hash differs from their contribution are
+        re-aggregated; files no longer in `file_analyses` are removed.
+        Other files are not looked at beyond their content hash.
+
+        Args:
+            file_analyses: Dictionary mapping file paths to FileAnalysis objects
+            changed: Paths re-analyzed in this run
+
+        Returns:
+            Number of files added, updated or removed
+        """
+        updates = 0
+        for file_path in [fp for fp in self.contributions if fp not in file_analyses]:
+            self._remove(file_path)
+            updates += 1
+
+        changed = set(changed or ())
+        for file_path, analysis in file_analyses.items():
+            contribution = self.contributions.get(file_path)
+            if (
+                contribution is not None
+                and file_path not in changed
+                and contribution.content_hash is not None
+                and contribution.content_hash == getattr(analysis, 'content_hash', None)
+            ):
+                continue
+            if contribution is not None:
+                self._remove(file_path)
+            self._add(file_path, FileContribution.from_analysis(analysis))
+            updates += 1
+        return updates
+
+    def files_with(self, pattern_type: str) -> Set[str]:
+        """Files containing at least one pattern of a type."""
+        return set(self.pattern_files.get(pattern_type, ()))
+
+    def top_teaching_files(self, limit: int = 20) -> List[Tuple[str, float]]:
+        """
+        Files with the highest teaching value.
+
+        Args:
+            limit: Maximum number of files
+
+        Returns:
+            (file_path, score) tuples, best first (ties by path)
+        """
+        return [(file_path, -score) for score, file_path in self._ranking[:limit]]
+
+    def _add(self, file_path: str, contribution: FileContribution) -> None:
+        """Add a file's contribution to the indexes."""
+        self.contributions[file_path] = contribution
+        for pattern_type, count in contribution.pattern_counts.items():
+            self.pattern_counts[pattern_type] = self.pattern_counts.get(pattern_type, 0) + count
+            self.pattern_files.setdefault(pattern_type, set()).add(file_path)
+        self.total_patterns += contribution.total_patterns
+        bisect.insort(self._ranking, (-contribution.teaching_score, file_path))
+
+    def _remove(self, file_path: str) -> None:
+        """Subtract a file's contribution from the indexes."""
+        contribution = self.contributions.pop(file_path)
+        for pattern_type, count in contribution.pattern_counts.items():
+            remaining = self.pattern_counts[pattern_type] - count
+            files = self.pattern_files[pattern_type]
+            files.discard(file_path)
+            if remaining > 0:
+                self.pattern_counts[pattern_type] = remaining
+            else:
+                del self.pattern_counts[pattern_type]
+                del self.pattern_files[pattern_type]
+        self.total_patterns -= contribution.total_patterns
+        entry = (-contribution.teaching_score, file_path)
+        index = bisect.bisect_left(self._ranking, entry)
+        if index < len(self._ranking) and self._ranking[index] == entry:
+            del self._ranking[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization (contributions only)."""
+        return {
+            'files': {
+                file_path: contribution.to_dict()
+                for file_path, contribution in self.contributions.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PatternAggregate':
+        """Create from dictionary, rebuilding the indexes."""
+        return cls({
+            file_path: FileContribution.from_dict(contribution)
+            for file_path, contribution in data.get('files', {}).items()
+        })
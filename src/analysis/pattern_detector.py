@@ -6,10 +6,16 @@ API routes, database models, authentication patterns, and more.
 """
 
 import logging
+import os
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, FrozenSet, Mapping, Optional, Tuple, Union
 from dataclasses import dataclass, field
 
+from .detector_budget import DetectorBudget
+from .pattern_aggregate import PatternAggregate
+from .signal_scanner import Signal, SignalMatches, SignalScan, SignalScanner
+from .source_document import SourceDocument
 from .symbol_extractor import SymbolInfo
 
 logger = logging.getLogger(__name__)
@@ -52,8 +58,51 @@ class BasePatternDetector(ABC):
     All pattern detectors must inherit from this class and implement
     the detect() method. This enables a plugin architecture where
     custom pattern detectors can be easily added.
+    
+    Detectors declare which files they apply to so that PatternDetector
+    only invokes them where they can match: LANGUAGES and EXTENSIONS select
+    files by parser language and file extension (None means any), and
+    is_applicable() is a cheap precondition such as a required import.
+    
+    Detectors that search the file text declare what they look for in
+    SIGNALS instead of scanning it themselves. PatternDetector finds the
+    signals of all detectors in one scan (see signal_scanner) and passes
+    each detector its matches as the `signals` argument of detect().
+    
+    Detectors that query the syntax tree set USES_TREE and receive the
+    file's root node and parser language as the `tree` and `language`
+    arguments of detect() (see pattern_rules).
     """
     
+    # Parser languages this detector applies to (None: any language)
+    LANGUAGES: Optional[FrozenSet[str]] = None
+    
+    # Lowercase file extensions this detector applies to (None: any extension)
+    EXTENSIONS: Optional[FrozenSet[str]] = None
+    
+    # Text signals searched for by detect(): {name: literal or compiled regex}
+    SIGNALS: Mapping[str, Signal] = {}
+    
+    # Whether detect() takes the file's syntax tree (tree= and language=)
+    USES_TREE: bool = False
+    
+    def is_applicable(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> bool:
+        """
+        Check cheap preconditions before detect() runs.
+        
+        Called only for files that match LANGUAGES and EXTENSIONS. Returning
+        False must mean that detect() would find nothing.
+        
+        Args:
+            symbol_info: Extracted symbols from the file
+            file_content: Raw file content as string
+            file_path: Path to the file being analyzed
+        
+        Returns:
+            True if detect() should run for this file
+        """
+        return True
+    
     @abstractmethod
     def detect(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> List[DetectedPattern]:
         """
@@ -64,6 +113,9 @@ class BasePatternDetector(ABC):
             file_content: Raw file content as string
             file_path: Path to the file being analyzed
         
+        Detectors declaring SIGNALS also accept a `signals` keyword argument
+        with their SignalMatches, and scan for themselves when it is omitted.
+        
         Returns:
             List of detected patterns with confidence scores
         
@@ -75,6 +127,25 @@ class BasePatternDetector(ABC):
         """
         pass
     
+    def scan_signals(self, file_content: Union[str, SourceDocument]) -> SignalMatches:
+        """
+        Find this detector's SIGNALS in a file on its own.
+        
+        Used when detect() is called without precomputed signals.
+        
+        Args:
+            file_content: Raw file content as string, or its SourceDocument
+        
+        Returns:
+            SignalMatches of the detector's signals
+        """
+        cls = type(self)
+        scanner = cls.__dict__.get('_signal_scanner')
+        if scanner is None:
+            scanner = SignalScanner([self.SIGNALS])
+            cls._signal_scanner = scanner
+        return scanner.scan(file_content).matches(self.SIGNALS)
+    
     def _calculate_confidence(self, evidence_count: int, max_evidence: int = 5) -> float:
         """
         Calculate confidence score based on evidence count.
@@ -98,12 +169,18 @@ class PatternDetector:
     Uses a plugin architecture to support custom pattern detectors.
     """
     
-    def __init__(self, detectors: Optional[List[BasePatternDetector]] = None):
+    def __init__(
+        self,
+        detectors: Optional[List[BasePatternDetector]] = None,
+        budget: Optional[DetectorBudget] = None
+    ):
         """
         Initialize the Pattern Detector with a list of detectors.
         
         Args:
             detectors: List of pattern detector instances. If None, uses default detectors.
+            budget: Time budgets and cost accounting for the detectors. If
+                    None, detector costs are recorded but never limited.
         """
         if detectors is None:
             # Default detectors will be added in subsequent tasks
@@ -111,6 +188,17 @@ class PatternDetector:
         else:
             self.detectors = detectors
         
+        # Detectors that apply to each (language, extension), built on demand
+        self._dispatch: Dict[Tuple[Optional[str], str], List[BasePatternDetector]] = {}
+        
+        # Scanner for the signals of each dispatch entry's detectors
+        self._scanners: Dict[Tuple[Optional[str], str], SignalScanner] = {}
+        
+        # Detector invocations and skips since creation (see get_dispatch_stats)
+        self.dispatch_stats = self._new_dispatch_stats()
+        
+        self.budget = budget if budget is not None else DetectorBudget()
+        
         logger.debug(f"PatternDetector initialized with {len(self.detectors)} detectors")
     
     def register_detector(self, detector: BasePatternDetector):
@@ -125,38 +213,187 @@ class PatternDetector:
             >>> pattern_detector.register_detector(CustomPatternDetector())
         """
         self.detectors.append(detector)
+        self._dispatch.clear()
+        self._scanners.clear()
         logger.debug(f"Registered detector: {detector.__class__.__name__}")
     
-    def detect_patterns_in_file(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> List[DetectedPattern]:
+    @staticmethod
+    def _new_dispatch_stats() -> Dict[str, int]:
+        """Create zeroed dispatch counters."""
+        return {'invoked': 0, 'skipped_language': 0, 'skipped_precondition': 0}
+    
+    def get_detectors_for(self, file_path: str, language: Optional[str] = None) -> List[BasePatternDetector]:
         """
-        Detect all patterns in a single file using all registered detectors.
+        Get the detectors that apply to a file's language and extension.
+        
+        The list is computed once per (language, extension) and cached.
         
         Args:
-            symbol_info: Extracted symbols from the file
-            file_content: Raw file content as string
             file_path: Path to the file being analyzed
+            language: Parser language of the file; when None, only
+                      extensions are used to select detectors
+        
+        Returns:
+            Detectors in registration order
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        key = (language, extension)
+        detectors = self._dispatch.get(key)
+        if detectors is None:
+            detectors = [
+                detector for detector in self.detectors
+                if (language is None or detector.LANGUAGES is None or language in detector.LANGUAGES)
+                and (detector.EXTENSIONS is None or extension in detector.EXTENSIONS)
+            ]
+            self._dispatch[key] = detectors
+            self._scanners[key] = SignalScanner(detector.SIGNALS for detector in detectors)
+            logger.debug(
+                f"Dispatch table for {language or 'any language'} ({extension or 'no extension'}): "
+                f"{[d.__class__.__name__ for d in detectors]}"
+            )
+        return detectors
+    
+    def get_dispatch_stats(self) -> Dict[str, int]:
+        """
+        Get detector invocation counters.
         
         Returns:
-            List of all detected patterns from all detectors
+            Dictionary with 'invoked', 'skipped_language' (detector not
+            registered for the file's language or extension) and
+            'skipped_precondition' (is_applicable() returned False)
+        """
+        return dict(self.dispatch_stats)
+    
+    def detect_patterns_in_file(
+        self,
+        symbol_info: SymbolInfo,
+        file_content: Union[str, SourceDocument],
+        file_path: str,
+        timings: Optional[Dict[str, float]] = None,
+        language: Optional[str] = None,
+        counts: Optional[Dict[str, int]] = None,
+        tree: Optional[Any] = None,
+        yields: Optional[Dict[str, int]] = None,
+        budget_skips: Optional[Dict[str, int]] = None
+    ) -> List[DetectedPattern]:
         """
-        all_patterns = []
+        Detect all patterns in a single file using the applicable detectors.
+        
+        Only detectors registered for the file's language and extension are
+        considered (see get_detectors_for), and each of them only runs when
+        its is_applicable() precondition holds. The text signals of all
+        these detectors are found in a single scan of the file, done when
+        the first detector declaring SIGNALS runs.
+        
+        Line lookups on the signals use the file's SourceDocument, so its
+        line index is built at most once per file, whichever detectors use it.
+        
+        Detectors run in the order chosen by the budget (cheap, productive
+        detectors first) and are skipped when the budget has demoted them or
+        the file budget is spent. Patterns are still returned in
+        registration order.
+        
+        Args:
+            symbol_info: Extracted symbols from the file
+            file_content: Raw file content as string, or the file's
+                          SourceDocument (detectors receive its text)
+            file_path: Path to the file being analyzed
+            timings: Optional dictionary that receives the milliseconds spent
+                     in each detector, keyed by detector class name, and in
+                     the shared signal scan ('SignalScanner')
+            language: Parser language of the file (e.g. 'python')
+            counts: Optional dictionary that receives this file's 'invoked',
+                    'skipped_language' and 'skipped_precondition' counts
+            tree: Root node of the file's syntax tree, passed to detectors
+                  that set USES_TREE
+            yields: Optional dictionary that receives the number of patterns
+                    found by each detector that ran
+            budget_skips: Optional dictionary that receives the detectors
+                          skipped by the budget
         
-        for detector in self.detectors:
+        Returns:
+            List of all detected patterns from the applicable detectors
+        """
+        found: Dict[int, List[DetectedPattern]] = {}
+        if isinstance(file_content, SourceDocument):
+            document = file_content
+        else:
+            document = SourceDocument.from_text(file_content)
+        file_content = document.text
+        detectors = self.get_detectors_for(file_path, language)
+        scanner = self._scanners.get((language, os.path.splitext(file_path)[1].lower()))
+        scan: Optional[SignalScan] = None
+        file_counts = self._new_dispatch_stats()
+        file_counts['skipped_language'] = len(self.detectors) - len(detectors)
+        budget = self.budget
+        positions = {id(detector): index for index, detector in enumerate(detectors)}
+        spent_ms = 0.0
+        
+        for detector in budget.order(detectors):
+            name = detector.__class__.__name__
+            start = time.perf_counter()
+            ran = False
+            patterns = []
             try:
-                patterns = detector.detect(symbol_info, file_content, file_path)
-                all_patterns.extend(patterns)
+                if not detector.is_applicable(symbol_info, file_content, file_path):
+                    file_counts['skipped_precondition'] += 1
+                    continue
+                if not budget.should_run(name, spent_ms):
+                    if budget_skips is not None:
+                        budget_skips[name] = budget_skips.get(name, 0) + 1
+                    continue
+                file_counts['invoked'] += 1
+                ran = True
+                if detector.SIGNALS and scanner is not None:
+                    if scan is None:
+                        scan = scanner.scan(document)
+                        # The shared scan is timed on its own, not as part of this detector
+                        if timings is not None:
+                            scanned = time.perf_counter()
+                            timings['SignalScanner'] = timings.get('SignalScanner', 0.0) + (scanned - start) * 1000
+                            start = scanned
+                    patterns = detector.detect(
+                        symbol_info, file_content, file_path,
+                        signals=scan.matches(detector.SIGNALS)
+                    )
+                elif detector.USES_TREE:
+                    patterns = detector.detect(
+                        symbol_info, file_content, file_path,
+                        tree=tree, language=language
+                    )
+                else:
+                    patterns = detector.detect(symbol_info, file_content, file_path)
+                found[positions[id(detector)]] = patterns
                 logger.debug(
-                    f"{detector.__class__.__name__} found {len(patterns)} patterns in {file_path}"
+                    f"{name} found {len(patterns)} patterns in {file_path}"
                 )
             except Exception as e:
                 logger.error(
                     f"Error in {detector.__class__.__name__} for {file_path}: {e}",
                     exc_info=True
                 )
-        
-        return all_patterns
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                if timings is not None:
+                    timings[name] = timings.get(name, 0.0) + elapsed_ms
+                if ran:
+                    spent_ms += elapsed_ms
+                    budget.record(name, elapsed_ms, len(patterns), file_path)
+                    if yields is not None:
+                        yields[name] = yields.get(name, 0) + len(patterns)
+        
+        for key, value in file_counts.items():
+            self.dispatch_stats[key] += value
+            if counts is not None:
+                counts[key] = counts.get(key, 0) + value
+        
+        return [pattern for index in sorted(found) for pattern in found[index]]
     
-    def detect_global_patterns(self, file_analyses: Dict[str, Any]) -> List[DetectedPattern]:
+    def detect_global_patterns(
+        self,
+        file_analyses: Dict[str, Any],
+        aggregate: Optional[PatternAggregate] = None
+    ) -> List[DetectedPattern]:
         """
         Detect patterns across the entire codebase.
         
@@ -165,24 +402,20 @@ class PatternDetector:
         
         Args:
             file_analyses: Dictionary mapping file paths to FileAnalysis objects
+            aggregate: PatternAggregate already synced with file_analyses;
+                       when None, one is built from all file analyses
         
         Returns:
-            List of global patterns detected across the codebase
+            List of global patterns detected across the codebase, most
+            frequent first
         """
-        # Aggregate all patterns from individual files
-        all_patterns = []
-        pattern_counts = {}
-        
-        for file_path, analysis in file_analyses.items():
-            if hasattr(analysis, 'patterns'):
-                for pattern in analysis.patterns:
-                    all_patterns.append(pattern)
-                    pattern_type = pattern.pattern_type
-                    pattern_counts[pattern_type] = pattern_counts.get(pattern_type, 0) + 1
+        if aggregate is None:
+            aggregate = PatternAggregate()
+            aggregate.sync(file_analyses)
         
         # Create global pattern summaries
         global_patterns = []
-        for pattern_type, count in pattern_counts.items():
+        for pattern_type, count in sorted(aggregate.pattern_counts.items(), key=lambda item: (-item[1], item[0])):
             global_patterns.append(DetectedPattern(
                 pattern_type=f"global_{pattern_type}",
                 file_path="<codebase>",
@@ -191,7 +424,8 @@ class PatternDetector:
                 line_numbers=[],
                 metadata={
                     "count": count,
-                    "pattern_type": pattern_type
+                    "pattern_type": pattern_type,
+                    "file_count": len(aggregate.pattern_files[pattern_type])
                 }
             ))
         
@@ -199,7 +433,6 @@ class PatternDetector:
         return global_patterns
 
 
-
 class ReactPatternDetector(BasePatternDetector):
     """
     Detects React component patterns in JavaScript/TypeScript files.
@@ -219,7 +452,27 @@ class ReactPatternDetector(BasePatternDetector):
         'useTransition', 'useId', 'useSyncExternalStore'
     }
     
-    def detect(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> List[DetectedPattern]:
+    LANGUAGES = frozenset({'javascript', 'typescript', 'tsx'})
+    EXTENSIONS = frozenset({'.js', '.jsx', '.ts', '.tsx'})
+    
+    SIGNALS = {
+        **{hook: hook for hook in REACT_HOOKS},
+        'return <': 'return <',
+        'return (': 'return (',
+        'React.createElement': 'React.createElement',
+    }
+    
+    def is_applicable(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> bool:
+        """Only files importing React can contain React patterns."""
+        return self._has_react_import(symbol_info)
+    
+    def detect(
+        self,
+        symbol_info: SymbolInfo,
+        file_content: str,
+        file_path: str,
+        signals: Optional[SignalMatches] = None
+    ) -> List[DetectedPattern]:
         """
         Detect React patterns in the file.
         
@@ -227,6 +480,7 @@ class ReactPatternDetector(BasePatternDetector):
             symbol_info: Extracted symbols from the file
             file_content: Raw file content as string
             file_path: Path to the file being analyzed
+            signals: Matches of SIGNALS in file_content (scanned when omitted)
         
         Returns:
             List of detected React patterns
@@ -238,16 +492,19 @@ class ReactPatternDetector(BasePatternDetector):
         if not has_react_import:
             return patterns
         
+        if signals is None:
+            signals = self.scan_signals(file_content)
+        
         # Detect functional components
         for func in symbol_info.functions:
             component_pattern = self._detect_functional_component(
-                func, file_content, file_path
+                func, signals, file_path
             )
             if component_pattern:
                 patterns.append(component_pattern)
         
         # Detect hooks usage
-        hooks_pattern = self._detect_hooks_usage(symbol_info, file_content, file_path)
+        hooks_pattern = self._detect_hooks_usage(symbol_info, signals, file_path)
         if hooks_pattern:
             patterns.append(hooks_pattern)
         
@@ -266,7 +523,7 @@ class ReactPatternDetector(BasePatternDetector):
     def _detect_functional_component(
         self, 
         func: Any, 
-        file_content: str, 
+        signals: SignalMatches, 
         file_path: str
     ) -> Optional[DetectedPattern]:
         """
@@ -301,11 +558,7 @@ class ReactPatternDetector(BasePatternDetector):
                 metadata["has_props"] = True
         
         # Check 3: Returns JSX (look for JSX syntax in function body)
-        # Extract function body from file content
-        func_lines = self._get_function_lines(file_content, func.start_line, func.end_line)
-        func_body = '\n'.join(func_lines)
-        
-        if self._contains_jsx(func_body):
+        if self._contains_jsx(signals, func.start_line, func.end_line):
             evidence.append("Returns JSX elements")
             metadata["returns_jsx"] = True
         else:
@@ -313,7 +566,7 @@ class ReactPatternDetector(BasePatternDetector):
             return None
         
         # Check 4: Uses React hooks
-        hooks_used = self._find_hooks_in_code(func_body)
+        hooks_used = self._find_hooks(signals, func.start_line, func.end_line)
         if hooks_used:
             evidence.append(f"Uses hooks: {', '.join(hooks_used)}")
             metadata["hooks"] = hooks_used
@@ -333,7 +586,7 @@ class ReactPatternDetector(BasePatternDetector):
     def _detect_hooks_usage(
         self, 
         symbol_info: SymbolInfo, 
-        file_content: str, 
+        signals: SignalMatches, 
         file_path: str
     ) -> Optional[DetectedPattern]:
         """
@@ -341,7 +594,7 @@ class ReactPatternDetector(BasePatternDetector):
         
         Returns a pattern if hooks are used, with details about which hooks.
         """
-        hooks_used = self._find_hooks_in_code(file_content)
+        hooks_used = self._find_hooks(signals)
         
         if not hooks_used:
             return None
@@ -351,13 +604,7 @@ class ReactPatternDetector(BasePatternDetector):
             evidence.append(f"Hook: {hook}")
         
         # Find line numbers where hooks are used
-        line_numbers = []
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            for hook in hooks_used:
-                if hook in line:
-                    line_numbers.append(i)
-                    break
+        line_numbers = signals.lines(*hooks_used)
         
         confidence = min(len(hooks_used) / 3, 1.0)  # 3+ hooks = high confidence
         
@@ -373,44 +620,30 @@ class ReactPatternDetector(BasePatternDetector):
             }
         )
     
-    def _contains_jsx(self, code: str) -> bool:
+    def _contains_jsx(self, signals: SignalMatches, start_line: int, end_line: int) -> bool:
         """
-        Check if code contains JSX syntax.
+        Check if the lines of a function contain JSX syntax.
         
         Looks for:
         - return <Element>
         - return (<Element>
         - React.createElement
         """
-        # Simple heuristic: look for return statements with JSX
-        lines = code.split('\n')
-        for line in lines:
-            line = line.strip()
-            # Check for JSX return
-            if 'return' in line and '<' in line:
-                # Make sure it's not a comparison
-                if 'return <' in line or 'return (' in line:
-                    return True
-            # Check for React.createElement
-            if 'React.createElement' in line:
-                return True
-        return False
+        if signals.in_lines('return <', start_line, end_line):
+            return True
+        if signals.in_lines('React.createElement', start_line, end_line):
+            return True
+        # 'return (' only counts on lines that also open an element
+        return any(
+            start_line <= line_number <= end_line and '<' in signals.line(line_number)
+            for line_number in signals.lines('return (')
+        )
     
-    def _find_hooks_in_code(self, code: str) -> set:
-        """Find all React hooks used in the code."""
-        hooks_found = set()
-        for hook in self.REACT_HOOKS:
-            if hook in code:
-                hooks_found.add(hook)
-        return hooks_found
-    
-    def _get_function_lines(self, file_content: str, start_line: int, end_line: int) -> List[str]:
-        """Extract lines of a function from file content."""
-        lines = file_content.split('\n')
-        # Convert to 0-indexed
-        start_idx = start_line - 1
-        end_idx = end_line
-        return lines[start_idx:end_idx]
+    def _find_hooks(self, signals: SignalMatches, start_line: Optional[int] = None, end_line: Optional[int] = None) -> set:
+        """Find all React hooks used in the file, or between two lines."""
+        if start_line is None:
+            return {hook for hook in self.REACT_HOOKS if hook in signals}
+        return {hook for hook in self.REACT_HOOKS if signals.in_lines(hook, start_line, end_line)}
 
 
 
@@ -433,7 +666,24 @@ class APIPatternDetector(BasePatternDetector):
         '@router.get', '@router.post', '@router.put', '@router.delete', '@router.patch'
     }
     
-    def detect(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> List[DetectedPattern]:
+    # Route definitions (app.METHOD( / router.METHOD() by HTTP method
+    EXPRESS_ROUTE_CALLS = {
+        method: (f'app.{method}(', f'router.{method}(', f'app.{method} (', f'router.{method} (')
+        for method in EXPRESS_METHODS
+    }
+    
+    SIGNALS = {
+        **{call: call for calls in EXPRESS_ROUTE_CALLS.values() for call in calls},
+        'export default': 'export default',
+    }
+    
+    def detect(
+        self,
+        symbol_info: SymbolInfo,
+        file_content: str,
+        file_path: str,
+        signals: Optional[SignalMatches] = None
+    ) -> List[DetectedPattern]:
         """
         Detect API route patterns in the file.
         
@@ -441,14 +691,17 @@ class APIPatternDetector(BasePatternDetector):
             symbol_info: Extracted symbols from the file
             file_content: Raw file content as string
             file_path: Path to the file being analyzed
+            signals: Matches of SIGNALS in file_content (scanned when omitted)
         
         Returns:
             List of detected API patterns
         """
         patterns = []
+        if signals is None:
+            signals = self.scan_signals(file_content)
         
         # Detect Express routes
-        express_pattern = self._detect_express_routes(symbol_info, file_content, file_path)
+        express_pattern = self._detect_express_routes(symbol_info, signals, file_path)
         if express_pattern:
             patterns.append(express_pattern)
         
@@ -458,7 +711,7 @@ class APIPatternDetector(BasePatternDetector):
             patterns.append(fastapi_pattern)
         
         # Detect Next.js API routes
-        nextjs_pattern = self._detect_nextjs_api_routes(symbol_info, file_content, file_path)
+        nextjs_pattern = self._detect_nextjs_api_routes(symbol_info, signals, file_path)
         if nextjs_pattern:
             patterns.append(nextjs_pattern)
         
@@ -467,7 +720,7 @@ class APIPatternDetector(BasePatternDetector):
     def _detect_express_routes(
         self, 
         symbol_info: SymbolInfo, 
-        file_content: str, 
+        signals: SignalMatches, 
         file_path: str
     ) -> Optional[DetectedPattern]:
         """
@@ -495,31 +748,24 @@ class APIPatternDetector(BasePatternDetector):
             return None
         
         # Find route definitions in code
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            line_stripped = line.strip()
+        route_calls = signals.line_signals(
+            call for method in self.EXPRESS_METHODS for call in self.EXPRESS_ROUTE_CALLS[method]
+        )
+        for i, calls in route_calls.items():
+            line_stripped = signals.line(i).strip()
             
             # Check for app.METHOD or router.METHOD patterns
             for method in self.EXPRESS_METHODS:
-                patterns_to_check = [
-                    f'app.{method}(',
-                    f'router.{method}(',
-                    f'app.{method} (',
-                    f'router.{method} ('
-                ]
-                
-                for pattern in patterns_to_check:
-                    if pattern in line_stripped:
-                        # Extract route path if possible
-                        route_path = self._extract_route_path(line_stripped)
-                        routes.append({
-                            "method": method.upper(),
-                            "path": route_path,
-                            "line": i
-                        })
-                        evidence.append(f"Route: {method.upper()} {route_path}")
-                        line_numbers.append(i)
-                        break
+                if any(call in calls for call in self.EXPRESS_ROUTE_CALLS[method]):
+                    # Extract route path if possible
+                    route_path = self._extract_route_path(line_stripped)
+                    routes.append({
+                        "method": method.upper(),
+                        "path": route_path,
+                        "line": i
+                    })
+                    evidence.append(f"Route: {method.upper()} {route_path}")
+                    line_numbers.append(i)
         
         if not routes:
             return None
@@ -611,7 +857,7 @@ class APIPatternDetector(BasePatternDetector):
     def _detect_nextjs_api_routes(
         self, 
         symbol_info: SymbolInfo, 
-        file_content: str, 
+        signals: SignalMatches, 
         file_path: str
     ) -> Optional[DetectedPattern]:
         """
@@ -637,23 +883,22 @@ class APIPatternDetector(BasePatternDetector):
         handler_name = None
         
         # Check for "export default" in file content
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            if 'export default' in line:
-                # Check if it's a function
-                if 'function' in line or '=>' in line:
-                    has_handler = True
-                    line_numbers.append(i)
-                    evidence.append("Exports default handler function")
-                    
-                    # Try to extract handler name
-                    if 'function' in line:
-                        parts = line.split('function')
-                        if len(parts) > 1:
-                            name_part = parts[1].strip().split('(')[0].strip()
-                            if name_part:
-                                handler_name = name_part
-                    break
+        for i in signals.lines('export default'):
+            line = signals.line(i)
+            # Check if it's a function
+            if 'function' in line or '=>' in line:
+                has_handler = True
+                line_numbers.append(i)
+                evidence.append("Exports default handler function")
+                
+                # Try to extract handler name
+                if 'function' in line:
+                    parts = line.split('function')
+                    if len(parts) > 1:
+                        name_part = parts[1].strip().split('(')[0].strip()
+                        if name_part:
+                            handler_name = name_part
+                break
         
         if not has_handler:
             return None
@@ -751,7 +996,22 @@ class DatabasePatternDetector(BasePatternDetector):
         'async up(', 'async down('  # TypeORM migrations
     ]
     
-    def detect(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> List[DetectedPattern]:
+    # ORM field definitions marking a class as a model
+    ORM_FIELD_INDICATORS = ['Column(', 'Field(', 'CharField', 'IntegerField']
+    
+    SIGNALS = {
+        indicator: indicator
+        for indicators in [ORM_FIELD_INDICATORS, MIGRATION_INDICATORS, *QUERY_BUILDER_INDICATORS.values()]
+        for indicator in indicators
+    }
+    
+    def detect(
+        self,
+        symbol_info: SymbolInfo,
+        file_content: str,
+        file_path: str,
+        signals: Optional[SignalMatches] = None
+    ) -> List[DetectedPattern]:
         """
         Detect database patterns in the file.
         
@@ -759,24 +1019,27 @@ class DatabasePatternDetector(BasePatternDetector):
             symbol_info: Extracted symbols from the file
             file_content: Raw file content as string
             file_path: Path to the file being analyzed
+            signals: Matches of SIGNALS in file_content (scanned when omitted)
         
         Returns:
             List of detected database patterns
         """
         patterns = []
+        if signals is None:
+            signals = self.scan_signals(file_content)
         
         # Detect ORM models
-        orm_pattern = self._detect_orm_models(symbol_info, file_content, file_path)
+        orm_pattern = self._detect_orm_models(symbol_info, signals, file_path)
         if orm_pattern:
             patterns.append(orm_pattern)
         
         # Detect query builders
-        query_pattern = self._detect_query_builders(symbol_info, file_content, file_path)
+        query_pattern = self._detect_query_builders(symbol_info, signals, file_path)
         if query_pattern:
             patterns.append(query_pattern)
         
         # Detect migrations
-        migration_pattern = self._detect_migrations(symbol_info, file_content, file_path)
+        migration_pattern = self._detect_migrations(symbol_info, signals, file_path)
         if migration_pattern:
             patterns.append(migration_pattern)
         
@@ -785,7 +1048,7 @@ class DatabasePatternDetector(BasePatternDetector):
     def _detect_orm_models(
         self, 
         symbol_info: SymbolInfo, 
-        file_content: str, 
+        signals: SignalMatches, 
         file_path: str
     ) -> Optional[DetectedPattern]:
         """
@@ -832,12 +1095,11 @@ class DatabasePatternDetector(BasePatternDetector):
             
             # Check for Column/Field definitions in class
             if not is_model:
-                # Get class body from file content
-                class_lines = self._get_lines(file_content, cls.start_line, cls.end_line)
-                class_body = '\n'.join(class_lines)
-                
-                # Look for ORM field definitions
-                if any(indicator in class_body for indicator in ['Column(', 'Field(', 'CharField', 'IntegerField']):
+                # Look for ORM field definitions in the class body
+                if any(
+                    signals.in_lines(indicator, cls.start_line, cls.end_line)
+                    for indicator in self.ORM_FIELD_INDICATORS
+                ):
                     is_model = True
             
             if is_model:
@@ -870,7 +1132,7 @@ class DatabasePatternDetector(BasePatternDetector):
     def _detect_query_builders(
         self, 
         symbol_info: SymbolInfo, 
-        file_content: str, 
+        signals: SignalMatches, 
         file_path: str
     ) -> Optional[DetectedPattern]:
         """
@@ -898,14 +1160,10 @@ class DatabasePatternDetector(BasePatternDetector):
             return None
         
         # Count query builder method calls
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            for indicator in self.QUERY_BUILDER_INDICATORS.get(detected_builder, []):
-                if indicator in line:
-                    query_count += 1
-                    if len(line_numbers) < 10:  # Limit line numbers
-                        line_numbers.append(i)
-                    break
+        for i in signals.lines(*self.QUERY_BUILDER_INDICATORS.get(detected_builder, [])):
+            query_count += 1
+            if len(line_numbers) < 10:  # Limit line numbers
+                line_numbers.append(i)
         
         if query_count > 0:
             evidence.append(f"Uses query builder methods ({query_count} occurrences)")
@@ -927,7 +1185,7 @@ class DatabasePatternDetector(BasePatternDetector):
     def _detect_migrations(
         self, 
         symbol_info: SymbolInfo, 
-        file_content: str, 
+        signals: SignalMatches, 
         file_path: str
     ) -> Optional[DetectedPattern]:
         """
@@ -949,15 +1207,11 @@ class DatabasePatternDetector(BasePatternDetector):
         # Look for migration indicators
         migration_type = None
         for indicator in self.MIGRATION_INDICATORS:
-            if indicator in file_content:
+            if indicator in signals:
                 evidence.append(f"Contains migration function: {indicator}")
                 
                 # Find line number
-                lines = file_content.split('\n')
-                for i, line in enumerate(lines, 1):
-                    if indicator in line:
-                        line_numbers.append(i)
-                        break
+                line_numbers.append(signals.line_of(signals.get(indicator)[0]))
                 
                 # Determine migration type
                 if 'upgrade' in indicator or 'downgrade' in indicator:
@@ -984,13 +1238,6 @@ class DatabasePatternDetector(BasePatternDetector):
                 "migration_type": migration_type
             }
         )
-    
-    def _get_lines(self, file_content: str, start_line: int, end_line: int) -> List[str]:
-        """Extract lines from file content."""
-        lines = file_content.split('\n')
-        start_idx = start_line - 1
-        end_idx = end_line
-        return lines[start_idx:end_idx]
 
 
 
@@ -1042,7 +1289,20 @@ class AuthPatternDetector(BasePatternDetector):
         'PasswordHasher'
     ]
     
-    def detect(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> List[DetectedPattern]:
+    SIGNALS = {
+        indicator: indicator
+        for indicators in [JWT_INDICATORS, OAUTH_INDICATORS, SESSION_INDICATORS,
+                           API_KEY_INDICATORS, PASSWORD_INDICATORS]
+        for indicator in indicators
+    }
+    
+    def detect(
+        self,
+        symbol_info: SymbolInfo,
+        file_content: str,
+        file_path: str,
+        signals: Optional[SignalMatches] = None
+    ) -> List[DetectedPattern]:
         """
         Detect authentication patterns in the file.
         
@@ -1050,34 +1310,37 @@ class AuthPatternDetector(BasePatternDetector):
             symbol_info: Extracted symbols from the file
             file_content: Raw file content as string
             file_path: Path to the file being analyzed
+            signals: Matches of SIGNALS in file_content (scanned when omitted)
         
         Returns:
             List of detected authentication patterns
         """
         patterns = []
+        if signals is None:
+            signals = self.scan_signals(file_content)
         
         # Detect JWT patterns
-        jwt_pattern = self._detect_jwt_pattern(symbol_info, file_content, file_path)
+        jwt_pattern = self._detect_jwt_pattern(symbol_info, signals, file_path)
         if jwt_pattern:
             patterns.append(jwt_pattern)
         
         # Detect OAuth patterns
-        oauth_pattern = self._detect_oauth_pattern(symbol_info, file_content, file_path)
+        oauth_pattern = self._detect_oauth_pattern(symbol_info, signals, file_path)
         if oauth_pattern:
             patterns.append(oauth_pattern)
         
         # Detect session-based auth
-        session_pattern = self._detect_session_pattern(symbol_info, file_content, file_path)
+        session_pattern = self._detect_session_pattern(symbol_info, signals, file_path)
         if session_pattern:
             patterns.append(session_pattern)
         
         # Detect API key auth
-        api_key_pattern = self._detect_api_key_pattern(symbol_info, file_content, file_path)
+        api_key_pattern = self._detect_api_key_pattern(symbol_info, signals, file_path)
         if api_key_pattern:
             patterns.append(api_key_pattern)
         
         # Detect password hashing
-        password_pattern = self._detect_password_hashing(symbol_info, file_content, file_path)
+        password_pattern = self._detect_password_hashing(symbol_info, signals, file_path)
         if password_pattern:
             patterns.append(password_pattern)
         
@@ -1086,7 +1349,7 @@ class AuthPatternDetector(BasePatternDetector):
     def _detect_jwt_pattern(
         self, 
         symbol_info: SymbolInfo, 
-        file_content: str, 
+        signals: SignalMatches, 
         file_path: str
     ) -> Optional[DetectedPattern]:
         """
@@ -1107,16 +1370,13 @@ class AuthPatternDetector(BasePatternDetector):
                 evidence.append(f"Imports JWT library: {imp.module}")
                 line_numbers.append(imp.line_number)
         
-        # Check for JWT operations in code
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            for indicator in self.JWT_INDICATORS:
-                if indicator in line:
-                    jwt_operations.append(indicator)
-                    if len(line_numbers) < 10:
-                        line_numbers.append(i)
-                    evidence.append(f"JWT operation: {indicator}")
-                    break
+        # Check for JWT operations in code (first indicator of each line)
+        for i, indicators in signals.line_signals(self.JWT_INDICATORS).items():
+            indicator = indicators[0]
+            jwt_operations.append(indicator)
+            if len(line_numbers) < 10:
+                line_numbers.append(i)
+            evidence.append(f"JWT operation: {indicator}")
         
         if not evidence:
             return None
@@ -1146,7 +1406,7 @@ class AuthPatternDetector(BasePatternDetector):
     def _detect_oauth_pattern(
         self, 
         symbol_info: SymbolInfo, 
-        file_content: str, 
+        signals: SignalMatches, 
         file_path: str
     ) -> Optional[DetectedPattern]:
         """
@@ -1169,16 +1429,13 @@ class AuthPatternDetector(BasePatternDetector):
         
         # Check for OAuth indicators in code
         for indicator in self.OAUTH_INDICATORS:
-            if indicator in file_content:
+            if indicator in signals:
                 oauth_features.append(indicator)
                 evidence.append(f"OAuth feature: {indicator}")
                 
                 # Find line number
-                lines = file_content.split('\n')
-                for i, line in enumerate(lines, 1):
-                    if indicator in line and len(line_numbers) < 10:
-                        line_numbers.append(i)
-                        break
+                if len(line_numbers) < 10:
+                    line_numbers.append(signals.line_of(signals.get(indicator)[0]))
         
         if not evidence:
             return None
@@ -1200,7 +1457,7 @@ class AuthPatternDetector(BasePatternDetector):
     def _detect_session_pattern(
         self, 
         symbol_info: SymbolInfo, 
-        file_content: str, 
+        signals: SignalMatches, 
         file_path: str
     ) -> Optional[DetectedPattern]:
         """
@@ -1224,17 +1481,14 @@ class AuthPatternDetector(BasePatternDetector):
         
         # Check for session indicators
         for indicator in self.SESSION_INDICATORS:
-            if indicator in file_content:
+            if indicator in signals:
                 session_features.append(indicator)
                 if len(evidence) < 10:
                     evidence.append(f"Session feature: {indicator}")
                 
                 # Find line number
-                lines = file_content.split('\n')
-                for i, line in enumerate(lines, 1):
-                    if indicator in line and len(line_numbers) < 10:
-                        line_numbers.append(i)
-                        break
+                if len(line_numbers) < 10:
+                    line_numbers.append(signals.line_of(signals.get(indicator)[0]))
         
         if not evidence:
             return None
@@ -1256,7 +1510,7 @@ class AuthPatternDetector(BasePatternDetector):
     def _detect_api_key_pattern(
         self, 
         symbol_info: SymbolInfo, 
-        file_content: str, 
+        signals: SignalMatches, 
         file_path: str
     ) -> Optional[DetectedPattern]:
         """
@@ -1270,14 +1524,10 @@ class AuthPatternDetector(BasePatternDetector):
         evidence = []
         line_numbers = []
         
-        # Check for API key indicators
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            for indicator in self.API_KEY_INDICATORS:
-                if indicator in line:
-                    evidence.append(f"API key usage: {indicator}")
-                    line_numbers.append(i)
-                    break
+        # Check for API key indicators (first indicator of each line)
+        for i, indicators in signals.line_signals(self.API_KEY_INDICATORS).items():
+            evidence.append(f"API key usage: {indicators[0]}")
+            line_numbers.append(i)
         
         if not evidence:
             return None
@@ -1305,7 +1555,7 @@ class AuthPatternDetector(BasePatternDetector):
     def _detect_password_hashing(
         self, 
         symbol_info: SymbolInfo, 
-        file_content: str, 
+        signals: SignalMatches, 
         file_path: str
     ) -> Optional[DetectedPattern]:
         """
@@ -1331,17 +1581,14 @@ class AuthPatternDetector(BasePatternDetector):
         
         # Check for password hashing indicators
         for indicator in self.PASSWORD_INDICATORS:
-            if indicator in file_content:
+            if indicator in signals:
                 if indicator not in hash_algorithms:
                     hash_algorithms.append(indicator)
                 
                 # Find line number
-                lines = file_content.split('\n')
-                for i, line in enumerate(lines, 1):
-                    if indicator in line and len(line_numbers) < 10:
-                        evidence.append(f"Password hashing: {indicator}")
-                        line_numbers.append(i)
-                        break
+                if len(line_numbers) < 10:
+                    evidence.append(f"Password hashing: {indicator}")
+                    line_numbers.append(signals.line_of(signals.get(indicator)[0]))
         
         if not evidence:
             return None
@@ -0,0 +1,486 @@
+"""
+Declarative pattern rules compiled to tree-sitter queries.
+
+Team-specific patterns can be added without writing a detector class. A
+YAML rule file lists rules; each rule is a tree-sitter query whose
+captures mark the code that makes up the pattern, plus optional checks on
+the captured text, a confidence weight and an evidence template:
+
+    rules:
+      - id: jwt-calls
+        pattern_type: jwt_usage
+        languages: [python]
+        query: |
+          ((call
+             function: (attribute
+               object: (identifier) @module
+               attribute: (identifier) @method)) @match
+           (#eq? @module "jwt"))
+        where:
+          method: {any_of: [encode, decode]}
+        confidence: {base: 0.4, per_match: 0.2, max: 1.0}
+        evidence: "JWT call: {module}.{method}"
+        metadata: {category: auth}
+
+The queries of all rules for a language are compiled into one query, so
+a file's tree is searched once, in tree-sitter's C code, however many
+rules there are. Capture names are prefixed with the rule's index when
+compiling, which tells each match's rule apart.
+
+Rule fields:
+
+- id: Unique rule name (required)
+- pattern_type: DetectedPattern.pattern_type (default: id)
+- languages: Parser languages the query is written for (required)
+- query: Query source (required); `#eq?` and `#match?` predicates are
+  evaluated by tree-sitter and go inside the pattern they apply to, as in
+  `((pattern) (#eq? @capture "text"))`
+- capture: Capture whose node locates a match (default: 'match', else the
+  first capture of the match)
+- where: {capture: {check: value}} checks on captured text, with checks
+  eq, not_eq, match, not_match (regexes, searched) and any_of (a list)
+- min_matches: Matches needed for the pattern to be reported (default: 1)
+- confidence: {base, per_match, max}, or a number used as per_match;
+  confidence is min(max, base + per_match * matches)
+- evidence: Template formatted with each match's captured text, by
+  capture name, and its {line} (default: "<pattern_type> at line <n>");
+  identical evidence is reported once
+- metadata: Extra DetectedPattern metadata
+"""
+
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Pattern, Tuple
+
+import yaml
+from tree_sitter_languages import get_language, get_parser
+
+from .pattern_detector import BasePatternDetector, DetectedPattern
+from .symbol_extractor import SymbolInfo
+
+logger = logging.getLogger(__name__)
+
+# Checks allowed in a rule's `where` block
+WHERE_CHECKS = frozenset({'eq', 'not_eq', 'match', 'not_match', 'any_of'})
+
+# Evidence and line numbers kept per pattern, like the built-in detectors
+MAX_EVIDENCE = 10
+MAX_LINE_NUMBERS = 10
+
+_CAPTURE_NAME = re.compile(r'[A-Za-z_][\w.\-]*')
+
+
+@dataclass
+class PatternRule:
+    """
+    One declarative pattern rule.
+
+    Attributes:
+        rule_id: Unique rule name
+        pattern_type: Type of the patterns the rule reports
+        languages: Parser languages the query applies to
+        query: tree-sitter query source
+        capture: Capture locating each match (None: 'match' or the first)
+        where: Checks on captured text, by capture name
+        min_matches: Matches needed to report the pattern
+        base_confidence: Confidence before any match is counted
+        match_confidence: Confidence added per match
+        max_confidence: Upper bound of the confidence
+        evidence: Evidence template formatted with captured text
+        metadata: Extra metadata of the reported pattern
+    """
+    rule_id: str
+    pattern_type: str
+    languages: FrozenSet[str]
+    query: str
+    capture: Optional[str] = None
+    where: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    min_matches: int = 1
+    base_confidence: float = 0.0
+    match_confidence: float = 0.2
+    max_confidence: float = 1.0
+    evidence: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PatternRule':
+        """
+        Create a rule from its YAML mapping.
+
+        Raises:
+            ValueError: If a required field is missing or a field is invalid
+        """
+        rule_id = data.get('id')
+        if not rule_id:
+            raise ValueError(f"Pattern rule without an id: {data}")
+        for required in ('languages', 'query'):
+            if not data.get(required):
+                raise ValueError(f"Pattern rule '{rule_id}' has no {required}")
+
+        languages = data['languages']
+        if isinstance(languages, str):
+            languages = [languages]
+
+        where = data.get('where') or {}
+        for capture, checks in where.items():
+            unknown = set(checks) - WHERE_CHECKS
+            if unknown:
+                raise ValueError(
+                    f"Pattern rule '{rule_id}' uses unknown checks on @{capture}: {sorted(unknown)}"
+                )
+
+        confidence = data.get('confidence', {})
+        if isinstance(confidence, (int, float)):
+            confidence = {'per_match': confidence}
+
+        return cls(
+            rule_id=str(rule_id),
+            pattern_type=str(data.get('pattern_type', rule_id)),
+            languages=frozenset(languages),
+            query=data['query'],
+            capture=data.get('capture'),
+            where=where,
+            min_matches=int(data.get('min_matches', 1)),
+            base_confidence=float(confidence.get('base', 0.0)),
+            match_confidence=float(confidence.get('per_match', 0.2)),
+            max_confidence=float(confidence.get('max', 1.0)),
+            evidence=data.get('evidence'),
+            metadata=dict(data.get('metadata') or {})
+        )
+
+    def accepts(self, texts: Dict[str, str]) -> bool:
+        """
+        Check the `where` block against one match.
+
+        Args:
+            texts: Captured text by capture name
+
+        Returns:
+            True if every check holds (checks on missing captures fail)
+        """
+        for capture, checks in self.where.items():
+            text = texts.get(capture)
+            if text is None:
+                return False
+            for check, value in checks.items():
+                if check == 'eq' and text != str(value):
+                    return False
+                if check == 'not_eq' and text == str(value):
+                    return False
+                if check == 'match' and not _compile(value).search(text):
+                    return False
+                if check == 'not_match' and _compile(value).search(text):
+                    return False
+                if check == 'any_of' and text not in [str(v) for v in value]:
+                    return False
+        return True
+
+    def format_evidence(self, texts: Dict[str, str], line_number: int) -> str:
+        """Format the evidence of one match."""
+        if not self.evidence:
+            return f"{self.pattern_type} at line {line_number}"
+        return self.evidence.format_map(_Texts(texts, line=str(line_number)))
+
+
+class _Texts(dict):
+    """Captured text for evidence templates; unknown captures stay as written."""
+
+    def __missing__(self, key: str) -> str:
+        return '{' + key + '}'
+
+
+_regex_cache: Dict[str, Pattern] = {}
+
+
+def _compile(regex: str) -> Pattern:
+    """Compile a `where` regex, caching it."""
+    compiled = _regex_cache.get(regex)
+    if compiled is None:
+        compiled = _regex_cache[regex] = re.compile(regex)
+    return compiled
+
+
+def namespace_captures(source: str, prefix: str) -> str:
+    """
+    Prefix the capture names of a query.
+
+    Captures in predicates are renamed too; strings and comments are left
+    untouched.
+
+    Args:
+        source: Query source
+        prefix: Prefix added to each capture name (e.g. 'r3.')
+
+    Returns:
+        Query source with `@name` replaced by `@<prefix>name`
+    """
+    parts = []
+    index = 0
+    length = len(source)
+    while index < length:
+        char = source[index]
+        if char == '"':
+            end = index + 1
+            while end < length and source[end] != '"':
+                end += 2 if source[end] == '\\' else 1
+            parts.append(source[index:end + 1])
+            index = end + 1
+        elif char == ';':
+            end = source.find('\n', index)
+            end = length if end == -1 else end
+            parts.append(source[index:end])
+            index = end
+        elif char == '@':
+            match = _CAPTURE_NAME.match(source, index + 1)
+            if match:
+                parts.append('@' + prefix + match.group())
+                index = match.end()
+            else:
+                parts.append(char)
+                index += 1
+        else:
+            parts.append(char)
+            index += 1
+    return ''.join(parts)
+
+
+class CompiledRules:
+    """
+    The rules of one language, compiled into one query.
+
+    Example:
+        >>> compiled = rule_set.compiled('python')
+        >>> for rule, node, texts in compiled.matches(tree.root_node):
+        ...     print(rule.rule_id, node.start_point[0] + 1)
+    """
+
+    def __init__(self, language: str, rules: List[PatternRule]):
+        """
+        Compile the rules of a language.
+
+        Rules whose query does not compile for the language are dropped
+        with a warning, so one broken rule does not disable the others.
+
+        Args:
+            language: Parser language name
+            rules: Rules applying to the language
+        """
+        self.language = language
+        grammar = get_language(language)
+        self.rules: List[PatternRule] = []
+        sources = []
+        for rule in rules:
+            source = namespace_captures(rule.query, f"r{len(self.rules)}.")
+            try:
+                grammar.query(source)
+            except Exception as e:
+                logger.warning(f"Pattern rule '{rule.rule_id}' does not compile for {language}: {e}")
+                continue
+            self.rules.append(rule)
+            sources.append(source)
+        self.query = grammar.query('\n'.join(sources)) if sources else None
+
+    def matches(self, root_node: Any) -> Iterable[Tuple[PatternRule, Any, Dict[str, str]]]:
+        """
+        Run the rules on a tree.
+
+        Args:
+            root_node: Root node of the tree
+
+        Yields:
+            (rule, node locating the match, captured text by capture name)
+            for each match that passes its rule's `where` checks
+        """
+        if self.query is None:
+            return
+        for _, captures in self.query.matches(root_node):
+            # A match whose predicates failed has no captures
+            if not captures:
+                continue
+            rule_key, _, _ = next(iter(captures)).partition('.')
+            rule = self.rules[int(rule_key[1:])]
+            nodes = {}
+            for name, node in captures.items():
+                if isinstance(node, list):
+                    if not node:
+                        continue
+                    node = node[0]
+                nodes[name.partition('.')[2]] = node
+            texts = {name: _node_text(node) for name, node in nodes.items()}
+            if not rule.accepts(texts):
+                continue
+            node = nodes.get(rule.capture or 'match')
+            if node is None:
+                node = min(nodes.values(), key=lambda n: n.start_byte)
+            yield rule, node, texts
+
+
+def _node_text(node: Any) -> str:
+    """Text of a node."""
+    text = node.text
+    return text.decode('utf-8', errors='ignore') if text is not None else ''
+
+
+class RuleSet:
+    """
+    Pattern rules loaded from YAML files, compiled per language on first use.
+
+    Example:
+        >>> rule_set = RuleSet.from_paths(['team_rules.yaml'])
+        >>> detector = RulePatternDetector(rule_set)
+    """
+
+    def __init__(self, rules: Iterable[PatternRule]):
+        """
+        Initialize the rule set.
+
+        Raises:
+            ValueError: If two rules share an id
+        """
+        self.rules: List[PatternRule] = []
+        seen = set()
+        for rule in rules:
+            if rule.rule_id in seen:
+                raise ValueError(f"Duplicate pattern rule id: {rule.rule_id}")
+            seen.add(rule.rule_id)
+            self.rules.append(rule)
+        self._compiled: Dict[str, CompiledRules] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_yaml(cls, text: str) -> 'RuleSet':
+        """
+        Load rules from YAML text with a top-level `rules` list.
+
+        Raises:
+            ValueError: If the document or one of its rules is invalid
+        """
+        data = yaml.safe_load(text) or {}
+        if not isinstance(data, dict) or not isinstance(data.get('rules', []), list):
+            raise ValueError("Pattern rule files need a top-level 'rules' list")
+        return cls(PatternRule.from_dict(rule) for rule in data.get('rules', []))
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[str]) -> 'RuleSet':
+        """
+        Load rules from YAML files, or from the .yaml/.yml files of directories.
+
+        Raises:
+            OSError: If a file cannot be read
+            ValueError: If a file or one of its rules is invalid
+        """
+        rules = []
+        for path in paths:
+            if os.path.isdir(path):
+                files = sorted(
+                    os.path.join(path, name) for name in os.listdir(path)
+                    if name.endswith(('.yaml', '.yml'))
+                )
+            else:
+                files = [path]
+            for file_path in files:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    try:
+                        rules.extend(cls.from_yaml(f.read()).rules)
+                    except ValueError as e:
+                        raise ValueError(f"{file_path}: {e}") from e
+        return cls(rules)
+
+    @property
+    def languages(self) -> FrozenSet[str]:
+        """Languages at least one rule applies to."""
+        return frozenset(language for rule in self.rules for language in rule.languages)
+
+    def compiled(self, language: str) -> CompiledRules:
+        """Get the compiled rules of a language, compiling them on first use."""
+        try:
+            return self._compiled[language]
+        except KeyError:
+            pass
+        with self._lock:
+            if language not in self._compiled:
+                self._compiled[language] = CompiledRules(
+                    language,
+                    [rule for rule in self.rules if language in rule.languages]
+                )
+            return self._compiled[language]
+
+
+class RulePatternDetector(BasePatternDetector):
+    """
+    Detects the patterns described by a RuleSet.
+
+    Runs on the file's syntax tree: each file gets one query run for all
+    rules of its language, and one DetectedPattern per rule with enough
+    matches.
+    """
+
+    USES_TREE = True
+
+    def __init__(self, rule_set: RuleSet):
+        """
+        Initialize the detector.
+
+        Args:
+            rule_set: Rules to detect
+        """
+        self.rule_set = rule_set
+        self.LANGUAGES = rule_set.languages
+
+    def detect(
+        self,
+        symbol_info: SymbolInfo,
+        file_content: str,
+        file_path: str,
+        tree: Optional[Any] = None,
+        language: Optional[str] = None
+    ) -> List[DetectedPattern]:
+        """
+        Detect rule patterns in the file.
+
+        Args:
+            symbol_info: Extracted symbols from the file
+            file_content: Raw file content as string
+            file_path: Path to the file being analyzed
+            tree: Root node of the file's syntax tree (parsed from
+                  file_content when omitted)
+            language: Parser language of the file
+
+        Returns:
+            One pattern per rule with at least min_matches matches
+        """
+        if language is None or language not in self.LANGUAGES:
+            return []
+        if tree is None:
+            tree = get_parser(language).parse(file_content.encode('utf-8')).root_node
+
+        found: Dict[str, Tuple[PatternRule, List[int], List[str]]] = {}
+        for rule, node, texts in self.rule_set.compiled(language).matches(tree):
+            line_number = node.start_point[0] + 1
+            _, lines, evidence = found.setdefault(rule.rule_id, (rule, [], []))
+            lines.append(line_number)
+            evidence.append(rule.format_evidence(texts, line_number))
+
+        patterns = []
+        for rule, lines, evidence in found.values():
+            if len(lines) < rule.min_matches:
+                continue
+            patterns.append(DetectedPattern(
+                pattern_type=rule.pattern_type,
+                file_path=file_path,
+                confidence=min(
+                    rule.max_confidence,
+                    rule.base_confidence + rule.match_confidence * len(lines)
+                ),
+                evidence=list(dict.fromkeys(evidence))[:MAX_EVIDENCE],
+                line_numbers=sorted(set(lines))[:MAX_LINE_NUMBERS],
+                metadata={
+                    **rule.metadata,
+                    "rule_id": rule.rule_id,
+                    "match_count": len(lines)
+                }
+            ))
+        return patterns
@@ -9,10 +9,13 @@ import json
 import hashlib
 import logging
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from src.models.analysis_models import CodebaseAnalysis, FileAnalysis
 
+from .file_manifest import FileManifest
+from .pattern_aggregate import PatternAggregate
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,7 +27,13 @@ class PersistenceManager:
     .documee/analysis/{codebase_id}/
         - analysis.json (main codebase analysis)
         - file_hashes.json (file hashes for incremental analysis)
+        - file_manifest.json (file stat tuples for skipping unchanged files)
+        - timed_out_files.json (files that exceeded the parse timeout)
+        - pattern_aggregate.json (per-file pattern counts and teaching scores)
         - file_{hash}.json (individual file analyses)
+    
+    Files with byte-identical content and identical analyses are stored
+    once; the other paths are saved as references to that analysis.
     """
     
     def __init__(self, base_path: str = ".documee/analysis"):
@@ -58,23 +67,31 @@ class PersistenceManager:
             analysis_dir = self.base_path / codebase_id
             analysis_dir.mkdir(parents=True, exist_ok=True)
             
-            # Save main analysis file
+            # Save main analysis file, storing duplicate files by reference
+            data = analysis.to_dict()
+            file_entries, unique_count = self._deduplicate_file_analyses(analysis.file_analyses)
+            data['file_analyses'] = file_entries
             analysis_file = analysis_dir / "analysis.json"
             with open(analysis_file, 'w', encoding='utf-8') as f:
-                json.dump(analysis.to_dict(), f, indent=2, ensure_ascii=False)
+                json.dump(data, f, indent=2, ensure_ascii=False)
             
             logger.info(f"Saved analysis for codebase {codebase_id} to {analysis_file}")
             
             # Save individual file analyses for efficient partial loading
-            for file_path, file_analysis in analysis.file_analyses.items():
+            for file_path, entry in file_entries.items():
+                if 'duplicate_of' in entry:
+                    continue
                 # Create safe filename from file path hash
                 safe_name = hashlib.sha256(file_path.encode()).hexdigest()[:16]
                 file_analysis_path = analysis_dir / f"file_{safe_name}.json"
                 
                 with open(file_analysis_path, 'w', encoding='utf-8') as f:
-                    json.dump(file_analysis.to_dict(), f, indent=2, ensure_ascii=False)
+                    json.dump(entry, f, indent=2, ensure_ascii=False)
             
-            logger.debug(f"Saved {len(analysis.file_analyses)} individual file analyses")
+            logger.debug(
+                f"Saved {unique_count} individual file analyses "
+                f"({len(file_entries) - unique_count} duplicates stored by reference)"
+            )
             
         except Exception as e:
             logger.error(f"Failed to save analysis for {codebase_id}: {e}")
@@ -100,7 +117,27 @@ class PersistenceManager:
             with open(analysis_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
+            # Expand files that were stored as references to an identical file
+            entries = data.get('file_analyses', {})
+            duplicates = {
+                file_path: entry['duplicate_of']
+                for file_path, entry in entries.items()
+                if 'duplicate_of' in entry
+            }
+            data['file_analyses'] = {
+                file_path: entry for file_path, entry in entries.items()
+                if file_path not in duplicates
+            }
             analysis = CodebaseAnalysis.from_dict(data)
+            if duplicates:
+                file_analyses = analysis.file_analyses
+                analysis.file_analyses = {
+                    file_path: (
+                        file_analyses[duplicates[file_path]].with_file_path(file_path)
+                        if file_path in duplicates else file_analyses[file_path]
+                    )
+                    for file_path in entries
+                }
             logger.info(f"Loaded analysis for codebase {codebase_id} from {analysis_file}")
             
             return analysis
@@ -109,6 +146,42 @@ class PersistenceManager:
             logger.error(f"Failed to load analysis for {codebase_id}: {e}")
             return None
     
+    @staticmethod
+    def _deduplicate_file_analyses(
+        file_analyses: Dict[str, FileAnalysis]
+    ) -> Tuple[Dict[str, Dict[str, Any]], int]:
+        """
+        Serialize file analyses, replacing duplicates with references.
+        
+        A file is stored as {'file_path': ..., 'duplicate_of': ...} when an
+        earlier file has the same content hash and language and its analysis
+        is identical once the path-dependent fields are rewritten, so loading
+        the reference with FileAnalysis.with_file_path() is lossless.
+        
+        Args:
+            file_analyses: Dictionary mapping file paths to FileAnalysis objects
+        
+        Returns:
+            Tuple of (serialized entries in the original order, number of
+            analyses stored in full)
+        """
+        entries = {}
+        primaries: Dict[Tuple[str, str], list] = {}
+        unique_count = 0
+        for file_path, file_analysis in file_analyses.items():
+            if file_analysis.content_hash:
+                candidates = primaries.setdefault((file_analysis.content_hash, file_analysis.language), [])
+                for primary_path in candidates:
+                    if file_analysis.with_file_path(primary_path).to_dict() == entries[primary_path]:
+                        entries[file_path] = {'file_path': file_path, 'duplicate_of': primary_path}
+                        break
+                else:
+                    candidates.append(file_path)
+            if file_path not in entries:
+                entries[file_path] = file_analysis.to_dict()
+                unique_count += 1
+        return entries, unique_count
+    
     def get_file_hashes(self, codebase_id: str) -> Dict[str, str]:
         """
         Get stored file hashes for incremental analysis.
@@ -169,6 +242,169 @@ class PersistenceManager:
             logger.error(f"Failed to save file hashes for {codebase_id}: {e}")
             raise IOError(f"Failed to save file hashes: {e}") from e
     
+    def get_file_manifest(self, codebase_id: str) -> Optional[FileManifest]:
+        """
+        Get the stored stat manifest for incremental analysis.
+        
+        The manifest records the (size, mtime_ns, inode) of every file at
+        the time it was hashed, so unchanged files can be skipped without
+        reading them.
+        
+        Args:
+            codebase_id: Unique identifier for the codebase
+        
+        Returns:
+            FileManifest if found, None otherwise
+        """
+        try:
+            manifest_file = self.base_path / codebase_id / "file_manifest.json"
+            
+            if not manifest_file.exists():
+                logger.debug(f"No file manifest found for codebase {codebase_id}")
+                return None
+            
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = FileManifest.from_dict(json.load(f))
+            
+            logger.debug(f"Loaded manifest with {len(manifest.entries)} entries for codebase {codebase_id}")
+            return manifest
+            
+        except Exception as e:
+            logger.error(f"Failed to load file manifest for {codebase_id}: {e}")
+            return None
+    
+    def save_file_manifest(self, codebase_id: str, manifest: FileManifest) -> None:
+        """
+        Save the stat manifest for incremental analysis.
+        
+        Args:
+            codebase_id: Unique identifier for the codebase
+            manifest: FileManifest recorded during the analysis
+        
+        Raises:
+            IOError: If unable to write to disk
+        """
+        try:
+            # Create codebase-specific directory
+            analysis_dir = self.base_path / codebase_id
+            analysis_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Save manifest (compact: it is read on every incremental run)
+            manifest_file = analysis_dir / "file_manifest.json"
+            with open(manifest_file, 'w', encoding='utf-8') as f:
+                json.dump(manifest.to_dict(), f, ensure_ascii=False)
+            
+            logger.info(f"Saved manifest with {len(manifest.entries)} entries for codebase {codebase_id}")
+            
+        except Exception as e:
+            logger.error(f"Failed to save file manifest for {codebase_id}: {e}")
+            raise IOError(f"Failed to save file manifest: {e}") from e
+    
+    def get_timed_out_files(self, codebase_id: str) -> Dict[str, str]:
+        """
+        Get the files whose analysis exceeded the parse timeout.
+        
+        Args:
+            codebase_id: Unique identifier for the codebase
+        
+        Returns:
+            Dictionary mapping file paths to the content hash that timed out
+        """
+        try:
+            timeouts_file = self.base_path / codebase_id / "timed_out_files.json"
+            
+            if not timeouts_file.exists():
+                return {}
+            
+            with open(timeouts_file, 'r', encoding='utf-8') as f:
+                timeouts = json.load(f)
+            
+            logger.debug(f"Loaded {len(timeouts)} timed-out files for codebase {codebase_id}")
+            return timeouts
+            
+        except Exception as e:
+            logger.error(f"Failed to load timed-out files for {codebase_id}: {e}")
+            return {}
+    
+    def save_timed_out_files(self, codebase_id: str, timeouts: Dict[str, str]) -> None:
+        """
+        Save the files whose analysis exceeded the parse timeout.
+        
+        Args:
+            codebase_id: Unique identifier for the codebase
+            timeouts: Dictionary mapping file paths to the content hash that timed out
+        
+        Raises:
+            IOError: If unable to write to disk
+        """
+        try:
+            analysis_dir = self.base_path / codebase_id
+            analysis_dir.mkdir(parents=True, exist_ok=True)
+            
+            timeouts_file = analysis_dir / "timed_out_files.json"
+            with open(timeouts_file, 'w', encoding='utf-8') as f:
+                json.dump(timeouts, f, indent=2, ensure_ascii=False)
+            
+            if timeouts:
+                logger.info(f"Saved {len(timeouts)} timed-out files for codebase {codebase_id}")
+            
+        except Exception as e:
+            logger.error(f"Failed to save timed-out files for {codebase_id}: {e}")
+            raise IOError(f"Failed to save timed-out files: {e}") from e
+    
+    def get_pattern_aggregate(self, codebase_id: str) -> Optional[PatternAggregate]:
+        """
+        Get the stored pattern aggregate of the last analysis.
+        
+        Args:
+            codebase_id: Unique identifier for the codebase
+        
+        Returns:
+            PatternAggregate if found, None otherwise
+        """
+        try:
+            aggregate_file = self.base_path / codebase_id / "pattern_aggregate.json"
+            
+            if not aggregate_file.exists():
+                logger.debug(f"No pattern aggregate found for codebase {codebase_id}")
+                return None
+            
+            with open(aggregate_file, 'r', encoding='utf-8') as f:
+                aggregate = PatternAggregate.from_dict(json.load(f))
+            
+            logger.debug(f"Loaded pattern aggregate of {len(aggregate.contributions)} files for codebase {codebase_id}")
+            return aggregate
+            
+        except Exception as e:
+            logger.error(f"Failed to load pattern aggregate for {codebase_id}: {e}")
+            return None
+    
+    def save_pattern_aggregate(self, codebase_id: str, aggregate: PatternAggregate) -> None:
+        """
+        Save the pattern aggregate for incremental analysis.
+        
+        Args:
+            codebase_id: Unique identifier for the codebase
+            aggregate: PatternAggregate synced with the saved analysis
+        
+        Raises:
+            IOError: If unable to write to disk
+        """
+        try:
+            analysis_dir = self.base_path / codebase_id
+            analysis_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Compact, like the manifest: it is read on every incremental run
+            aggregate_file = analysis_dir / "pattern_aggregate.json"
+            with open(aggregate_file, 'w', encoding='utf-8') as f:
+                json.dump(aggregate.to_dict(), f, ensure_ascii=False)
+            
+            logger.debug(f"Saved pattern aggregate of {len(aggregate.contributions)} files for codebase {codebase_id}")
+            
+        except Exception as e:
+            logger.error(f"Failed to save pattern aggregate for {codebase_id}: {e}")
+            raise IOError(f"Failed to save pattern aggregate: {e}") from e
+    
     def delete_analysis(self, codebase_id: str) -> bool:
         """
         Delete all stored analysis data for a codebase.
@@ -0,0 +1,4 @@
+; Symbol queries for C.
+;   @function  top-level function definition
+
+(translation_unit (function_definition) @function)
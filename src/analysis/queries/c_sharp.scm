@@ -0,0 +1,6 @@
+; Symbol queries for C#.
+;
+; Classes are captured at any depth, including inside namespaces.
+; Methods are read from the class bodies.
+
+(class_declaration) @class
@@ -0,0 +1,7 @@
+; Symbol queries for C++.
+;   @function  top-level function definition
+;   @class     top-level class
+
+(translation_unit (function_definition) @function)
+
+(translation_unit (class_specifier) @class)
@@ -0,0 +1,10 @@
+; Symbol queries for Go.
+;   @function  top-level function
+;   @method    top-level method (function with a receiver)
+;   @class     type declaration
+
+(source_file (function_declaration) @function)
+
+(source_file (method_declaration) @method)
+
+(source_file (type_declaration) @class)
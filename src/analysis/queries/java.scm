@@ -0,0 +1,6 @@
+; Symbol queries for Java.
+;
+; Classes are captured at any depth, so nested classes are reported too.
+; Methods are read from the class bodies.
+
+(class_declaration) @class
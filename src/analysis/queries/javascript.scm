@@ -0,0 +1,19 @@
+; Symbol queries for JavaScript and TypeScript.
+;
+; Declarations are captured at any depth, including inside functions and
+; export statements.
+;   @function  named function declaration or expression
+;   @arrow     const/let declaration holding an arrow function
+;   @class     class declaration or expression
+
+(function_declaration) @function
+
+(function) @function
+
+(lexical_declaration
+  (variable_declarator
+    value: (arrow_function))) @arrow
+
+(class_declaration) @class
+
+(class) @class
@@ -0,0 +1,7 @@
+; Symbol queries for PHP.
+;
+; Functions and classes are captured at any depth.
+
+(function_definition) @function
+
+(class_declaration) @class
@@ -0,0 +1,21 @@
+; Symbol queries for Python.
+;
+; Captures are turned into symbols by QuerySymbolExtractor:
+;   @function            top-level function
+;   @function.decorated  top-level function under decorators
+;   @class               top-level class
+;   @class.decorated     top-level class under decorators
+; Methods, docstrings, decorators and parameters are read from the
+; captured definitions.
+
+(module (function_definition) @function)
+
+(module (class_definition) @class)
+
+(module
+  (decorated_definition
+    definition: (function_definition) @function.decorated))
+
+(module
+  (decorated_definition
+    definition: (class_definition) @class.decorated))
@@ -0,0 +1,7 @@
+; Symbol queries for Ruby.
+;   @function  top-level method
+;   @class     top-level class
+
+(program (method) @function)
+
+(program (class) @class)
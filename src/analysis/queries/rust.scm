@@ -0,0 +1,7 @@
+; Symbol queries for Rust.
+;   @function  top-level function
+;   @class     top-level struct or impl block
+
+(source_file (function_item) @function)
+
+(source_file [(struct_item) (impl_item)] @class)
@@ -0,0 +1,152 @@
+"""
+Lazy construction of analysis components and optional modules.
+
+MCP servers are started per editor session, so everything that is not
+needed to answer the first request is deferred: engine components are
+registered as factories and built on first access, and heavy optional
+modules are imported when one of their attributes is first used.
+"""
+
+import importlib.util
+import logging
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def lazy_import(name: str) -> Optional[ModuleType]:
+    """
+    Import a module on first attribute access.
+
+    Args:
+        name: Fully qualified module name
+
+    Returns:
+        Module whose body runs on first attribute access (or the module
+        itself if it was already imported), or None if it is not installed
+
+    Example:
+        >>> nbformat = lazy_import("nbformat")
+        >>> nb = nbformat.reads(content, as_version=4)  # imported here
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None or spec.loader is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class ComponentRegistry:
+    """
+    Named component factories that are built once, on first use.
+
+    Factories may use other components of the same registry. Construction
+    is serialized by a lock, so a component is built exactly once even
+    when first used from several threads.
+
+    Example:
+        >>> registry = ComponentRegistry()
+        >>> registry.register('parser', lambda: ASTParserManager(config), "AST Parser Manager")
+        >>> registry.is_built('parser')
+        False
+        >>> parser = registry.get('parser')
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._descriptions: Dict[str, str] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any], description: Optional[str] = None):
+        """
+        Register a component factory.
+
+        Args:
+            name: Component name
+            factory: Callable building the component
+            description: Human-readable name used in log messages
+        """
+        self._factories[name] = factory
+        self._descriptions[name] = description or name
+
+    def get(self, name: str) -> Any:
+        """
+        Get a component, building it on first use.
+
+        Args:
+            name: Component name
+
+        Returns:
+            The component instance
+
+        Raises:
+            KeyError: If no factory is registered under name
+            Exception: Whatever the factory raises (the next call retries)
+        """
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._instances:
+                description = self._descriptions[name]
+                start = time.perf_counter()
+                try:
+                    instance = self._factories[name]()
+                except Exception as e:
+                    logger.error(f"Failed to initialize {description}: {e}", exc_info=True)
+                    raise
+                self._instances[name] = instance
+                logger.debug(
+                    f"{description} initialized on first use in "
+                    f"{(time.perf_counter() - start) * 1000:.1f}ms"
+                )
+            return self._instances[name]
+
+    def set(self, name: str, instance: Any):
+        """Replace a component with an existing instance."""
+        with self._lock:
+            self._instances[name] = instance
+
+    def is_built(self, name: str) -> bool:
+        """Check whether a component has been built."""
+        return name in self._instances
+
+    def built_components(self) -> List[str]:
+        """Names of the components built so far, in registration order."""
+        return [name for name in self._factories if name in self._instances]
+
+
+class LazyComponent:
+    """
+    Descriptor exposing a registry component as an instance attribute.
+
+    The owning class keeps its ComponentRegistry in `self.components`.
+    Assigning the attribute replaces the component.
+    """
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance.components.get(self.name)
+
+    def __set__(self, instance, value):
+        instance.components.set(self.name, value)
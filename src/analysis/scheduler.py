@@ -0,0 +1,328 @@
+"""
+Cost-aware work scheduler for file analysis.
+
+This module dispatches file analyses longest-first with a bounded number of
+in-flight tasks shared by all running jobs. Costs are estimated from file
+size and language and refined with the timings observed for each file, and
+jobs (one per analyze_codebase run) are interleaved round-robin so that two
+codebases analyzed at once both make progress.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CostModel:
+    """
+    Estimates the analysis time of a file in milliseconds.
+
+    Files seen before are estimated from their last observed timing. Other
+    files are estimated as a fixed overhead plus size times a per-language
+    rate (ms per KB), which is an exponentially weighted moving average of
+    observed rates.
+
+    Example:
+        >>> model = CostModel()
+        >>> model.estimate("src/main.py", 4096, "python")
+        6.0
+        >>> model.observe("src/main.py", 4096, "python", 12.0)
+        >>> model.estimate("src/main.py", 4096, "python")
+        12.0
+    """
+
+    # Fixed per-file overhead (read, hash, cache lookup) in milliseconds
+    BASE_COST_MS = 2.0
+
+    # Initial analysis rate for languages without observations
+    DEFAULT_MS_PER_KB = 1.0
+
+    # Weight of a new observation in the per-language rate
+    EWMA_ALPHA = 0.3
+
+    def __init__(self, max_history: int = 100000):
+        """
+        Initialize the cost model.
+
+        Args:
+            max_history: Maximum number of per-file timings to remember
+        """
+        self.max_history = max_history
+        self.ms_per_kb: Dict[str, float] = {}
+        self.file_history: "OrderedDict[str, float]" = OrderedDict()
+
+    def estimate(self, file_path: str, size_bytes: int, language: str) -> float:
+        """
+        Estimate the analysis time of a file.
+
+        Args:
+            file_path: Path to file
+            size_bytes: File size in bytes
+            language: Language name used to pick the rate
+
+        Returns:
+            Estimated cost in milliseconds
+        """
+        if file_path in self.file_history:
+            return self.file_history[file_path]
+        rate = self.ms_per_kb.get(language, self.DEFAULT_MS_PER_KB)
+        return self.BASE_COST_MS + rate * size_bytes / 1024
+
+    def observe(self, file_path: str, size_bytes: int, language: str, elapsed_ms: float) -> None:
+        """
+        Record the measured analysis time of a file.
+
+        Args:
+            file_path: Path to file
+            size_bytes: File size in bytes
+            language: Language name
+            elapsed_ms: Measured analysis time in milliseconds
+        """
+        self.file_history[file_path] = elapsed_ms
+        self.file_history.move_to_end(file_path)
+        while len(self.file_history) > self.max_history:
+            self.file_history.popitem(last=False)
+
+        if size_bytes > 0:
+            rate = max(0.0, elapsed_ms - self.BASE_COST_MS) * 1024 / size_bytes
+            previous = self.ms_per_kb.get(language)
+            self.ms_per_kb[language] = rate if previous is None else (
+                self.EWMA_ALPHA * rate + (1 - self.EWMA_ALPHA) * previous
+            )
+
+
+@dataclass
+class WorkItem:
+    """A file waiting to be analyzed.
+
+    Attributes:
+        file_path: Path to file
+        size_bytes: File size in bytes
+        language: Language name
+        priority: Dispatch tier; higher tiers start after all lower ones
+                  (used to defer files that timed out before)
+        cost_ms: Estimated cost in milliseconds
+    """
+    file_path: str
+    size_bytes: int
+    language: str
+    priority: int = 0
+    cost_ms: float = 0.0
+
+
+@dataclass
+class _Job:
+    """Scheduler-internal state of one run()."""
+    job_id: int
+    label: str
+    worker: Callable[[str], Awaitable[Any]]
+    measured: Optional[Callable[[str, Any], bool]] = None
+    pending: List[Tuple[int, float, int, WorkItem]] = field(default_factory=list)
+    running: Set[asyncio.Task] = field(default_factory=set)
+    results: "asyncio.Queue[Tuple[str, Any]]" = field(default_factory=asyncio.Queue)
+    remaining: int = 0
+    pending_cost_ms: float = 0.0
+    running_cost_ms: float = 0.0
+
+
+class AnalysisScheduler:
+    """
+    Dispatches file analyses longest-first with bounded concurrency.
+
+    All jobs share max_in_flight slots. Whenever a slot frees up, the next
+    job in round-robin order dispatches its most expensive pending file, so
+    concurrent codebases are interleaved fairly and large files start early
+    instead of dominating the tail of a run. Tasks are only created when a
+    slot is available, which keeps memory flat on large codebases.
+
+    Example:
+        >>> scheduler = AnalysisScheduler(max_in_flight=10)
+        >>> items = [WorkItem("a.py", 1024, "python"), WorkItem("b.py", 90000, "python")]
+        >>> async for file_path, result in scheduler.run("my_project", items, analyze):
+        ...     print(file_path, scheduler.queue_depth, scheduler.eta_seconds())
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        parallelism: int = 1,
+        cost_model: Optional[CostModel] = None
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_in_flight: Maximum number of concurrently running analyses
+            parallelism: Number of analyses that actually execute at the same
+                         time (execution backend workers), used for the ETA
+            cost_model: Cost model (a new one is created if not provided)
+        """
+        self.max_in_flight = max(1, max_in_flight)
+        self.parallelism = max(1, min(parallelism, self.max_in_flight))
+        self.cost_model = cost_model or CostModel()
+        self._jobs: Dict[int, _Job] = {}
+        self._rotation: Deque[int] = deque()
+        self._in_flight = 0
+        self._job_ids = itertools.count()
+        self._sequence = itertools.count()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of files waiting to be dispatched across all jobs."""
+        return sum(len(job.pending) for job in self._jobs.values())
+
+    @property
+    def in_flight(self) -> int:
+        """Number of analyses currently running."""
+        return self._in_flight
+
+    def eta_seconds(self, label: Optional[str] = None) -> float:
+        """
+        Estimate the time until queued and running work is finished.
+
+        Args:
+            label: Only count work of jobs with this label (all jobs if None)
+
+        Returns:
+            Estimated remaining time in seconds
+        """
+        remaining_ms = 0.0
+        for job in self._jobs.values():
+            if label is not None and job.label != label:
+                continue
+            # Running work is assumed half done on average
+            remaining_ms += job.pending_cost_ms + job.running_cost_ms / 2
+        return remaining_ms / self.parallelism / 1000
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of scheduler state.
+
+        Returns:
+            Dictionary with queue depth, in-flight count, active jobs and ETA
+        """
+        return {
+            'queue_depth': self.queue_depth,
+            'in_flight': self._in_flight,
+            'max_in_flight': self.max_in_flight,
+            'active_jobs': [job.label for job in self._jobs.values()],
+            'eta_seconds': self.eta_seconds()
+        }
+
+    async def run(
+        self,
+        label: str,
+        items: List[WorkItem],
+        worker: Callable[[str], Awaitable[Any]],
+        measured: Optional[Callable[[str, Any], bool]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Schedule a job and yield (file_path, result) pairs as they complete.
+
+        Exceptions raised by the worker are yielded as results. Closing the
+        iterator early drops the job's pending files and cancels its
+        running tasks.
+
+        Args:
+            label: Job label, usually the codebase ID
+            items: Files to analyze
+            worker: Coroutine function analyzing one file path
+            measured: Tells whether a (file_path, result) timing reflects a
+                      real analysis and should refine the cost model; results
+                      served from a cache or reused take almost no time and
+                      would make the file look cheap (all are used when None)
+
+        Yields:
+            Tuples of (file_path, result or exception)
+        """
+        job = _Job(job_id=next(self._job_ids), label=label, worker=worker, measured=measured)
+        for item in items:
+            item.cost_ms = self.cost_model.estimate(item.file_path, item.size_bytes, item.language)
+            # heapq is a min-heap: negate cost for longest-first within a tier
+            job.pending.append((item.priority, -item.cost_ms, next(self._sequence), item))
+            job.pending_cost_ms += item.cost_ms
+        heapq.heapify(job.pending)
+        job.remaining = len(items)
+
+        if job.remaining == 0:
+            return
+
+        self._jobs[job.job_id] = job
+        # A new job has not been served yet, so it takes the next free slot
+        self._rotation.appendleft(job.job_id)
+        logger.debug(
+            f"Scheduled job {label} with {len(items)} files "
+            f"(queue depth: {self.queue_depth}, eta: {self.eta_seconds():.1f}s)"
+        )
+
+        try:
+            self._dispatch()
+            while job.remaining > 0:
+                file_path, result = await job.results.get()
+                job.remaining -= 1
+                yield file_path, result
+        finally:
+            running = self._remove_job(job)
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        """Fill free slots round-robin across jobs with pending work."""
+        while self._in_flight < self.max_in_flight and self._rotation:
+            job_id = self._rotation.popleft()
+            job = self._jobs.get(job_id)
+            if job is None or not job.pending:
+                continue
+
+            *_, item = heapq.heappop(job.pending)
+            job.pending_cost_ms -= item.cost_ms
+            job.running_cost_ms += item.cost_ms
+            self._in_flight += 1
+            task = asyncio.ensure_future(self._execute(job, item))
+            job.running.add(task)
+            task.add_done_callback(job.running.discard)
+
+            if job.pending:
+                self._rotation.append(job_id)
+
+    async def _execute(self, job: _Job, item: WorkItem) -> None:
+        """Run the worker for one file, free its slot and deliver the result."""
+        start = time.perf_counter()
+        try:
+            result = await job.worker(item.file_path)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result = e
+        else:
+            if job.measured is None or job.measured(item.file_path, result):
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self.cost_model.observe(item.file_path, item.size_bytes, item.language, elapsed_ms)
+        finally:
+            # Release the slot before the consumer sees the result, so queue
+            # depth and ETA are up to date when it is delivered
+            job.running_cost_ms -= item.cost_ms
+            self._in_flight -= 1
+            self._dispatch()
+        job.results.put_nowait((item.file_path, result))
+
+    def _remove_job(self, job: _Job) -> List[asyncio.Task]:
+        """Drop a job's pending work and cancel its running tasks."""
+        self._jobs.pop(job.job_id, None)
+        job.pending.clear()
+        job.pending_cost_ms = 0.0
+        try:
+            self._rotation.remove(job.job_id)
+        except ValueError:
+            pass
+        running = list(job.running)
+        for task in running:
+            task.cancel()
+        return running
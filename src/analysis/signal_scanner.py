@@ -0,0 +1,289 @@
+"""
+Shared text scanning for pattern detectors.
+
+Detectors used to search file text on their own: a `keyword in line` loop
+per detector and per keyword, so the cost of pattern detection grew with
+every registered detector. Detectors now declare the text signals they
+need in `SIGNALS`, and `SignalScanner` finds all of them in one pass:
+
+- Literal signals of every detector are merged into a single trie-shaped
+  regular expression, matched at each position of the text. Its cost
+  depends on the text and on how often signals occur, not on how many
+  literals are registered.
+- Regular expression signals are run once per distinct pattern, however
+  many detectors declare them.
+
+Each detector then gets a `SignalMatches` with the offsets of its own
+signals, plus line lookups for the usual "which lines contain X" checks.
+Line lookups use the file's shared `SourceDocument` line index.
+"""
+
+import bisect
+import logging
+import re
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Pattern, Tuple, Union
+
+from .source_document import SourceDocument
+
+logger = logging.getLogger(__name__)
+
+# A signal is a literal string or a compiled regular expression
+Signal = Union[str, Pattern]
+
+_NO_OFFSETS: List[int] = []
+
+
+def _signal_key(signal: Signal) -> Hashable:
+    """Key identifying equal signals declared by different detectors."""
+    if isinstance(signal, str):
+        return signal
+    return (signal.pattern, signal.flags)
+
+
+def _trie_pattern(literals: Iterable[str]) -> str:
+    """
+    Build a regular expression matching the longest of the literals.
+
+    The literals are arranged in a trie, so matching at a position follows
+    one path through shared prefixes instead of trying every literal.
+    """
+    trie: Dict[str, dict] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy: longer literals are preferred over one ending here
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+class SignalMatches:
+    """
+    Offsets of a detector's signals in one file.
+
+    Literal signals list every occurrence, including overlapping ones;
+    regular expression signals list the start of each (non-overlapping)
+    match. Line numbers are 1-based.
+
+    Example:
+        >>> signals = detector.scan_signals(file_content)
+        >>> if 'yield' in signals:
+        ...     print(signals.lines('yield'))
+    """
+
+    def __init__(self, document: SourceDocument, offsets: Dict[str, List[int]], lengths: Dict[str, int]):
+        """
+        Initialize the matches.
+
+        Args:
+            document: Scanned document
+            offsets: Match offsets by signal name
+            lengths: Length of each literal signal (used by count)
+        """
+        self.document = document
+        self.offsets = offsets
+        self._lengths = lengths
+
+    @property
+    def text(self) -> str:
+        """Scanned text."""
+        return self.document.text
+
+    def __contains__(self, name: str) -> bool:
+        """Whether the signal occurs in the text."""
+        return bool(self.offsets.get(name))
+
+    def get(self, name: str) -> List[int]:
+        """Offsets of a signal (empty if it does not occur)."""
+        return self.offsets.get(name, _NO_OFFSETS)
+
+    def count(self, name: str) -> int:
+        """
+        Count non-overlapping occurrences of a signal.
+
+        Matches `str.count` for literals and `len(re.findall(...))` for
+        regular expressions.
+        """
+        offsets = self.offsets.get(name, _NO_OFFSETS)
+        length = self._lengths.get(name)
+        if not length:
+            return len(offsets)
+        count = 0
+        next_start = -1
+        for offset in offsets:
+            if offset >= next_start:
+                count += 1
+                next_start = offset + length
+        return count
+
+    def line_of(self, offset: int) -> int:
+        """Line number containing an offset."""
+        return self.document.line_of(offset)
+
+    def line(self, line_number: int) -> str:
+        """Text of a line, without its newline."""
+        return self.document.line(line_number)
+
+    def lines(self, *names: str) -> List[int]:
+        """
+        Lines on which any of the signals occur.
+
+        Args:
+            *names: Signal names
+
+        Returns:
+            Sorted line numbers, each listed once
+        """
+        found = set()
+        for name in names:
+            found.update(self.line_of(offset) for offset in self.offsets.get(name, _NO_OFFSETS))
+        return sorted(found)
+
+    def line_signals(self, names: Iterable[str]) -> Dict[int, List[str]]:
+        """
+        Map each line to the signals occurring on it.
+
+        Args:
+            names: Signal names, in the order they are reported per line
+
+        Returns:
+            {line number: signal names on that line}, in line order
+        """
+        by_line: Dict[int, List[str]] = {}
+        for name in names:
+            for line_number in sorted({self.line_of(offset) for offset in self.offsets.get(name, _NO_OFFSETS)}):
+                by_line.setdefault(line_number, []).append(name)
+        return dict(sorted(by_line.items()))
+
+    def in_lines(self, name: str, start_line: int, end_line: int) -> bool:
+        """
+        Whether a signal occurs between two lines (both included).
+
+        Args:
+            name: Signal name
+            start_line: First line of the range
+            end_line: Last line of the range
+        """
+        offsets = self.offsets.get(name)
+        if not offsets or end_line < start_line:
+            return False
+        starts = self.document.line_starts
+        if start_line > len(starts):
+            return False
+        start = starts[max(start_line, 1) - 1]
+        end = starts[end_line] if end_line < len(starts) else len(self.text) + 1
+        index = bisect.bisect_left(offsets, start)
+        return index < len(offsets) and offsets[index] < end
+
+
+class SignalScanner:
+    """
+    Finds the text signals of many detectors in one scan of a file.
+
+    Example:
+        >>> scanner = SignalScanner([detector.SIGNALS for detector in detectors])
+        >>> scan = scanner.scan(file_content)
+        >>> signals = scan.matches(detector.SIGNALS)
+    """
+
+    def __init__(self, signal_sets: Iterable[Mapping[str, Signal]]):
+        """
+        Compile the signals of several detectors.
+
+        Args:
+            signal_sets: Each detector's {signal name: literal or compiled regex}
+        """
+        literals = set()
+        patterns: Dict[Hashable, Pattern] = {}
+        for signals in signal_sets:
+            for signal in signals.values():
+                if isinstance(signal, str):
+                    if signal:
+                        literals.add(signal)
+                else:
+                    patterns.setdefault(_signal_key(signal), signal)
+
+        self.literals = frozenset(literals)
+        self.patterns = patterns
+        self._literal_regex: Optional[Pattern] = None
+        # Literals that also match wherever a longer literal starts with them
+        self._prefixes: Dict[str, Tuple[str, ...]] = {}
+        if literals:
+            self._literal_regex = re.compile('(?=(' + _trie_pattern(literals) + '))')
+            for literal in literals:
+                self._prefixes[literal] = tuple(
+                    literal[:length] for length in range(len(literal), 0, -1)
+                    if literal[:length] in literals
+                )
+
+    def scan(self, source: Union[str, SourceDocument]) -> 'SignalScan':
+        """
+        Find all signals in a text.
+
+        Args:
+            source: File content, as text or as the file's SourceDocument
+
+        Returns:
+            SignalScan from which each detector takes its SignalMatches
+        """
+        document = source if isinstance(source, SourceDocument) else SourceDocument.from_text(source)
+        text = document.text
+        found: Dict[Hashable, List[int]] = {}
+        if self._literal_regex is not None:
+            prefixes = self._prefixes
+            for match in self._literal_regex.finditer(text):
+                offset = match.start()
+                for literal in prefixes[match.group(1)]:
+                    offsets = found.get(literal)
+                    if offsets is None:
+                        found[literal] = [offset]
+                    else:
+                        offsets.append(offset)
+        for key, pattern in self.patterns.items():
+            offsets = [match.start() for match in pattern.finditer(text)]
+            if offsets:
+                found[key] = offsets
+        return SignalScan(document, found)
+
+
+class SignalScan:
+    """Result of scanning one text for the signals of several detectors."""
+
+    def __init__(self, document: SourceDocument, found: Dict[Hashable, List[int]]):
+        """
+        Initialize the scan result.
+
+        Args:
+            document: Scanned document
+            found: Offsets by signal key (literal, or regex pattern and flags)
+        """
+        self.document = document
+        self.found = found
+
+    def matches(self, signals: Mapping[str, Signal]) -> SignalMatches:
+        """
+        Get the matches of one detector's signals.
+
+        Args:
+            signals: The detector's {signal name: literal or compiled regex};
+                     must have been compiled into the scanner
+
+        Returns:
+            SignalMatches keyed by the detector's signal names
+        """
+        found = self.found
+        offsets = {}
+        lengths = {}
+        for name, signal in signals.items():
+            offsets[name] = found.get(_signal_key(signal), _NO_OFFSETS)
+            if isinstance(signal, str):
+                lengths[name] = len(signal)
+        return SignalMatches(self.document, offsets, lengths)
@@ -0,0 +1,68 @@
+"""
+Bounded-cost analysis of very large source files.
+
+Files above `skeleton_threshold_kb` (schema definitions, large controllers)
+are analyzed in skeleton mode: symbols are extracted without per-function
+complexity, and pattern detectors only see a sample of the file. Time and
+memory then grow with the number of declarations rather than with the
+amount of code inside them.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_MODE_SKELETON = "skeleton"
+
+# Number of evenly spaced windows the pattern detection sample is made of
+SAMPLE_WINDOWS = 4
+
+
+def sample_source(text: str, sample_chars: int, windows: int = SAMPLE_WINDOWS) -> str:
+    """
+    Sample a file's text for pattern detection.
+
+    The sample is made of `windows` runs of whole lines spread evenly over
+    the file, the first starting at the top (where imports and module-level
+    setup usually are). Lines between the windows are blanked rather than
+    removed, so line numbers in the sample match the original file.
+
+    Args:
+        text: Full file text
+        sample_chars: Approximate number of characters to keep
+        windows: Number of windows the sample is split into
+
+    Returns:
+        The text itself if it is no longer than sample_chars, otherwise the
+        sampled text with the same number of lines
+
+    Example:
+        >>> sample = sample_source(content, 256 * 1024)
+        >>> sample.count('\\n') == content.count('\\n')
+        True
+    """
+    if len(text) <= sample_chars:
+        return text
+
+    windows = max(windows, 1)
+    window_chars = max(sample_chars // windows, 1)
+    stride = len(text) / windows
+    parts = []
+    position = 0
+    for index in range(windows):
+        start = int(index * stride)
+        if start > 0:
+            # Start at the beginning of the next line
+            newline = text.find('\n', start - 1)
+            start = newline + 1 if newline != -1 else len(text)
+        start = max(start, position)
+        if start >= len(text):
+            break
+        # End after the last complete line of the window
+        end = text.rfind('\n', start, start + window_chars)
+        end = end + 1 if end != -1 else min(start + window_chars, len(text))
+        parts.append('\n' * text.count('\n', position, start))
+        parts.append(text[start:end])
+        position = end
+    parts.append('\n' * text.count('\n', position))
+    return ''.join(parts)
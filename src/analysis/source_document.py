@@ -0,0 +1,149 @@
+"""
+Source documents with a shared line index.
+
+Detectors and course generators often need "lines N to M of this file" or
+"which line is this offset on". Splitting the whole text for every function
+or class they look at costs O(symbols x file size). A `SourceDocument` is
+built once per file and holds:
+
+- the raw bytes (as read for hashing and parsing),
+- the decoded text, decoded on first use,
+- a line-start offset array, built on first use.
+
+Line-range slices are then a single `str` slice of the requested range, and
+offset <-> line mapping is a binary search or an index lookup.
+"""
+
+import bisect
+import re
+from typing import Iterator, List, Optional
+
+_NEWLINE = re.compile('\n')
+
+
+class SourceDocument:
+    """
+    One file's bytes, decoded text and line index.
+
+    Line numbers are 1-based, and lines are separated by '\\n' only, as with
+    `text.split('\\n')`: a trailing newline ends in an empty last line.
+
+    Example:
+        >>> document = SourceDocument(source_bytes)
+        >>> body = document.lines(func.start_line, func.end_line)
+        >>> document.line_of(match.start())
+        12
+    """
+
+    __slots__ = ('data', '_text', '_line_starts')
+
+    def __init__(self, data: Optional[bytes] = None, text: Optional[str] = None):
+        """
+        Initialize the document from bytes, text or both.
+
+        Args:
+            data: Raw file content
+            text: Decoded file content (decoded from data when omitted)
+        """
+        if data is None and text is None:
+            raise ValueError("SourceDocument needs data or text")
+        self.data = data
+        self._text = text
+        self._line_starts: Optional[List[int]] = None
+
+    @classmethod
+    def from_text(cls, text: str) -> 'SourceDocument':
+        """Create a document from already decoded text."""
+        return cls(text=text)
+
+    @classmethod
+    def from_path(cls, file_path: str) -> 'SourceDocument':
+        """
+        Read a file into a document.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        with open(file_path, 'rb') as f:
+            return cls(f.read())
+
+    @classmethod
+    def from_text_file(cls, file_path: str) -> 'SourceDocument':
+        """
+        Read a file as UTF-8 text into a document.
+
+        Unlike `from_path`, the file is read in text mode: newlines are
+        normalized to '\\n' and invalid UTF-8 raises instead of being dropped.
+
+        Raises:
+            OSError: If the file cannot be read
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return cls(text=f.read())
+
+    @property
+    def text(self) -> str:
+        """Decoded text (UTF-8, undecodable bytes dropped)."""
+        if self._text is None:
+            self._text = self.data.decode('utf-8', errors='ignore')
+        return self._text
+
+    @property
+    def line_starts(self) -> List[int]:
+        """Text offset at which each line starts."""
+        if self._line_starts is None:
+            self._line_starts = [0] + [match.end() for match in _NEWLINE.finditer(self.text)]
+        return self._line_starts
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines, as `len(text.split('\\n'))`."""
+        return len(self.line_starts)
+
+    def line_of(self, offset: int) -> int:
+        """Line number containing a text offset."""
+        return bisect.bisect_right(self.line_starts, offset)
+
+    def offset_of(self, line_number: int) -> int:
+        """Text offset at which a line starts."""
+        return self.line_starts[line_number - 1]
+
+    def _end_of(self, line_number: int) -> int:
+        """Text offset at which a line ends, excluding its newline."""
+        starts = self.line_starts
+        return starts[line_number] - 1 if line_number < len(starts) else len(self.text)
+
+    def line(self, line_number: int) -> str:
+        """Text of a line, without its newline."""
+        return self.text[self.offset_of(line_number):self._end_of(line_number)]
+
+    def lines(self, start_line: int, end_line: int) -> str:
+        """
+        Text of a range of lines, without the final newline.
+
+        The range is clamped to the document, like `lines[start - 1:end]`
+        on a list of lines.
+
+        Args:
+            start_line: First line of the range
+            end_line: Last line of the range (included)
+
+        Returns:
+            The lines joined by '\\n' ('' for an empty range)
+        """
+        start_line = max(start_line, 1)
+        end_line = min(end_line, self.line_count)
+        if end_line < start_line:
+            return ''
+        return self.text[self.offset_of(start_line):self._end_of(end_line)]
+
+    def iter_lines(self, start_line: int = 1, end_line: Optional[int] = None) -> Iterator[str]:
+        """Yield lines one at a time, without their newlines."""
+        end_line = self.line_count if end_line is None else min(end_line, self.line_count)
+        for line_number in range(max(start_line, 1), end_line + 1):
+            yield self.line(line_number)
+
+    def __len__(self) -> int:
+        """Length of the decoded text."""
+        return len(self.text)
@@ -6,10 +6,13 @@ imports, etc.) from parsed Abstract Syntax Trees across multiple languages.
 """
 
 import logging
+import threading
 from typing import List, Optional, Any, Dict
 from dataclasses import dataclass, field
 
 from .ast_parser import ParseResult
+from .ast_visitor import DECISION_NODES, FileVisit, visit_file
+from .tree_walk import count_nodes, walk_tree
 
 logger = logging.getLogger(__name__)
 
@@ -123,16 +126,36 @@ class SymbolExtractor:
     Supports multiple languages with language-specific extraction logic.
     """
     
+    # Node types holding JavaScript/TypeScript symbols
+    JAVASCRIPT_SYMBOL_NODES = frozenset({
+        'function_declaration', 'function', 'lexical_declaration', 'class_declaration', 'class'
+    })
+    
     def __init__(self):
         """Initialize the Symbol Extractor."""
+        # FileVisit of the file being extracted, per thread
+        self._local = threading.local()
         logger.debug("SymbolExtractor initialized")
     
-    def extract_symbols(self, parse_result: ParseResult) -> SymbolInfo:
+    def extract_symbols(
+        self,
+        parse_result: ParseResult,
+        visit: Optional[FileVisit] = None,
+        reuse: Optional[Any] = None
+    ) -> SymbolInfo:
         """
         Extract all symbols from parsed file.
         
+        Function complexity is looked up in a FileVisit, which gathers the
+        metrics of every function in one traversal of the tree.
+        
         Args:
             parse_result: Result from AST parser
+            visit: FileVisit of the tree (computed when omitted); pass one to
+                   share it with the complexity and documentation analyzers
+            reuse: IncrementalReuse holding the symbols of the file's previous
+                   version (see incremental_parse); only query-based
+                   extraction reuses symbols, the tree walk ignores it
         
         Returns:
             SymbolInfo containing all extracted symbols
@@ -141,6 +164,42 @@ class SymbolExtractor:
             >>> symbols = extractor.extract_symbols(parse_result)
             >>> print(f"Found {len(symbols.functions)} functions")
         """
+        self._local.visit = visit if visit is not None else visit_file(parse_result)
+        self._local.reuse = reuse
+        try:
+            return self._extract_symbols(parse_result)
+        finally:
+            self._local.visit = None
+            self._local.reuse = None
+    
+    def extract_skeleton(self, parse_result: ParseResult) -> SymbolInfo:
+        """
+        Extract declarations and imports without measuring complexity.
+        
+        Used for very large files (see skeleton). Functions, classes and
+        methods are reported with their signatures, docstrings and line
+        ranges, but their bodies are not walked: every complexity is left
+        at the minimum of 1.
+        
+        Args:
+            parse_result: Result from AST parser
+        
+        Returns:
+            SymbolInfo with the file's declarations and imports
+        
+        Example:
+            >>> symbols = extractor.extract_skeleton(parse_result)
+        """
+        self._local.visit = None
+        self._local.reuse = None
+        self._local.skeleton = True
+        try:
+            return self._extract_symbols(parse_result)
+        finally:
+            self._local.skeleton = False
+    
+    def _extract_symbols(self, parse_result: ParseResult) -> SymbolInfo:
+        """Route to the language-specific extractor."""
         language = parse_result.language
         
         # Route to language-specific extractor
@@ -470,38 +529,25 @@ class SymbolExtractor:
         - except
         - case (in match statements)
         
+        Uses the metrics of the current FileVisit and only walks the
+        function's subtree for nodes the visit did not record. Skeleton
+        extraction does not measure complexity and always returns 1.
+        
         Args:
             node: Function node to analyze
         
         Returns:
             Cyclomatic complexity score
         """
-        complexity = 1
-        
-        # Decision point node types
-        decision_nodes = {
-            'if_statement', 'elif_clause',
-            'for_statement', 'while_statement',
-            'except_clause',
-            'case_clause',  # Python 3.10+ match statements
-            'boolean_operator'  # and, or
-        }
-        
-        # Recursively count decision points
-        def count_decisions(n: Any) -> int:
-            count = 0
-            
-            if n.type in decision_nodes:
-                count += 1
-            
-            for child in n.children:
-                count += count_decisions(child)
-            
-            return count
-        
-        complexity += count_decisions(node)
-        
-        return complexity
+        if getattr(self._local, 'skeleton', False):
+            return 1
+        visit = getattr(self._local, 'visit', None)
+        metrics = visit.lookup(node) if visit is not None else None
+        if metrics is not None:
+            return metrics.complexity
+        
+        # Count decision points without recursion
+        return 1 + count_nodes(node, DECISION_NODES)
     
     def _extract_javascript_symbols(self, parse_result: ParseResult) -> SymbolInfo:
         """
@@ -535,29 +581,33 @@ class SymbolExtractor:
         return symbols
     
     def _traverse_javascript_node(self, node: Any, symbols: SymbolInfo, is_top_level: bool = False):
-        """Traverse JavaScript AST and extract symbols."""
-        # Extract functions
-        if node.type in ['function_declaration', 'function']:
-            func_info = self._extract_javascript_function(node)
-            if func_info and is_top_level:
-                symbols.functions.append(func_info)
-        
-        # Extract arrow functions (const x = () => {})
-        elif node.type == 'lexical_declaration' and is_top_level:
-            func_info = self._extract_javascript_arrow_function(node)
-            if func_info:
-                symbols.functions.append(func_info)
+        """
+        Traverse JavaScript AST and extract symbols.
         
-        # Extract classes
-        elif node.type in ['class_declaration', 'class']:
-            class_info = self._extract_javascript_class(node)
-            if class_info and is_top_level:
-                symbols.classes.append(class_info)
+        Functions, arrow functions and classes are extracted wherever they
+        are declared below a top-level node, in source order.
+        """
+        if not (is_top_level or node.type == 'program'):
+            return
         
-        # Traverse children for top-level declarations
-        if is_top_level or node.type == 'program':
-            for child in node.children:
-                self._traverse_javascript_node(child, symbols, is_top_level=True)
+        for current in walk_tree(node, self.JAVASCRIPT_SYMBOL_NODES):
+            # Extract functions
+            if current.type in ['function_declaration', 'function']:
+                func_info = self._extract_javascript_function(current)
+                if func_info:
+                    symbols.functions.append(func_info)
+            
+            # Extract arrow functions (const x = () => {})
+            elif current.type == 'lexical_declaration':
+                func_info = self._extract_javascript_arrow_function(current)
+                if func_info:
+                    symbols.functions.append(func_info)
+            
+            # Extract classes
+            else:
+                class_info = self._extract_javascript_class(current)
+                if class_info:
+                    symbols.classes.append(class_info)
     
     def _extract_javascript_function(self, node: Any) -> Optional[FunctionInfo]:
         """Extract function information from JavaScript function node."""
@@ -923,14 +973,11 @@ class SymbolExtractor:
         return symbols
     
     def _traverse_java_node(self, node: Any, symbols: SymbolInfo):
-        """Traverse Java AST and extract symbols."""
-        if node.type == 'class_declaration':
-            class_info = self._extract_java_class(node)
+        """Traverse Java AST and extract classes at any depth."""
+        for current in walk_tree(node, ('class_declaration',)):
+            class_info = self._extract_java_class(current)
             if class_info:
                 symbols.classes.append(class_info)
-        
-        for child in node.children:
-            self._traverse_java_node(child, symbols)
     
     def _extract_java_class(self, node: Any) -> Optional[ClassInfo]:
         """Extract class information from Java class node."""
@@ -1418,14 +1465,11 @@ class SymbolExtractor:
         return symbols
     
     def _traverse_csharp_node(self, node: Any, symbols: SymbolInfo):
-        """Traverse C# AST."""
-        if node.type == 'class_declaration':
-            class_info = self._extract_csharp_class(node)
+        """Traverse C# AST and extract classes at any depth."""
+        for current in walk_tree(node, ('class_declaration',)):
+            class_info = self._extract_csharp_class(current)
             if class_info:
                 symbols.classes.append(class_info)
-        
-        for child in node.children:
-            self._traverse_csharp_node(child, symbols)
     
     def _extract_csharp_class(self, node: Any) -> Optional[ClassInfo]:
         """Extract class from C# AST."""
@@ -1565,18 +1609,16 @@ class SymbolExtractor:
         return symbols
     
     def _traverse_php_node(self, node: Any, symbols: SymbolInfo):
-        """Traverse PHP AST."""
-        if node.type == 'function_definition':
-            func_info = self._extract_php_function(node)
-            if func_info:
-                symbols.functions.append(func_info)
-        elif node.type == 'class_declaration':
-            class_info = self._extract_php_class(node)
-            if class_info:
-                symbols.classes.append(class_info)
-        
-        for child in node.children:
-            self._traverse_php_node(child, symbols)
+        """Traverse PHP AST and extract functions and classes at any depth."""
+        for current in walk_tree(node, ('function_definition', 'class_declaration')):
+            if current.type == 'function_definition':
+                func_info = self._extract_php_function(current)
+                if func_info:
+                    symbols.functions.append(func_info)
+            else:
+                class_info = self._extract_php_class(current)
+                if class_info:
+                    symbols.classes.append(class_info)
     
     def _extract_php_function(self, node: Any) -> Optional[FunctionInfo]:
         """Extract function from PHP AST."""
@@ -0,0 +1,256 @@
+"""
+Declarative symbol extraction with tree-sitter queries.
+
+Each language has a `.scm` query file in the `queries` directory whose
+captures mark the nodes that become symbols (`@function`, `@class`, ...).
+Queries run in tree-sitter's C code and return only the captured nodes,
+so the Python side never visits the rest of the tree. Compiled queries
+are cached per language.
+
+`QuerySymbolExtractor` turns the captures into the same `SymbolInfo` that
+`SymbolExtractor` builds by walking the tree, reusing its per-node
+extraction of names, parameters, docstrings and decorators.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tree_sitter_languages import get_language
+
+from .ast_parser import ParseResult
+from .symbol_extractor import SymbolExtractor, SymbolInfo
+
+logger = logging.getLogger(__name__)
+
+QUERY_DIR = os.path.join(os.path.dirname(__file__), 'queries')
+
+# Languages sharing another language's query file
+QUERY_FILES = {
+    'typescript': 'javascript',
+    'tsx': 'javascript',
+}
+
+
+class SymbolQuery:
+    """
+    Compiled symbol query of one language.
+
+    Example:
+        >>> query = get_symbol_query('python')
+        >>> captures = query.captures(parse_result.root_node)
+        >>> [node.type for node in captures.get('function', [])]
+    """
+
+    def __init__(self, language: str, source: str):
+        """
+        Compile a query.
+
+        Args:
+            language: Parser language name
+            source: Query source in tree-sitter's S-expression syntax
+
+        Raises:
+            Exception: If the query does not compile for the language
+        """
+        self.language = language
+        self.query = get_language(language).query(source)
+
+    def captures(self, root_node: Any) -> Dict[str, List[Any]]:
+        """
+        Run the query on a tree.
+
+        Args:
+            root_node: Root node of the tree
+
+        Returns:
+            Captured nodes by capture name, in document order (enclosing
+            nodes before the nodes they contain), each node once
+        """
+        captures: Dict[str, List[Any]] = {}
+        seen = set()
+        for node, name in self.query.captures(root_node):
+            key = (name, node.start_byte, node.end_byte, node.type)
+            if key not in seen:
+                seen.add(key)
+                captures.setdefault(name, []).append(node)
+        for nodes in captures.values():
+            nodes.sort(key=lambda node: (node.start_byte, -node.end_byte))
+        return captures
+
+
+_queries: Dict[str, Optional[SymbolQuery]] = {}
+_queries_lock = threading.Lock()
+
+
+def load_query_source(language: str) -> Optional[str]:
+    """
+    Read the query file of a language.
+
+    Args:
+        language: Parser language name
+
+    Returns:
+        Query source, or None if the language has no query file
+    """
+    path = os.path.join(QUERY_DIR, f"{QUERY_FILES.get(language, language)}.scm")
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def get_symbol_query(language: str) -> Optional[SymbolQuery]:
+    """
+    Get the compiled symbol query of a language, compiling it on first use.
+
+    Args:
+        language: Parser language name
+
+    Returns:
+        SymbolQuery, or None if the language has no query file or its
+        query does not compile
+    """
+    try:
+        return _queries[language]
+    except KeyError:
+        pass
+    with _queries_lock:
+        if language not in _queries:
+            query = None
+            source = load_query_source(language)
+            if source is not None:
+                try:
+                    query = SymbolQuery(language, source)
+                except Exception as e:
+                    logger.warning(f"Failed to compile symbol query for {language}: {e}")
+            _queries[language] = query
+        return _queries[language]
+
+
+class QuerySymbolExtractor(SymbolExtractor):
+    """
+    SymbolExtractor that locates symbols with tree-sitter queries.
+
+    Produces the same SymbolInfo as SymbolExtractor. Languages without a
+    usable query fall back to walking the tree. When given an IncrementalReuse,
+    captured definitions unchanged since the file's previous version are
+    not extracted again.
+    """
+
+    def _capture_handlers(self, language: str) -> Dict[str, Tuple[str, Callable[[Any], Any]]]:
+        """
+        Map capture names to the symbol list they fill and their extractor.
+
+        Args:
+            language: Parser language name
+
+        Returns:
+            {capture name: ('functions' or 'classes', extractor)}
+        """
+        if language == 'python':
+            return {
+                'function': ('functions', self._extract_python_function),
+                'function.decorated': ('functions', self._extract_decorated_python_function),
+                'class': ('classes', self._extract_python_class),
+                'class.decorated': ('classes', self._extract_decorated_python_class),
+            }
+        if language in ('javascript', 'typescript', 'tsx'):
+            return {
+                'function': ('functions', self._extract_javascript_function),
+                'arrow': ('functions', self._extract_javascript_arrow_function),
+                'class': ('classes', self._extract_javascript_class),
+            }
+        if language == 'java':
+            return {'class': ('classes', self._extract_java_class)}
+        if language == 'go':
+            return {
+                'function': ('functions', self._extract_go_function),
+                'method': ('functions', self._extract_go_method),
+                'class': ('classes', self._extract_go_type),
+            }
+        if language == 'rust':
+            return {
+                'function': ('functions', self._extract_rust_function),
+                'class': ('classes', self._extract_rust_struct),
+            }
+        if language in ('cpp', 'c'):
+            return {
+                'function': ('functions', self._extract_cpp_function),
+                'class': ('classes', self._extract_cpp_class),
+            }
+        if language == 'c_sharp':
+            return {'class': ('classes', self._extract_csharp_class)}
+        if language == 'ruby':
+            return {
+                'function': ('functions', self._extract_ruby_method),
+                'class': ('classes', self._extract_ruby_class),
+            }
+        if language == 'php':
+            return {
+                'function': ('functions', self._extract_php_function),
+                'class': ('classes', self._extract_php_class),
+            }
+        return {}
+
+    def _extract_symbols(self, parse_result: ParseResult) -> SymbolInfo:
+        """Build symbols from query captures, or walk the tree without a query."""
+        language = parse_result.language
+        query = get_symbol_query(language)
+        handlers = self._capture_handlers(language)
+        if query is None or not handlers:
+            return super()._extract_symbols(parse_result)
+
+        root_node = parse_result.root_node
+        captures = query.captures(root_node)
+        symbols = SymbolInfo()
+        reuse = getattr(self._local, 'reuse', None)
+
+        # Functions and classes from different captures interleave in document order
+        for target in ('functions', 'classes'):
+            nodes = []
+            for name, (handler_target, extractor) in handlers.items():
+                if handler_target == target:
+                    nodes.extend((node, name, extractor) for node in captures.get(name, []))
+            nodes.sort(key=lambda item: (item[0].start_byte, -item[0].end_byte))
+            symbol_list = getattr(symbols, target)
+            for node, name, extractor in nodes:
+                if reuse is not None:
+                    symbol = reuse.extract(name, node, extractor, self._local.visit)
+                else:
+                    symbol = extractor(node)
+                if symbol:
+                    symbol_list.append(symbol)
+
+        if language == 'python':
+            symbols.imports = self._extract_python_imports(root_node)
+        elif language in ('javascript', 'typescript', 'tsx'):
+            symbols.imports = self._extract_javascript_imports(root_node)
+            symbols.exports = self._extract_javascript_exports(root_node)
+        elif language == 'java':
+            symbols.imports = self._extract_java_imports(root_node)
+        elif language == 'go':
+            symbols.imports = self._extract_go_imports(root_node)
+
+        logger.debug(
+            f"Extracted {len(symbols.functions)} functions, "
+            f"{len(symbols.classes)} classes, "
+            f"{len(symbols.imports)} imports from {language} file using queries"
+        )
+
+        return symbols
+
+    def _extract_decorated_python_function(self, node: Any):
+        """Extract a decorated Python function with its decorators."""
+        func_info = self._extract_python_function(node)
+        if func_info:
+            func_info.decorators = self._extract_python_decorators(node)
+        return func_info
+
+    def _extract_decorated_python_class(self, node: Any):
+        """Extract a decorated Python class with its decorators."""
+        class_info = self._extract_python_class(node)
+        if class_info:
+            class_info.decorators = self._extract_python_decorators(node)
+        return class_info
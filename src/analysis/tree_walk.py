@@ -0,0 +1,143 @@
+"""
+Iterative syntax tree traversal with tree-sitter cursors.
+
+Walking a tree by recursing over `node.children` builds a child list at
+every level and fails with RecursionError on deeply nested (often
+generated) code. The helpers here move a single `TreeCursor` through the
+tree instead: traversal depth is bounded only by memory, and callers can
+filter by node type and cut off whole subtrees early.
+"""
+
+from typing import Any, Callable, Collection, Iterator, List, Optional, Tuple
+
+
+def walk_tree_depths(
+    node: Any,
+    prune: Optional[Callable[[Any], bool]] = None,
+    max_depth: Optional[int] = None
+) -> Iterator[Tuple[Any, int]]:
+    """
+    Walk a subtree in pre-order, yielding each node with its depth.
+
+    Args:
+        node: Root of the subtree (depth 0)
+        prune: Predicate; the descendants of nodes for which it returns
+               True are skipped (the nodes themselves are still yielded)
+        max_depth: Deepest level to visit (None for no limit)
+
+    Yields:
+        (node, depth) tuples, parents before their children and siblings
+        in source order
+
+    Example:
+        >>> for node, depth in walk_tree_depths(root):
+        ...     print("  " * depth + node.type)
+    """
+    cursor = node.walk()
+    goto_first_child = cursor.goto_first_child
+    goto_next_sibling = cursor.goto_next_sibling
+    goto_parent = cursor.goto_parent
+    depth = 0
+    while True:
+        current = cursor.node
+        yield current, depth
+        if (max_depth is None or depth < max_depth) and not (prune and prune(current)):
+            if goto_first_child():
+                depth += 1
+                continue
+        while depth > 0 and not goto_next_sibling():
+            goto_parent()
+            depth -= 1
+        if depth == 0:
+            return
+
+
+def walk_tree(
+    node: Any,
+    node_types: Optional[Collection[str]] = None,
+    prune: Optional[Callable[[Any], bool]] = None,
+    max_depth: Optional[int] = None
+) -> Iterator[Any]:
+    """
+    Walk a subtree in pre-order.
+
+    Args:
+        node: Root of the subtree
+        node_types: Only yield nodes of these types (None for all)
+        prune: Predicate; the descendants of nodes for which it returns
+               True are skipped
+        max_depth: Deepest level to visit below node (None for no limit)
+
+    Yields:
+        Nodes in pre-order (the order of a recursive walk over children)
+
+    Example:
+        >>> classes = list(walk_tree(root, node_types={'class_declaration'}))
+    """
+    for current, _ in walk_tree_depths(node, prune, max_depth):
+        if node_types is None or current.type in node_types:
+            yield current
+
+
+def count_nodes(node: Any, node_types: Collection[str], predicate: Optional[Callable[[Any], bool]] = None) -> int:
+    """
+    Count the nodes of some types in a subtree.
+
+    Args:
+        node: Root of the subtree (counted too)
+        node_types: Node types to count
+        predicate: Optional extra condition a node must meet to be counted
+
+    Returns:
+        Number of matching nodes
+    """
+    return sum(
+        1 for current in walk_tree(node, node_types)
+        if predicate is None or predicate(current)
+    )
+
+
+def max_nesting_depth(node: Any, nesting_types: Collection[str]) -> int:
+    """
+    Deepest nesting of nodes of the given types within a subtree.
+
+    Args:
+        node: Root of the subtree
+        nesting_types: Node types that increase the nesting depth
+
+    Returns:
+        Largest number of nesting nodes on any path from node down
+        (node itself included)
+    """
+    # levels[d] is the nesting depth at tree depth d, including that node
+    levels: List[int] = []
+    deepest = 0
+    for current, depth in walk_tree_depths(node):
+        nesting = (levels[depth - 1] if depth else 0) + (current.type in nesting_types)
+        if depth < len(levels):
+            levels[depth] = nesting
+        else:
+            levels.append(nesting)
+        if nesting > deepest:
+            deepest = nesting
+    return deepest
+
+
+def find_error_nodes(node: Any) -> List[Any]:
+    """
+    Find the ERROR and MISSING nodes of a subtree.
+
+    Subtrees without errors are skipped using tree-sitter's `has_error`
+    flag, so clean regions of a file with a few syntax errors are not
+    visited.
+
+    Args:
+        node: Root of the subtree
+
+    Returns:
+        Error nodes in source order
+    """
+    return [
+        current for current in walk_tree(node, prune=lambda n: not n.has_error)
+        if current.type == 'ERROR' or current.is_missing
+    ]
@@ -9,6 +9,7 @@ import re
 from typing import List, Optional
 
 from .pattern_detector import BasePatternDetector, DetectedPattern
+from .signal_scanner import SignalMatches
 from .symbol_extractor import SymbolInfo
 
 logger = logging.getLogger(__name__)
@@ -17,15 +18,33 @@ logger = logging.getLogger(__name__)
 class JavaPatternDetector(BasePatternDetector):
     """Detects Java patterns: annotations, streams, generics, exceptions."""
     
-    def detect(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> List[DetectedPattern]:
+    LANGUAGES = frozenset({'java'})
+    EXTENSIONS = frozenset({'.java'})
+    
+    SIGNALS = {
+        'annotation': re.compile(r'^[^\S\n]*@(?![^\n]*//)', re.MULTILINE),
+        '.stream(': '.stream(',
+        '.parallelStream(': '.parallelStream(',
+        '<': '<',
+        '<!--': '<!--',
+    }
+    
+    def detect(
+        self,
+        symbol_info: SymbolInfo,
+        file_content: str,
+        file_path: str,
+        signals: Optional[SignalMatches] = None
+    ) -> List[DetectedPattern]:
         if not file_path.endswith('.java'):
             return []
         
         patterns = []
-        lines = file_content.split('\n')
+        if signals is None:
+            signals = self.scan_signals(file_content)
         
         # Annotations
-        annotation_count = sum(1 for line in lines if line.strip().startswith('@') and '//' not in line)
+        annotation_count = signals.count('annotation')
         if annotation_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="java_annotations",
@@ -37,7 +56,7 @@ class JavaPatternDetector(BasePatternDetector):
             ))
         
         # Streams
-        stream_count = file_content.count('.stream(') + file_content.count('.parallelStream(')
+        stream_count = signals.count('.stream(') + signals.count('.parallelStream(')
         if stream_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="java_streams",
@@ -49,7 +68,7 @@ class JavaPatternDetector(BasePatternDetector):
             ))
         
         # Generics
-        generic_count = file_content.count('<') - file_content.count('<!--')
+        generic_count = signals.count('<') - signals.count('<!--')
         if generic_count > 5:
             patterns.append(DetectedPattern(
                 pattern_type="java_generics",
@@ -66,14 +85,32 @@ class JavaPatternDetector(BasePatternDetector):
 class GoPatternDetector(BasePatternDetector):
     """Detects Go patterns: goroutines, channels, defer, interfaces."""
     
-    def detect(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> List[DetectedPattern]:
+    LANGUAGES = frozenset({'go'})
+    EXTENSIONS = frozenset({'.go'})
+    
+    SIGNALS = {
+        'go ': 'go ',
+        'chan ': 'chan ',
+        '<-': '<-',
+        'defer ': 'defer ',
+    }
+    
+    def detect(
+        self,
+        symbol_info: SymbolInfo,
+        file_content: str,
+        file_path: str,
+        signals: Optional[SignalMatches] = None
+    ) -> List[DetectedPattern]:
         if not file_path.endswith('.go'):
             return []
         
         patterns = []
+        if signals is None:
+            signals = self.scan_signals(file_content)
         
         # Goroutines
-        goroutine_count = file_content.count('go ')
+        goroutine_count = signals.count('go ')
         if goroutine_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="go_goroutines",
@@ -85,7 +122,7 @@ class GoPatternDetector(BasePatternDetector):
             ))
         
         # Channels
-        channel_count = file_content.count('chan ') + file_content.count('<-')
+        channel_count = signals.count('chan ') + signals.count('<-')
         if channel_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="go_channels",
@@ -97,7 +134,7 @@ class GoPatternDetector(BasePatternDetector):
             ))
         
         # Defer
-        defer_count = file_content.count('defer ')
+        defer_count = signals.count('defer ')
         if defer_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="go_defer",
@@ -114,14 +151,33 @@ class GoPatternDetector(BasePatternDetector):
 class RustPatternDetector(BasePatternDetector):
     """Detects Rust patterns: ownership, lifetimes, traits, macros."""
     
-    def detect(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> List[DetectedPattern]:
+    LANGUAGES = frozenset({'rust'})
+    EXTENSIONS = frozenset({'.rs'})
+    
+    SIGNALS = {
+        'lifetime': re.compile(r"'[a-z]+"),
+        'impl ': 'impl ',
+        'trait ': 'trait ',
+        '!': '!',
+        '!=': '!=',
+    }
+    
+    def detect(
+        self,
+        symbol_info: SymbolInfo,
+        file_content: str,
+        file_path: str,
+        signals: Optional[SignalMatches] = None
+    ) -> List[DetectedPattern]:
         if not file_path.endswith('.rs'):
             return []
         
         patterns = []
+        if signals is None:
+            signals = self.scan_signals(file_content)
         
         # Lifetimes
-        lifetime_count = len(re.findall(r"'[a-z]+", file_content))
+        lifetime_count = signals.count('lifetime')
         if lifetime_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="rust_lifetimes",
@@ -133,7 +189,7 @@ class RustPatternDetector(BasePatternDetector):
             ))
         
         # Traits
-        trait_count = file_content.count('impl ') + file_content.count('trait ')
+        trait_count = signals.count('impl ') + signals.count('trait ')
         if trait_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="rust_traits",
@@ -145,7 +201,7 @@ class RustPatternDetector(BasePatternDetector):
             ))
         
         # Macros
-        macro_count = file_content.count('!') - file_content.count('!=')
+        macro_count = signals.count('!') - signals.count('!=')
         if macro_count > 5:
             patterns.append(DetectedPattern(
                 pattern_type="rust_macros",
@@ -163,15 +219,37 @@ class RustPatternDetector(BasePatternDetector):
 class CppPatternDetector(BasePatternDetector):
     """Detects C++ patterns: templates, RAII, smart pointers, STL."""
     
-    def detect(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> List[DetectedPattern]:
+    LANGUAGES = frozenset({'cpp', 'c'})
+    EXTENSIONS = frozenset({'.cpp', '.cc', '.cxx', '.hpp', '.h'})
+    
+    SIGNALS = {
+        'template<': 'template<',
+        'unique_ptr': 'unique_ptr',
+        'shared_ptr': 'shared_ptr',
+        'weak_ptr': 'weak_ptr',
+        'std::vector': 'std::vector',
+        'std::map': 'std::map',
+        'std::set': 'std::set',
+        'std::unordered': 'std::unordered',
+    }
+    
+    def detect(
+        self,
+        symbol_info: SymbolInfo,
+        file_content: str,
+        file_path: str,
+        signals: Optional[SignalMatches] = None
+    ) -> List[DetectedPattern]:
         if not (file_path.endswith('.cpp') or file_path.endswith('.cc') or 
                 file_path.endswith('.cxx') or file_path.endswith('.hpp') or file_path.endswith('.h')):
             return []
         
         patterns = []
+        if signals is None:
+            signals = self.scan_signals(file_content)
         
         # Templates
-        template_count = file_content.count('template<')
+        template_count = signals.count('template<')
         if template_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="cpp_templates",
@@ -183,8 +261,8 @@ class CppPatternDetector(BasePatternDetector):
             ))
         
         # Smart pointers
-        smart_ptr_count = (file_content.count('unique_ptr') + file_content.count('shared_ptr') + 
-                          file_content.count('weak_ptr'))
+        smart_ptr_count = (signals.count('unique_ptr') + signals.count('shared_ptr') + 
+                          signals.count('weak_ptr'))
         if smart_ptr_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="cpp_smart_pointers",
@@ -196,8 +274,8 @@ class CppPatternDetector(BasePatternDetector):
             ))
         
         # STL containers
-        stl_count = (file_content.count('std::vector') + file_content.count('std::map') + 
-                    file_content.count('std::set') + file_content.count('std::unordered'))
+        stl_count = (signals.count('std::vector') + signals.count('std::map') + 
+                    signals.count('std::set') + signals.count('std::unordered'))
         if stl_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="cpp_stl_containers",
@@ -215,15 +293,38 @@ class CppPatternDetector(BasePatternDetector):
 class CSharpPatternDetector(BasePatternDetector):
     """Detects C# patterns: LINQ, async/await, properties, attributes."""
     
-    def detect(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> List[DetectedPattern]:
+    LANGUAGES = frozenset({'c_sharp'})
+    EXTENSIONS = frozenset({'.cs'})
+    
+    SIGNALS = {
+        '.Select(': '.Select(',
+        '.Where(': '.Where(',
+        '.OrderBy(': '.OrderBy(',
+        'from ': 'from ',
+        ' in ': ' in ',
+        'async ': 'async ',
+        'await ': 'await ',
+        '{ get; set; }': '{ get; set; }',
+        '{ get; }': '{ get; }',
+    }
+    
+    def detect(
+        self,
+        symbol_info: SymbolInfo,
+        file_content: str,
+        file_path: str,
+        signals: Optional[SignalMatches] = None
+    ) -> List[DetectedPattern]:
         if not file_path.endswith('.cs'):
             return []
         
         patterns = []
+        if signals is None:
+            signals = self.scan_signals(file_content)
         
         # LINQ
-        linq_count = (file_content.count('.Select(') + file_content.count('.Where(') + 
-                     file_content.count('.OrderBy(') + file_content.count('from ') + file_content.count(' in '))
+        linq_count = (signals.count('.Select(') + signals.count('.Where(') + 
+                     signals.count('.OrderBy(') + signals.count('from ') + signals.count(' in '))
         if linq_count > 5:
             patterns.append(DetectedPattern(
                 pattern_type="csharp_linq",
@@ -235,7 +336,7 @@ class CSharpPatternDetector(BasePatternDetector):
             ))
         
         # Async/await
-        async_count = file_content.count('async ') + file_content.count('await ')
+        async_count = signals.count('async ') + signals.count('await ')
         if async_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="csharp_async_await",
@@ -247,7 +348,7 @@ class CSharpPatternDetector(BasePatternDetector):
             ))
         
         # Properties
-        property_count = file_content.count('{ get; set; }') + file_content.count('{ get; }')
+        property_count = signals.count('{ get; set; }') + signals.count('{ get; }')
         if property_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="csharp_properties",
@@ -265,14 +366,35 @@ class CSharpPatternDetector(BasePatternDetector):
 class RubyPatternDetector(BasePatternDetector):
     """Detects Ruby patterns: blocks, metaprogramming, symbols, mixins."""
     
-    def detect(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> List[DetectedPattern]:
+    LANGUAGES = frozenset({'ruby'})
+    EXTENSIONS = frozenset({'.rb'})
+    
+    SIGNALS = {
+        'symbol': re.compile(r':[a-zA-Z_]\w*'),
+        ' do ': ' do ',
+        '{': '{',
+        'define_method': 'define_method',
+        'method_missing': 'method_missing',
+        'class_eval': 'class_eval',
+        'instance_eval': 'instance_eval',
+    }
+    
+    def detect(
+        self,
+        symbol_info: SymbolInfo,
+        file_content: str,
+        file_path: str,
+        signals: Optional[SignalMatches] = None
+    ) -> List[DetectedPattern]:
         if not file_path.endswith('.rb'):
             return []
         
         patterns = []
+        if signals is None:
+            signals = self.scan_signals(file_content)
         
         # Blocks
-        block_count = file_content.count(' do ') + file_content.count('{')
+        block_count = signals.count(' do ') + signals.count('{')
         if block_count > 5:
             patterns.append(DetectedPattern(
                 pattern_type="ruby_blocks",
@@ -284,7 +406,7 @@ class RubyPatternDetector(BasePatternDetector):
             ))
         
         # Symbols
-        symbol_count = len(re.findall(r':[a-zA-Z_]\w*', file_content))
+        symbol_count = signals.count('symbol')
         if symbol_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="ruby_symbols",
@@ -296,8 +418,8 @@ class RubyPatternDetector(BasePatternDetector):
             ))
         
         # Metaprogramming
-        meta_count = (file_content.count('define_method') + file_content.count('method_missing') + 
-                     file_content.count('class_eval') + file_content.count('instance_eval'))
+        meta_count = (signals.count('define_method') + signals.count('method_missing') + 
+                     signals.count('class_eval') + signals.count('instance_eval'))
         if meta_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="ruby_metaprogramming",
@@ -315,14 +437,33 @@ class RubyPatternDetector(BasePatternDetector):
 class PHPPatternDetector(BasePatternDetector):
     """Detects PHP patterns: namespaces, traits, closures, type hints."""
     
-    def detect(self, symbol_info: SymbolInfo, file_content: str, file_path: str) -> List[DetectedPattern]:
+    LANGUAGES = frozenset({'php'})
+    EXTENSIONS = frozenset({'.php'})
+    
+    SIGNALS = {
+        'namespace ': 'namespace ',
+        'use ': 'use ',
+        'trait ': 'trait ',
+        'function(': 'function(',
+        'fn(': 'fn(',
+    }
+    
+    def detect(
+        self,
+        symbol_info: SymbolInfo,
+        file_content: str,
+        file_path: str,
+        signals: Optional[SignalMatches] = None
+    ) -> List[DetectedPattern]:
         if not file_path.endswith('.php'):
             return []
         
         patterns = []
+        if signals is None:
+            signals = self.scan_signals(file_content)
         
         # Namespaces
-        namespace_count = file_content.count('namespace ') + file_content.count('use ')
+        namespace_count = signals.count('namespace ') + signals.count('use ')
         if namespace_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="php_namespaces",
@@ -334,7 +475,7 @@ class PHPPatternDetector(BasePatternDetector):
             ))
         
         # Traits
-        trait_count = file_content.count('trait ') + file_content.count('use ')
+        trait_count = signals.count('trait ') + signals.count('use ')
         if trait_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="php_traits",
@@ -346,7 +487,7 @@ class PHPPatternDetector(BasePatternDetector):
             ))
         
         # Closures
-        closure_count = file_content.count('function(') + file_content.count('fn(')
+        closure_count = signals.count('function(') + signals.count('fn(')
         if closure_count > 0:
             patterns.append(DetectedPattern(
                 pattern_type="php_closures",
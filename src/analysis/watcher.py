@@ -0,0 +1,309 @@
+"""
+File system watchers for keeping a codebase analysis warm.
+
+A watcher reports batches of changed file paths under a codebase root. The
+default backend uses `watchfiles` (inotify on Linux, FSEvents on macOS,
+ReadDirectoryChangesW on Windows) when it is installed; otherwise a polling
+watcher compares (size, mtime_ns, inode) stat tuples between directory
+scans. `CodebaseWatcher` debounces the batches and hands each settled set
+of paths to the analysis engine, which re-analyzes only those files.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from .file_manifest import scan_files
+
+try:
+    import watchfiles
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    watchfiles = None
+    WATCHFILES_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+WATCH_BACKENDS = ('auto', 'watchfiles', 'polling')
+
+
+class FileWatcher(ABC):
+    """
+    Abstract base class for file system watchers.
+
+    Subclasses implement `changes()`, an async iterator yielding sets of
+    paths (created, modified or deleted) for which `include` returns True.
+    """
+
+    name = "base"
+
+    def __init__(self, root_path: str, ignore_dirs: Iterable[str], include: Callable[[str], bool]):
+        """
+        Initialize the watcher.
+
+        Args:
+            root_path: Directory to watch recursively
+            ignore_dirs: Directory names whose contents are never reported
+            include: Predicate selecting which file paths to report
+        """
+        self.root_path = root_path
+        self.ignore_dirs = set(ignore_dirs)
+        self.include = include
+        self._stop_event = asyncio.Event()
+
+    def is_relevant(self, path: str) -> bool:
+        """Check whether a path is outside ignored directories and included."""
+        relative = os.path.relpath(path, self.root_path)
+        parts = relative.split(os.sep)[:-1]
+        if relative.startswith(os.pardir) or self.ignore_dirs.intersection(parts):
+            return False
+        return self.include(path)
+
+    async def start(self):
+        """Prepare the watcher so that changes made from now on are reported."""
+
+    @abstractmethod
+    def changes(self) -> AsyncIterator[Set[str]]:
+        """Yield batches of changed paths until stop() is called."""
+        pass
+
+    def stop(self):
+        """Stop yielding changes."""
+        self._stop_event.set()
+
+
+class WatchfilesWatcher(FileWatcher):
+    """Native file system notifications through the watchfiles package."""
+
+    name = "watchfiles"
+
+    async def changes(self) -> AsyncIterator[Set[str]]:
+        async for batch in watchfiles.awatch(
+            self.root_path,
+            watch_filter=lambda change, path: self.is_relevant(path),
+            stop_event=self._stop_event
+        ):
+            yield set(path for _, path in batch)
+
+
+class PollingWatcher(FileWatcher):
+    """
+    Portable fallback that detects changes by rescanning the directory.
+
+    Each scan costs one stat call per file, the same as the stat manifest
+    pre-pass of an incremental analysis.
+    """
+
+    name = "polling"
+
+    def __init__(
+        self,
+        root_path: str,
+        ignore_dirs: Iterable[str],
+        include: Callable[[str], bool],
+        interval_seconds: float = 1.0
+    ):
+        """
+        Initialize the polling watcher.
+
+        Args:
+            root_path: Directory to watch recursively
+            ignore_dirs: Directory names whose contents are never reported
+            include: Predicate selecting which file paths to report
+            interval_seconds: Time between directory scans
+        """
+        super().__init__(root_path, ignore_dirs, include)
+        self.interval_seconds = interval_seconds
+        self._snapshot: Optional[Dict[str, Tuple[int, int, int]]] = None
+
+    def _scan(self) -> Dict[str, Tuple[int, int, int]]:
+        """Collect the stat tuple of every included file."""
+        return {
+            path: (st.st_size, st.st_mtime_ns, st.st_ino)
+            for path, st in scan_files(self.root_path, self.ignore_dirs, self.include)
+        }
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._snapshot = await loop.run_in_executor(None, self._scan)
+
+    async def changes(self) -> AsyncIterator[Set[str]]:
+        if self._snapshot is None:
+            await self.start()
+        loop = asyncio.get_running_loop()
+        while not self._stop_event.is_set():
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), self.interval_seconds)
+                break
+            except asyncio.TimeoutError:
+                pass
+            snapshot = await loop.run_in_executor(None, self._scan)
+            changed = set(
+                path for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            )
+            self._snapshot = snapshot
+            if changed:
+                yield changed
+
+
+def create_watcher(
+    backend: str,
+    root_path: str,
+    ignore_dirs: Iterable[str],
+    include: Callable[[str], bool],
+    poll_interval_seconds: float = 1.0
+) -> FileWatcher:
+    """
+    Create a file watcher for a directory.
+
+    Args:
+        backend: 'watchfiles', 'polling', or 'auto' (watchfiles when
+                 installed, polling otherwise)
+        root_path: Directory to watch recursively
+        ignore_dirs: Directory names whose contents are never reported
+        include: Predicate selecting which file paths to report
+        poll_interval_seconds: Time between scans of the polling watcher
+
+    Returns:
+        FileWatcher instance
+
+    Raises:
+        ValueError: If the backend is unknown, or watchfiles is requested
+                    but not installed
+    """
+    if backend not in WATCH_BACKENDS:
+        raise ValueError(f"Unknown watch backend: {backend} (expected one of {', '.join(WATCH_BACKENDS)})")
+    if backend == 'watchfiles' and not WATCHFILES_AVAILABLE:
+        raise ValueError("watch backend 'watchfiles' requires the watchfiles package")
+    if backend == 'watchfiles' or (backend == 'auto' and WATCHFILES_AVAILABLE):
+        return WatchfilesWatcher(root_path, ignore_dirs, include)
+    return PollingWatcher(root_path, ignore_dirs, include, poll_interval_seconds)
+
+
+class CodebaseWatcher:
+    """
+    Keeps the analysis of one codebase up to date while files change.
+
+    Events from the file watcher are collected until no new event arrives
+    for the debounce interval, then the settled batch is passed to
+    `AnalysisEngine.apply_file_changes`. Batches are applied one at a time.
+    """
+
+    def __init__(self, engine, codebase_id: str, watcher: FileWatcher, debounce_seconds: float = 0.2):
+        """
+        Initialize the codebase watcher.
+
+        Args:
+            engine: AnalysisEngine that re-analyzes changed files
+            codebase_id: ID of the watched codebase
+            watcher: File watcher for the codebase root
+            debounce_seconds: Quiet period that ends a batch of events
+        """
+        self.engine = engine
+        self.codebase_id = codebase_id
+        self.watcher = watcher
+        self.debounce_seconds = debounce_seconds
+        self.analysis = None
+        self.updates = 0
+        self.files_updated = 0
+        self.last_update_ms = 0.0
+        self.last_error: Optional[str] = None
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._baseline_ready = asyncio.Event()
+        self._tasks = []
+
+    async def start(self):
+        """
+        Start receiving file events.
+
+        Events are queued from now on but only applied once a baseline
+        analysis has been set, so edits made while the baseline is being
+        computed are not lost.
+        """
+        await self.watcher.start()
+        self._tasks = [
+            asyncio.create_task(self._pump()),
+            asyncio.create_task(self._run())
+        ]
+
+    def set_baseline(self, analysis):
+        """
+        Replace the analysis that file changes are applied to.
+
+        Args:
+            analysis: CodebaseAnalysis of the watched codebase
+        """
+        self.analysis = analysis
+        self._baseline_ready.set()
+
+    def cancel(self):
+        """Stop watching without waiting for the background tasks."""
+        self.watcher.stop()
+        for task in self._tasks:
+            task.cancel()
+
+    async def stop(self):
+        """Stop watching and wait for the background tasks to finish."""
+        self.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _pump(self):
+        """Move batches from the file watcher into the queue."""
+        try:
+            async for paths in self.watcher.changes():
+                self._queue.put_nowait(paths)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"File watcher for {self.codebase_id} stopped: {e}", exc_info=True)
+
+    async def _next_batch(self) -> Set[str]:
+        """Wait for events and merge them until the debounce interval passes quietly."""
+        paths = set(await self._queue.get())
+        while True:
+            try:
+                paths |= await asyncio.wait_for(self._queue.get(), self.debounce_seconds)
+            except asyncio.TimeoutError:
+                return paths
+
+    async def _run(self):
+        """Apply debounced batches to the analysis."""
+        await self._baseline_ready.wait()
+        while True:
+            paths = await self._next_batch()
+            start = time.perf_counter()
+            try:
+                updated = await self.engine.apply_file_changes(self.codebase_id, paths)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Failed to apply file changes for {self.codebase_id}: {e}", exc_info=True)
+                continue
+            if updated:
+                self.updates += 1
+                self.files_updated += updated
+                self.last_update_ms = (time.perf_counter() - start) * 1000
+                logger.info(
+                    f"Watch update for {self.codebase_id}: {updated} files "
+                    f"in {self.last_update_ms:.0f}ms"
+                )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the watcher state for status reporting."""
+        return {
+            'codebase_id': self.codebase_id,
+            'root_path': self.watcher.root_path,
+            'backend': self.watcher.name,
+            'debounce_ms': round(self.debounce_seconds * 1000),
+            'updates': self.updates,
+            'files_updated': self.files_updated,
+            'last_update_ms': round(self.last_update_ms, 2),
+            'last_error': self.last_error
+        }
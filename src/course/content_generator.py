@@ -2,6 +2,7 @@
 
 from typing import List, Dict, Optional
 from src.models import FileAnalysis, DetectedPattern, FunctionInfo, ClassInfo
+from src.analysis.source_document import SourceDocument
 from .models import LessonContent, CodeExample, CodeHighlight
 from .config import CourseConfig
 from .performance_monitor import get_monitor
@@ -486,16 +487,16 @@ class LessonContentGenerator:
             File content as string
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            document = SourceDocument.from_text_file(file_path)
+            content = document.text
             
             # Limit to max_code_lines if configured (Req 7.2)
             if self.config.max_code_lines:
-                lines = content.split('\n')
-                if len(lines) > self.config.max_code_lines:
+                line_count = document.line_count
+                if line_count > self.config.max_code_lines:
                     # Take first max_code_lines
-                    content = '\n'.join(lines[:self.config.max_code_lines])
-                    content += f"\n\n# ... ({len(lines) - self.config.max_code_lines} more lines)"
+                    content = document.lines(1, self.config.max_code_lines)
+                    content += f"\n\n# ... ({line_count - self.config.max_code_lines} more lines)"
             
             return content
         except Exception as e:
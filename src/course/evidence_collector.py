@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 import aiofiles
 
+from src.analysis.source_document import SourceDocument
 from src.models.analysis_models import FileAnalysis
 from src.course.models import Lesson
 
@@ -113,7 +114,7 @@ class EvidenceCollector:
             async with aiofiles.open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
                 code = await f.read()
             
-            lines = code.split('\n')
+            document = SourceDocument.from_text(code)
             
             # Detect language from extension
             language = self._detect_language(file_path)
@@ -128,14 +129,14 @@ class EvidenceCollector:
                             'start_line': highlight.start_line,
                             'end_line': highlight.end_line,
                             'description': highlight.description,
-                            'code': '\n'.join(lines[highlight.start_line-1:highlight.end_line])
+                            'code': document.lines(highlight.start_line, highlight.end_line)
                         })
             
             # If no sections specified, treat entire file as one section
             if not sections:
                 sections.append({
                     'start_line': 1,
-                    'end_line': len(lines),
+                    'end_line': document.line_count,
                     'description': 'Complete file',
                     'code': code
                 })
@@ -143,7 +144,7 @@ class EvidenceCollector:
             return {
                 'path': file_path,
                 'code': code,
-                'lines': len(lines),
+                'lines': document.line_count,
                 'language': language,
                 'sections': sections
             }
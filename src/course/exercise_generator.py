@@ -4,6 +4,7 @@ import re
 import uuid
 from typing import List, Tuple
 from src.models import DetectedPattern, FileAnalysis
+from src.analysis.source_document import SourceDocument
 from .models import Exercise, TestCase
 from .config import CourseConfig
 from .performance_monitor import get_monitor
@@ -109,38 +110,31 @@ class ExerciseGenerator:
         """
         # Read the source file
         try:
-            with open(file_analysis.file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            document = SourceDocument.from_text_file(file_analysis.file_path)
             
             # If pattern has line numbers, extract those lines
             if pattern.line_numbers:
-                start_line = min(pattern.line_numbers) - 1  # 0-indexed
-                end_line = max(pattern.line_numbers)
-                
-                # Expand to include context (up to 10 lines before/after)
-                start_line = max(0, start_line - 2)
-                end_line = min(len(lines), end_line + 2)
-                
-                code_lines = lines[start_line:end_line]
-                return ''.join(code_lines).strip()
+                # Expand to include context (2 lines before/after)
+                start_line = min(pattern.line_numbers) - 2
+                end_line = max(pattern.line_numbers) + 2
+                return document.lines(start_line, end_line).strip()
             
             # Otherwise, try to find relevant function or class
             for func in file_analysis.symbol_info.functions:
                 if any(evidence in func.name.lower() for evidence in pattern.evidence):
-                    func_lines = lines[func.start_line - 1:func.end_line]
-                    return ''.join(func_lines).strip()
+                    return document.lines(func.start_line, func.end_line).strip()
             
             for cls in file_analysis.symbol_info.classes:
                 if any(evidence in cls.name.lower() for evidence in pattern.evidence):
-                    cls_lines = lines[cls.start_line - 1:cls.end_line]
                     # Limit to 50 lines
-                    if len(cls_lines) > 50:
-                        cls_lines = cls_lines[:50]
-                        cls_lines.append("    # ... (truncated for brevity)\n")
-                    return ''.join(cls_lines).strip()
+                    end_line = min(cls.end_line, document.line_count)
+                    if end_line - cls.start_line + 1 > 50:
+                        code = document.lines(cls.start_line, cls.start_line + 49)
+                        return (code + "\n    # ... (truncated for brevity)").strip()
+                    return document.lines(cls.start_line, end_line).strip()
             
             # Fallback: return first 30 lines
-            return ''.join(lines[:30]).strip()
+            return document.lines(1, 30).strip()
             
         except Exception as e:
             # Fallback to a simple template
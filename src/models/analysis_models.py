@@ -5,7 +5,7 @@ This module defines dataclasses for analysis results that can be persisted
 to disk and cached in memory.
 """
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, replace
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
@@ -205,6 +205,9 @@ class FileAnalysis:
     analyzed_at: str  # ISO format datetime string
     cache_hit: bool
     is_notebook: bool = False
+    content_hash: str = ""  # Engine file hash: SHA-256 of the content, or its git blob SHA-1 when analyzed from a git checkout (git index pre-pass)
+    analysis_mode: str = "full"  # 'full', 'skeleton' for very large files, or 'metadata' for files flagged before parsing
+    skip_reason: str = ""  # Why the file was not fully analyzed (e.g. 'minified')
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -221,7 +224,10 @@ class FileAnalysis:
             'errors': self.errors,
             'analyzed_at': self.analyzed_at,
             'cache_hit': self.cache_hit,
-            'is_notebook': self.is_notebook
+            'is_notebook': self.is_notebook,
+            'content_hash': self.content_hash,
+            'analysis_mode': self.analysis_mode,
+            'skip_reason': self.skip_reason
         }
     
     @classmethod
@@ -240,7 +246,35 @@ class FileAnalysis:
             errors=data.get('errors', []),
             analyzed_at=data['analyzed_at'],
             cache_hit=data.get('cache_hit', False),
-            is_notebook=data.get('is_notebook', False)
+            is_notebook=data.get('is_notebook', False),
+            content_hash=data.get('content_hash', ""),
+            analysis_mode=data.get('analysis_mode', "full"),
+            skip_reason=data.get('skip_reason', "")
+        )
+    
+    def with_file_path(self, file_path: str) -> 'FileAnalysis':
+        """
+        Copy this analysis for another file with byte-identical content.
+        
+        Only the path-dependent fields (file_path and the file_path of the
+        patterns detected in this file) are rewritten. The remaining fields
+        are shared with this analysis rather than deep-copied.
+        
+        Args:
+            file_path: Path of the file with the same content
+        
+        Returns:
+            FileAnalysis for file_path
+        """
+        if file_path == self.file_path:
+            return self
+        return replace(
+            self,
+            file_path=file_path,
+            patterns=[
+                replace(p, file_path=file_path) if p.file_path == self.file_path else p
+                for p in self.patterns
+            ]
         )
 
 
@@ -334,6 +368,12 @@ class CodebaseMetrics:
     total_patterns_detected: int
     analysis_time_ms: float
     cache_hit_rate: float
+    duplicate_files: int = 0  # Files resolved from an identical file in the same run
+    dedup_ratio: float = 0.0  # duplicate_files / files that needed analysis
+    dedup_time_saved_ms: float = 0.0  # Estimated analysis time avoided by deduplication
+    skipped_files: int = 0  # Generated or minified files that were not parsed
+    skip_reasons: Dict[str, int] = field(default_factory=dict)  # Skipped files by reason
+    skeleton_files: int = 0  # Large files that only got a skeleton analysis
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -25,6 +25,7 @@ from src.tools.detect_frameworks import detect_frameworks as detect_frameworks_i
 from src.tools.discover_features import discover_features as discover_features_impl
 from src.analysis.engine import AnalysisEngine
 from src.analysis.config import AnalysisConfig
+from src.analysis.events import AnalysisEvent
 
 
 # Configure logging
@@ -95,7 +96,7 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
         logger.info("UnifiedCacheManager initialized successfully")
         
         # Create analysis engine
-        analysis_config = AnalysisConfig()
+        analysis_config = AnalysisConfig.from_dict(config.config)
         analysis_engine = AnalysisEngine(cache_manager, analysis_config)
         logger.info("Analysis Engine initialized successfully")
         
@@ -113,6 +114,12 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
         # Shutdown: cleanup resources
         logger.info("MCP Server shutting down gracefully")
         
+        if app_context and app_context.analysis_engine:
+            for codebase_id in list(app_context.analysis_engine.watchers):
+                await app_context.analysis_engine.unwatch_codebase(codebase_id)
+            app_context.analysis_engine.shutdown()
+            logger.info("Analysis Engine shut down")
+        
         if app_context and app_context.cache_manager:
             await app_context.cache_manager.close()
             logger.info("Cache manager closed")
@@ -434,6 +441,37 @@ async def get_features(ctx: Context = None) -> dict:
     return features
 
 
+@mcp.resource("metrics://analysis")
+async def get_analysis_metrics(ctx: Context = None) -> dict:
+    """
+    Get analysis engine performance metrics.
+    
+    Returns counters, recent slow operations and latency histograms
+    (p50/p95/p99) of the analyze_file pipeline by stage (parse, symbols,
+    patterns, complexity, documentation, scoring, linters, total), by
+    language and by pattern detector, plus the scheduler queue state.
+    
+    Args:
+        ctx: FastMCP context (injected automatically)
+    
+    Returns:
+        Dictionary with analysis performance metrics
+    
+    Examples:
+        >>> metrics = await get_analysis_metrics()
+        >>> print(metrics["latency"]["stage"]["parse"]["p95_ms"])
+        4.8
+    """
+    # Access app context
+    if not app_context:
+        raise RuntimeError("Server not initialized")
+    
+    # Log resource access
+    logger.info("Resource accessed: metrics://analysis")
+    
+    return app_context.analysis_engine.get_performance_metrics()
+
+
 @mcp.prompt
 async def analyze_codebase(codebase_path: str) -> str:
     """
@@ -651,6 +689,7 @@ async def detect_patterns(
     if not app_context:
         raise RuntimeError("Server not initialized")
     
+    analysis_engine = app_context.analysis_engine
     cache_manager = app_context.cache_manager
     config = app_context.config
     
@@ -666,7 +705,11 @@ async def detect_patterns(
     from_cache = False
     
     if use_cache:
-        cached_analysis = await cache_manager.get_analysis(cache_key)
+        # Watched codebases keep an up-to-date analysis even after the entry expires
+        cached_analysis = (
+            await cache_manager.get_analysis(cache_key)
+            or analysis_engine.get_watched_analysis(codebase_id)
+        )
         if cached_analysis:
             from_cache = True
             logger.info(f"Cache hit for codebase analysis: {codebase_id}")
@@ -753,6 +796,7 @@ async def analyze_dependencies(
     if not app_context:
         raise RuntimeError("Server not initialized")
     
+    analysis_engine = app_context.analysis_engine
     cache_manager = app_context.cache_manager
     config = app_context.config
     
@@ -768,7 +812,11 @@ async def analyze_dependencies(
     from_cache = False
     
     if use_cache:
-        cached_analysis = await cache_manager.get_analysis(cache_key)
+        # Watched codebases keep an up-to-date analysis even after the entry expires
+        cached_analysis = (
+            await cache_manager.get_analysis(cache_key)
+            or analysis_engine.get_watched_analysis(codebase_id)
+        )
         if cached_analysis:
             from_cache = True
             logger.info(f"Cache hit for codebase analysis: {codebase_id}")
@@ -907,6 +955,7 @@ async def analyze_codebase_tool(
     Analyzes all files in the codebase in parallel, extracting symbols, detecting
     patterns, building dependency graphs, and scoring teaching value. Supports
     incremental analysis (only re-analyze changed files) for fast updates.
+    Progress is reported per file and per codebase-level stage.
     Results are cached and persisted to disk.
     
     Args:
@@ -967,7 +1016,11 @@ async def analyze_codebase_tool(
     from_cache = False
     
     if use_cache:
-        cached_analysis = await cache_manager.get_analysis(cache_key)
+        # Watched codebases keep an up-to-date analysis even after the entry expires
+        cached_analysis = (
+            await cache_manager.get_analysis(cache_key)
+            or analysis_engine.get_watched_analysis(codebase_id)
+        )
         if cached_analysis:
             from_cache = True
             logger.info(f"Cache hit for codebase analysis: {codebase_id}")
@@ -986,11 +1039,19 @@ async def analyze_codebase_tool(
             return result
     
     try:
-        # Perform analysis
-        result = await analysis_engine.analyze_codebase(
+        # Perform analysis, reporting per-file progress as results stream in
+        result = None
+        async for event in analysis_engine.analyze_codebase_stream(
             codebase_id=codebase_id,
             incremental=incremental
-        )
+        ):
+            if event.kind == AnalysisEvent.COMPLETE:
+                result = event.data
+            elif ctx:
+                try:
+                    await ctx.report_progress(event.completed, event.total, event.message)
+                except Exception as e:
+                    logger.debug(f"Failed to report progress: {e}")
         
         # Convert to dict for JSON serialization
         result_dict = result.to_dict()
@@ -1017,6 +1078,75 @@ async def analyze_codebase_tool(
         raise ValueError(f"Failed to analyze codebase: {str(e)}")
 
 
+@mcp.tool
+async def watch_codebase(
+    codebase_id: str,
+    enabled: bool = True,
+    ctx: Context = None
+) -> dict:
+    """
+    Start or stop watch mode for a scanned codebase.
+    
+    In watch mode file changes are picked up through native file system
+    events (or periodic rescans when those are unavailable), debounced, and
+    only the touched files are re-analyzed. The cached codebase analysis and
+    dependency graph are patched in place, so analyze_codebase_tool keeps
+    returning current results without walking the directory again.
+    
+    Args:
+        codebase_id: Unique identifier from scan_codebase (required)
+        enabled: Start watching (default: true); false stops watching
+        ctx: FastMCP context (injected automatically)
+    
+    Returns:
+        Dictionary with:
+        - codebase_id: Codebase identifier
+        - watching: Whether the codebase is now watched
+        - backend: Event source ("watchfiles" or "polling") when watching
+        - debounce_ms: Quiet period before a batch of changes is applied
+        - updates / files_updated: Batches and files applied so far
+    
+    Raises:
+        ValueError: If codebase has not been scanned (run scan_codebase first!)
+        RuntimeError: If server not initialized
+    
+    Examples:
+        Start watching:
+        {"codebase_id": "a1b2c3d4e5f6g7h8"}
+        
+        Stop watching:
+        {"codebase_id": "a1b2c3d4e5f6g7h8", "enabled": false}
+    """
+    # Access app context
+    if not app_context:
+        raise RuntimeError("Server not initialized")
+    
+    analysis_engine = app_context.analysis_engine
+    
+    # Validate input
+    if not codebase_id or not codebase_id.strip():
+        raise ValueError("codebase_id parameter is required and cannot be empty")
+    
+    # Log tool invocation
+    logger.info(f"Tool invoked: watch_codebase with arguments: codebase_id={codebase_id}, enabled={enabled}")
+    
+    if not enabled:
+        await analysis_engine.unwatch_codebase(codebase_id)
+        return {'codebase_id': codebase_id, 'watching': False}
+    
+    try:
+        status = await analysis_engine.watch_codebase(codebase_id)
+    except ValueError as e:
+        # Re-raise ValueError with clear message
+        raise ValueError(str(e))
+    except Exception as e:
+        logger.error(f"Error watching codebase {codebase_id}: {e}")
+        raise ValueError(f"Failed to watch codebase: {str(e)}")
+    
+    status['watching'] = True
+    return status
+
+
 @mcp.tool
 async def export_course(
     codebase_id: str,
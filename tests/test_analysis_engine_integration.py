@@ -597,5 +597,78 @@ async def test_analysis_data_integrity(analysis_engine, test_python_file):
     assert 0.0 <= result.documentation_coverage <= 1.0
 
 
+# Test 9: Single-read pipeline
+@pytest.mark.asyncio
+async def test_file_read_once_per_analysis(analysis_engine, test_python_file, monkeypatch):
+    """Test that hashing, parsing and detection share a single read."""
+    import builtins
+    
+    real_open = builtins.open
+    opened = []
+    
+    def counting_open(file, *args, **kwargs):
+        if str(file) == test_python_file:
+            opened.append(file)
+        return real_open(file, *args, **kwargs)
+    
+    monkeypatch.setattr(builtins, "open", counting_open)
+    
+    result = await analysis_engine.analyze_file(test_python_file, force=True)
+    
+    assert len(opened) == 1
+    assert not result.has_errors
+    assert len(result.symbol_info.functions) > 0
+    with real_open(test_python_file, 'rb') as f:
+        assert result.content_hash == analysis_engine._hash_content(f.read())
+
+
+@pytest.mark.asyncio
+async def test_parse_bytes_matches_parse_file(analysis_engine, test_python_file):
+    """Test that parsing an in-memory buffer matches parsing from disk."""
+    with open(test_python_file, 'rb') as f:
+        source = f.read()
+    
+    from_disk = analysis_engine.parser.parse_file(test_python_file)
+    from_bytes = analysis_engine.parser.parse_bytes(source, "python", test_python_file)
+    
+    assert from_bytes.language == from_disk.language
+    assert from_bytes.root_node.sexp() == from_disk.root_node.sexp()
+    assert from_bytes.has_errors == from_disk.has_errors
+
+
+@pytest.mark.asyncio
+async def test_notebook_parses_extracted_code(analysis_engine):
+    """Test that notebooks are parsed from their code cells, not the JSON."""
+    import json
+    
+    notebook = {
+        "cells": [
+            {"cell_type": "markdown", "metadata": {}, "source": "# Title"},
+            {
+                "cell_type": "code",
+                "execution_count": 1,
+                "metadata": {},
+                "outputs": [],
+                "source": "def notebook_func(x):\n    return x * 2"
+            }
+        ],
+        "metadata": {},
+        "nbformat": 4,
+        "nbformat_minor": 5
+    }
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.ipynb', delete=False) as f:
+        json.dump(notebook, f)
+        temp_path = f.name
+    
+    try:
+        result = await analysis_engine.analyze_file(temp_path, force=True)
+        
+        assert result.is_notebook
+        assert not result.has_errors
+        assert [func.name for func in result.symbol_info.functions] == ["notebook_func"]
+    finally:
+        os.unlink(temp_path)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
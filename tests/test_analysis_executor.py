@@ -0,0 +1,307 @@
+"""
+Tests for the analysis execution backends.
+
+Tests:
+- Inline, thread and process backends produce identical analyses
+- Process and thread backends honour max_parallel_files
+- Parsers are per thread
+- PipelineResult payload round-trip
+- Unknown backend configuration
+- Per-file timeout kills and replaces workers; timed-out files are skipped later
+- Process workers reset their detector budgets at the start of each run
+"""
+
+import asyncio
+import dataclasses
+import os
+import tempfile
+import threading
+
+import pytest
+import pytest_asyncio
+
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.executor import (
+    InlineBackend,
+    ParseTimeoutError,
+    PipelineResult,
+    ProcessPoolBackend,
+    ThreadPoolBackend,
+    create_backend
+)
+from src.cache.unified_cache import UnifiedCacheManager
+
+
+PYTHON_SOURCE = '''"""Module docstring."""
+
+import os
+
+
+def add(x, y):
+    """Add two numbers."""
+    if x > 0 and y > 0:
+        return x + y
+    return 0
+
+
+class Greeter:
+    """Says hello."""
+
+    def greet(self, name):
+        """Greet someone."""
+        return f"Hello {name}"
+'''
+
+
+@pytest_asyncio.fixture
+async def cache_manager():
+    """Create a temporary cache manager for testing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = UnifiedCacheManager(
+            max_memory_mb=10,
+            sqlite_path=os.path.join(tmpdir, "test_cache.db"),
+            redis_url=None
+        )
+        await manager.initialize()
+        try:
+            yield manager
+        finally:
+            await manager.close()
+
+
+@pytest.fixture
+def codebase_dir():
+    """Create a small codebase on disk."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(4):
+            with open(os.path.join(tmpdir, f"module_{i}.py"), 'w') as f:
+                f.write(PYTHON_SOURCE.replace("add", f"add_{i}"))
+        yield tmpdir
+
+
+def slow_source(functions=30000):
+    """Generate a Python module large enough to exceed a short timeout."""
+    return "".join(
+        f"def f{i}(x):\n    if x > {i}:\n        return x\n    return {i}\n\n"
+        for i in range(functions)
+    )
+
+
+def make_config(tmpdir, backend, max_parallel_files=2, parse_timeout_seconds=5):
+    """Create an analysis config for the given backend."""
+    return AnalysisConfig(
+        supported_languages=["python", "javascript"],
+        enable_linters=False,
+        max_parallel_files=max_parallel_files,
+        parse_timeout_seconds=parse_timeout_seconds,
+        executor_backend=backend,
+        # slow_source() is larger than the skeleton threshold; keep it on the
+        # full pipeline so the timeout tests exercise it
+        skeleton_threshold_kb=0,
+        persistence_path=os.path.join(tmpdir, ".documee")
+    )
+
+
+def comparable(analysis):
+    """Strip run-dependent fields from an analysis dict."""
+    data = analysis.to_dict()
+    data.pop('analyzed_at')
+    data.pop('cache_hit')
+    return data
+
+
+class TestBackendSelection:
+    """Tests for create_backend."""
+
+    def test_inline_is_default(self, codebase_dir):
+        engine = AnalysisEngine(None, AnalysisConfig(
+            persistence_path=os.path.join(codebase_dir, ".documee")
+        ))
+        assert isinstance(engine.backend, InlineBackend)
+
+    def test_process_backend_worker_count(self, codebase_dir):
+        config = make_config(codebase_dir, "process", max_parallel_files=1)
+        backend = create_backend(None, config)
+        assert isinstance(backend, ProcessPoolBackend)
+        assert backend.max_workers == 1
+
+    def test_thread_backend_worker_count(self, codebase_dir):
+        engine = AnalysisEngine(None, make_config(codebase_dir, "thread", max_parallel_files=1))
+        assert isinstance(engine.backend, ThreadPoolBackend)
+        assert engine.backend.max_workers == 1
+
+    def test_unknown_backend(self, codebase_dir):
+        config = make_config(codebase_dir, "gpu")
+        with pytest.raises(ValueError, match="Unknown executor backend"):
+            create_backend(None, config)
+
+
+class TestPipelineResult:
+    """Tests for the inter-process payload."""
+
+    def test_payload_round_trip(self, cache_manager, codebase_dir):
+        engine = AnalysisEngine(cache_manager, make_config(codebase_dir, "inline"))
+        result = engine._run_pipeline(os.path.join(codebase_dir, "module_0.py"))
+
+        restored = PipelineResult.from_payload(result.to_payload())
+
+        assert restored.completed
+        assert restored.analysis.to_dict() == result.analysis.to_dict()
+
+    def test_missing_file_is_not_completed(self, cache_manager, codebase_dir):
+        engine = AnalysisEngine(cache_manager, make_config(codebase_dir, "inline"))
+        missing = os.path.join(codebase_dir, "missing.py")
+
+        result = engine._run_pipeline(missing)
+
+        assert not result.completed
+        assert result.analysis.has_errors
+        assert result.errors and result.errors[0][0] == missing
+
+
+@pytest.mark.asyncio
+async def test_process_backend_matches_inline(cache_manager, codebase_dir):
+    """Process workers produce the same analysis as the inline pipeline."""
+    file_path = os.path.join(codebase_dir, "module_1.py")
+
+    inline_engine = AnalysisEngine(cache_manager, make_config(codebase_dir, "inline"))
+    inline_result = await inline_engine.analyze_file(file_path, force=True)
+
+    process_engine = AnalysisEngine(cache_manager, make_config(codebase_dir, "process"))
+    try:
+        process_result = await process_engine.analyze_file(file_path, force=True)
+    finally:
+        process_engine.shutdown()
+
+    assert comparable(process_result) == comparable(inline_result)
+    assert len(process_result.symbol_info.functions) == 1
+    assert len(process_result.symbol_info.classes) == 1
+
+
+@pytest.mark.asyncio
+async def test_thread_backend_matches_inline(cache_manager, codebase_dir):
+    """Pool threads produce the same analysis as the inline pipeline."""
+    inline_engine = AnalysisEngine(cache_manager, make_config(codebase_dir, "inline"))
+    thread_engine = AnalysisEngine(cache_manager, make_config(codebase_dir, "thread", max_parallel_files=4))
+    paths = [os.path.join(codebase_dir, f"module_{i}.py") for i in range(4)]
+    try:
+        thread_results = await asyncio.gather(
+            *(thread_engine.analyze_file(path, force=True) for path in paths)
+        )
+        for path, thread_result in zip(paths, thread_results):
+            inline_result = await inline_engine.analyze_file(path, force=True)
+            assert comparable(thread_result) == comparable(inline_result)
+    finally:
+        thread_engine.shutdown()
+
+
+def test_parsers_are_per_thread(codebase_dir):
+    """Each thread parses with its own parser; grammars are loaded once."""
+    engine = AnalysisEngine(None, make_config(codebase_dir, "inline"))
+    parser_manager = engine.parser
+    main_parser = parser_manager.get_parser('python')
+    assert parser_manager.get_parser('python') is main_parser
+
+    other = {}
+    thread = threading.Thread(target=lambda: other.update(parser=parser_manager.get_parser('python')))
+    thread.start()
+    thread.join()
+
+    assert other['parser'] is not main_parser
+    assert list(parser_manager.languages) == ['python']
+
+
+@pytest.mark.asyncio
+async def test_codebase_analysis_with_process_backend(cache_manager, codebase_dir):
+    """analyze_codebase dispatches all files to the worker pool."""
+    codebase_id = "executor_test"
+    await cache_manager.set_analysis(f"scan:{codebase_id}", {"path": codebase_dir})
+
+    engine = AnalysisEngine(cache_manager, make_config(codebase_dir, "process"))
+    try:
+        result = await engine.analyze_codebase(codebase_id, incremental=False)
+    finally:
+        engine.shutdown()
+
+    assert len(result.file_analyses) == 4
+    assert all(not fa.has_errors for fa in result.file_analyses.values())
+    assert engine.get_performance_metrics()['total_files_analyzed'] == 4
+
+
+@pytest.mark.asyncio
+async def test_process_workers_reset_detector_budgets_per_run(cache_manager, codebase_dir):
+    """Detectors demoted in a worker during one run are active again in the next."""
+    codebase_id = "budget_runs"
+    await cache_manager.set_analysis(f"scan:{codebase_id}", {"path": codebase_dir})
+    config = dataclasses.replace(
+        make_config(codebase_dir, "process", max_parallel_files=1),
+        detector_soft_budget_ms=0.001,
+        detector_overrun_limit=2
+    )
+
+    def modes():
+        return {cost['mode'] for cost in engine.get_performance_metrics()['detector_costs'].values()}
+
+    engine = AnalysisEngine(cache_manager, config)
+    try:
+        await engine.analyze_codebase(codebase_id)
+        assert modes() - {'active'}
+
+        # One new file: a single overrun per detector, so no demotion this run
+        with open(os.path.join(codebase_dir, "module_new.py"), 'w') as f:
+            f.write(PYTHON_SOURCE.replace("add", "add_new"))
+        second = await engine.analyze_codebase(codebase_id)
+    finally:
+        engine.shutdown()
+
+    assert not second.file_analyses[os.path.join(codebase_dir, "module_new.py")].cache_hit
+    assert modes() == {'active'}
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_and_replaces_worker(codebase_dir):
+    """A file exceeding the deadline kills its worker; the next file still runs."""
+    slow_file = os.path.join(codebase_dir, "slow.py")
+    backend = ProcessPoolBackend(make_config(codebase_dir, "process"), max_workers=1, timeout_seconds=0.5)
+    try:
+        with pytest.raises(ParseTimeoutError):
+            await backend.run(slow_file, slow_source().encode())
+        assert backend.timeouts == 1
+        assert backend.restarts == 1
+
+        result = await backend.run(os.path.join(codebase_dir, "module_0.py"))
+        assert result.completed
+        assert len(result.analysis.symbol_info.functions) == 1
+    finally:
+        backend.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_files_are_recorded_and_skipped(cache_manager, codebase_dir):
+    """Timed-out files get an error analysis and are skipped while unchanged."""
+    codebase_id = "timeout_test"
+    slow_file = os.path.join(codebase_dir, "slow.py")
+    with open(slow_file, 'w') as f:
+        f.write(slow_source())
+    await cache_manager.set_analysis(f"scan:{codebase_id}", {"path": codebase_dir})
+
+    engine = AnalysisEngine(cache_manager, make_config(codebase_dir, "process", parse_timeout_seconds=0.5))
+    try:
+        result = await engine.analyze_codebase(codebase_id, incremental=False)
+        second = await engine.analyze_codebase(codebase_id, incremental=False)
+    finally:
+        engine.shutdown()
+
+    timed_out = result.file_analyses[slow_file]
+    assert timed_out.has_errors
+    assert "parse timeout" in timed_out.errors[0]
+    assert all(
+        not fa.has_errors for path, fa in result.file_analyses.items() if path != slow_file
+    )
+    assert engine.get_performance_metrics()['parse_timeouts_count'] == 1
+    assert list(engine.persistence.get_timed_out_files(codebase_id)) == [slow_file]
+
+    # The second run skips the file instead of waiting for the deadline again
+    assert engine.backend.timeouts == 1
+    assert second.file_analyses[slow_file].errors[0].startswith("Skipped")
@@ -0,0 +1,178 @@
+"""
+Tests for analysis latency metrics.
+
+Tests:
+- Histogram percentiles, bounded memory and serialization
+- Per-stage, per-language and per-detector histograms from the engine
+- Bounded recent-sample buffers
+- metrics://analysis MCP resource
+"""
+
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+import src.server
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.latency_metrics import LatencyHistogram, LatencyRecorder
+from src.cache.unified_cache import UnifiedCacheManager
+from src.config.settings import Settings
+
+
+class TestLatencyHistogram:
+    """Tests for the log-bucketed histogram."""
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(50) == 0.0
+        assert histogram.to_dict() == {'count': 0}
+
+    def test_percentiles_are_accurate(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(float(ms))
+
+        assert histogram.percentile(50) == pytest.approx(500, rel=0.05)
+        assert histogram.percentile(95) == pytest.approx(950, rel=0.05)
+        assert histogram.percentile(99) == pytest.approx(990, rel=0.05)
+        assert histogram.percentile(100) == 1000
+
+    def test_percentiles_clamped_to_observed_range(self):
+        histogram = LatencyHistogram()
+        histogram.record(7.0)
+        assert histogram.percentile(1) == histogram.percentile(99) == 7.0
+
+    def test_memory_is_bounded(self):
+        histogram = LatencyHistogram()
+        for i in range(10000):
+            histogram.record(i * 0.37)
+        histogram.record(0.0)
+        histogram.record(1e12)
+
+        assert len(histogram.counts) == LatencyHistogram.NUM_BUCKETS
+        assert histogram.count == 10002
+
+    def test_to_dict(self):
+        histogram = LatencyHistogram()
+        for ms in [1.0, 2.0, 3.0]:
+            histogram.record(ms)
+        data = histogram.to_dict()
+
+        assert data['count'] == 3
+        assert data['mean_ms'] == 2.0
+        assert data['min_ms'] == 1.0
+        assert data['max_ms'] == 3.0
+        assert data['p50_ms'] <= data['p95_ms'] <= data['p99_ms']
+
+
+def test_recorder_groups_by_category():
+    """The recorder keeps one histogram per (category, key)."""
+    recorder = LatencyRecorder()
+    recorder.record('stage', 'parse', 5.0)
+    recorder.record_all('stage', {'parse': 7.0, 'symbols': 1.0})
+
+    assert recorder.get('stage', 'parse').count == 2
+    assert recorder.get('detector', 'parse') is None
+    assert set(recorder.to_dict()['stage']) == {'parse', 'symbols'}
+
+
+@pytest_asyncio.fixture
+async def cache_manager():
+    """Create a temporary cache manager for testing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = UnifiedCacheManager(
+            max_memory_mb=10,
+            sqlite_path=os.path.join(tmpdir, "test_cache.db"),
+            redis_url=None
+        )
+        await manager.initialize()
+        try:
+            yield manager
+        finally:
+            await manager.close()
+
+
+@pytest.fixture
+def engine(cache_manager):
+    """Create an analysis engine without linters."""
+    return AnalysisEngine(cache_manager, AnalysisConfig(enable_linters=False))
+
+
+@pytest.fixture
+def source_files():
+    """Create a Python and a JavaScript file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        py_file = os.path.join(tmpdir, "module.py")
+        with open(py_file, 'w') as f:
+            f.write('def add(a, b):\n    """Add."""\n    return a + b\n')
+        js_file = os.path.join(tmpdir, "module.js")
+        with open(js_file, 'w') as f:
+            f.write('function add(a, b) { return a + b; }\n')
+        yield py_file, js_file
+
+
+@pytest.mark.asyncio
+async def test_engine_records_latency_histograms(engine, source_files):
+    """analyze_file records stage, language and detector histograms."""
+    for file_path in source_files:
+        await engine.analyze_file(file_path)
+
+    latency = engine.get_performance_metrics()['latency']
+
+    for stage in ['parse', 'symbols', 'patterns', 'complexity', 'documentation', 'scoring', 'total']:
+        assert latency['stage'][stage]['count'] == 2
+    assert latency['language']['python']['count'] == 1
+    assert latency['language']['javascript']['count'] == 1
+    # Language-specific detectors only run (and are only timed) for their language
+    assert latency['detector']['PythonPatternDetector']['count'] == 1
+    assert latency['detector']['JavaScriptPatternDetector']['count'] == 1
+    assert latency['detector']['APIPatternDetector']['count'] == 2
+    assert 'p99_ms' in latency['stage']['total']
+
+
+@pytest.mark.asyncio
+async def test_recent_samples_are_bounded(engine, source_files):
+    """Recent file timings are capped while counters keep the full totals."""
+    engine.MAX_RECENT_SAMPLES = 1
+    engine.reset_performance_metrics()
+
+    for file_path in source_files:
+        await engine.analyze_file(file_path)
+    metrics = engine.get_performance_metrics()
+
+    assert metrics['total_files_analyzed'] == 2
+    assert metrics['file_analysis_times'] == [
+        (source_files[1], metrics['file_analysis_times'][0][1])
+    ]
+    assert metrics['latency']['stage']['total']['count'] == 2
+
+
+@pytest.mark.asyncio
+async def test_reset_clears_histograms(engine, source_files):
+    """reset_performance_metrics starts new histograms."""
+    await engine.analyze_file(source_files[0])
+    engine.reset_performance_metrics()
+
+    assert engine.get_performance_metrics()['latency'] == {}
+
+
+@pytest.mark.asyncio
+async def test_metrics_resource(cache_manager, engine, source_files):
+    """The metrics://analysis resource returns the engine metrics."""
+    await engine.analyze_file(source_files[0])
+    original_context = src.server.app_context
+    src.server.app_context = src.server.AppContext(
+        cache_manager=cache_manager,
+        config=Settings(),
+        analysis_engine=engine
+    )
+    try:
+        metrics = await src.server.get_analysis_metrics()
+    finally:
+        src.server.app_context = original_context
+
+    assert metrics['total_files_analyzed'] == 1
+    assert metrics['latency']['stage']['parse']['count'] == 1
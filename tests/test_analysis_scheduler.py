@@ -0,0 +1,266 @@
+"""
+Tests for the cost-aware analysis scheduler.
+
+Tests:
+- Cost estimation from size, language and observed timings
+- Longest-first dispatch and bounded in-flight work
+- Round-robin fairness across concurrent jobs
+- Queue depth, ETA and early cancellation
+- Only real analyses refine the cost model
+- Engine integration
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.events import AnalysisEvent
+from src.analysis.scheduler import AnalysisScheduler, CostModel, WorkItem
+from src.cache.unified_cache import UnifiedCacheManager
+
+
+def make_items(sizes, prefix="f", language="python"):
+    """Create work items named by index with the given sizes."""
+    return [WorkItem(f"{prefix}{i}.py", size, language) for i, size in enumerate(sizes)]
+
+
+class TestCostModel:
+    """Tests for cost estimation."""
+
+    def test_estimate_scales_with_size(self):
+        model = CostModel()
+        assert model.estimate("a.py", 100 * 1024, "python") > model.estimate("b.py", 1024, "python")
+
+    def test_observed_file_timing_is_used(self):
+        model = CostModel()
+        model.observe("a.py", 1024, "python", 250.0)
+        assert model.estimate("a.py", 1024, "python") == 250.0
+
+    def test_language_rate_is_refined(self):
+        model = CostModel()
+        default = model.estimate("new.js", 10 * 1024, "javascript")
+        model.observe("seen.js", 10 * 1024, "javascript", 500.0)
+        assert model.estimate("new.js", 10 * 1024, "javascript") > default
+        # Other languages keep the default rate
+        assert model.estimate("new.py", 10 * 1024, "python") == default
+
+    def test_history_is_bounded(self):
+        model = CostModel(max_history=2)
+        for i in range(3):
+            model.observe(f"f{i}.py", 1024, "python", 10.0)
+        assert list(model.file_history) == ["f1.py", "f2.py"]
+
+
+@pytest.mark.asyncio
+async def test_longest_first_dispatch():
+    """With one slot, files are dispatched in decreasing estimated cost."""
+    scheduler = AnalysisScheduler(max_in_flight=1)
+    started = []
+
+    async def worker(file_path):
+        started.append(file_path)
+        return file_path
+
+    items = make_items([10, 5000, 300, 90000])
+    results = [fp async for fp, _ in scheduler.run("job", items, worker)]
+
+    assert started == ["f3.py", "f1.py", "f2.py", "f0.py"]
+    assert results == started
+
+
+@pytest.mark.asyncio
+async def test_deferred_items_start_last():
+    """Items in a higher priority tier wait for all lower-tier items."""
+    scheduler = AnalysisScheduler(max_in_flight=1)
+    started = []
+
+    async def worker(file_path):
+        started.append(file_path)
+
+    items = make_items([90000, 10, 300])
+    items[0].priority = 1
+    [r async for r in scheduler.run("job", items, worker)]
+
+    assert started == ["f2.py", "f1.py", "f0.py"]
+
+
+@pytest.mark.asyncio
+async def test_in_flight_is_bounded():
+    """Never more than max_in_flight workers run at once."""
+    scheduler = AnalysisScheduler(max_in_flight=3)
+    running = 0
+    peak = 0
+
+    async def worker(file_path):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+
+    results = [r async for r in scheduler.run("job", make_items([100] * 20), worker)]
+
+    assert len(results) == 20
+    assert peak == 3
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_interleaved_fairly():
+    """Two concurrent jobs alternate slots instead of running back to back."""
+    scheduler = AnalysisScheduler(max_in_flight=1)
+    started = []
+
+    async def worker(file_path):
+        started.append(file_path[0])
+        await asyncio.sleep(0)
+
+    async def consume(prefix):
+        return [r async for r in scheduler.run(prefix, make_items([100] * 4, prefix), worker)]
+
+    await asyncio.gather(consume("a"), consume("b"))
+
+    assert started == ["a", "b", "a", "b", "a", "b", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_and_eta():
+    """Queue depth and ETA shrink to zero as the job completes."""
+    scheduler = AnalysisScheduler(max_in_flight=1)
+    observed = []
+
+    async def worker(file_path):
+        observed.append((scheduler.queue_depth, scheduler.eta_seconds("job")))
+
+    [r async for r in scheduler.run("job", make_items([50 * 1024] * 3), worker)]
+
+    assert [depth for depth, _ in observed] == [2, 1, 0]
+    etas = [eta for _, eta in observed]
+    assert etas[0] > etas[1] > etas[2] > 0
+    assert scheduler.queue_depth == 0
+    assert scheduler.eta_seconds() == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_exceptions_are_yielded():
+    """A failing file is reported as a result rather than aborting the job."""
+    scheduler = AnalysisScheduler(max_in_flight=2)
+
+    async def worker(file_path):
+        if file_path == "f1.py":
+            raise RuntimeError("boom")
+        return "ok"
+
+    results = dict([r async for r in scheduler.run("job", make_items([1, 2, 3]), worker)])
+
+    assert isinstance(results["f1.py"], RuntimeError)
+    assert results["f0.py"] == results["f2.py"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_only_measured_results_refine_costs():
+    """Timings of results the job does not count as analyses are not observed."""
+    scheduler = AnalysisScheduler(max_in_flight=2)
+
+    async def worker(file_path):
+        return "cached" if file_path == "f1.py" else "analyzed"
+
+    items = make_items([1, 2, 3])
+    [r async for r in scheduler.run("job", items, worker, measured=lambda fp, result: result == "analyzed")]
+
+    assert set(scheduler.cost_model.file_history) == {"f0.py", "f2.py"}
+
+
+@pytest.mark.asyncio
+async def test_closing_run_cancels_pending_work():
+    """Closing the iterator drops pending files and frees the slots."""
+    scheduler = AnalysisScheduler(max_in_flight=2)
+    started = []
+
+    async def worker(file_path):
+        started.append(file_path)
+        await asyncio.sleep(0.001 if file_path == "f0.py" else 10)
+
+    run = scheduler.run("job", make_items([100000, 10, 10, 10, 10]), worker)
+    async for _ in run:
+        break
+    await run.aclose()
+
+    # Two initial slots plus the refill of the finished one; the rest is dropped
+    assert len(started) == 3
+    assert scheduler.queue_depth == 0
+    assert scheduler.in_flight == 0
+
+
+@pytest_asyncio.fixture
+async def cache_manager():
+    """Create a temporary cache manager for testing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = UnifiedCacheManager(
+            max_memory_mb=10,
+            sqlite_path=os.path.join(tmpdir, "test_cache.db"),
+            redis_url=None
+        )
+        await manager.initialize()
+        try:
+            yield manager
+        finally:
+            await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_engine_dispatches_largest_file_first(cache_manager):
+    """analyze_codebase_stream analyzes the largest file first and reports the queue."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i, count in enumerate([1, 50, 5]):
+            body = "".join(f"def func_{n}(x):\n    return x + {n}\n\n" for n in range(count))
+            with open(os.path.join(tmpdir, f"module_{i}.py"), 'w') as f:
+                f.write(body)
+        await cache_manager.set_analysis("scan:sched", {"path": tmpdir})
+        engine = AnalysisEngine(cache_manager, AnalysisConfig(
+            enable_linters=False,
+            max_parallel_files=1,
+            persistence_path=os.path.join(tmpdir, ".documee")
+        ))
+
+        events = [
+            e async for e in engine.analyze_codebase_stream("sched", incremental=False)
+            if e.kind == AnalysisEvent.FILE
+        ]
+
+    assert [os.path.basename(e.file_path) for e in events] == [
+        "module_1.py", "module_2.py", "module_0.py"
+    ]
+    assert [e.queue_depth for e in events] == [1, 0, 0]
+    assert events[-1].eta_seconds == 0
+    assert engine.get_performance_metrics()['scheduler']['queue_depth'] == 0
+
+
+@pytest.mark.asyncio
+async def test_engine_does_not_observe_reused_or_cached_files(cache_manager):
+    """Files that were not analyzed again keep their measured cost."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(2):
+            with open(os.path.join(tmpdir, f"module_{i}.py"), 'w') as f:
+                f.write(f"def func_{i}(x):\n    return x + {i}\n")
+        await cache_manager.set_analysis("scan:costs", {"path": tmpdir})
+        engine = AnalysisEngine(cache_manager, AnalysisConfig(
+            enable_linters=False,
+            persistence_path=os.path.join(tmpdir, ".documee")
+        ))
+        cost_model = engine.scheduler.cost_model
+
+        await engine.analyze_codebase("costs")
+        history = dict(cost_model.file_history)
+        assert len(history) == 2
+
+        # Reused from the previous run, then served from the cache
+        await engine.analyze_codebase("costs")
+        await engine.analyze_codebase("costs", incremental=False)
+
+    assert dict(cost_model.file_history) == history
@@ -0,0 +1,281 @@
+"""
+Tests for streaming codebase analysis.
+
+Tests:
+- Event order: STARTED, FILE per file, STAGE per codebase step, COMPLETE
+- Incremental runs mark reused file analyses and patch the dependency graph
+- Stopping iteration early cancels outstanding work
+- Byte-identical files are analyzed once and fanned out to every path
+- analyze_codebase_tool reports progress through the MCP context
+"""
+
+import json
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+import src.server
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.events import AnalysisEvent
+from src.cache.unified_cache import UnifiedCacheManager
+from src.config.settings import Settings
+
+
+@pytest_asyncio.fixture
+async def cache_manager():
+    """Create a temporary cache manager for testing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = UnifiedCacheManager(
+            max_memory_mb=10,
+            sqlite_path=os.path.join(tmpdir, "test_cache.db"),
+            redis_url=None
+        )
+        await manager.initialize()
+        try:
+            yield manager
+        finally:
+            await manager.close()
+
+
+@pytest_asyncio.fixture
+async def scanned_codebase(cache_manager):
+    """Create a small codebase on disk and register its scan result."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(5):
+            with open(os.path.join(tmpdir, f"module_{i}.py"), 'w') as f:
+                f.write(f'def func_{i}(x):\n    """Double x."""\n    return x * 2\n')
+        codebase_id = "stream_test"
+        await cache_manager.set_analysis(f"scan:{codebase_id}", {"path": tmpdir})
+        yield codebase_id, tmpdir
+
+
+@pytest.fixture
+def engine(cache_manager, scanned_codebase):
+    """Create an analysis engine persisting into the codebase directory."""
+    _, tmpdir = scanned_codebase
+    return AnalysisEngine(cache_manager, AnalysisConfig(
+        enable_linters=False,
+        persistence_path=os.path.join(tmpdir, ".documee")
+    ))
+
+
+@pytest.mark.asyncio
+async def test_stream_event_order(engine, scanned_codebase):
+    """Files stream first, then codebase-level stages, then the result."""
+    codebase_id, _ = scanned_codebase
+
+    events = [e async for e in engine.analyze_codebase_stream(codebase_id, incremental=False)]
+    kinds = [e.kind for e in events]
+
+    assert kinds[0] == AnalysisEvent.STARTED
+    assert kinds[1:6] == [AnalysisEvent.FILE] * 5
+    assert [e.stage for e in events if e.kind == AnalysisEvent.STAGE] == [
+        AnalysisEvent.STAGE_DEPENDENCY_GRAPH,
+        AnalysisEvent.STAGE_GLOBAL_PATTERNS,
+        AnalysisEvent.STAGE_METRICS,
+        AnalysisEvent.STAGE_PERSISTED
+    ]
+    assert kinds[-1] == AnalysisEvent.COMPLETE
+
+    file_events = [e for e in events if e.kind == AnalysisEvent.FILE]
+    assert [e.completed for e in file_events] == [1, 2, 3, 4, 5]
+    assert all(e.total == 5 for e in file_events)
+    assert all(not e.reused and e.file_analysis is not None for e in file_events)
+
+    result = events[-1].data
+    assert set(result.file_analyses) == {e.file_path for e in file_events}
+
+
+@pytest.mark.asyncio
+async def test_incremental_stream_marks_reused_files(engine, scanned_codebase):
+    """Unchanged files are streamed as reused analyses."""
+    codebase_id, tmpdir = scanned_codebase
+    await engine.analyze_codebase(codebase_id, incremental=False)
+
+    changed = os.path.join(tmpdir, "module_0.py")
+    with open(changed, 'a') as f:
+        f.write("\ndef extra():\n    pass\n")
+
+    events = [e async for e in engine.analyze_codebase_stream(codebase_id, incremental=True)]
+    file_events = {e.file_path: e for e in events if e.kind == AnalysisEvent.FILE}
+
+    assert len(file_events) == 5
+    assert not file_events[changed].reused
+    assert sum(e.reused for e in file_events.values()) == 4
+
+
+@pytest.mark.asyncio
+async def test_incremental_run_patches_dependency_graph(engine, scanned_codebase, monkeypatch):
+    """Incremental runs update the persisted dependency graph instead of rebuilding it."""
+    codebase_id, tmpdir = scanned_codebase
+    await engine.analyze_codebase(codebase_id, incremental=False)
+
+    changed = os.path.join(tmpdir, "module_0.py")
+    with open(changed, 'a') as f:
+        f.write("\nimport module_1\n")
+
+    def rebuild(*args, **kwargs):
+        raise AssertionError("dependency graph was rebuilt")
+
+    monkeypatch.setattr(engine.dependency_analyzer, "analyze_dependencies", rebuild)
+    result = await engine.analyze_codebase(codebase_id, incremental=True)
+
+    graph = result.dependency_graph
+    assert graph.nodes[changed].imports == [os.path.join(tmpdir, "module_1.py")]
+    assert graph.nodes[os.path.join(tmpdir, "module_1.py")].imported_by == [changed]
+
+
+@pytest.mark.asyncio
+async def test_stream_can_stop_early(engine, scanned_codebase):
+    """Closing the stream after the first file skips the codebase stages."""
+    codebase_id, _ = scanned_codebase
+
+    stream = engine.analyze_codebase_stream(codebase_id, incremental=False)
+    seen = []
+    async for event in stream:
+        seen.append(event.kind)
+        if event.kind == AnalysisEvent.FILE:
+            break
+    await stream.aclose()
+
+    assert seen == [AnalysisEvent.STARTED, AnalysisEvent.FILE]
+    assert engine.persistence.load_analysis(codebase_id) is None
+
+
+@pytest.mark.asyncio
+async def test_event_to_dict(engine, scanned_codebase):
+    """File events serialize with their analysis and a progress message."""
+    codebase_id, _ = scanned_codebase
+
+    stream = engine.analyze_codebase_stream(codebase_id, incremental=False)
+    async for event in stream:
+        if event.kind == AnalysisEvent.FILE:
+            data = event.to_dict()
+            break
+    await stream.aclose()
+
+    assert data['kind'] == AnalysisEvent.FILE
+    assert data['file_analysis']['file_path'] == data['file_path']
+    assert data['message'].startswith("Analyzed ")
+
+
+class RecordingContext:
+    """Minimal stand-in for the FastMCP context that records progress."""
+
+    def __init__(self):
+        self.progress = []
+
+    async def report_progress(self, progress, total=None, message=None):
+        self.progress.append((progress, total, message))
+
+
+@pytest.mark.asyncio
+async def test_tool_reports_progress(cache_manager, engine, scanned_codebase):
+    """analyze_codebase_tool forwards stream events as MCP progress."""
+    codebase_id, _ = scanned_codebase
+    context = src.server.AppContext(
+        cache_manager=cache_manager,
+        config=Settings(),
+        analysis_engine=engine
+    )
+    original_context = src.server.app_context
+    src.server.app_context = context
+    ctx = RecordingContext()
+    try:
+        result = await src.server.analyze_codebase_tool(
+            codebase_id=codebase_id,
+            incremental=False,
+            use_cache=False,
+            ctx=ctx
+        )
+    finally:
+        src.server.app_context = original_context
+
+    assert result['metrics']['total_files'] == 5
+    file_progress = [p for p in ctx.progress if p[2].startswith("Analyzed ")]
+    assert [p[0] for p in file_progress] == [1, 2, 3, 4, 5]
+    assert all(p[1] == 5 for p in ctx.progress)
+    assert ctx.progress[-1][2] == f"Completed stage: {AnalysisEvent.STAGE_PERSISTED}"
+
+
+DUPLICATED_SOURCE = (
+    "async def fetch(items):\n"
+    "    return [item async for item in items]\n"
+)
+
+
+@pytest_asyncio.fixture
+async def duplicated_codebase(cache_manager):
+    """Create a codebase with three vendored copies of the same module."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for vendor in ["a", "b", "c"]:
+            os.makedirs(os.path.join(tmpdir, vendor))
+            paths.append(os.path.join(tmpdir, vendor, "client.py"))
+            with open(paths[-1], 'w') as f:
+                f.write(DUPLICATED_SOURCE)
+        with open(os.path.join(tmpdir, "main.py"), 'w') as f:
+            f.write("def main():\n    return 1\n")
+        codebase_id = "dedup_test"
+        await cache_manager.set_analysis(f"scan:{codebase_id}", {"path": tmpdir})
+        yield codebase_id, tmpdir, paths
+
+
+@pytest.mark.asyncio
+async def test_identical_files_are_analyzed_once(cache_manager, duplicated_codebase):
+    """Duplicates reuse one analysis with their own paths and are stored by reference."""
+    codebase_id, tmpdir, paths = duplicated_codebase
+    engine = AnalysisEngine(cache_manager, AnalysisConfig(
+        enable_linters=False,
+        persistence_path=os.path.join(tmpdir, ".documee")
+    ))
+    analyzed = []
+    run = engine.backend.run
+
+    async def recording_run(file_path, source):
+        analyzed.append(file_path)
+        return await run(file_path, source)
+
+    engine.backend.run = recording_run
+    events = [e async for e in engine.analyze_codebase_stream(codebase_id, incremental=False)]
+    result = events[-1].data
+
+    assert len(analyzed) == 2
+    file_events = [e for e in events if e.kind == AnalysisEvent.FILE]
+    assert sorted(e.file_path for e in file_events) == sorted(result.file_analyses)
+    duplicates = [e for e in file_events if e.duplicate_of]
+    assert len(duplicates) == 2
+    assert all(e.duplicate_of in paths and e.duplicate_of != e.file_path for e in duplicates)
+
+    for path in paths:
+        analysis = result.file_analyses[path]
+        assert analysis.file_path == path
+        assert analysis.patterns
+        assert all(p.file_path == path for p in analysis.patterns)
+    assert result.metrics.duplicate_files == 2
+    assert result.metrics.dedup_ratio == 0.5
+
+    with open(os.path.join(tmpdir, ".documee", codebase_id, "analysis.json")) as f:
+        stored = json.load(f)['file_analyses']
+    assert sum('duplicate_of' in entry for entry in stored.values()) == 2
+    loaded = engine.persistence.load_analysis(codebase_id)
+    assert list(loaded.file_analyses) == list(result.file_analyses)
+    assert {fp: fa.to_dict() for fp, fa in loaded.file_analyses.items()} == {
+        fp: fa.to_dict() for fp, fa in result.file_analyses.items()
+    }
+
+
+@pytest.mark.asyncio
+async def test_cached_analysis_gets_requested_path(engine, duplicated_codebase):
+    """The content-keyed cache rewrites the path of analyses from another file."""
+    _, _, paths = duplicated_codebase
+    first = await engine.analyze_file(paths[0])
+    second = await engine.analyze_file(paths[1])
+
+    assert second.cache_hit
+    assert second.file_path == paths[1]
+    assert [p.file_path for p in second.patterns] == [paths[1]] * len(first.patterns)
+    assert first.file_path == paths[0]
@@ -0,0 +1,235 @@
+"""
+Tests for watch mode.
+
+Tests:
+- Polling watcher reports created, modified and deleted files
+- Watcher backend selection
+- Applying file changes patches the analysis, dependency graph and cache
+- Watch mode picks up edits in the background
+- watch_codebase MCP tool
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+import src.server
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.watcher import (
+    WATCHFILES_AVAILABLE, PollingWatcher, WatchfilesWatcher, create_watcher
+)
+from src.cache.unified_cache import UnifiedCacheManager
+from src.config.settings import Settings
+
+
+IGNORED_DIRS = ['node_modules', '.git']
+
+
+def is_python(path):
+    return path.endswith('.py')
+
+
+def write(path, content):
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+async def wait_for(predicate, timeout=10.0):
+    """Poll a predicate until it holds or the timeout expires."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached in time"
+        await asyncio.sleep(0.05)
+
+
+@pytest.fixture
+def project():
+    """Create a project with two Python files, one importing the other."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        write(os.path.join(tmpdir, "main.py"), "import helper\n\ndef main():\n    return helper.help()\n")
+        write(os.path.join(tmpdir, "helper.py"), "def help():\n    return 1\n")
+        yield tmpdir
+
+
+@pytest.mark.asyncio
+async def test_polling_watcher_reports_changes(project):
+    """Created, modified and deleted files are reported; ignored directories are not."""
+    watcher = PollingWatcher(project, IGNORED_DIRS, is_python, interval_seconds=0.05)
+    await watcher.start()
+    changes = watcher.changes()
+
+    os.makedirs(os.path.join(project, "node_modules"))
+    write(os.path.join(project, "node_modules", "dep.py"), "x = 1\n")
+    write(os.path.join(project, "new.py"), "x = 1\n")
+    write(os.path.join(project, "main.py"), "def main():\n    return 2\n")
+    os.remove(os.path.join(project, "helper.py"))
+    write(os.path.join(project, "notes.txt"), "not analyzed\n")
+
+    batch = await asyncio.wait_for(changes.__anext__(), 5)
+    watcher.stop()
+
+    assert batch == {
+        os.path.join(project, "new.py"),
+        os.path.join(project, "main.py"),
+        os.path.join(project, "helper.py"),
+    }
+
+
+def test_create_watcher_backends(project):
+    """The backend is selected by name, with auto preferring native events."""
+    assert isinstance(create_watcher('polling', project, IGNORED_DIRS, is_python), PollingWatcher)
+    expected = WatchfilesWatcher if WATCHFILES_AVAILABLE else PollingWatcher
+    assert isinstance(create_watcher('auto', project, IGNORED_DIRS, is_python), expected)
+    with pytest.raises(ValueError):
+        create_watcher('inotify', project, IGNORED_DIRS, is_python)
+
+
+def test_is_relevant(project):
+    """Paths in ignored directories or outside the root are filtered out."""
+    watcher = PollingWatcher(project, IGNORED_DIRS, is_python)
+    assert watcher.is_relevant(os.path.join(project, "pkg", "mod.py"))
+    assert not watcher.is_relevant(os.path.join(project, "node_modules", "mod.py"))
+    assert not watcher.is_relevant(os.path.join(project, "mod.js"))
+    assert not watcher.is_relevant(os.path.join(os.path.dirname(project), "mod.py"))
+
+
+@pytest_asyncio.fixture
+async def cache_manager():
+    """Create a temporary cache manager for testing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = UnifiedCacheManager(
+            max_memory_mb=10,
+            sqlite_path=os.path.join(tmpdir, "test_cache.db"),
+            redis_url=None
+        )
+        await manager.initialize()
+        try:
+            yield manager
+        finally:
+            await manager.close()
+
+
+@pytest_asyncio.fixture
+async def engine(cache_manager, project):
+    """Create an engine using the polling watcher with short intervals."""
+    engine = AnalysisEngine(cache_manager, AnalysisConfig(
+        enable_linters=False,
+        persistence_path=os.path.join(project, ".documee"),
+        watch_backend='polling',
+        watch_debounce_ms=50,
+        watch_poll_interval_ms=50
+    ))
+    await cache_manager.set_analysis("scan:watched", {"path": project})
+    try:
+        yield engine
+    finally:
+        for codebase_id in list(engine.watchers):
+            await engine.unwatch_codebase(codebase_id)
+        engine.shutdown()
+
+
+def edges(analysis):
+    return sorted(
+        (os.path.basename(e.from_file), os.path.basename(e.to_file))
+        for e in analysis.dependency_graph.edges
+    )
+
+
+@pytest.mark.asyncio
+async def test_apply_file_changes(engine, cache_manager, project):
+    """Only touched files are re-analyzed and the cached analysis is replaced."""
+    status = await engine.watch_codebase("watched")
+    assert status['backend'] == 'polling'
+    baseline = engine.get_watched_analysis("watched")
+    assert edges(baseline) == [("main.py", "helper.py")]
+
+    main = os.path.join(project, "main.py")
+    helper = os.path.join(project, "helper.py")
+    util = os.path.join(project, "util.py")
+    write(util, "def util():\n    return 3\n")
+    write(main, "import util\n\ndef main():\n    return util.util()\n\ndef other():\n    pass\n")
+    os.remove(helper)
+
+    analyzed = []
+    analyze_file = engine.analyze_file
+
+    async def recording_analyze_file(file_path, *args, **kwargs):
+        analyzed.append(file_path)
+        return await analyze_file(file_path, *args, **kwargs)
+
+    engine.analyze_file = recording_analyze_file
+    updated = await engine.apply_file_changes("watched", {main, helper, util})
+
+    assert updated == 3
+    assert sorted(analyzed) == sorted([main, util])
+    analysis = engine.get_watched_analysis("watched")
+    assert sorted(analysis.file_analyses) == sorted([main, util])
+    assert [f.name for f in analysis.file_analyses[main].symbol_info.functions] == ["main", "other"]
+    assert edges(analysis) == [("main.py", "util.py")]
+    assert analysis.metrics.total_files == 2
+
+    cached = await cache_manager.get_analysis("codebase:watched")
+    assert sorted(cached['file_analyses']) == sorted([main, util])
+
+
+@pytest.mark.asyncio
+async def test_watch_applies_edits_in_background(engine, cache_manager, project):
+    """Edits are picked up without another analyze_codebase call."""
+    await engine.watch_codebase("watched")
+    codebase_watcher = engine.watchers["watched"]
+
+    write(os.path.join(project, "main.py"), "def main():\n    return 1\n\ndef added():\n    pass\n")
+    await wait_for(lambda: codebase_watcher.updates >= 1)
+
+    cached = await cache_manager.get_analysis("codebase:watched")
+    functions = cached['file_analyses'][os.path.join(project, "main.py")]['symbol_info']['functions']
+    assert [f['name'] for f in functions] == ["main", "added"]
+    assert cached['dependency_graph']['edges'] == []
+
+    assert await engine.unwatch_codebase("watched")
+    assert not await engine.unwatch_codebase("watched")
+    assert engine.get_watched_analysis("watched") is None
+
+
+@pytest.mark.asyncio
+async def test_watch_requires_scan(engine):
+    """Watching an unscanned codebase fails without leaving a watcher behind."""
+    with pytest.raises(ValueError):
+        await engine.watch_codebase("unknown")
+    assert "unknown" not in engine.watchers
+
+
+@pytest.mark.asyncio
+async def test_watch_codebase_tool(engine, cache_manager, project):
+    """The watch_codebase tool starts and stops watch mode."""
+    original_context = src.server.app_context
+    src.server.app_context = src.server.AppContext(
+        cache_manager=cache_manager,
+        config=Settings(),
+        analysis_engine=engine
+    )
+    try:
+        status = await src.server.watch_codebase("watched")
+        assert status['watching'] is True
+        assert status['backend'] == 'polling'
+
+        # Expired cache entries fall back to the watched analysis
+        get_analysis = cache_manager.get_analysis
+
+        async def expired_get_analysis(key):
+            return None if key == "codebase:watched" else await get_analysis(key)
+
+        cache_manager.get_analysis = expired_get_analysis
+        result = await src.server.analyze_codebase_tool("watched")
+        assert result['from_cache'] is True
+        assert result['codebase_id'] == "watched"
+
+        status = await src.server.watch_codebase("watched", enabled=False)
+        assert status == {'codebase_id': 'watched', 'watching': False}
+    finally:
+        src.server.app_context = original_context
+    assert engine.watchers == {}
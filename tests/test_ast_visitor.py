@@ -0,0 +1,134 @@
+"""
+Tests for the single-pass AST visitor.
+
+Tests per-function decision points and nesting depth, comment collection,
+and that the analyzers give the same results from a visit as from
+walking the tree themselves.
+"""
+
+import pytest
+
+from src.analysis.ast_parser import ASTParserManager
+from src.analysis.ast_visitor import FusedASTVisitor, VisitorSpec, get_visitor, visit_file
+from src.analysis.complexity_analyzer import ComplexityAnalyzer
+from src.analysis.config import AnalysisConfig
+from src.analysis.documentation_coverage import DocumentationCoverageAnalyzer
+from src.analysis.symbol_extractor import SymbolExtractor
+
+
+PYTHON_SOURCE = b'''def outer(items):
+    """Process items."""
+    for item in items:
+        if item and item.ready:  # skip items that are not ready yet
+            def inner():
+                while True:
+                    break
+            inner()
+    return items
+
+
+class Service:
+    def handle(self, request):
+        # validate the request before dispatching it to a handler
+        try:
+            return request.run()
+        except ValueError:
+            return None
+'''
+
+
+@pytest.fixture
+def parser_manager():
+    """Create AST parser manager."""
+    return ASTParserManager(AnalysisConfig())
+
+
+def test_function_metrics(parser_manager):
+    """Decision points and nesting depth include nested functions."""
+    parse_result = parser_manager.parse_bytes(PYTHON_SOURCE, 'python')
+    visit = visit_file(parse_result, PYTHON_SOURCE)
+
+    metrics = {
+        start: m for (start, _, node_type), m in visit.functions.items()
+        if node_type == 'function_definition'
+    }
+    outer, inner, handle = (metrics[k] for k in sorted(metrics))
+
+    # for, if, and, while
+    assert outer.complexity == 5
+    assert outer.max_nesting_depth == 3
+    assert inner.complexity == 2
+    assert inner.max_nesting_depth == 1
+    # try, except
+    assert handle.complexity == 2
+    assert handle.max_nesting_depth == 2
+    assert visit.max_nesting_depth == 3
+
+
+def test_matches_recursive_analysis(parser_manager):
+    """The visit gives the same numbers as the per-function recursive walks."""
+    parse_result = parser_manager.parse_bytes(PYTHON_SOURCE, 'python')
+    analyzer = ComplexityAnalyzer()
+    visit = visit_file(parse_result, PYTHON_SOURCE)
+
+    stack = [parse_result.root_node]
+    while stack:
+        node = stack.pop()
+        stack.extend(node.children)
+        if node.type == 'function_definition':
+            metrics = visit.lookup(node)
+            assert metrics.max_nesting_depth == analyzer.calculate_nesting_depth(node)
+            assert metrics.complexity == analyzer.calculate_complexity(node, 'python')
+
+
+def test_comments(parser_manager):
+    """Comments are collected with their line and whether code precedes them."""
+    source = b'x = "# not a comment"\ny = 1  # trailing\n    // not python either\n'
+    parse_result = parser_manager.parse_bytes(source, 'python')
+    visit = visit_file(parse_result, source)
+
+    assert [(c.text, c.has_code_before) for c in visit.comments] == [("trailing", True)]
+    assert visit.comments[0].line == "y = 1  # trailing"
+
+
+def test_javascript_functions(parser_manager):
+    """JavaScript arrow functions and methods are recorded."""
+    source = b'const f = (a) => { if (a) { return 1; } /* block comment */ };\nclass A { m() { return 2; } }\n'
+    parse_result = parser_manager.parse_bytes(source, 'javascript')
+    visit = visit_file(parse_result, source)
+
+    types = sorted(node_type for _, _, node_type in visit.functions)
+    assert types == ['arrow_function', 'method_definition']
+    assert [c.text for c in visit.comments] == ["block comment"]
+
+
+def test_unknown_language_has_no_functions():
+    """Languages without a spec share the generic node types."""
+    visitor = get_visitor('kotlin')
+    assert isinstance(visitor, FusedASTVisitor)
+    assert visitor.spec == VisitorSpec(frozenset())
+    assert get_visitor('kotlin') is visitor
+
+
+def test_analyzers_use_visit(parser_manager):
+    """Symbols, complexity and documentation agree with and without a shared visit."""
+    parse_result = parser_manager.parse_bytes(PYTHON_SOURCE, 'python')
+    extractor = SymbolExtractor()
+    complexity = ComplexityAnalyzer()
+    documentation = DocumentationCoverageAnalyzer()
+
+    visit = visit_file(parse_result, PYTHON_SOURCE)
+    symbols = extractor.extract_symbols(parse_result, visit=visit)
+    assert symbols.to_dict() == extractor.extract_symbols(parse_result).to_dict()
+    assert [f.complexity for f in symbols.functions] == [5]
+    assert [m.complexity for m in symbols.classes[0].methods] == [2]
+
+    metrics = complexity.analyze_file(symbols, visit=visit)
+    assert metrics.max_nesting_depth == 3
+    assert metrics.avg_nesting_depth == 2.5
+    assert complexity.analyze_file(symbols).avg_nesting_depth == 0.0
+
+    content = PYTHON_SOURCE.decode()
+    with_visit = documentation.calculate_coverage(symbols, content, 'python', visit=visit)
+    without_visit = documentation.calculate_coverage(symbols, content, 'python')
+    assert with_visit.has_inline_comments == without_visit.has_inline_comments
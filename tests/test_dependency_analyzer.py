@@ -440,5 +440,159 @@ class TestPackageNameExtraction:
         assert package == "@angular/core"
 
 
+def make_analyses(import_map):
+    """Create mock analyses from a {file_path: [module, ...]} mapping."""
+    return {
+        file_path: MockFileAnalysis(symbol_info=SymbolInfo(imports=[
+            ImportInfo(
+                module=module,
+                imported_symbols=[],
+                is_relative=False,
+                import_type="import",
+                line_number=line
+            )
+            for line, module in enumerate(modules, 1)
+        ]))
+        for file_path, modules in import_map.items()
+    }
+
+
+def graph_summary(graph):
+    """Summarize a graph independently of node and edge order."""
+    return (
+        {path: sorted(node.imports) for path, node in graph.nodes.items()},
+        {path: sorted(node.imported_by) for path, node in graph.nodes.items()},
+        sorted((e.from_file, e.to_file) for e in graph.edges),
+        graph.external_dependencies,
+        sorted(sorted(set(c.cycle)) for c in graph.circular_dependencies)
+    )
+
+
+class TestIncrementalDependencyUpdates:
+    """Test patching a previous dependency graph."""
+    
+    BASE = {
+        "a.py": ["b", "os"],
+        "b.py": ["c"],
+        "c.py": ["requests"],
+        "d.py": ["e"],
+        "e.py": ["d"],
+    }
+    
+    def assert_matches_rebuild(self, analyzer, changes, changed_files):
+        """Patch the base graph and compare it with a full rebuild."""
+        previous = analyzer.analyze_dependencies("test", make_analyses(self.BASE))
+        import_map = {**self.BASE, **changes}
+        current = make_analyses({
+            path: modules for path, modules in import_map.items() if modules is not None
+        })
+        
+        updated = analyzer.update_dependencies("test", previous, current, changed_files)
+        rebuilt = analyzer.analyze_dependencies("test", current)
+        
+        assert graph_summary(updated) == graph_summary(rebuilt)
+        return updated
+    
+    def test_changed_import(self, dependency_analyzer):
+        """A changed file gets its edges and external counts re-resolved."""
+        graph = self.assert_matches_rebuild(
+            dependency_analyzer, {"a.py": ["c", "json"]}, {"a.py"}
+        )
+        assert graph.nodes["b.py"].imported_by == []
+        assert "os" not in graph.external_dependencies
+    
+    def test_added_file_resolves_unresolved_imports(self, dependency_analyzer):
+        """An added file satisfies imports that were external before."""
+        graph = self.assert_matches_rebuild(dependency_analyzer, {"requests.py": []}, set())
+        assert graph.nodes["c.py"].imports == ["requests.py"]
+    
+    def test_removed_file(self, dependency_analyzer):
+        """Importers of a removed file fall back to external imports."""
+        graph = self.assert_matches_rebuild(dependency_analyzer, {"c.py": None}, set())
+        assert "c.py" not in graph.nodes
+        assert graph.nodes["b.py"].external_imports == ["c"]
+    
+    def test_cycle_created(self, dependency_analyzer):
+        """A new edge that closes a loop adds a cycle."""
+        graph = self.assert_matches_rebuild(dependency_analyzer, {"c.py": ["a"]}, {"c.py"})
+        assert len(graph.circular_dependencies) == 2
+    
+    def test_cycle_broken(self, dependency_analyzer):
+        """Removing an edge of a cycle drops it; other cycles are kept."""
+        previous = dependency_analyzer.analyze_dependencies(
+            "test", make_analyses({**self.BASE, "c.py": ["a"]})
+        )
+        kept = [c for c in previous.circular_dependencies if "d.py" in c.cycle]
+        
+        graph = dependency_analyzer.update_dependencies(
+            "test", previous, make_analyses(self.BASE), {"c.py"}
+        )
+        
+        assert graph.circular_dependencies == kept
+    
+    def test_only_affected_files_are_resolved(self, dependency_analyzer, monkeypatch):
+        """Unchanged files are not resolved again."""
+        previous = dependency_analyzer.analyze_dependencies("test", make_analyses(self.BASE))
+        resolved = []
+        resolve = dependency_analyzer._resolve_import_path
+        
+        def counting_resolve(import_info, source_file, file_analyses):
+            resolved.append(source_file)
+            return resolve(import_info, source_file, file_analyses)
+        
+        monkeypatch.setattr(dependency_analyzer, "_resolve_import_path", counting_resolve)
+        dependency_analyzer.update_dependencies(
+            "test", previous, make_analyses({**self.BASE, "e.py": []}), {"e.py"}
+        )
+        
+        assert resolved == []
+    
+    def test_unchanged_graph_is_returned(self, dependency_analyzer):
+        """Nothing to patch when no file changed."""
+        previous = dependency_analyzer.analyze_dependencies("test", make_analyses(self.BASE))
+        summary = graph_summary(previous)
+        
+        graph = dependency_analyzer.update_dependencies("test", previous, make_analyses(self.BASE), set())
+        
+        assert graph is previous
+        assert graph_summary(graph) == summary
+    
+    def test_sequential_updates_reuse_the_index(self, dependency_analyzer):
+        """Patching the same graph object repeatedly keeps edges and lookups in sync."""
+        import_map = dict(self.BASE)
+        graph = dependency_analyzer.analyze_dependencies("test", make_analyses(import_map))
+        steps = [
+            ({"requests.py": []}, set()),
+            ({"a.py": ["c", "e"]}, {"a.py"}),
+            ({"c.py": None}, set()),
+            ({"c.py": ["a"], "f.py": ["d", "c"]}, {"c.py"}),
+        ]
+        for changes, changed_files in steps:
+            import_map.update(changes)
+            import_map = {path: modules for path, modules in import_map.items() if modules is not None}
+            current = make_analyses(import_map)
+            graph = dependency_analyzer.update_dependencies("test", graph, current, changed_files)
+            rebuilt = dependency_analyzer.analyze_dependencies("test", current)
+            assert graph_summary(graph) == graph_summary(rebuilt)
+    
+    def test_added_file_only_resolves_matching_importers(self, dependency_analyzer, monkeypatch):
+        """Only files with an unresolved import the added file could satisfy are resolved."""
+        previous = dependency_analyzer.analyze_dependencies("test", make_analyses(self.BASE))
+        resolved = []
+        resolve = dependency_analyzer._resolve_import_path
+        
+        def counting_resolve(import_info, source_file, file_analyses):
+            resolved.append(source_file)
+            return resolve(import_info, source_file, file_analyses)
+        
+        monkeypatch.setattr(dependency_analyzer, "_resolve_import_path", counting_resolve)
+        graph = dependency_analyzer.update_dependencies(
+            "test", previous, make_analyses({**self.BASE, "lib/requests.py": []}), set()
+        )
+        
+        assert set(resolved) == {"c.py"}
+        assert graph.nodes["c.py"].imports == ["lib/requests.py"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
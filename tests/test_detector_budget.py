@@ -0,0 +1,207 @@
+"""
+Tests for pattern detector budgets.
+
+Tests:
+- Detector runs are recorded in the cost table
+- Soft overruns demote a detector to sampled, then disabled, until the next run
+- A hard budget overrun demotes a detector at once
+- Sampled detectors run on 1 in sample_rate files
+- The run budget disables a detector until the next run
+- The file budget skips the remaining detectors of a file
+- Adaptive ordering runs productive detectors first, keeping output order
+- The engine exposes the cost table in its performance metrics
+"""
+
+import os
+import tempfile
+import time
+
+import pytest
+
+from src.analysis.config import AnalysisConfig
+from src.analysis.detector_budget import (
+    MIN_HISTORY_RUNS, MODE_ACTIVE, MODE_DISABLED, MODE_SAMPLED, DetectorBudget, DetectorCostTable
+)
+from src.analysis.engine import AnalysisEngine
+from src.analysis.pattern_detector import BasePatternDetector, DetectedPattern, PatternDetector
+from src.analysis.symbol_extractor import SymbolInfo
+
+
+class SlowDetector(BasePatternDetector):
+    """Sleeps, then finds nothing."""
+
+    delay = 0.02
+
+    def detect(self, symbol_info, file_content, file_path):
+        time.sleep(self.delay)
+        return []
+
+
+class FastDetector(BasePatternDetector):
+    """Finds one pattern per file."""
+
+    def detect(self, symbol_info, file_content, file_path):
+        return [DetectedPattern(pattern_type="fast", file_path=file_path, confidence=1.0)]
+
+
+def _symbols():
+    return SymbolInfo()
+
+
+def _run_files(detector, count):
+    return [
+        detector.detect_patterns_in_file(_symbols(), "x = 1", f"file{i}.py")
+        for i in range(count)
+    ]
+
+
+def test_runs_are_recorded():
+    detector = PatternDetector([FastDetector(), SlowDetector()])
+    yields = {}
+    detector.detect_patterns_in_file(_symbols(), "x = 1", "a.py", yields=yields)
+
+    costs = detector.budget.costs.to_dict()
+    assert yields == {'FastDetector': 1, 'SlowDetector': 0}
+    assert costs['FastDetector']['runs'] == 1
+    assert costs['FastDetector']['hit_rate'] == 1.0
+    assert costs['SlowDetector']['hit_rate'] == 0.0
+    # Slowest first
+    assert list(costs) == ['SlowDetector', 'FastDetector']
+    assert detector.budget.modes() == {}
+
+
+def test_soft_overruns_demote_step_by_step(caplog):
+    budget = DetectorBudget(soft_ms=5, overrun_limit=2, sample_rate=1)
+    detector = PatternDetector([SlowDetector()], budget=budget)
+
+    _run_files(detector, 2)
+    assert budget.modes() == {'SlowDetector': MODE_SAMPLED}
+    assert "SlowDetector" in caplog.text
+
+    _run_files(detector, 2)
+    assert budget.modes() == {'SlowDetector': MODE_DISABLED}
+
+    skips = {}
+    detector.detect_patterns_in_file(_symbols(), "x = 1", "b.py", budget_skips=skips)
+    assert skips == {'SlowDetector': 1}
+    assert budget.costs.get('SlowDetector').runs == 4
+
+
+def test_demotions_last_until_the_next_run():
+    budget = DetectorBudget(soft_ms=5, overrun_limit=1)
+    detector = PatternDetector([SlowDetector()], budget=budget)
+    _run_files(detector, 2)
+    assert budget.modes() == {'SlowDetector': MODE_DISABLED}
+
+    budget.start_run()
+
+    assert budget.modes() == {}
+    assert budget.costs.get('SlowDetector').runs == 2
+
+
+def test_hard_budget_demotes_at_once():
+    budget = DetectorBudget(soft_ms=1, hard_ms=5, overrun_limit=10)
+    detector = PatternDetector([SlowDetector()], budget=budget)
+
+    _run_files(detector, 1)
+
+    assert budget.modes() == {'SlowDetector': MODE_SAMPLED}
+
+
+def test_sampled_detector_runs_on_one_in_n_files():
+    budget = DetectorBudget(hard_ms=5, sample_rate=3)
+    detector = PatternDetector([SlowDetector()], budget=budget)
+    _run_files(detector, 1)
+    SlowDetector.delay = 0
+    try:
+        _run_files(detector, 6)
+    finally:
+        SlowDetector.delay = 0.02
+
+    cost = budget.costs.get('SlowDetector')
+    assert cost.mode == MODE_SAMPLED
+    assert cost.runs == 1 + 2
+    assert cost.skipped == 4
+
+
+def test_run_budget_disables_until_next_run():
+    budget = DetectorBudget(run_ms=30)
+    detector = PatternDetector([SlowDetector()], budget=budget)
+
+    _run_files(detector, 3)
+    assert budget.modes() == {'SlowDetector': MODE_DISABLED}
+
+    budget.start_run()
+    assert budget.modes() == {}
+    assert budget.costs.get('SlowDetector').run_ms == 0.0
+
+
+def test_file_budget_skips_remaining_detectors():
+    budget = DetectorBudget(file_ms=5, adaptive_order=False)
+    detector = PatternDetector([SlowDetector(), FastDetector()], budget=budget)
+    skips = {}
+
+    patterns = detector.detect_patterns_in_file(_symbols(), "x = 1", "a.py", budget_skips=skips)
+
+    assert patterns == []
+    assert skips == {'FastDetector': 1}
+    # A file budget skip does not demote the detector
+    assert budget.modes() == {}
+
+
+def test_adaptive_order_runs_productive_detectors_first():
+    SlowDetector.delay = 0.002
+    try:
+        detector = PatternDetector([SlowDetector(), FastDetector()])
+        _run_files(detector, MIN_HISTORY_RUNS)
+        ordered = detector.budget.order(detector.detectors)
+        patterns = _run_files(detector, 1)[0]
+    finally:
+        SlowDetector.delay = 0.02
+
+    assert [d.__class__.__name__ for d in ordered] == ['FastDetector', 'SlowDetector']
+    assert [p.pattern_type for p in patterns] == ['fast']
+
+
+def test_adaptive_order_disabled_keeps_registration_order():
+    budget = DetectorBudget(adaptive_order=False)
+    detectors = [SlowDetector(), FastDetector()]
+    assert budget.order(detectors) == detectors
+
+
+def test_cost_table_keeps_most_demoted_mode():
+    table = DetectorCostTable()
+    table.record_file({'A': 2.0}, {'A': 1}, {}, {'A': MODE_DISABLED})
+    table.record_file({'A': 1.0}, {'A': 0}, {'A': 1}, {'A': MODE_SAMPLED})
+
+    cost = table.to_dict()['A']
+    assert cost['mode'] == MODE_DISABLED
+    assert cost['runs'] == 2
+    assert cost['skipped'] == 1
+    assert cost['hit_rate'] == 0.5
+
+
+def test_budget_from_config():
+    config = AnalysisConfig(detector_soft_budget_ms=50, detector_sample_rate=4)
+    budget = DetectorBudget.from_config(config)
+    assert budget.soft_ms == 50
+    assert budget.sample_rate == 4
+    assert DetectorBudget.from_config(AnalysisConfig()).hard_ms == 0
+    assert AnalysisConfig.from_dict({'analysis': {'detector_run_budget_ms': 500}}).detector_run_budget_ms == 500
+
+
+@pytest.mark.asyncio
+async def test_engine_metrics_include_detector_costs():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "app.py")
+        with open(file_path, "w") as f:
+            f.write("import jwt\n\ndef login(token):\n    return jwt.decode(token)\n")
+        config = AnalysisConfig(persistence_path=os.path.join(tmp_dir, ".documee"))
+        engine = AnalysisEngine(None, config)
+
+        await engine.analyze_file(file_path)
+        costs = engine.get_performance_metrics()['detector_costs']
+
+    assert 'PythonPatternDetector' in costs
+    assert costs['PythonPatternDetector']['runs'] == 1
+    assert costs['PythonPatternDetector']['mode'] == MODE_ACTIVE
@@ -0,0 +1,211 @@
+"""
+Tests for the stat-based file manifest.
+
+Tests:
+- Stat tuple matching and racy entry detection
+- Manifest serialization and persistence
+- scandir-based file discovery
+- Incremental analysis skips reading files with unchanged stat tuples
+"""
+
+import os
+import tempfile
+import time
+
+import pytest
+import pytest_asyncio
+
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.file_manifest import (
+    RACY_WINDOW_NS,
+    FileManifest,
+    ManifestEntry,
+    scan_files
+)
+from src.analysis.persistence import PersistenceManager
+from src.cache.unified_cache import UnifiedCacheManager
+
+
+# An mtime safely older than any scan started during the test run
+OLD_MTIME_NS = time.time_ns() - 3600 * 1_000_000_000
+
+
+@pytest_asyncio.fixture
+async def cache_manager():
+    """Create a temporary cache manager for testing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = UnifiedCacheManager(
+            max_memory_mb=10,
+            sqlite_path=os.path.join(tmpdir, "test_cache.db"),
+            redis_url=None
+        )
+        await manager.initialize()
+        try:
+            yield manager
+        finally:
+            await manager.close()
+
+
+@pytest.fixture
+def codebase_dir():
+    """Create a small codebase with an ignored directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.makedirs(os.path.join(tmpdir, "pkg"))
+        os.makedirs(os.path.join(tmpdir, "node_modules", "lib"))
+        files = {
+            "main.py": "def main():\n    return 1\n",
+            os.path.join("pkg", "util.py"): "def util(x):\n    return x * 2\n",
+            os.path.join("pkg", "app.js"): "function app() { return 1; }\n",
+            os.path.join("node_modules", "lib", "index.js"): "module.exports = 1;\n",
+            "README.md": "# Readme\n",
+        }
+        for name, content in files.items():
+            with open(os.path.join(tmpdir, name), 'w') as f:
+                f.write(content)
+        yield tmpdir
+
+
+def age_files(root):
+    """Move every file's mtime into the past so manifest entries are not racy."""
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            os.utime(os.path.join(dirpath, filename), ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+
+
+class TestManifestEntry:
+    """Tests for stat tuple matching."""
+
+    def test_matches_same_stat(self, codebase_dir):
+        st = os.stat(os.path.join(codebase_dir, "main.py"))
+        entry = ManifestEntry.from_stat(st, "abc")
+        assert entry.matches(st)
+
+    def test_detects_size_change(self, codebase_dir):
+        path = os.path.join(codebase_dir, "main.py")
+        entry = ManifestEntry.from_stat(os.stat(path), "abc")
+        with open(path, 'a') as f:
+            f.write("# changed\n")
+        assert not entry.matches(os.stat(path))
+
+    def test_round_trip(self):
+        entry = ManifestEntry(size=10, mtime_ns=123, inode=7, content_hash="abc")
+        assert ManifestEntry.from_dict(entry.to_dict()) == entry
+
+
+class TestFileManifest:
+    """Tests for manifest lookup."""
+
+    def test_lookup_unchanged_file(self, codebase_dir):
+        age_files(codebase_dir)
+        path = os.path.join(codebase_dir, "main.py")
+        manifest = FileManifest(scan_started_ns=time.time_ns())
+        manifest.record(path, os.stat(path), "abc")
+
+        assert manifest.lookup(path, os.stat(path)) == "abc"
+
+    def test_lookup_unknown_file(self, codebase_dir):
+        path = os.path.join(codebase_dir, "main.py")
+        manifest = FileManifest(scan_started_ns=time.time_ns())
+        assert manifest.lookup(path, os.stat(path)) is None
+
+    def test_racy_entry_requires_rehash(self, codebase_dir):
+        path = os.path.join(codebase_dir, "main.py")
+        st = os.stat(path)
+        manifest = FileManifest(scan_started_ns=st.st_mtime_ns + RACY_WINDOW_NS // 2)
+        manifest.record(path, st, "abc")
+
+        assert manifest.lookup(path, st) is None
+        assert manifest.lookup(path, st, trust=True) == "abc"
+
+    def test_persistence_round_trip(self, codebase_dir):
+        path = os.path.join(codebase_dir, "main.py")
+        manifest = FileManifest(scan_started_ns=time.time_ns())
+        manifest.record(path, os.stat(path), "abc")
+
+        persistence = PersistenceManager(os.path.join(codebase_dir, ".documee"))
+        assert persistence.get_file_manifest("cb") is None
+        persistence.save_file_manifest("cb", manifest)
+
+        assert persistence.get_file_manifest("cb") == manifest
+
+
+def test_scan_files_skips_ignored_dirs(codebase_dir):
+    """scan_files returns matching files with their stats, skipping ignored dirs."""
+    found = scan_files(
+        codebase_dir,
+        AnalysisEngine.IGNORED_DIRS,
+        lambda path: path.endswith(('.py', '.js'))
+    )
+    paths = sorted(os.path.relpath(path, codebase_dir) for path, _ in found)
+
+    assert paths == sorted(["main.py", os.path.join("pkg", "util.py"), os.path.join("pkg", "app.js")])
+    for path, st in found:
+        assert st.st_size == os.path.getsize(path)
+
+
+async def analyze_twice(cache_manager, codebase_dir, trust=False, modify=None):
+    """Run a full then an incremental analysis, counting reads in the second run."""
+    codebase_id = "manifest_test"
+    await cache_manager.set_analysis(f"scan:{codebase_id}", {"path": codebase_dir})
+    config = AnalysisConfig(
+        enable_linters=False,
+        trust_stat_manifest=trust,
+        persistence_path=os.path.join(codebase_dir, ".documee")
+    )
+    engine = AnalysisEngine(cache_manager, config)
+    await engine.analyze_codebase(codebase_id, incremental=False)
+
+    if modify:
+        modify()
+
+    reads = []
+    read_source = engine._read_source
+
+    def counting_read(file_path):
+        reads.append(file_path)
+        return read_source(file_path)
+
+    engine._read_source = counting_read
+    result = await engine.analyze_codebase(codebase_id, incremental=True)
+    return result, reads
+
+
+@pytest.mark.asyncio
+async def test_unchanged_codebase_is_not_read(cache_manager, codebase_dir):
+    """Files with an unchanged, non-racy stat tuple are reused without reading."""
+    age_files(codebase_dir)
+
+    result, reads = await analyze_twice(cache_manager, codebase_dir)
+
+    assert reads == []
+    assert len(result.file_analyses) == 3
+
+
+@pytest.mark.asyncio
+async def test_recently_modified_files_are_rehashed(cache_manager, codebase_dir):
+    """Racy entries are re-hashed unless the stat tuple is trusted."""
+    result, reads = await analyze_twice(cache_manager, codebase_dir)
+    assert len(reads) == 3
+    assert len(result.file_analyses) == 3
+
+    result, reads = await analyze_twice(cache_manager, codebase_dir, trust=True)
+    assert reads == []
+    assert len(result.file_analyses) == 3
+
+
+@pytest.mark.asyncio
+async def test_changed_file_is_reanalyzed(cache_manager, codebase_dir):
+    """Only the file whose stat tuple changed is read and analyzed again."""
+    age_files(codebase_dir)
+    changed = os.path.join(codebase_dir, "main.py")
+
+    def modify():
+        with open(changed, 'a') as f:
+            f.write("\ndef added():\n    pass\n")
+
+    result, reads = await analyze_twice(cache_manager, codebase_dir, modify=modify)
+
+    assert reads == [changed]
+    functions = [func.name for func in result.file_analyses[changed].symbol_info.functions]
+    assert functions == ["main", "added"]
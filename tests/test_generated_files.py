@@ -0,0 +1,169 @@
+"""
+Tests for generated and minified file detection.
+
+Tests:
+- File name patterns, generated-code headers, bundles and minified content
+- Regular source files are not flagged
+- The engine records flagged files without parsing them and reports skip
+  reasons in the codebase metrics
+"""
+
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.generated_files import (
+    REASON_BUNDLE, REASON_FILENAME, REASON_HEADER, REASON_MINIFIED, GeneratedFileClassifier
+)
+from src.cache.unified_cache import UnifiedCacheManager
+
+
+REGULAR_SOURCE = b'''"""Helpers."""
+
+
+def add(a, b):
+    """Add two numbers."""
+    return a + b
+'''
+
+MINIFIED_SOURCE = b"var a=1;" + b"function f(n){return n*2}" * 200 + b"\n"
+
+
+@pytest.fixture
+def classifier():
+    """Create a classifier with default thresholds."""
+    return GeneratedFileClassifier()
+
+
+@pytest.mark.parametrize("file_path", [
+    "dist/app.min.js",
+    "static/js/main.chunk.js",
+    "static/js/vendors-main.3f2a9c1b.js",
+    "proto/user_pb2.py",
+    "proto/user_pb2_grpc.py",
+    "api/user.pb.go",
+    "Forms/Main.Designer.cs",
+])
+def test_filename_patterns(classifier, file_path):
+    """Known generated file names are flagged without reading content."""
+    assert classifier.classify(file_path) == REASON_FILENAME
+
+
+@pytest.mark.parametrize("header", [
+    b"// Code generated by protoc-gen-go. DO NOT EDIT.\n",
+    b"# -*- coding: utf-8 -*-\n# Generated by the protocol buffer compiler.  DO NOT EDIT!\n",
+    b"/* @generated */\n",
+    b"// This file was automatically generated.\n",
+])
+def test_generated_headers(classifier, header):
+    """Generator headers in the first lines are flagged."""
+    assert classifier.classify("src/models.py", header + REGULAR_SOURCE) == REASON_HEADER
+
+
+def test_header_must_be_near_the_top(classifier):
+    """Markers deep inside a file do not count as headers."""
+    source = REGULAR_SOURCE * 10 + b"# @generated\n"
+    assert classifier.classify("src/models.py", source) is None
+
+
+def test_bundles_and_minified_content(classifier):
+    """Bundler runtimes and very long lines are flagged."""
+    bundle = b"(function(modules) { // webpackBootstrap\n  function __webpack_require__(id) {}\n})([]);\n"
+    assert classifier.classify("public/app.js", bundle) == REASON_BUNDLE
+    # Only JavaScript files are searched for bundler runtimes
+    assert classifier.classify("tools/build.py", bundle) is None
+
+    assert classifier.classify("public/vendor.js", MINIFIED_SOURCE) == REASON_MINIFIED
+    assert GeneratedFileClassifier(max_avg_line_length=10000).classify("public/vendor.js", MINIFIED_SOURCE) is None
+
+
+def test_regular_sources_are_not_flagged(classifier):
+    """Ordinary code, including short one-liners, is analyzed."""
+    assert classifier.classify("src/helpers.py", REGULAR_SOURCE) is None
+    assert classifier.classify("src/index.js", b"export default function main() { return 1; }") is None
+    assert classifier.classify("src/empty.py", b"") is None
+
+
+@pytest_asyncio.fixture
+async def cache_manager():
+    """Create a temporary cache manager for testing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = UnifiedCacheManager(
+            max_memory_mb=10,
+            sqlite_path=os.path.join(tmpdir, "test_cache.db"),
+            redis_url=None
+        )
+        await manager.initialize()
+        try:
+            yield manager
+        finally:
+            await manager.close()
+
+
+@pytest.fixture
+def codebase_dir():
+    """Create a codebase with one regular and two generated files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "helpers.py"), 'wb') as f:
+            f.write(REGULAR_SOURCE)
+        with open(os.path.join(tmpdir, "vendor.js"), 'wb') as f:
+            f.write(MINIFIED_SOURCE)
+        with open(os.path.join(tmpdir, "user_pb2.py"), 'wb') as f:
+            f.write(REGULAR_SOURCE)
+        yield tmpdir
+
+
+def make_engine(cache_manager, codebase_dir, generated_files):
+    """Create an engine with the given handling of generated files."""
+    return AnalysisEngine(cache_manager, AnalysisConfig(
+        supported_languages=["python", "javascript"],
+        enable_linters=False,
+        generated_files=generated_files,
+        persistence_path=os.path.join(codebase_dir, ".documee")
+    ))
+
+
+@pytest.mark.asyncio
+async def test_engine_records_metadata_only(cache_manager, codebase_dir):
+    """Generated files get a metadata-only analysis and are never parsed."""
+    await cache_manager.set_analysis("scan:generated", {"path": codebase_dir})
+    engine = make_engine(cache_manager, codebase_dir, "metadata")
+
+    result = await engine.analyze_codebase("generated", incremental=False)
+
+    vendor = result.file_analyses[os.path.join(codebase_dir, "vendor.js")]
+    assert vendor.analysis_mode == "metadata"
+    assert vendor.skip_reason == REASON_MINIFIED
+    assert not vendor.has_errors
+    assert vendor.symbol_info.functions == []
+
+    helpers = result.file_analyses[os.path.join(codebase_dir, "helpers.py")]
+    assert helpers.analysis_mode == "full"
+    assert [f.name for f in helpers.symbol_info.functions] == ["add"]
+
+    assert result.metrics.total_files == 3
+    assert result.metrics.skipped_files == 2
+    assert result.metrics.skip_reasons == {REASON_MINIFIED: 1, REASON_FILENAME: 1}
+    assert result.metrics.avg_documentation_coverage == helpers.documentation_coverage
+    assert engine.get_performance_metrics()['total_files_analyzed'] == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_skip_and_analyze_modes(cache_manager, codebase_dir):
+    """'skip' leaves generated files out; 'analyze' parses everything."""
+    await cache_manager.set_analysis("scan:skipped", {"path": codebase_dir})
+    result = await make_engine(cache_manager, codebase_dir, "skip").analyze_codebase("skipped", incremental=False)
+
+    assert list(result.file_analyses) == [os.path.join(codebase_dir, "helpers.py")]
+    assert result.metrics.skipped_files == 2
+
+    await cache_manager.set_analysis("scan:everything", {"path": codebase_dir})
+    result = await make_engine(cache_manager, codebase_dir, "analyze").analyze_codebase("everything", incremental=False)
+
+    assert len(result.file_analyses) == 3
+    assert all(fa.analysis_mode == "full" for fa in result.file_analyses.values())
+    assert result.metrics.skipped_files == 0
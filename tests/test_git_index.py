@@ -0,0 +1,143 @@
+"""
+Tests for git index based change detection.
+
+Tests:
+- Blob SHAs match git hash-object
+- Clean tracked files are read from the index; dirty and untracked are not
+- Non-repositories fall back to hashing
+- Incremental analysis keys files by blob SHA without reading them
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.git_index import git_blob_sha, read_git_index
+from src.cache.unified_cache import UnifiedCacheManager
+
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(repo, *args):
+    """Run a git command in repo and return its output."""
+    return subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+
+
+@pytest.fixture
+def repo():
+    """Create a git repository with two committed files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.makedirs(os.path.join(tmpdir, "pkg"))
+        files = {
+            "main.py": "def main():\n    return 1\n",
+            os.path.join("pkg", "util.py"): "def util(x):\n    return x * 2\n",
+        }
+        for name, content in files.items():
+            with open(os.path.join(tmpdir, name), 'w') as f:
+                f.write(content)
+        git(tmpdir, "init", "-q")
+        git(tmpdir, "add", ".")
+        git(tmpdir, "commit", "-q", "-m", "initial")
+        yield tmpdir
+
+
+def test_blob_sha_matches_git(repo):
+    """git_blob_sha computes the same digest as git hash-object."""
+    path = os.path.join(repo, "main.py")
+    with open(path, 'rb') as f:
+        content = f.read()
+    assert git_blob_sha(content) == git(repo, "hash-object", path).strip()
+
+
+def test_clean_tracked_files_only(repo):
+    """Modified and untracked files are left out of the index map."""
+    with open(os.path.join(repo, "main.py"), 'a') as f:
+        f.write("# changed\n")
+    with open(os.path.join(repo, "new.py"), 'w') as f:
+        f.write("x = 1\n")
+
+    shas = read_git_index(repo)
+
+    util = os.path.join(repo, "pkg", "util.py")
+    assert list(shas) == [util]
+    assert shas[util] == git(repo, "hash-object", util).strip()
+
+
+def test_subdirectory_paths(repo):
+    """Reading from a subdirectory returns only files below it."""
+    subdir = os.path.join(repo, "pkg")
+    assert list(read_git_index(subdir)) == [os.path.join(subdir, "util.py")]
+
+
+def test_not_a_repository():
+    """Directories outside git return None."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        assert read_git_index(tmpdir) is None
+
+
+@pytest_asyncio.fixture
+async def cache_manager():
+    """Create a temporary cache manager for testing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = UnifiedCacheManager(
+            max_memory_mb=10,
+            sqlite_path=os.path.join(tmpdir, "test_cache.db"),
+            redis_url=None
+        )
+        await manager.initialize()
+        try:
+            yield manager
+        finally:
+            await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_incremental_analysis_uses_blob_shas(cache_manager, repo):
+    """Clean tracked files are neither read nor hashed in an incremental run."""
+    codebase_id = "git_test"
+    await cache_manager.set_analysis(f"scan:{codebase_id}", {"path": repo})
+    engine = AnalysisEngine(cache_manager, AnalysisConfig(
+        enable_linters=False,
+        persistence_path=os.path.join(repo, ".documee")
+    ))
+    result = await engine.analyze_codebase(codebase_id, incremental=False)
+
+    main = os.path.join(repo, "main.py")
+    util = os.path.join(repo, "pkg", "util.py")
+    util_sha = git(repo, "hash-object", util).strip()
+    assert result.file_analyses[util].content_hash == util_sha
+    assert await cache_manager.get_analysis(f"file:{util_sha}") is not None
+
+    with open(main, 'a') as f:
+        f.write("\ndef added():\n    pass\n")
+    untracked = os.path.join(repo, "new.py")
+    with open(untracked, 'w') as f:
+        f.write("def new():\n    pass\n")
+
+    reads = []
+    read_source = engine._read_source
+
+    def counting_read(file_path):
+        reads.append(file_path)
+        return read_source(file_path)
+
+    engine._read_source = counting_read
+    result = await engine.analyze_codebase(codebase_id, incremental=True)
+
+    assert sorted(reads) == sorted([main, untracked])
+    with open(untracked, 'rb') as f:
+        assert result.file_analyses[untracked].content_hash == git_blob_sha(f.read())
+    assert [func.name for func in result.file_analyses[main].symbol_info.functions] == ["main", "added"]
@@ -0,0 +1,125 @@
+"""
+Tests for server cold-start cost.
+
+Tests:
+- Importing src.server stays well within an import-time ceiling (the
+  measured time is reported, not used as a tight gate)
+- Heavy optional modules are not imported at startup
+- Engine components and grammars are built on first use only
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.registry import ComponentRegistry, lazy_import
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Ceiling for the project's own import work, with a wide margin over the
+# ~200ms measured on an idle machine so CI load does not fail the test;
+# fastmcp and its lazily imported dependencies are loaded first so that only
+# src.* is measured
+IMPORT_CEILING_MS = 2000
+
+PRELOAD = "import fastmcp, griffe; from fastmcp import FastMCP, Context"
+
+
+def run_python(code):
+    """
+    Run code in a fresh interpreter and return stderr and stdout.
+    
+    The interpreter runs in a temporary directory (with the project on
+    PYTHONPATH), so files written at import time, such as server.log, stay
+    out of the working tree.
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [PROJECT_ROOT, env.get('PYTHONPATH')]))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=tmpdir,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    return completed.stderr, completed.stdout
+
+
+def import_time_ms(stderr, module):
+    """Cumulative import time of a module from -X importtime output."""
+    for line in stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module and parts[2].startswith(' ' + module):
+            return int(parts[1]) / 1000
+    raise AssertionError(f"{module} not found in import time output")
+
+
+def test_server_import_time():
+    """Report the src.server import time (best of three runs) and check the ceiling."""
+    timings = [
+        import_time_ms(run_python(f"{PRELOAD}; import src.server")[0], "src.server")
+        for _ in range(3)
+    ]
+    print(f"\nsrc.server import time: {min(timings):.0f}ms (best of {len(timings)})")
+    assert min(timings) < IMPORT_CEILING_MS, f"src.server import took {min(timings):.0f}ms"
+
+
+def test_heavy_modules_not_imported_at_startup():
+    """Notebook support (nbformat, jsonschema) is only imported when used."""
+    _, stdout = run_python(
+        "import sys, src.server; "
+        "print(sorted(m for m in ('nbformat', 'jsonschema') "
+        "if m in sys.modules and type(sys.modules[m]).__name__ != '_LazyModule'))"
+    )
+    assert stdout.strip() == "[]"
+
+
+def test_lazy_import_missing_module():
+    """Modules that are not installed resolve to None."""
+    assert lazy_import("documee_module_that_does_not_exist") is None
+    assert lazy_import("os") is os
+
+
+def test_registry_builds_once():
+    """Factories run on first get() only."""
+    calls = []
+    registry = ComponentRegistry()
+    registry.register('thing', lambda: calls.append(1) or object())
+
+    assert not registry.is_built('thing')
+    assert registry.get('thing') is registry.get('thing')
+    assert calls == [1]
+    assert registry.built_components() == ['thing']
+
+
+def test_engine_builds_components_on_first_use():
+    """Creating an engine builds nothing; parsing Python loads only its grammar."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = AnalysisEngine(None, AnalysisConfig(
+            enable_linters=False,
+            persistence_path=os.path.join(tmpdir, "analysis")
+        ))
+        assert engine.components.built_components() == []
+        assert not os.path.exists(os.path.join(tmpdir, "analysis"))
+        assert engine.get_performance_metrics()['scheduler'] == {}
+        assert engine.components.built_components() == []
+
+        result = engine._run_pipeline("module.py", b"def f():\n    return 1\n")
+
+        assert result.completed
+        assert list(engine.parser.parsers) == ['python']
+        assert 'linter' not in engine.components.built_components()
+        assert 'persistence' not in engine.components.built_components()
+        engine.shutdown()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
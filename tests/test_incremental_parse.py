@@ -0,0 +1,227 @@
+"""
+Tests for incremental re-parsing.
+
+Tests:
+- Edits are computed from the common prefix and suffix of two versions
+- Incremental parses produce the same tree as full parses
+- Unchanged definitions and statements are reused, with shifted lines
+- The engine keeps trees between analyses of the same file
+"""
+
+import random
+
+import pytest
+
+from src.analysis.ast_parser import ASTParserManager
+from src.analysis.ast_visitor import visit_file
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.incremental_parse import (
+    IncrementalReuse, ParseTreeCache, ParsedFile, compute_edit, parse_incremental
+)
+from src.analysis.symbol_queries import QuerySymbolExtractor
+
+
+PYTHON_SOURCE = b'''import os
+
+
+def first(a):
+    """First function."""
+    if a:
+        return a
+    return None
+
+
+# Helper for the second function
+def second(items):
+    for item in items:
+        while item:
+            item = item.next
+
+
+class Holder:
+    def get(self):
+        return self.value
+'''
+
+JAVASCRIPT_SOURCE = b'''import React from 'react';
+
+/** Adds numbers. */
+function add(a, b) { return a + b; }
+
+const twice = (x) => x * 2;
+
+class Widget {
+  render() { return null; }
+}
+
+export const a = 1;
+export const b = 2;
+export const c = 3;
+
+function last() {}
+'''
+
+
+@pytest.fixture(scope="module")
+def parser_manager():
+    """Create AST parser manager."""
+    return ASTParserManager(AnalysisConfig())
+
+
+def analyze(parser_manager, source, language, previous=None):
+    """Parse, visit and extract symbols the way the engine does."""
+    parse_result, changed_ranges = parse_incremental(parser_manager, source, language, 'sample', previous)
+    reuse = IncrementalReuse(source, language, previous if parse_result.incremental else None, changed_ranges)
+    visit = visit_file(parse_result, source, reuse=reuse)
+    symbols = QuerySymbolExtractor().extract_symbols(parse_result, visit=visit, reuse=reuse)
+    return parse_result, visit, symbols, reuse
+
+
+def visit_summary(visit):
+    """Comparable form of a FileVisit."""
+    return (
+        sorted(
+            (key, metrics.decision_points, metrics.max_nesting_depth, metrics.base_depth)
+            for key, metrics in visit.functions.items()
+        ),
+        [(c.text, c.line, c.has_code_before) for c in visit.comments],
+        visit.max_nesting_depth,
+        [(m.decision_points, m.max_nesting_depth) for m in visit.extracted]
+    )
+
+
+def test_compute_edit():
+    """The differing byte range and its points are reported."""
+    assert compute_edit(b"same", b"same") is None
+
+    edit = compute_edit(b"a = 1\nb = 2\n", b"a = 1\nb = 20\nc = 3\n")
+    assert (edit.start_byte, edit.old_end_byte, edit.new_end_byte) == (11, 11, 18)
+    assert edit.start_point == (1, 5)
+    assert edit.old_end_point == (1, 5)
+    assert edit.new_end_point == (2, 5)
+
+    # Deletion; the suffix does not overlap the prefix
+    edit = compute_edit(b"aaaa", b"aa")
+    assert (edit.start_byte, edit.old_end_byte, edit.new_end_byte) == (2, 4, 2)
+
+
+def test_incremental_parse_matches_full_parse(parser_manager):
+    """Reparsing from an edited tree gives the tree of a full parse."""
+    previous = ParsedFile(PYTHON_SOURCE, parser_manager.parse_bytes(PYTHON_SOURCE, 'python').tree, 'python')
+    source = PYTHON_SOURCE.replace(b"return a\n", b"return a + 1\n")
+
+    parse_result, changed_ranges = parse_incremental(parser_manager, source, 'python', 'sample', previous)
+
+    assert parse_result.incremental
+    assert changed_ranges is not None
+    assert parse_result.root_node.sexp() == parser_manager.parse_bytes(source, 'python').root_node.sexp()
+
+    # Without a previous version (or for another language) the file is parsed in full
+    parse_result, changed_ranges = parse_incremental(parser_manager, source, 'python', 'sample')
+    assert not parse_result.incremental
+    assert changed_ranges is None
+
+
+def test_unchanged_definitions_are_reused(parser_manager):
+    """Only edited definitions are re-extracted; the others move with the edit."""
+    _, _, _, reuse = analyze(parser_manager, PYTHON_SOURCE, 'python')
+    previous = reuse.parsed_file(parser_manager.parse_bytes(PYTHON_SOURCE, 'python'))
+    assert reuse.stats['symbols_reused'] == 0
+
+    # Two new lines inside first() shift everything after it
+    source = PYTHON_SOURCE.replace(b"    return None\n", b"    a = 1\n    b = 2\n    return None\n")
+    _, visit, symbols, reuse = analyze(parser_manager, source, 'python', previous)
+
+    assert reuse.stats['symbols_extracted'] == 1
+    assert reuse.stats['symbols_reused'] == 2
+    assert reuse.stats['statements_reused'] > 0
+
+    fresh_parse = parser_manager.parse_bytes(source, 'python')
+    fresh_visit = visit_file(fresh_parse, source)
+    fresh_symbols = QuerySymbolExtractor().extract_symbols(fresh_parse, visit=fresh_visit)
+    assert symbols.to_dict() == fresh_symbols.to_dict()
+    assert visit_summary(visit) == visit_summary(fresh_visit)
+
+    holder = symbols.classes[0]
+    assert (holder.start_line, holder.methods[0].start_line) == (20, 21)
+
+
+def test_edited_doc_comment_invalidates_definition(parser_manager):
+    """Changing the comment before a definition re-extracts it."""
+    _, _, _, reuse = analyze(parser_manager, JAVASCRIPT_SOURCE, 'javascript')
+    previous = reuse.parsed_file(parser_manager.parse_bytes(JAVASCRIPT_SOURCE, 'javascript'))
+
+    source = JAVASCRIPT_SOURCE.replace(b"Adds numbers.", b"Adds two numbers.")
+    _, _, symbols, reuse = analyze(parser_manager, source, 'javascript', previous)
+
+    add = next(f for f in symbols.functions if f.name == 'add')
+    assert add.docstring == "Adds two numbers."
+    assert reuse.stats['symbols_extracted'] >= 1
+    assert reuse.stats['symbols_reused'] >= 1
+
+
+@pytest.mark.parametrize("language,original", [
+    ('python', PYTHON_SOURCE),
+    ('javascript', JAVASCRIPT_SOURCE),
+])
+def test_random_edits_match_full_analysis(parser_manager, language, original):
+    """A sequence of random line edits always matches analyzing from scratch."""
+    rng = random.Random(7)
+    source = original
+    previous = None
+    for _ in range(30):
+        _, visit, symbols, reuse = analyze(parser_manager, source, language, previous)
+
+        fresh_parse = parser_manager.parse_bytes(source, language)
+        fresh_visit = visit_file(fresh_parse, source)
+        fresh_symbols = QuerySymbolExtractor().extract_symbols(fresh_parse, visit=fresh_visit)
+        assert symbols.to_dict() == fresh_symbols.to_dict()
+        assert visit_summary(visit) == visit_summary(fresh_visit)
+
+        previous = reuse.parsed_file(fresh_parse)
+        previous.tree = parser_manager.parse_bytes(source, language).tree
+
+        lines = source.split(b'\n')
+        index = rng.randrange(len(lines))
+        operation = rng.random()
+        if operation < 0.3 and len(lines) > 1:
+            del lines[index]
+        elif operation < 0.6:
+            lines.insert(index, lines[rng.randrange(len(lines))])
+        else:
+            lines[index] += b' // x' if language == 'javascript' else b' # x'
+        source = b'\n'.join(lines)
+
+
+def test_parse_tree_cache_is_bounded():
+    """The least recently stored files are evicted."""
+    cache = ParseTreeCache(max_entries=2)
+    for name in ('a', 'b', 'c'):
+        cache.put(name, ParsedFile(b"", None, 'python'))
+
+    assert len(cache) == 2
+    assert cache.take('a') is None
+    assert cache.take('c') is not None
+    assert cache.take('c') is None
+
+
+def test_engine_reuses_previous_tree(tmp_path):
+    """Analyzing an edited file reparses it from the cached tree."""
+    engine = AnalysisEngine(None, AnalysisConfig(enable_linters=False))
+    file_path = str(tmp_path / "sample.py")
+
+    engine._run_pipeline(file_path, PYTHON_SOURCE)
+    assert len(engine.parse_cache) == 1
+
+    source = PYTHON_SOURCE.replace(b"return a\n", b"return a * 2\n")
+    result = engine._run_pipeline(file_path, source)
+    assert result.completed
+    assert [f.name for f in result.analysis.symbol_info.functions] == ['first', 'second']
+
+    engine.shutdown()
+
+    engine = AnalysisEngine(None, AnalysisConfig(enable_linters=False, incremental_parse=False))
+    engine._run_pipeline(file_path, PYTHON_SOURCE)
+    assert not engine.components.is_built('parse_cache')
+    engine.shutdown()
@@ -208,6 +208,18 @@ class TestExtractCode:
         finally:
             os.unlink(temp_path)
     
+    def test_extract_code_from_content(self, analyzer, temp_notebook):
+        """Test extraction from notebook JSON that was already read."""
+        with open(temp_notebook, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        from_content = analyzer.extract_code_from_content(content, temp_notebook)
+        from_file = analyzer.extract_code(temp_notebook)
+        
+        assert from_content.full_code == from_file.full_code
+        assert from_content.total_cells == from_file.total_cells
+        assert from_content.notebook_path == temp_notebook
+    
     def test_extract_code_without_nbformat(self, analyzer, temp_notebook, monkeypatch):
         """Test extraction when nbformat is not available."""
         # Mock nbformat as unavailable
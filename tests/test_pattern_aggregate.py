@@ -0,0 +1,222 @@
+"""
+Tests for incremental global pattern aggregation.
+
+Tests:
+- Delta updates (add, change, remove) match a full recomputation
+- Metadata-only analyses are left out of the pattern total
+- Teaching ranking and per-pattern file sets
+- Round trip through PersistenceManager
+- Incremental codebase runs only re-aggregate changed files, also after a restart
+"""
+
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.pattern_aggregate import FileContribution, PatternAggregate
+from src.analysis.pattern_detector import DetectedPattern, PatternDetector
+from src.analysis.persistence import PersistenceManager
+from src.analysis.teaching_value_scorer import TeachingValueScore
+from src.cache.unified_cache import UnifiedCacheManager
+
+
+class FakeAnalysis:
+    """Minimal stand-in for FileAnalysis."""
+
+    def __init__(self, path, pattern_types, score, content_hash, skip_reason=None):
+        self.patterns = [
+            DetectedPattern(pattern_type=pattern_type, file_path=path, confidence=1.0)
+            for pattern_type in pattern_types
+        ]
+        self.teaching_value = TeachingValueScore(total_score=score)
+        self.content_hash = content_hash
+        self.skip_reason = skip_reason
+
+
+def _snapshot(aggregate):
+    return (
+        dict(aggregate.pattern_counts),
+        {k: set(v) for k, v in aggregate.pattern_files.items()},
+        aggregate.total_patterns,
+        aggregate.top_teaching_files(10)
+    )
+
+
+def test_delta_updates_match_full_recomputation():
+    analyses = {
+        "a.py": FakeAnalysis("a.py", ["decorator", "decorator"], 0.5, "h1"),
+        "b.py": FakeAnalysis("b.py", ["decorator", "context_manager"], 0.9, "h2"),
+        "c.py": FakeAnalysis("c.py", ["async"], 0.1, "h3"),
+    }
+    aggregate = PatternAggregate()
+    assert aggregate.sync(analyses) == 3
+
+    # Change a.py, remove c.py, add d.py
+    analyses["a.py"] = FakeAnalysis("a.py", ["async"], 0.95, "h1b")
+    del analyses["c.py"]
+    analyses["d.py"] = FakeAnalysis("d.py", [], 0.3, "h4")
+    assert aggregate.sync(analyses, changed={"a.py", "d.py"}) == 3
+
+    fresh = PatternAggregate()
+    fresh.sync(analyses)
+    assert _snapshot(aggregate) == _snapshot(fresh)
+    assert aggregate.pattern_counts == {"decorator": 1, "context_manager": 1, "async": 1}
+    assert aggregate.files_with("async") == {"a.py"}
+    assert aggregate.top_teaching_files(2) == [("a.py", 0.95), ("b.py", 0.9)]
+
+    # Nothing changed: nothing re-aggregated
+    assert aggregate.sync(analyses) == 0
+
+
+def test_changed_paths_are_reaggregated_even_with_the_same_hash():
+    aggregate = PatternAggregate()
+    aggregate.sync({"a.py": FakeAnalysis("a.py", ["x"], 0.5, "h1")})
+    aggregate.sync({"a.py": FakeAnalysis("a.py", ["y"], 0.5, "h1")}, changed={"a.py"})
+    assert aggregate.pattern_counts == {"y": 1}
+
+
+def test_metadata_only_analyses_are_not_counted():
+    aggregate = PatternAggregate()
+    aggregate.sync({
+        "a.py": FakeAnalysis("a.py", ["x", "x"], 0.5, "h1"),
+        "gen.js": FakeAnalysis("gen.js", ["x"], 0.0, "h2", skip_reason="minified"),
+    })
+    assert aggregate.total_patterns == 2
+    assert aggregate.pattern_counts == {"x": 3}
+
+
+def test_persistence_round_trip():
+    aggregate = PatternAggregate()
+    aggregate.sync({
+        "a.py": FakeAnalysis("a.py", ["x"], 0.5, "h1"),
+        "b.py": FakeAnalysis("b.py", ["y", "x"], 0.7, "h2"),
+    })
+    with tempfile.TemporaryDirectory() as tmpdir:
+        persistence = PersistenceManager(tmpdir)
+        assert persistence.get_pattern_aggregate("demo") is None
+        persistence.save_pattern_aggregate("demo", aggregate)
+        loaded = persistence.get_pattern_aggregate("demo")
+
+    assert _snapshot(loaded) == _snapshot(aggregate)
+    assert loaded.contributions["b.py"] == FileContribution("h2", {"y": 1, "x": 1}, 0.7, True)
+
+
+def test_global_patterns_from_aggregate():
+    analyses = {
+        "a.py": FakeAnalysis("a.py", ["x"], 0.5, "h1"),
+        "b.py": FakeAnalysis("b.py", ["y", "y", "x", "y"], 0.7, "h2"),
+    }
+    aggregate = PatternAggregate()
+    aggregate.sync(analyses)
+
+    global_patterns = PatternDetector().detect_global_patterns(analyses, aggregate)
+
+    assert [p.pattern_type for p in global_patterns] == ["global_y", "global_x"]
+    assert global_patterns[1].metadata == {"count": 2, "pattern_type": "x", "file_count": 2}
+
+
+SOURCES = {
+    "app.py": (
+        "import functools\n\n"
+        "def cached(func):\n"
+        "    @functools.wraps(func)\n"
+        "    def wrapper(*args):\n"
+        "        return func(*args)\n"
+        "    return wrapper\n\n"
+        "@cached\n"
+        "def compute(x):\n"
+        "    with open('data.txt') as f:\n"
+        "        return f.read() + str(x)\n"
+    ),
+    "models.py": (
+        "from dataclasses import dataclass\n\n"
+        "@dataclass\n"
+        "class User:\n"
+        "    name: str\n\n"
+        "    @property\n"
+        "    def display(self):\n"
+        "        return self.name.title()\n"
+    ),
+    "tasks.py": (
+        "import asyncio\n\n"
+        "async def fetch(url):\n"
+        "    await asyncio.sleep(0)\n"
+        "    return [u for u in [url] if u]\n"
+    ),
+}
+
+
+@pytest_asyncio.fixture
+async def cache_manager():
+    """Create a temporary cache manager for testing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = UnifiedCacheManager(
+            max_memory_mb=10,
+            sqlite_path=os.path.join(tmpdir, "test_cache.db"),
+            redis_url=None
+        )
+        await manager.initialize()
+        try:
+            yield manager
+        finally:
+            await manager.close()
+
+
+def _write(root, name, source):
+    with open(os.path.join(root, name), "w") as f:
+        f.write(source)
+
+
+def _make_engine(cache_manager, root):
+    return AnalysisEngine(cache_manager, AnalysisConfig(
+        supported_languages=["python"],
+        enable_linters=False,
+        persistence_path=os.path.join(root, ".documee")
+    ))
+
+
+def _assert_matches_full_recomputation(result):
+    expected = PatternDetector().detect_global_patterns(result.file_analyses)
+    assert [p.to_dict() for p in result.global_patterns] == [p.to_dict() for p in expected]
+    assert result.metrics.total_patterns_detected == sum(
+        len(fa.patterns) for fa in result.file_analyses.values()
+    )
+    scores = sorted(fa.teaching_value.total_score for fa in result.file_analyses.values())
+    assert [score for _, score in result.top_teaching_files] == scores[::-1]
+
+
+@pytest.mark.asyncio
+async def test_incremental_runs_update_the_aggregate_by_delta(cache_manager, monkeypatch):
+    with tempfile.TemporaryDirectory() as root:
+        for name, source in SOURCES.items():
+            _write(root, name, source)
+        await cache_manager.set_analysis("scan:aggregate", {"path": root})
+        engine = _make_engine(cache_manager, root)
+
+        first = await engine.analyze_codebase("aggregate")
+        assert first.global_patterns
+        _assert_matches_full_recomputation(first)
+
+        aggregated = []
+        original = FileContribution.from_analysis.__func__
+        monkeypatch.setattr(
+            FileContribution, "from_analysis",
+            classmethod(lambda cls, analysis: aggregated.append(analysis.file_path) or original(cls, analysis))
+        )
+
+        _write(root, "tasks.py", SOURCES["tasks.py"] + "\nwith open('x') as f:\n    pass\n")
+        os.remove(os.path.join(root, "models.py"))
+        second = await engine.analyze_codebase("aggregate")
+        assert aggregated == [os.path.join(root, "tasks.py")]
+        _assert_matches_full_recomputation(second)
+
+        # After a restart the persisted aggregate is used
+        aggregated.clear()
+        restarted = _make_engine(cache_manager, root)
+        third = await restarted.analyze_codebase("aggregate")
+        assert aggregated == []
+        assert [p.to_dict() for p in third.global_patterns] == [p.to_dict() for p in second.global_patterns]
@@ -843,6 +843,57 @@ app.get('/api/test', (req, res) => {
         )
         assert fastapi_global is not None
         assert fastapi_global.metadata["count"] == 1
+
+    def test_dispatch_by_language_and_extension(self):
+        """Test that detectors only run for the languages they declare."""
+        from src.analysis.language_pattern_detector import PythonPatternDetector
+    
+        detector = PatternDetector()
+        react = ReactPatternDetector()
+        python = PythonPatternDetector()
+        api = APIPatternDetector()
+        for d in (react, python, api):
+            detector.register_detector(d)
+    
+        assert detector.get_detectors_for("app.py", "python") == [python, api]
+        assert detector.get_detectors_for("App.tsx", "tsx") == [react, api]
+        assert detector.get_detectors_for("App.JSX") == [react, api]
+        assert detector.get_detectors_for("main.go", "go") == [api]
+    
+        # Registering a detector rebuilds the dispatch table
+        auth = AuthPatternDetector()
+        detector.register_detector(auth)
+        assert detector.get_detectors_for("main.go", "go") == [api, auth]
+    
+    def test_dispatch_skip_counters(self):
+        """Test that skipped invocations are counted per reason."""
+        detector = PatternDetector()
+        detector.register_detector(ReactPatternDetector())
+        detector.register_detector(APIPatternDetector())
+    
+        calls = []
+        react = detector.detectors[0]
+        react.detect = lambda *args, **kwargs: calls.append(args) or []
+    
+        # Python file: React is not registered for the language
+        counts = {}
+        detector.detect_patterns_in_file(SymbolInfo(), "x = 1", "util.py", language="python", counts=counts)
+        assert counts == {'invoked': 1, 'skipped_language': 1, 'skipped_precondition': 0}
+    
+        # JS file without a React import: the precondition fails
+        counts = {}
+        detector.detect_patterns_in_file(SymbolInfo(), "const x = 1;", "util.js", language="javascript", counts=counts)
+        assert counts == {'invoked': 1, 'skipped_language': 0, 'skipped_precondition': 1}
+        assert calls == []
+    
+        # JS file importing React: both detectors run
+        symbol_info = SymbolInfo(imports=[ImportInfo(module="react")])
+        detector.detect_patterns_in_file(symbol_info, "", "App.jsx", language="javascript")
+        assert len(calls) == 1
+    
+        assert detector.get_dispatch_stats() == {
+            'invoked': 4, 'skipped_language': 1, 'skipped_precondition': 1
+        }
     
     def test_confidence_scoring_consistency(self):
         """Test that confidence scoring is consistent (Requirement 14.4)."""
@@ -0,0 +1,216 @@
+"""
+Tests for declarative pattern rules.
+
+Tests:
+- Rules load from YAML and invalid rules are rejected
+- Capture names are namespaced per rule without touching strings/comments
+- Rules of a language compile into one query; matches go to their rule
+- tree-sitter predicates and `where` checks filter matches
+- Confidence, evidence and min_matches
+- PatternDetector passes the syntax tree to rule detectors
+- The engine loads the rule files listed in AnalysisConfig.pattern_rules, skipping bad files
+"""
+
+import os
+import tempfile
+
+import pytest
+from tree_sitter_languages import get_parser
+
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.pattern_detector import PatternDetector
+from src.analysis.pattern_rules import (
+    PatternRule, RulePatternDetector, RuleSet, namespace_captures
+)
+from src.analysis.symbol_extractor import SymbolInfo
+
+
+RULES = '''
+rules:
+  - id: jwt-calls
+    pattern_type: jwt_usage
+    languages: [python]
+    query: |
+      ((call
+         function: (attribute
+           object: (identifier) @module
+           attribute: (identifier) @method)) @match
+       (#eq? @module "jwt"))
+    where:
+      method: {any_of: [encode, decode]}
+    confidence: {base: 0.4, per_match: 0.2, max: 0.9}
+    evidence: "JWT call: {module}.{method} (line {line})"
+    metadata: {category: auth}
+
+  - id: try-blocks
+    languages: [python]
+    query: "(try_statement) @match"
+    min_matches: 2
+
+  - id: console-error
+    languages: [javascript]
+    query: |
+      ((call_expression
+         function: (member_expression
+           object: (identifier) @object
+           property: (property_identifier) @method))
+       (#eq? @object "console")
+       (#eq? @method "error"))
+'''
+
+PYTHON_SOURCE = '''import jwt
+
+token = jwt.encode(payload, key)
+claims = jwt.decode(token, key)
+jwt.register_algorithm("x", algo)
+other.encode(token)
+
+try:
+    pass
+except Exception:
+    pass
+'''
+
+
+@pytest.fixture
+def detector():
+    """Create a rule detector from the test rules."""
+    return RulePatternDetector(RuleSet.from_yaml(RULES))
+
+
+def test_load_rules():
+    """Rules load with their defaults and languages."""
+    rule_set = RuleSet.from_yaml(RULES)
+    assert [rule.rule_id for rule in rule_set.rules] == ['jwt-calls', 'try-blocks', 'console-error']
+    assert rule_set.languages == {'python', 'javascript'}
+    
+    try_rule = rule_set.rules[1]
+    assert try_rule.pattern_type == 'try-blocks'
+    assert try_rule.match_confidence == 0.2
+
+
+@pytest.mark.parametrize("data", [
+    {'languages': ['python'], 'query': '(call) @match'},
+    {'id': 'x', 'query': '(call) @match'},
+    {'id': 'x', 'languages': ['python']},
+    {'id': 'x', 'languages': ['python'], 'query': '(call) @c', 'where': {'c': {'contains': 'a'}}},
+])
+def test_invalid_rules(data):
+    """Rules missing required fields or using unknown checks are rejected."""
+    with pytest.raises(ValueError):
+        PatternRule.from_dict(data)
+
+
+def test_duplicate_rule_ids():
+    """Rule ids must be unique within a rule set."""
+    rule = PatternRule.from_dict({'id': 'x', 'languages': ['python'], 'query': '(call) @c'})
+    with pytest.raises(ValueError):
+        RuleSet([rule, rule])
+
+
+def test_namespace_captures():
+    """Captures are prefixed in patterns and predicates only."""
+    source = '((identifier) @name (#eq? @name "a@b")) ; @comment\n(call) @call.site'
+    assert namespace_captures(source, 'r1.') == (
+        '((identifier) @r1.name (#eq? @r1.name "a@b")) ; @comment\n(call) @r1.call.site'
+    )
+
+
+def test_rules_detect_patterns(detector):
+    """Each rule reports one pattern per file from a single batched query."""
+    patterns = {p.pattern_type: p for p in detector.detect(
+        SymbolInfo(), PYTHON_SOURCE, "auth.py", language="python"
+    )}
+    
+    # register_algorithm fails the where check, other.encode the #eq? predicate
+    jwt = patterns['jwt_usage']
+    assert jwt.line_numbers == [3, 4]
+    assert jwt.evidence == ["JWT call: jwt.encode (line 3)", "JWT call: jwt.decode (line 4)"]
+    assert jwt.confidence == pytest.approx(0.8)
+    assert jwt.metadata == {'category': 'auth', 'rule_id': 'jwt-calls', 'match_count': 2}
+    
+    # Only one try block: below min_matches
+    assert 'try-blocks' not in patterns
+    
+    assert len(detector.rule_set.compiled('python').rules) == 2
+
+
+def test_other_languages(detector):
+    """Rules only run for their languages."""
+    assert detector.detect(SymbolInfo(), PYTHON_SOURCE, "auth.py", language="go") == []
+    assert detector.detect(SymbolInfo(), PYTHON_SOURCE, "auth.py") == []
+    
+    patterns = detector.detect(
+        SymbolInfo(), "console.error(e); console.log(e);", "app.js", language="javascript"
+    )
+    assert [p.metadata['match_count'] for p in patterns] == [1]
+    assert patterns[0].evidence == ["console-error at line 1"]
+
+
+def test_broken_rule_is_dropped():
+    """A rule that does not compile does not disable the others."""
+    rule_set = RuleSet.from_yaml('''
+rules:
+  - {id: bad, languages: [python], query: "(no_such_node) @match"}
+  - {id: calls, languages: [python], query: "(call) @match"}
+''')
+    patterns = RulePatternDetector(rule_set).detect(SymbolInfo(), "f()\n", "a.py", language="python")
+    assert [p.pattern_type for p in patterns] == ['calls']
+
+
+def test_pattern_detector_passes_tree(detector):
+    """PatternDetector hands rule detectors the parsed tree."""
+    pattern_detector = PatternDetector()
+    pattern_detector.register_detector(detector)
+    assert pattern_detector.get_detectors_for("auth.py", "python") == [detector]
+    assert pattern_detector.get_detectors_for("main.go", "go") == []
+    
+    tree = get_parser('python').parse(PYTHON_SOURCE.encode('utf-8'))
+    patterns = pattern_detector.detect_patterns_in_file(
+        SymbolInfo(), PYTHON_SOURCE, "auth.py", language="python", tree=tree.root_node
+    )
+    assert [p.pattern_type for p in patterns] == ['jwt_usage']
+
+
+def test_engine_runs_configured_rules():
+    """Rules listed in the config are detected in analyzed files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        rules_path = os.path.join(tmpdir, "rules.yaml")
+        with open(rules_path, 'w', encoding='utf-8') as f:
+            f.write(RULES)
+        engine = AnalysisEngine(None, AnalysisConfig(
+            enable_linters=False,
+            persistence_path=os.path.join(tmpdir, "analysis"),
+            pattern_rules=[tmpdir]
+        ))
+        
+        result = engine._run_pipeline("auth.py", PYTHON_SOURCE.encode('utf-8'))
+        
+        assert result.completed
+        jwt = [p for p in result.analysis.patterns if p.pattern_type == 'jwt_usage']
+        assert len(jwt) == 1 and jwt[0].line_numbers == [3, 4]
+        engine.shutdown()
+
+
+def test_engine_skips_bad_rule_files(caplog):
+    """Missing or invalid rule files are logged and skipped."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        rules_path = os.path.join(tmpdir, "rules.yaml")
+        with open(rules_path, 'w', encoding='utf-8') as f:
+            f.write(RULES)
+        invalid_path = os.path.join(tmpdir, "invalid.yml")
+        with open(invalid_path, 'w', encoding='utf-8') as f:
+            f.write("rules: {}\n")
+        engine = AnalysisEngine(None, AnalysisConfig(
+            enable_linters=False,
+            persistence_path=os.path.join(tmpdir, "analysis"),
+            pattern_rules=[os.path.join(tmpdir, "missing.yaml"), invalid_path, rules_path]
+        ))
+        
+        result = engine._run_pipeline("auth.py", PYTHON_SOURCE.encode('utf-8'))
+        
+        assert result.completed
+        assert [p for p in result.analysis.patterns if p.pattern_type == 'jwt_usage']
+        assert "missing.yaml" in caplog.text and "invalid.yml" in caplog.text
+        engine.shutdown()
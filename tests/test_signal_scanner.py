@@ -0,0 +1,102 @@
+"""
+Tests for the shared signal scanner.
+
+Tests:
+- Literal and regex signals are found in one scan, including literals that
+  are prefixes of other literals
+- Counts and line lookups match str.count / re.findall / per-line checks
+- Detectors sharing a signal get the same offsets
+- PatternDetector scans each file once for all of its detectors
+"""
+
+import re
+
+import pytest
+
+from src.analysis.signal_scanner import SignalScanner
+from src.analysis.pattern_detector import (
+    PatternDetector,
+    APIPatternDetector,
+    AuthPatternDetector,
+    DatabasePatternDetector,
+)
+from src.analysis.symbol_extractor import ImportInfo, SymbolInfo
+
+
+SAMPLE = """import jwt
+# <!-- not a generic -->
+token = jwt.encode(payload, key)
+if a != b and c < d:
+    print!("go go")
+"""
+
+
+@pytest.mark.parametrize("literal", ['<', '<!--', '!', '!=', 'go ', 'jwt', 'jwt.encode', 'missing'])
+def test_literal_counts_match_str_count(literal):
+    """Overlapping and prefix literals are counted like str.count."""
+    signals = {literal: literal}
+    scanner = SignalScanner([{'<': '<', '<!--': '<!--', '!': '!', '!=': '!=',
+                              'go ': 'go ', 'jwt': 'jwt', 'jwt.encode': 'jwt.encode'}, signals])
+    matches = scanner.scan(SAMPLE).matches(signals)
+    assert matches.count(literal) == SAMPLE.count(literal)
+    assert (literal in matches) == (literal in SAMPLE)
+
+
+def test_regex_signals():
+    """Regex signals report each match start."""
+    signals = {'comment': re.compile(r'^\s*#', re.MULTILINE), 'word': re.compile(r'go\b')}
+    matches = SignalScanner([signals]).scan(SAMPLE).matches(signals)
+    assert matches.count('comment') == 1
+    assert matches.count('word') == len(re.findall(r'go\b', SAMPLE))
+    assert matches.lines('comment') == [2]
+
+
+def test_line_lookups():
+    """Line numbers, line text and line ranges agree with the text."""
+    signals = {'jwt': 'jwt', 'lt': '<', 'go': 'go '}
+    matches = SignalScanner([signals]).scan(SAMPLE).matches(signals)
+    lines = SAMPLE.split('\n')
+    assert matches.lines('jwt') == [i for i, line in enumerate(lines, 1) if 'jwt' in line]
+    assert matches.lines('jwt', 'lt') == [1, 2, 3, 4]
+    assert matches.line(3) == lines[2]
+    assert matches.line_signals(['jwt', 'lt']) == {1: ['jwt'], 2: ['lt'], 3: ['jwt'], 4: ['lt']}
+    assert matches.in_lines('go', 5, 5)
+    assert not matches.in_lines('go', 1, 4)
+    assert not matches.in_lines('jwt', 4, 3)
+
+
+def test_shared_signals_across_detectors():
+    """Equal signals declared by two detectors are scanned once and shared."""
+    first = {'then': '.then(', 'tag': re.compile(r'<\w+')}
+    second = {'chain': '.then(', 'element': re.compile(r'<\w+')}
+    scanner = SignalScanner([first, second])
+    assert scanner.literals == {'.then('}
+    assert len(scanner.patterns) == 1
+    
+    scan = scanner.scan("p.then(f).then(g); <div>")
+    assert scan.matches(first).get('then') == scan.matches(second).get('chain') == [1, 9]
+    assert scan.matches(first).get('tag') == scan.matches(second).get('element') == [19]
+
+
+def test_detectors_scan_once():
+    """PatternDetector scans a file once for all detectors declaring signals."""
+    detector = PatternDetector()
+    for d in (APIPatternDetector(), DatabasePatternDetector(), AuthPatternDetector()):
+        detector.register_detector(d)
+    
+    symbol_info = SymbolInfo(imports=[ImportInfo(module="jwt", line_number=1)])
+    file_content = "import jwt\ntoken = jwt.encode(payload, key)\n"
+    timings = {}
+    with_shared = detector.detect_patterns_in_file(
+        symbol_info, file_content, "auth.py", timings=timings, language="python"
+    )
+    assert 'SignalScanner' in timings
+    assert any(p.pattern_type == "jwt_authentication" for p in with_shared)
+    
+    # Detectors called on their own scan for their own signals
+    on_their_own = [
+        pattern
+        for d in detector.detectors
+        for pattern in d.detect(symbol_info, file_content, "auth.py")
+    ]
+    assert [p.to_dict() for p in with_shared] == [p.to_dict() for p in on_their_own]
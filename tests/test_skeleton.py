@@ -0,0 +1,134 @@
+"""
+Tests for skeleton analysis of very large files.
+
+Tests:
+- Pattern detection samples keep line numbers and cover the whole file
+- Skeleton symbol extraction reports declarations without complexity
+- The engine selects skeleton mode above the configured size threshold
+"""
+
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+from src.analysis.ast_parser import ASTParserManager
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.skeleton import ANALYSIS_MODE_SKELETON, sample_source
+from src.analysis.symbol_queries import QuerySymbolExtractor
+from src.cache.unified_cache import UnifiedCacheManager
+
+
+FUNCTION_TEMPLATE = '''
+def handler_{index}(request):
+    """Handle request {index}."""
+    if request.user and request.user.is_admin:
+        for item in request.items:
+            if item:
+                return item
+    return None
+'''
+
+SOURCE = (
+    "import os\nfrom typing import List\n\n\n"
+    "class Controller:\n"
+    "    \"\"\"Request controller.\"\"\"\n\n"
+    "    def dispatch(self, request):\n"
+    "        if request:\n"
+    "            return request\n"
+    + "".join(FUNCTION_TEMPLATE.format(index=i) for i in range(200))
+)
+
+
+def test_sample_source_keeps_lines():
+    """Sampled text has the original line count, with windows across the file."""
+    text = "".join(f"line {i}\n" for i in range(10000))
+    sample = sample_source(text, 4000)
+
+    assert len(sample) < len(text) // 5
+    assert sample.count("\n") == text.count("\n")
+    lines = sample.split("\n")
+    original = text.split("\n")
+    kept = [i for i, line in enumerate(lines) if line]
+    assert kept[0] == 0 and kept[-1] > 7000
+    assert all(lines[i] == original[i] for i in kept)
+
+
+def test_sample_source_small_and_single_line():
+    """Short texts are returned unchanged; a single long line is cut."""
+    assert sample_source("x = 1\n", 100) == "x = 1\n"
+    sample = sample_source("a" * 1000, 100)
+    assert sample.count("a") <= 100
+    assert "\n" not in sample
+
+
+def test_extract_skeleton():
+    """Declarations, docstrings and imports are kept; complexity is not measured."""
+    parse_result = ASTParserManager(AnalysisConfig()).parse_bytes(SOURCE.encode(), 'python')
+    extractor = QuerySymbolExtractor()
+
+    full = extractor.extract_symbols(parse_result)
+    skeleton = extractor.extract_skeleton(parse_result)
+
+    assert [f.name for f in skeleton.functions] == [f.name for f in full.functions]
+    assert [c.name for c in skeleton.classes] == ['Controller']
+    assert [m.name for m in skeleton.classes[0].methods] == ['dispatch']
+    assert [i.module for i in skeleton.imports] == [i.module for i in full.imports]
+    assert skeleton.functions[0].docstring == full.functions[0].docstring
+    assert full.functions[0].complexity > 1
+    assert all(f.complexity == 1 for f in skeleton.functions)
+
+    # The flag does not leak into later full extractions
+    assert extractor.extract_symbols(parse_result).functions[0].complexity == full.functions[0].complexity
+
+
+@pytest_asyncio.fixture
+async def cache_manager():
+    """Create a temporary cache manager for testing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = UnifiedCacheManager(
+            max_memory_mb=10,
+            sqlite_path=os.path.join(tmpdir, "test_cache.db"),
+            redis_url=None
+        )
+        await manager.initialize()
+        try:
+            yield manager
+        finally:
+            await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_engine_selects_skeleton_mode(cache_manager):
+    """Files above skeleton_threshold_kb get a skeleton analysis."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = os.path.join(tmpdir, "controller.py")
+        with open(file_path, 'w') as f:
+            f.write(SOURCE)
+
+        config = AnalysisConfig(
+            enable_linters=False,
+            skeleton_threshold_kb=len(SOURCE) // 1024 - 1,
+            skeleton_sample_kb=4,
+            persistence_path=os.path.join(tmpdir, ".documee")
+        )
+        engine = AnalysisEngine(cache_manager, config)
+        analysis = await engine.analyze_file(file_path)
+
+        assert analysis.analysis_mode == ANALYSIS_MODE_SKELETON
+        assert not analysis.has_errors
+        assert len(analysis.symbol_info.functions) == 200
+        assert analysis.symbol_info.classes[0].name == 'Controller'
+        assert len(analysis.symbol_info.imports) == 2
+        assert analysis.complexity_metrics.avg_complexity == 0
+        assert analysis.complexity_metrics.trivial_functions == []
+        assert analysis.documentation_coverage > 0
+        # Skeleton trees are not kept for incremental re-parsing
+        assert len(engine.parse_cache) == 0
+
+        config.skeleton_threshold_kb = 0
+        analysis = await engine.analyze_file(file_path, force=True)
+        assert analysis.analysis_mode == "full"
+        assert analysis.complexity_metrics.avg_complexity > 1
@@ -0,0 +1,96 @@
+"""
+Tests for SourceDocument.
+
+Tests:
+- Line slicing and line counts agree with text.split('\\n')
+- Offset <-> line mapping
+- Bytes are decoded lazily and the document can be read from disk
+- Text files are read with normalized newlines and strict decoding
+- Signal matches use the document's line index
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from src.analysis.signal_scanner import SignalScanner
+from src.analysis.source_document import SourceDocument
+
+
+TEXT = "import os\n\ndef f():\n    return 1\n"
+
+
+@pytest.fixture
+def document():
+    """Create a document from bytes."""
+    return SourceDocument(TEXT.encode('utf-8'))
+
+
+def test_lines_match_split(document):
+    """Line ranges and counts match slicing text.split('\\n')."""
+    lines = TEXT.split('\n')
+    assert document.line_count == len(lines)
+    for start in range(0, len(lines) + 2):
+        for end in range(start - 1, len(lines) + 2):
+            assert document.lines(start, end) == '\n'.join(lines[max(start, 1) - 1:max(end, 0)])
+    assert [document.line(i) for i in range(1, len(lines) + 1)] == lines
+    assert list(document.iter_lines(2, 3)) == lines[1:3]
+
+
+def test_offset_line_mapping(document):
+    """Offsets map to the line they are on and back."""
+    for offset, char in enumerate(TEXT):
+        line_number = document.line_of(offset)
+        assert TEXT[:offset].count('\n') + 1 == line_number
+        assert document.offset_of(line_number) <= offset
+    assert document.offset_of(3) == TEXT.index('def')
+
+
+def test_lazy_decoding():
+    """Text is decoded on first use, dropping undecodable bytes."""
+    document = SourceDocument(b"x = '\xff'\n")
+    assert document._text is None
+    assert document.text == "x = ''\n"
+    
+    with pytest.raises(ValueError):
+        SourceDocument()
+
+
+def test_from_path():
+    """Documents can be read straight from a file."""
+    with tempfile.NamedTemporaryFile('wb', suffix='.py', delete=False) as f:
+        f.write(TEXT.encode('utf-8'))
+    try:
+        document = SourceDocument.from_path(f.name)
+        assert document.data == TEXT.encode('utf-8')
+        assert document.lines(3, 4) == "def f():\n    return 1"
+    finally:
+        os.unlink(f.name)
+
+
+def test_from_text_file():
+    """Text files are read with normalized newlines and strict decoding."""
+    with tempfile.NamedTemporaryFile('wb', suffix='.py', delete=False) as f:
+        f.write(TEXT.replace('\n', '\r\n').encode('utf-8'))
+    try:
+        document = SourceDocument.from_text_file(f.name)
+        assert document.data is None
+        assert document.text == TEXT
+        assert document.lines(3, 4) == "def f():\n    return 1"
+
+        with open(f.name, 'wb') as bad:
+            bad.write(b"x = '\xff'\n")
+        with pytest.raises(UnicodeDecodeError):
+            SourceDocument.from_text_file(f.name)
+    finally:
+        os.unlink(f.name)
+
+
+def test_signal_matches_share_line_index(document):
+    """Signal line lookups use the scanned document's line index."""
+    signals = {'return': 'return'}
+    matches = SignalScanner([signals]).scan(document).matches(signals)
+    assert matches.document is document
+    assert matches.lines('return') == [4]
+    assert document._line_starts is not None
@@ -0,0 +1,232 @@
+"""
+Tests for query-based symbol extraction.
+
+Tests:
+- Every language's query compiles and is cached
+- Query extraction matches the tree-walking SymbolExtractor (parity)
+- Languages without a query fall back to walking the tree
+"""
+
+import glob
+import os
+
+import pytest
+
+from src.analysis.ast_parser import ASTParserManager
+from src.analysis.config import AnalysisConfig
+from src.analysis.engine import AnalysisEngine
+from src.analysis.symbol_extractor import SymbolExtractor
+from src.analysis.symbol_queries import QUERY_DIR, QuerySymbolExtractor, get_symbol_query
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLES = {
+    'python': b'''import os
+from .util import helper as h, other
+
+def plain(a, b=1):
+    """Add things together."""
+    return a + b
+
+@decorator
+def decorated(x):
+    if x and x > 1:
+        return x
+
+class Base:
+    """A base class."""
+    def method(self):
+        pass
+
+@dataclass
+class Data(Base):
+    value: int = 0
+
+def outer():
+    def inner():
+        pass
+    return inner
+''',
+    'javascript': b'''import React, { useState } from 'react';
+const path = require('path');
+
+/** Adds numbers. */
+function add(a, b) { return a + b; }
+
+export function exported() {
+  function nested() {}
+  const arrow = (x) => x * 2;
+  return nested;
+}
+
+const top = async (a, b) => { if (a) { return b; } };
+const notArrow = 1, second = () => 2;
+
+class Widget extends Base {
+  render() { return null; }
+}
+
+const Anonymous = class Named { m() {} };
+export { add, top };
+export default Widget;
+''',
+    'typescript': b'''import { Injectable } from '@angular/core';
+
+export class Service {
+  fetch(id: number, opts?: Options): Promise<Item> { return get(id); }
+}
+
+export function helper(x: string): string { return x; }
+const typed = (a: number): number => a;
+''',
+    'java': b'''import java.util.List;
+
+public class Outer {
+    /** Does work. */
+    public void work(int x) {
+        if (x > 0) { return; }
+    }
+
+    static class Inner {
+        void run() {}
+    }
+}
+''',
+    'go': b'''package main
+
+import (
+    "fmt"
+    "strings"
+)
+
+type Server struct {
+    Name string
+}
+
+func (s *Server) Start() error {
+    return nil
+}
+
+func main() {
+    fmt.Println(strings.ToUpper("x"))
+}
+''',
+    'rust': b'''struct Point { x: i32 }
+
+impl Point {
+    fn new(x: i32) -> Self { Point { x } }
+}
+
+/// Entry point.
+fn main() {
+    let p = Point::new(1);
+}
+''',
+    'cpp': b'''class Shape {
+public:
+    virtual double area();
+};
+
+int add(int a, int b) {
+    return a + b;
+}
+''',
+    'c': b'''int add(int a, int b) {
+    return a + b;
+}
+''',
+    'c_sharp': b'''namespace App {
+    public class Controller {
+        public void Index() {}
+        private int Count(int x) { return x; }
+    }
+}
+''',
+    'ruby': b'''class Greeter
+  def greet(name)
+    "Hello #{name}"
+  end
+end
+
+def helper(x)
+  x * 2
+end
+''',
+    'php': b'''<?php
+function greet($name) {
+    return "Hello $name";
+}
+
+class User {
+    public function getName() { return $this->name; }
+}
+''',
+}
+
+
+@pytest.fixture(scope="module")
+def parser_manager():
+    """Create AST parser manager."""
+    return ASTParserManager(AnalysisConfig())
+
+
+@pytest.mark.parametrize("language", sorted(SAMPLES))
+def test_query_compiles_and_is_cached(language):
+    """Each supported language has a compiled, cached query."""
+    query = get_symbol_query(language)
+    assert query is not None
+    assert get_symbol_query(language) is query
+
+
+@pytest.mark.parametrize("language", sorted(SAMPLES))
+def test_parity_with_tree_walk(parser_manager, language):
+    """Query extraction produces exactly the tree-walking extractor's symbols."""
+    parse_result = parser_manager.parse_bytes(SAMPLES[language], language)
+
+    expected = SymbolExtractor().extract_symbols(parse_result).to_dict()
+    actual = QuerySymbolExtractor().extract_symbols(parse_result).to_dict()
+
+    assert actual == expected
+    assert actual['functions'] or actual['classes']
+
+
+def test_parity_on_project_sources(parser_manager):
+    """Parity holds on this project's own Python modules."""
+    walker = SymbolExtractor()
+    extractor = QuerySymbolExtractor()
+    paths = sorted(glob.glob(os.path.join(PROJECT_ROOT, "src", "analysis", "*.py")))
+    assert paths
+
+    for path in paths:
+        with open(path, 'rb') as f:
+            parse_result = parser_manager.parse_bytes(f.read(), 'python', path)
+        assert extractor.extract_symbols(parse_result).to_dict() == \
+            walker.extract_symbols(parse_result).to_dict(), path
+
+
+def test_query_files_exist():
+    """Query files are shipped for every language the parser supports."""
+    names = {os.path.splitext(name)[0] for name in os.listdir(QUERY_DIR)}
+    assert names >= {'python', 'javascript', 'java', 'go', 'rust', 'cpp', 'c', 'c_sharp', 'ruby', 'php'}
+
+
+def test_fallback_without_query(parser_manager, monkeypatch):
+    """Languages without a query are extracted by walking the tree."""
+    monkeypatch.setattr("src.analysis.symbol_queries._queries", {'python': None})
+    parse_result = parser_manager.parse_bytes(SAMPLES['python'], 'python')
+
+    symbols = QuerySymbolExtractor().extract_symbols(parse_result)
+
+    assert [f.name for f in symbols.functions] == ['plain', 'decorated', 'outer']
+
+
+def test_engine_uses_queries():
+    """The engine's symbol extractor is selected by use_symbol_queries."""
+    engine = AnalysisEngine(None, AnalysisConfig(enable_linters=False))
+    assert isinstance(engine.symbol_extractor, QuerySymbolExtractor)
+    engine.shutdown()
+
+    engine = AnalysisEngine(None, AnalysisConfig(enable_linters=False, use_symbol_queries=False))
+    assert type(engine.symbol_extractor) is SymbolExtractor
+    engine.shutdown()
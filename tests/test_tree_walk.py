@@ -0,0 +1,126 @@
+"""
+Tests for cursor-based tree traversal.
+
+Tests:
+- Pre-order matches a recursive walk over children
+- Node type filtering, pruning and depth limits
+- Error node search skips clean subtrees
+- Deeply nested code is analyzed without RecursionError
+"""
+
+import sys
+
+import pytest
+
+from src.analysis.ast_parser import ASTParserManager
+from src.analysis.complexity_analyzer import ComplexityAnalyzer
+from src.analysis.config import AnalysisConfig
+from src.analysis.symbol_extractor import SymbolExtractor
+from src.analysis.tree_walk import (
+    count_nodes, find_error_nodes, max_nesting_depth, walk_tree, walk_tree_depths
+)
+
+
+SOURCE = b'''def outer(items):
+    for item in items:
+        if item:
+            while item.next:
+                item = item.next
+    return [x for x in items if x]
+
+
+class Box:
+    def get(self):
+        try:
+            return self.value
+        except AttributeError:
+            return None
+'''
+
+
+def recursive_walk(node, depth=0):
+    """Reference pre-order walk."""
+    yield node, depth
+    for child in node.children:
+        yield from recursive_walk(child, depth + 1)
+
+
+@pytest.fixture(scope="module")
+def parser_manager():
+    """Create AST parser manager."""
+    return ASTParserManager(AnalysisConfig())
+
+
+@pytest.fixture(scope="module")
+def tree(parser_manager):
+    """Parse the sample source."""
+    return parser_manager.parse_bytes(SOURCE, 'python').root_node
+
+
+def test_preorder_matches_recursive_walk(tree):
+    """Nodes and depths come out in the order of a recursive walk."""
+    def key(pairs):
+        return [(node.type, node.start_byte, node.end_byte, depth) for node, depth in pairs]
+
+    assert key(walk_tree_depths(tree)) == key(recursive_walk(tree))
+
+    # Walking a subtree stays within it
+    function = tree.children[0]
+    assert key(walk_tree_depths(function)) == key(recursive_walk(function))
+
+
+def test_filters(tree):
+    """Node types, pruning and max_depth limit what is visited."""
+    functions = [n.child_by_field_name('name').text for n in walk_tree(tree, {'function_definition'})]
+    assert functions == [b'outer', b'get']
+
+    # Pruned functions are yielded but not entered
+    pruned = list(walk_tree(tree, prune=lambda n: n.type == 'function_definition'))
+    assert not any(n.type == 'for_statement' for n in pruned)
+    assert any(n.type == 'class_definition' for n in pruned)
+
+    assert [n.type for n in walk_tree(tree, max_depth=1)] == [
+        'module', 'function_definition', 'class_definition'
+    ]
+
+
+def test_counts_and_depth(tree):
+    """Counting and nesting depth agree with the complexity analyzer's rules."""
+    outer = tree.children[0]
+    assert count_nodes(outer, {'if_statement', 'for_statement', 'while_statement'}) == 3
+    assert count_nodes(outer, {'if_clause'}, lambda n: False) == 0
+    assert max_nesting_depth(outer, {'if_statement', 'for_statement', 'while_statement'}) == 3
+    assert ComplexityAnalyzer().calculate_nesting_depth(outer) == 3
+
+
+def test_find_error_nodes(parser_manager):
+    """Error and missing nodes are found; clean trees yield none."""
+    def recursive_errors(node):
+        found = [node] if node.type == 'ERROR' or node.is_missing else []
+        for child in node.children:
+            found.extend(recursive_errors(child))
+        return found
+
+    broken = parser_manager.parse_bytes(b"def ok():\n    pass\n\ndef f(:\n    return (1\n", 'python').root_node
+    errors = find_error_nodes(broken)
+    assert errors
+    assert [(n.type, n.start_byte) for n in errors] == [(n.type, n.start_byte) for n in recursive_errors(broken)]
+
+    assert find_error_nodes(parser_manager.parse_bytes(SOURCE, 'python').root_node) == []
+
+
+def test_deeply_nested_code(parser_manager):
+    """Nesting deeper than the recursion limit is handled."""
+    depth = sys.getrecursionlimit() + 500
+    source = ("def generated():\n    return " + "[" * depth + "]" * depth + "\n").encode()
+    parse_result = parser_manager.parse_bytes(source, 'python')
+
+    extractor = SymbolExtractor()
+    symbols = extractor.extract_symbols(parse_result)
+    assert [f.name for f in symbols.functions] == ['generated']
+    assert extractor._calculate_complexity(parse_result.root_node.children[0]) == 1
+
+    analyzer = ComplexityAnalyzer()
+    function = parse_result.root_node.children[0]
+    assert analyzer.calculate_complexity(function, 'python') == 1
+    assert analyzer.calculate_nesting_depth(function) == 0